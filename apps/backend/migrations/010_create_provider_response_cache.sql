@@ -0,0 +1,26 @@
+-- Migration: Create provider_response_cache table
+-- Description: Durable tier of the content-addressed provider response cache.
+--              Keys are SHA-256 of (provider, model, temperature, prompt hash, system prompt hash).
+-- Date: 2026-10-16
+
+CREATE TABLE IF NOT EXISTS provider_response_cache (
+    cache_key CHAR(64) PRIMARY KEY,
+    provider VARCHAR(50),
+    model VARCHAR(100),
+    category_name VARCHAR(255),
+
+    -- Cached provider response (response text + request payload)
+    response JSONB NOT NULL,
+
+    -- Expiry and usage
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMP NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    last_hit_at TIMESTAMP
+);
+
+-- Index for purging expired entries
+CREATE INDEX IF NOT EXISTS idx_provider_response_cache_expires ON provider_response_cache(expires_at);
+
+COMMENT ON TABLE provider_response_cache IS 'Cached provider responses keyed by content hash of the request';
+COMMENT ON COLUMN provider_response_cache.response IS 'Cached response text and request payload (JSONB)';
@@ -0,0 +1,36 @@
+-- Migration: Create response_blobs table
+-- Description: Compressed, content-addressed storage for raw API responses.
+--              Blobs are keyed by the SHA-256 checksum of the response JSON and
+--              shared by every row holding that response (reference counted).
+--              api_responses and api_usage_logs hold only the blob reference.
+-- Date: 2026-10-16
+
+CREATE TABLE IF NOT EXISTS response_blobs (
+    checksum CHAR(64) PRIMARY KEY,
+
+    -- Compressed JSON ('zstd', 'gzip' or 'identity')
+    encoding VARCHAR(10) NOT NULL,
+    content BYTEA NOT NULL,
+    original_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+
+    -- Rows referencing this blob; may over-count after failed writes, never under-count
+    ref_count INTEGER NOT NULL DEFAULT 1,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    last_referenced_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Index for garbage-collecting unreferenced blobs
+CREATE INDEX IF NOT EXISTS idx_response_blobs_ref_count ON response_blobs(ref_count) WHERE ref_count <= 0;
+
+-- api_usage_logs: large response_data moves to a blob
+ALTER TABLE api_usage_logs ADD COLUMN IF NOT EXISTS response_blob CHAR(64);
+
+-- api_responses: raw/standardized response move to a blob
+ALTER TABLE api_responses ADD COLUMN IF NOT EXISTS response_blob_checksum CHAR(64);
+ALTER TABLE api_responses ALTER COLUMN raw_response DROP NOT NULL;
+ALTER TABLE api_responses ALTER COLUMN standardized_response DROP NOT NULL;
+
+COMMENT ON TABLE response_blobs IS 'Compressed raw API responses keyed by SHA-256 checksum, shared across rows';
+COMMENT ON COLUMN api_usage_logs.response_blob IS 'Checksum of the response_blobs row holding response_data, when offloaded';
+COMMENT ON COLUMN api_responses.response_blob_checksum IS 'Checksum of the response_blobs row holding raw_response';
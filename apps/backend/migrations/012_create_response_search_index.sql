@@ -0,0 +1,41 @@
+-- Migration: Create search indexes for api_responses
+-- Description: Trigram index on compound names (pg_trgm) so ILIKE '%...%'
+--              searches use an index instead of a sequential scan, and a
+--              tsvector over response text for ranked full-text search.
+--              search_vector is written by the application when a response
+--              is stored; rows stored earlier are backfilled here.
+-- Date: 2026-10-16
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_api_responses_compound_trgm
+    ON api_responses USING GIN (pharmaceutical_compound gin_trgm_ops);
+
+ALTER TABLE api_responses ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+
+-- Backfill rows whose standardized response is still inline
+UPDATE api_responses
+SET search_vector = to_tsvector(
+    'english',
+    left(
+        concat_ws(
+            E'\n',
+            standardized_response->>'query',
+            (SELECT string_agg(concat_ws(E'\n', r->>'title', r->>'content'), E'\n')
+             FROM jsonb_array_elements(COALESCE(standardized_response->'results', '[]'::jsonb)) AS r),
+            (SELECT string_agg(s->>'title', E'\n')
+             FROM jsonb_array_elements(COALESCE(standardized_response->'sources', '[]'::jsonb)) AS s)
+        ),
+        100000
+    )
+)
+WHERE search_vector IS NULL AND standardized_response IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_api_responses_search_vector
+    ON api_responses USING GIN (search_vector);
+
+-- Keyset pagination tie-breaker for unranked searches
+CREATE INDEX IF NOT EXISTS idx_api_responses_created_id
+    ON api_responses (created_at DESC, id DESC);
+
+COMMENT ON COLUMN api_responses.search_vector IS 'Full-text vector of query, result titles/content and source titles';
@@ -0,0 +1,33 @@
+-- Migration: Create integrity_scan_state table
+-- Description: Persisted progress of the api_responses checksum scan. The
+--              scan walks api_responses in (created_at, id) order and saves
+--              its keyset cursor after every batch, so runs resume where the
+--              previous one stopped instead of re-checking the same rows.
+-- Date: 2026-10-16
+
+CREATE TABLE IF NOT EXISTS integrity_scan_state (
+    scan_name VARCHAR(50) PRIMARY KEY,
+
+    -- 'idle', 'running', 'completed', 'failed'
+    status VARCHAR(20) NOT NULL DEFAULT 'idle',
+
+    -- Keyset cursor: last row verified
+    cursor_created_at TIMESTAMP WITH TIME ZONE,
+    cursor_id VARCHAR(36),
+
+    -- Counters for the current pass
+    rows_scanned BIGINT NOT NULL DEFAULT 0,
+    valid_count BIGINT NOT NULL DEFAULT 0,
+    invalid_count BIGINT NOT NULL DEFAULT 0,
+    passes_completed INTEGER NOT NULL DEFAULT 0,
+
+    started_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    completed_at TIMESTAMP WITH TIME ZONE,
+    last_error TEXT
+);
+
+-- Keyset order of the scan
+CREATE INDEX IF NOT EXISTS idx_api_responses_created_id_asc ON api_responses (created_at, id);
+
+COMMENT ON TABLE integrity_scan_state IS 'Resumable progress of the api_responses checksum verification scan';
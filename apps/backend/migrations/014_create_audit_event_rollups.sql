@@ -0,0 +1,26 @@
+-- Migration: Create audit_event_rollups table
+-- Description: Hourly audit event counts per event type, entity type and
+--              user, maintained incrementally by AuditRepository.refresh_rollups.
+--              Compliance reports read whole hours from here and aggregate
+--              only the partial edge hours and the not-yet-rolled-up tail
+--              from audit_events, so report cost no longer grows with the
+--              number of events in the range.
+-- Date: 2026-10-16
+
+CREATE TABLE IF NOT EXISTS audit_event_rollups (
+    -- Start of the hour (UTC)
+    bucket_hour TIMESTAMP NOT NULL,
+    event_type VARCHAR(50) NOT NULL,
+    entity_type VARCHAR(100) NOT NULL,
+    -- '' for events without a user
+    user_id VARCHAR(36) NOT NULL DEFAULT '',
+    event_count BIGINT NOT NULL,
+
+    PRIMARY KEY (bucket_hour, event_type, entity_type, user_id)
+);
+
+-- Range scans for reports filtered by entity type
+CREATE INDEX IF NOT EXISTS idx_audit_event_rollups_entity_hour
+    ON audit_event_rollups (entity_type, bucket_hour);
+
+COMMENT ON TABLE audit_event_rollups IS 'Hourly audit event counts per type/entity/user for compliance reports';
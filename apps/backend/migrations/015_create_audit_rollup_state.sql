@@ -0,0 +1,19 @@
+-- Migration: Create audit_rollup_state table
+-- Description: Persisted watermark of AuditRepository.refresh_rollups: the
+--              end of the last hour rolled up into audit_event_rollups.
+--              Progress used to be inferred from max(bucket_hour), which
+--              never moves across hours without events, so a stretch with
+--              no audit events longer than one refresh window stalled the
+--              rollups. The watermark advances even when a window is empty.
+-- Date: 2026-10-16
+
+CREATE TABLE IF NOT EXISTS audit_rollup_state (
+    rollup_name VARCHAR(50) PRIMARY KEY,
+
+    -- End (exclusive, UTC) of the last rolled-up hour
+    rolled_up_to TIMESTAMP NOT NULL,
+
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE audit_rollup_state IS 'Rolled-up-to watermark of audit_event_rollups';
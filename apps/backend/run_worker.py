@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""Run drug processing workers with environment variables loaded."""
+
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+# Fix Windows console encoding for Unicode characters
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Load environment variables from root .env file
+env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.env')
+load_dotenv(env_path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consume drug processing jobs from the work queue.")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=int(os.getenv("WORKER_PROCESSES", "1")),
+        help="Worker processes to start (WORKER_PROCESSES)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("WORKER_CONCURRENCY", "2")),
+        help="Concurrent jobs per process (WORKER_CONCURRENCY)"
+    )
+    args = parser.parse_args()
+
+    from src.core.message_queue import DEFAULT_WORK_QUEUE_URL
+    from src.services.drug_processing_worker import run_worker_pool
+
+    print(f"Work queue: {os.getenv('WORK_QUEUE_URL', DEFAULT_WORK_QUEUE_URL)}")
+    print(f"Starting {args.processes} worker process(es) x {args.concurrency} job slot(s)")
+    run_worker_pool(args.processes, args.concurrency)
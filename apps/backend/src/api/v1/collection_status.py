@@ -264,8 +264,8 @@ async def get_quality_indicators(
         verified_count = 0
 
         for response in responses:
-            # Check for duplicates
-            content_hash = hash(str(response.raw_response))
+            # Check for duplicates (checksum of the raw response)
+            content_hash = response.checksum
             if content_hash in unique_contents:
                 duplicates.add(content_hash)
             unique_contents.add(content_hash)
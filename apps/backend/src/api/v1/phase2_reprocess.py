@@ -9,6 +9,7 @@ import structlog
 from typing import Dict, Any
 
 from ...services.pipeline_integration_service import PipelineIntegrationService
+from ...services.phase1_snapshot import get_phase1_snapshots
 from ...utils.db_connection import DatabaseConnection
 
 logger = structlog.get_logger(__name__)
@@ -93,8 +94,10 @@ async def reprocess_phase2_only(request_id: str) -> Dict[str, Any]:
 
             logger.info(f"[REPROCESS_PHASE2] Found {len(phase2_cats)} Phase 2 categories to process")
 
-        # Step 5: Re-run Phase 2 processing
+        # Step 5: Re-run Phase 2 processing from a fresh Phase 1 snapshot
         pipeline = PipelineIntegrationService()
+        phase1_snapshots = get_phase1_snapshots()
+        await phase1_snapshots.build(request_id)
         results = []
 
         for cat in phase2_cats:
@@ -134,6 +137,8 @@ async def reprocess_phase2_only(request_id: str) -> Dict[str, Any]:
                     "error": str(e)
                 })
 
+        phase1_snapshots.discard(request_id)
+
         # Step 6: Return results
         successful = len([r for r in results if r['status'] == 'completed'])
         failed = len([r for r in results if r['status'] == 'failed'])
@@ -3,9 +3,10 @@ Pipeline categories API endpoints.
 """
 
 from fastapi import APIRouter
-import asyncpg
 import structlog
 
+from ...utils.db_connection import get_db_connection
+
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api/v1/pipeline", tags=["pipeline"])
@@ -16,13 +17,7 @@ async def get_categories_for_request(request_id: str):
     """Get all categories for a request."""
     logger.info(f"Fetching categories for request_id: {request_id}")
     try:
-        conn = await asyncpg.connect(
-            host='localhost',
-            port=5432,
-            user='postgres',
-            password='postgres',
-            database='cognito-engine'
-        )
+        conn = await get_db_connection()
 
         try:
             rows = await conn.fetch(
@@ -68,13 +63,7 @@ async def get_category_stage_executions(category_result_id: str):
     """Get pipeline stage executions for a category."""
     logger.info(f"Fetching stage executions for category_result_id: {category_result_id}")
     try:
-        conn = await asyncpg.connect(
-            host='localhost',
-            port=5432,
-            user='postgres',
-            password='postgres',
-            database='cognito-engine'
-        )
+        conn = await get_db_connection()
 
         try:
             rows = await conn.fetch(
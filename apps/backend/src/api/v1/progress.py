@@ -0,0 +1,159 @@
+"""
+Real-time request progress endpoints.
+
+Streams progress from the progress event bus over Server-Sent Events or
+WebSocket. Each watcher gets a snapshot per subscribed request followed by
+coalesced deltas; the database is read at most once per request when the
+bus has no state for it yet.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+import logging
+
+from ...services.progress_bus import get_progress_bus
+from ...services.request_db_service import RequestDatabaseService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/api/v1/progress",
+    tags=["progress"]
+)
+
+# Seconds between keep-alives on idle streams
+HEARTBEAT_INTERVAL = 15.0
+MAX_SUBSCRIPTIONS = 100
+
+request_db_service = RequestDatabaseService()
+
+
+async def _seed(request_ids: List[str]) -> List[str]:
+    """
+    Load stored state for requests the bus has not seen.
+
+    Returns:
+        Request IDs that do not exist
+    """
+    bus = get_progress_bus()
+    missing = []
+    for request_id in request_ids:
+        if bus.has_state(request_id):
+            continue
+        stored = await request_db_service.get_request(request_id)
+        if stored is None:
+            missing.append(request_id)
+        else:
+            bus.seed(request_id, stored)
+    return missing
+
+
+def _format_sse(message: Dict[str, Any]) -> str:
+    return f"event: {message['type']}\ndata: {json.dumps(message, default=str)}\n\n"
+
+
+@router.get("/stream")
+async def stream_progress(
+    request: Request,
+    request_id: List[str] = Query(..., description="Request IDs to watch")
+):
+    """
+    Stream progress for one or more requests as Server-Sent Events.
+
+    Events are "snapshot" (full state, first event per request) and
+    "delta" (changed fields only).
+
+    Args:
+        request: Incoming HTTP request (for disconnect detection)
+        request_id: Request IDs to watch
+
+    Returns:
+        text/event-stream response
+
+    Raises:
+        HTTPException: If none of the requests exist
+    """
+    request_ids = list(dict.fromkeys(request_id))[:MAX_SUBSCRIPTIONS]
+    subscription = get_progress_bus().subscribe(request_ids)
+    missing = await _seed(request_ids)
+    if len(missing) == len(request_ids):
+        subscription.close()
+        raise HTTPException(status_code=404, detail="Request not found")
+    subscription.remove(missing)
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                messages = await subscription.next(timeout=HEARTBEAT_INTERVAL)
+                if not messages:
+                    yield ": keep-alive\n\n"
+                for message in messages:
+                    yield _format_sse(message)
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def progress_websocket(
+    websocket: WebSocket,
+    request_id: List[str] = Query(default=[])
+):
+    """
+    Stream progress over WebSocket.
+
+    Initial subscriptions come from the request_id query parameters;
+    clients change them with {"action": "subscribe" | "unsubscribe",
+    "request_ids": [...]}. Server messages are {"request_id", "type",
+    "data"} with type "snapshot", "delta" or "not_found".
+    """
+    await websocket.accept()
+    bus = get_progress_bus()
+    subscription = bus.subscribe()
+
+    async def subscribe(request_ids: List[str]):
+        room = MAX_SUBSCRIPTIONS - len(subscription.request_ids)
+        request_ids = [rid for rid in request_ids if rid not in subscription.request_ids][:max(room, 0)]
+        subscription.add(request_ids)
+        missing = await _seed(request_ids)
+        subscription.remove(missing)
+        for rid in missing:
+            await websocket.send_json({"request_id": rid, "type": "not_found", "data": {}})
+
+    async def receive():
+        while True:
+            message = await websocket.receive_json()
+            request_ids = [str(rid) for rid in message.get("request_ids") or []]
+            if message.get("action") == "subscribe":
+                await subscribe(request_ids)
+            elif message.get("action") == "unsubscribe":
+                subscription.remove(request_ids)
+
+    async def send():
+        while True:
+            messages = await subscription.next(timeout=HEARTBEAT_INTERVAL)
+            for message in messages or [{"type": "heartbeat"}]:
+                await websocket.send_json(message)
+
+    try:
+        await subscribe(list(dict.fromkeys(request_id)))
+        tasks = [asyncio.create_task(receive()), asyncio.create_task(send())]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        for task in done:
+            if task.exception() and not isinstance(task.exception(), WebSocketDisconnect):
+                logger.warning(f"Progress websocket closed: {task.exception()!r}")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
@@ -10,12 +10,13 @@ Author: CognitoAI Development Team
 
 from typing import List, Dict, Optional, Any
 from datetime import datetime
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, Field
 
 from ...database.session import get_db
 from ...database.repositories.raw_data_repo import RawDataRepository
+from ...core.integrity_scanner import get_integrity_scanner
 from ...core.security.access_control import AccessControlService, require_access
 from ...core.security.data_encryption import DataMaskingService
 from ...config.logging import PharmaceuticalLogger
@@ -32,8 +33,10 @@ class RawDataSearchRequest(BaseModel):
     start_date: Optional[datetime] = Field(None, description="Start of date range")
     end_date: Optional[datetime] = Field(None, description="End of date range")
     correlation_id: Optional[str] = Field(None, description="Correlation ID for request tracing")
+    text_query: Optional[str] = Field(None, description="Full-text search over response content")
     limit: int = Field(100, ge=1, le=1000, description="Maximum results")
     include_archived: bool = Field(False, description="Include archived responses")
+    cursor: Optional[str] = Field(None, description="X-Next-Cursor value from the previous page")
 
 
 class RawDataResponse(BaseModel):
@@ -88,6 +91,7 @@ class StorageStatisticsResponse(BaseModel):
 @router.post("/search", response_model=List[RawDataResponse])
 async def search_raw_data(
     request: RawDataSearchRequest,
+    http_response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(lambda: {"id": "test_user", "role": "researcher"})  # TODO: Real auth
 ) -> List[RawDataResponse]:
@@ -96,6 +100,10 @@ async def search_raw_data(
 
     Requires appropriate access level based on user role.
     Data may be masked based on authorization level.
+
+    Results are ranked by compound and content relevance. When more
+    results exist, the X-Next-Cursor header holds the cursor for the
+    next page.
     """
     try:
         # Initialize services
@@ -119,26 +127,29 @@ async def search_raw_data(
         # Search responses
         if request.correlation_id:
             responses = await repo.get_by_correlation_id(request.correlation_id)
-        elif request.pharmaceutical_compound:
-            responses = await repo.search_by_compound(
-                compound=request.pharmaceutical_compound,
-                category=request.category,
-                start_date=request.start_date,
-                end_date=request.end_date,
-                limit=request.limit
-            )
         else:
-            # General search
-            conditions = []
-            if request.provider:
-                conditions.append(f"provider = '{request.provider}'")
-            if request.category:
-                conditions.append(f"category = '{request.category}'")
-
-            # TODO: Implement general search in repository
-            responses = []
+            try:
+                responses, next_cursor = await repo.search_indexed(
+                    compound=request.pharmaceutical_compound,
+                    text_query=request.text_query,
+                    category=request.category,
+                    provider=request.provider,
+                    start_date=request.start_date,
+                    end_date=request.end_date,
+                    include_archived=request.include_archived,
+                    limit=request.limit,
+                    cursor=request.cursor
+                )
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+            if next_cursor:
+                http_response.headers["X-Next-Cursor"] = next_cursor
 
         # Filter and mask data based on user role
+        payloads = await repo.load_payloads(responses)
         result = []
         for response in responses:
             # Convert to dict
@@ -150,8 +161,8 @@ async def search_raw_data(
                 'provider': response.provider,
                 'pharmaceutical_compound': response.pharmaceutical_compound,
                 'category': response.category,
-                'raw_response': response.raw_response,
-                'standardized_response': response.standardized_response,
+                'raw_response': payloads[response.id]['raw_response'],
+                'standardized_response': payloads[response.id]['standardized_response'],
                 'relevance_score': response.relevance_score,
                 'quality_score': response.quality_score,
                 'confidence_score': response.confidence_score,
@@ -236,6 +247,7 @@ async def get_raw_data(
             )
 
         # Convert and filter
+        payload = (await repo.load_payloads([response]))[response.id]
         response_dict = {
             'id': response.id,
             'process_id': response.process_id,
@@ -244,8 +256,8 @@ async def get_raw_data(
             'provider': response.provider,
             'pharmaceutical_compound': response.pharmaceutical_compound,
             'category': response.category,
-            'raw_response': response.raw_response,
-            'standardized_response': response.standardized_response,
+            'raw_response': payload['raw_response'],
+            'standardized_response': payload['standardized_response'],
             'relevance_score': response.relevance_score,
             'quality_score': response.quality_score,
             'confidence_score': response.confidence_score,
@@ -454,17 +466,21 @@ async def archive_old_responses(
 
 @router.post("/validate-integrity")
 async def validate_data_integrity(
-    batch_size: int = Query(100, ge=10, le=1000),
+    batch_size: int = Query(500, ge=10, le=5000),
+    rows_per_second: Optional[float] = Query(None, ge=0, description="Throughput target; 0 for unpaced"),
+    max_fetch_ms: Optional[float] = Query(None, ge=0, description="Batch fetch latency budget before backing off"),
+    max_rows: Optional[int] = Query(None, ge=1, description="Pause after this many rows"),
     db: AsyncSession = Depends(get_db),
     current_user: Dict = Depends(lambda: {"id": "test_user", "role": "admin"})
 ) -> Dict[str, Any]:
     """
-    Validate data integrity for stored responses.
+    Start or resume the data integrity scan.
 
+    The scan runs in the background from the persisted cursor, paced to
+    the throughput target, and the response reports its progress.
     Requires admin access level.
     """
     try:
-        repo = RawDataRepository(db)
         access_control = AccessControlService(db, logger)
 
         # Check admin access
@@ -480,15 +496,18 @@ async def validate_data_integrity(
                 detail="Admin access required"
             )
 
-        # Validate integrity
-        valid_count, invalid_count = await repo.validate_integrity_batch(batch_size)
+        scanner = get_integrity_scanner()
+        options = {'batch_size': batch_size, 'max_rows': max_rows}
+        if rows_per_second is not None:
+            options['rows_per_second'] = rows_per_second
+        if max_fetch_ms is not None:
+            options['max_fetch_ms'] = max_fetch_ms
+        started = scanner.start(**options)
 
-        return {
-            'batch_size': batch_size,
-            'valid': valid_count,
-            'invalid': invalid_count,
-            'timestamp': datetime.utcnow().isoformat()
-        }
+        progress = await scanner.get_progress()
+        progress['started'] = started
+        progress['timestamp'] = datetime.utcnow().isoformat()
+        return progress
 
     except HTTPException:
         raise
@@ -497,4 +516,43 @@ async def validate_data_integrity(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to validate data integrity"
+        )
+
+
+@router.get("/validate-integrity")
+async def get_integrity_scan_progress(
+    db: AsyncSession = Depends(get_db),
+    current_user: Dict = Depends(lambda: {"id": "test_user", "role": "admin"})
+) -> Dict[str, Any]:
+    """
+    Get data integrity scan progress.
+
+    Requires admin access level.
+    """
+    try:
+        access_control = AccessControlService(db, logger)
+
+        has_access = await access_control.check_access(
+            current_user["id"],
+            "system_maintenance",
+            "execute"
+        )
+
+        if not has_access:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin access required"
+            )
+
+        progress = await get_integrity_scanner().get_progress()
+        progress['timestamp'] = datetime.utcnow().isoformat()
+        return progress
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Integrity scan progress failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get integrity scan progress"
         )
\ No newline at end of file
@@ -4,9 +4,10 @@ Technology Go/No-Go Scoring Matrix API endpoints
 
 from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any
-import asyncpg
 import structlog
 
+from ...utils.db_connection import get_db_connection
+
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api/v1/technology-scoring", tags=["technology-scoring"])
@@ -17,13 +18,7 @@ async def get_scoring_categories():
     """Get all scoring categories with their weightages"""
     logger.info("Fetching scoring categories")
     try:
-        conn = await asyncpg.connect(
-            host='localhost',
-            port=5432,
-            user='postgres',
-            password='postgres',
-            database='cognito-engine'
-        )
+        conn = await get_db_connection()
 
         try:
             rows = await conn.fetch(
@@ -61,13 +56,7 @@ async def get_scoring_parameters():
     """Get all scoring parameters with their categories"""
     logger.info("Fetching scoring parameters")
     try:
-        conn = await asyncpg.connect(
-            host='localhost',
-            port=5432,
-            user='postgres',
-            password='postgres',
-            database='cognito-engine'
-        )
+        conn = await get_db_connection()
 
         try:
             rows = await conn.fetch(
@@ -118,13 +107,7 @@ async def get_scoring_ranges(parameter_id: int):
     """Get scoring ranges for a specific parameter"""
     logger.info(f"Fetching scoring ranges for parameter_id: {parameter_id}")
     try:
-        conn = await asyncpg.connect(
-            host='localhost',
-            port=5432,
-            user='postgres',
-            password='postgres',
-            database='cognito-engine'
-        )
+        conn = await get_db_connection()
 
         try:
             # Get parameter info
@@ -222,13 +205,7 @@ async def get_full_scoring_matrix():
     """Get the complete scoring matrix with all categories, parameters, and ranges"""
     logger.info("Fetching full scoring matrix")
     try:
-        conn = await asyncpg.connect(
-            host='localhost',
-            port=5432,
-            user='postgres',
-            password='postgres',
-            database='cognito-engine'
-        )
+        conn = await get_db_connection()
 
         try:
             # Get all data in one go
@@ -350,13 +327,7 @@ async def calculate_score(data: Dict[str, Any]):
         raise HTTPException(status_code=400, detail="No values provided")
 
     try:
-        conn = await asyncpg.connect(
-            host='localhost',
-            port=5432,
-            user='postgres',
-            password='postgres',
-            database='cognito-engine'
-        )
+        conn = await get_db_connection()
 
         try:
             results = []
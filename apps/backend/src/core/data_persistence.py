@@ -2,7 +2,9 @@
 Data persistence manager for raw API responses.
 
 Handles storage, retrieval, and management of raw pharmaceutical data
-with complete audit trail and 7-year retention compliance.
+with complete audit trail and 7-year retention compliance. Response
+payloads live in the shared, compressed response_blobs table keyed by
+checksum, so identical responses are stored once.
 
 Version: 1.0.0
 Author: CognitoAI Development Team
@@ -11,15 +13,19 @@ Author: CognitoAI Development Team
 import hashlib
 import json
 import sys
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from uuid import uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
 from ..database.models import APIResponse, APIResponseMetadata
+from ..database.repositories.raw_data_repo import RawDataRepository
 from ..integrations.providers.base import StandardizedAPIResponse
 from ..config.logging import PharmaceuticalLogger
+from .response_blobs import prepare_blob
+from .response_search import extract_search_text, get_fallback_search_index
+from .security.data_encryption import DataEncryptionService
 
 logger = structlog.get_logger(__name__)
 
@@ -35,9 +41,12 @@ class DataPersistenceManager:
         db: Database session
         audit_logger: Pharmaceutical compliance logger
         encryption_enabled: Whether to encrypt sensitive data
+        encryption_service: Service encrypting stored responses
 
     Example:
-        >>> manager = DataPersistenceManager(db, audit_logger)
+        >>> manager = DataPersistenceManager(
+        ...     db, audit_logger, encryption_service=get_data_encryption_service()
+        ... )
         >>> await manager.store_api_response(
         ...     response, process_id, request_id, compound, category
         ... )
@@ -50,7 +59,8 @@ class DataPersistenceManager:
         self,
         db: AsyncSession,
         audit_logger: PharmaceuticalLogger,
-        encryption_enabled: bool = True
+        encryption_enabled: bool = True,
+        encryption_service: Optional[DataEncryptionService] = None
     ):
         """
         Initialize data persistence manager.
@@ -59,13 +69,24 @@ class DataPersistenceManager:
             db: Database session
             audit_logger: Compliance logger
             encryption_enabled: Enable data encryption
+            encryption_service: Envelope encryption service; shared across
+                managers so data keys are derived once per process. Required
+                when encryption is enabled.
+
+        Raises:
+            ValueError: If encryption is enabled without an encryption service
 
         Since:
             Version 1.0.0
         """
+        if encryption_enabled and encryption_service is None:
+            raise ValueError("Encryption is enabled but no encryption service was provided")
+
         self.db = db
         self.audit_logger = audit_logger
         self.encryption_enabled = encryption_enabled
+        self.encryption_service = encryption_service
+        self.raw_data_repo = RawDataRepository(db)
 
     async def store_api_response(
         self,
@@ -101,14 +122,30 @@ class DataPersistenceManager:
             response_id = str(uuid4())
 
             # Calculate checksum for data integrity
-            raw_response_json = json.dumps(response.dict(), sort_keys=True)
+            # JSON-safe (timestamps as ISO strings) so it can be hashed and stored
+            response_dict = json.loads(response.json())
+            raw_response_json = json.dumps(response_dict, sort_keys=True)
             checksum = self._calculate_checksum(raw_response_json)
 
             # Encrypt sensitive data if enabled
             if self.encryption_enabled:
                 raw_response_data = await self._encrypt_data(raw_response_json)
             else:
-                raw_response_data = response.dict()
+                raw_response_data = response_dict
+
+            # Plaintext search text; only the derived tsvector is stored.
+            # Encrypted content is never indexed (its lexemes would sit in
+            # clear in search_vector); only the query, already stored in
+            # clear, is searchable for those rows.
+            if self.encryption_enabled:
+                search_text = str(response_dict.get('query') or '')
+            else:
+                search_text = extract_search_text(response_dict)
+
+            # Store the payload once per checksum; the row keeps the reference
+            await self.raw_data_repo.store_blob(
+                prepare_blob(raw_response_data, checksum=checksum)
+            )
 
             # Create API response record
             api_response = APIResponse(
@@ -126,9 +163,11 @@ class DataPersistenceManager:
                     'max_results': len(response.results)
                 },
 
-                # Response data
-                raw_response=raw_response_data,
-                standardized_response=response.dict(),
+                # Response data (loaded lazily from response_blobs)
+                raw_response=None,
+                standardized_response=None,
+                response_blob_checksum=checksum,
+                search_vector=self.raw_data_repo.search_vector(search_text),
 
                 # Metadata
                 response_time_ms=response.response_time_ms,
@@ -162,6 +201,13 @@ class DataPersistenceManager:
 
             # Commit transaction
             await self.db.commit()
+            self.raw_data_repo.index_fallback(
+                response_id,
+                pharmaceutical_compound,
+                search_text,
+                category=category,
+                provider=response.provider
+            )
 
             # Log for audit trail
             await self.audit_logger.log_data_access(
@@ -223,7 +269,7 @@ class DataPersistenceManager:
                 source_types[source_type] = source_types.get(source_type, 0) + 1
 
         # Calculate storage size
-        storage_size = sys.getsizeof(json.dumps(response.dict()))
+        storage_size = sys.getsizeof(response.json())
 
         # Extract key findings (simplified - would use NLP in production)
         key_findings = []
@@ -262,7 +308,7 @@ class DataPersistenceManager:
 
     async def _encrypt_data(self, data: str) -> Dict[str, Any]:
         """
-        Encrypt sensitive data (placeholder).
+        Encrypt sensitive data.
 
         Args:
             data: Data to encrypt
@@ -273,13 +319,26 @@ class DataPersistenceManager:
         Since:
             Version 1.0.0
         """
-        # TODO: Implement actual encryption using cryptography library
-        # For now, return data as-is with encryption flag
-        return {
-            'encrypted': True,
-            'data': data,
-            'algorithm': 'AES-256-GCM'
-        }
+        return await self.encryption_service.encrypt_data(
+            {'data': data},
+            context='api_response'
+        )
+
+    async def load_raw_response(self, response: APIResponse) -> Optional[Dict[str, Any]]:
+        """
+        Load a response's raw payload, from its blob if not stored inline.
+
+        Args:
+            response: API response row
+
+        Returns:
+            Raw response payload (encrypted if stored encrypted)
+
+        Since:
+            Version 1.0.0
+        """
+        payloads = await self.raw_data_repo.load_payloads([response])
+        return payloads[response.id]['raw_response']
 
     async def retrieve_response(
         self,
@@ -307,7 +366,7 @@ class DataPersistenceManager:
 
         if response and validate_checksum:
             # Validate data integrity
-            raw_json = json.dumps(response.raw_response, sort_keys=True)
+            raw_json = json.dumps(await self.load_raw_response(response), sort_keys=True)
             current_checksum = self._calculate_checksum(raw_json)
 
             if current_checksum != response.checksum:
@@ -339,11 +398,16 @@ class DataPersistenceManager:
         provider: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        limit: int = 100
+        limit: int = 100,
+        text_query: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[APIResponse]:
         """
         Search historical API responses.
 
+        Uses the compound trigram and response full-text indexes; results
+        are ranked by relevance, newest first among equals.
+
         Args:
             pharmaceutical_compound: Filter by compound
             category: Filter by category
@@ -351,6 +415,8 @@ class DataPersistenceManager:
             start_date: Start of date range
             end_date: End of date range
             limit: Maximum results
+            text_query: Search the response text
+            cursor: Continue after a previous page (see search_responses_page)
 
         Returns:
             List of matching API responses
@@ -358,39 +424,53 @@ class DataPersistenceManager:
         Since:
             Version 1.0.0
         """
-        from sqlalchemy import select, and_
-
-        conditions = []
-
-        if pharmaceutical_compound:
-            conditions.append(
-                APIResponse.pharmaceutical_compound.ilike(f'%{pharmaceutical_compound}%')
-            )
-
-        if category:
-            conditions.append(APIResponse.category == category)
-
-        if provider:
-            conditions.append(APIResponse.provider == provider)
-
-        if start_date:
-            conditions.append(APIResponse.created_at >= start_date)
-
-        if end_date:
-            conditions.append(APIResponse.created_at <= end_date)
+        responses, _ = await self.search_responses_page(
+            pharmaceutical_compound=pharmaceutical_compound,
+            category=category,
+            provider=provider,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            text_query=text_query,
+            cursor=cursor
+        )
+        return responses
 
-        # Only include valid, non-archived responses
-        conditions.append(APIResponse.is_valid == True)
-        conditions.append(APIResponse.archived_at.is_(None))
+    async def search_responses_page(
+        self,
+        pharmaceutical_compound: Optional[str] = None,
+        category: Optional[str] = None,
+        provider: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        text_query: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_archived: bool = False
+    ) -> Tuple[List[APIResponse], Optional[str]]:
+        """
+        Search historical API responses one page at a time.
 
-        query = select(APIResponse)
-        if conditions:
-            query = query.where(and_(*conditions))
+        Args:
+            Same as search_responses, plus include_archived
 
-        query = query.order_by(APIResponse.created_at.desc()).limit(limit)
+        Returns:
+            tuple: (responses, cursor for the next page or None)
 
-        result = await self.db.execute(query)
-        responses = result.scalars().all()
+        Since:
+            Version 1.0.0
+        """
+        responses, next_cursor = await self.raw_data_repo.search_indexed(
+            compound=pharmaceutical_compound,
+            text_query=text_query,
+            category=category,
+            provider=provider,
+            start_date=start_date,
+            end_date=end_date,
+            include_archived=include_archived,
+            limit=limit,
+            cursor=cursor
+        )
 
         # Log search for audit trail
         await self.audit_logger.log_data_access(
@@ -401,7 +481,7 @@ class DataPersistenceManager:
             drug_names=[pharmaceutical_compound] if pharmaceutical_compound else []
         )
 
-        return responses
+        return responses, next_cursor
 
     async def archive_old_responses(
         self,
@@ -419,7 +499,7 @@ class DataPersistenceManager:
         Since:
             Version 1.0.0
         """
-        from sqlalchemy import update
+        from sqlalchemy import update, and_
 
         cutoff_date = datetime.utcnow() - timedelta(days=days_old)
 
@@ -429,12 +509,15 @@ class DataPersistenceManager:
                 APIResponse.created_at < cutoff_date,
                 APIResponse.archived_at.is_(None)
             )
-        ).values(archived_at=datetime.utcnow())
+        ).values(archived_at=datetime.utcnow()).returning(APIResponse.id)
 
         result = await self.db.execute(stmt)
-        archived_count = result.rowcount
+        archived_ids = result.scalars().all()
+        archived_count = len(archived_ids)
 
         await self.db.commit()
+        if not self.raw_data_repo.uses_native_search():
+            get_fallback_search_index().mark_archived(archived_ids)
 
         if archived_count > 0:
             logger.info(
@@ -456,7 +539,10 @@ class DataPersistenceManager:
         batch_size: int = 100
     ) -> Dict[str, int]:
         """
-        Validate data integrity for stored responses.
+        Validate data integrity for the next batch of stored responses.
+
+        Continues the persisted integrity scan (see core.integrity_scanner
+        for the paced background job).
 
         Args:
             batch_size: Number of records to validate per batch
@@ -467,41 +553,12 @@ class DataPersistenceManager:
         Since:
             Version 1.0.0
         """
-        from sqlalchemy import select
-
-        # Get unvalidated or old validated responses
-        query = select(APIResponse).where(
-            APIResponse.is_valid == True
-        ).limit(batch_size)
-
-        result = await self.db.execute(query)
-        responses = result.scalars().all()
-
-        valid_count = 0
-        invalid_count = 0
-
-        for response in responses:
-            # Recalculate checksum
-            raw_json = json.dumps(response.raw_response, sort_keys=True)
-            current_checksum = self._calculate_checksum(raw_json)
-
-            if current_checksum == response.checksum:
-                valid_count += 1
-            else:
-                invalid_count += 1
-                response.is_valid = False
-                logger.warning(
-                    "Data integrity issue detected",
-                    response_id=response.id,
-                    provider=response.provider
-                )
-
-        await self.db.commit()
+        batch = await self.raw_data_repo.verify_next_batch(batch_size)
 
         return {
-            'valid': valid_count,
-            'invalid': invalid_count,
-            'total': len(responses)
+            'valid': batch['valid'],
+            'invalid': batch['invalid'],
+            'total': batch['rows']
         }
 
     async def get_retention_statistics(self) -> Dict[str, Any]:
@@ -0,0 +1,353 @@
+"""
+Streaming, resumable data-integrity scan of stored API responses.
+
+Walks api_responses in (created_at, id) order with a keyset cursor that is
+persisted after every batch (integrity_scan_state), so a scan survives
+restarts and never re-checks the same rows within a pass. Checksums are
+computed in a process pool, and the scan is paced to a rows-per-second
+target that backs off when batch queries slow down, so it can run against
+production without competing with OLTP traffic.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import structlog
+
+from ..database.repositories.raw_data_repo import DEFAULT_INTEGRITY_SCAN, RawDataRepository
+from .response_blobs import find_checksum_mismatches
+
+logger = structlog.get_logger(__name__)
+
+# Hashing processes per scan; 0 hashes inline in a thread
+INTEGRITY_SCAN_PROCESSES = int(os.getenv('INTEGRITY_SCAN_PROCESSES', '2'))
+DEFAULT_BATCH_SIZE = int(os.getenv('INTEGRITY_SCAN_BATCH_SIZE', '500'))
+# Throughput target; 0 means unpaced
+DEFAULT_ROWS_PER_SECOND = float(os.getenv('INTEGRITY_SCAN_ROWS_PER_SECOND', '2000'))
+# Batch fetches slower than this halve the scan rate
+DEFAULT_MAX_FETCH_MS = float(os.getenv('INTEGRITY_SCAN_MAX_FETCH_MS', '250'))
+
+# Lowest rate the back-off goes down to
+MIN_ROWS_PER_SECOND = 10.0
+
+
+def _default_session_factory():
+    from ..database import connection
+
+    connection.get_engine()
+    return connection.AsyncSessionLocal()
+
+
+class ScanPacer:
+    """
+    Paces a scan to a rows-per-second target with multiplicative back-off.
+
+    A batch whose fetch exceeds the latency budget halves the current
+    rate; each batch within budget recovers a tenth of the target (or
+    doubles the rate when unpaced).
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self, rows_per_second: Optional[float], max_fetch_ms: Optional[float]):
+        """
+        Initialize pacer.
+
+        Args:
+            rows_per_second: Throughput target; None or 0 for unpaced
+            max_fetch_ms: Batch fetch latency budget; None disables back-off
+
+        Since:
+            Version 1.0.0
+        """
+        self.target = rows_per_second or None
+        self.max_fetch_ms = max_fetch_ms or None
+        self.rate = self.target
+
+    def delay(self, rows: int, elapsed: float, fetch_ms: float) -> float:
+        """
+        Seconds to wait after a batch.
+
+        Args:
+            rows: Rows in the batch
+            elapsed: Seconds the batch took
+            fetch_ms: Milliseconds its fetch query took
+
+        Returns:
+            Delay before the next batch
+
+        Since:
+            Version 1.0.0
+        """
+        if self.max_fetch_ms is not None and fetch_ms > self.max_fetch_ms:
+            observed = rows / elapsed if elapsed > 0 else MIN_ROWS_PER_SECOND
+            self.rate = max((self.rate or observed) / 2, MIN_ROWS_PER_SECOND)
+        elif self.rate is not None:
+            self.rate = min(self.rate + self.target / 10, self.target) if self.target else self.rate * 2
+
+        if self.rate is None or rows == 0:
+            return 0.0
+        return max(rows / self.rate - elapsed, 0.0)
+
+
+class IntegrityScanner:
+    """
+    Runs the integrity scan as a background job.
+
+    Example:
+        >>> scanner = get_integrity_scanner()
+        >>> scanner.start(rows_per_second=1000)
+        >>> await scanner.get_progress()
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        scan_name: str = DEFAULT_INTEGRITY_SCAN,
+        processes: int = INTEGRITY_SCAN_PROCESSES
+    ):
+        """
+        Initialize scanner.
+
+        Args:
+            session_factory: Returns an AsyncSession context manager; one
+                session is opened per batch so no connection is held while
+                the scan is paused
+            scan_name: Scan identifier in integrity_scan_state
+            processes: Hashing processes; 0 hashes in a thread
+
+        Since:
+            Version 1.0.0
+        """
+        self.session_factory = session_factory or _default_session_factory
+        self.scan_name = scan_name
+        self.processes = processes
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.run_stats: Dict[str, Any] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        rows_per_second: Optional[float] = DEFAULT_ROWS_PER_SECOND,
+        max_fetch_ms: Optional[float] = DEFAULT_MAX_FETCH_MS,
+        max_rows: Optional[int] = None
+    ) -> bool:
+        """
+        Start (or resume) the scan in the background.
+
+        Args:
+            batch_size: Rows per batch
+            rows_per_second: Throughput target; None or 0 for unpaced
+            max_fetch_ms: Fetch latency budget for back-off
+            max_rows: Stop after this many rows (the cursor is kept)
+
+        Returns:
+            True if started, False if a scan is already running
+
+        Since:
+            Version 1.0.0
+        """
+        if self.running:
+            return False
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(
+            self.run(batch_size, rows_per_second, max_fetch_ms, max_rows)
+        )
+        return True
+
+    async def stop(self):
+        """Stop after the current batch; progress stays committed."""
+        self._stop.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def run(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        rows_per_second: Optional[float] = DEFAULT_ROWS_PER_SECOND,
+        max_fetch_ms: Optional[float] = DEFAULT_MAX_FETCH_MS,
+        max_rows: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Scan until the pass completes, max_rows is reached or stop() is called.
+
+        Args:
+            Same as start()
+
+        Returns:
+            Statistics of this run
+
+        Since:
+            Version 1.0.0
+        """
+        pacer = ScanPacer(rows_per_second, max_fetch_ms)
+        self.run_stats = {
+            'started_at': datetime.utcnow().isoformat(),
+            'rows': 0,
+            'valid': 0,
+            'invalid': 0,
+            'batches': 0,
+            'rows_per_second': 0.0,
+            'target_rows_per_second': pacer.target,
+            'current_rate_limit': pacer.rate,
+            'pass_completed': False
+        }
+        started = time.perf_counter()
+
+        try:
+            while not self._stop.is_set():
+                if max_rows is not None and self.run_stats['rows'] >= max_rows:
+                    break
+
+                batch_started = time.perf_counter()
+                async with self.session_factory() as db:
+                    batch = await RawDataRepository(db).verify_next_batch(
+                        batch_size,
+                        scan_name=self.scan_name,
+                        find_mismatches=self._find_mismatches
+                    )
+                elapsed = time.perf_counter() - batch_started
+
+                self.run_stats['rows'] += batch['rows']
+                self.run_stats['valid'] += batch['valid']
+                self.run_stats['invalid'] += batch['invalid']
+                self.run_stats['batches'] += 1
+                self.run_stats['rows_per_second'] = round(
+                    self.run_stats['rows'] / (time.perf_counter() - started), 1
+                )
+
+                if batch['completed']:
+                    self.run_stats['pass_completed'] = True
+                    break
+
+                delay = pacer.delay(batch['rows'], elapsed, batch['fetch_ms'])
+                self.run_stats['current_rate_limit'] = pacer.rate
+                if delay:
+                    try:
+                        await asyncio.wait_for(self._stop.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+
+        except Exception as e:
+            logger.error("Integrity scan failed", scan=self.scan_name, error=str(e))
+            self.run_stats['error'] = str(e)
+            await self._record_failure(str(e))
+            raise
+        finally:
+            self._shutdown_pool()
+            self.run_stats['finished_at'] = datetime.utcnow().isoformat()
+
+        logger.info("Integrity scan run finished", scan=self.scan_name, **self.run_stats)
+        return self.run_stats
+
+    async def _find_mismatches(self, rows: List[tuple]):
+        if self.processes <= 0:
+            return await asyncio.to_thread(find_checksum_mismatches, rows)
+
+        if self._pool is None:
+            # Spawn rather than fork: the parent runs an event loop and threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        # One chunk per process
+        chunk = -(-len(rows) // self.processes)
+        loop = asyncio.get_running_loop()
+        try:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(self._pool, find_checksum_mismatches, rows[i:i + chunk])
+                for i in range(0, len(rows), chunk)
+            ))
+        except BrokenProcessPool:
+            logger.warning("Integrity hash pool broken, hashing in a thread")
+            self._shutdown_pool()
+            return await asyncio.to_thread(find_checksum_mismatches, rows)
+        return [mismatch for result in results for mismatch in result]
+
+    def _shutdown_pool(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _record_failure(self, error: str):
+        try:
+            async with self.session_factory() as db:
+                state = await RawDataRepository(db).get_scan_state(self.scan_name)
+                state.status = 'failed'
+                state.last_error = error[:2000]
+                await db.commit()
+        except Exception as e:
+            logger.warning("Failed to record integrity scan failure", error=str(e))
+
+    async def get_progress(self) -> Dict[str, Any]:
+        """
+        Get persisted scan progress and statistics of the current run.
+
+        Returns:
+            Progress summary
+
+        Since:
+            Version 1.0.0
+        """
+        async with self.session_factory() as db:
+            state = await RawDataRepository(db).get_scan_state(self.scan_name)
+            progress = {
+                'scan_name': state.scan_name,
+                'status': 'running' if self.running else (
+                    'paused' if state.status == 'running' else state.status
+                ),
+                'rows_scanned': state.rows_scanned,
+                'valid': state.valid_count,
+                'invalid': state.invalid_count,
+                'passes_completed': state.passes_completed,
+                'cursor': {
+                    'created_at': state.cursor_created_at.isoformat() if state.cursor_created_at else None,
+                    'id': state.cursor_id
+                },
+                'started_at': state.started_at.isoformat() if state.started_at else None,
+                'completed_at': state.completed_at.isoformat() if state.completed_at else None,
+                'last_error': state.last_error
+            }
+            await db.commit()
+
+        progress['run'] = dict(self.run_stats)
+        return progress
+
+
+# Global scanner instance
+integrity_scanner: Optional[IntegrityScanner] = None
+
+
+def get_integrity_scanner() -> IntegrityScanner:
+    """
+    Get global integrity scanner instance.
+
+    Returns:
+        IntegrityScanner instance
+
+    Since:
+        Version 1.0.0
+    """
+    global integrity_scanner
+    if integrity_scanner is None:
+        integrity_scanner = IntegrityScanner()
+    return integrity_scanner
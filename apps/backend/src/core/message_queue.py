@@ -9,18 +9,48 @@ Author: CognitoAI Development Team
 """
 
 import json
+import os
 import asyncio
-from typing import Dict, Any, Optional, Callable
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, List, Union
 from datetime import datetime
+from pathlib import Path
 import structlog
 import aio_pika
 from aio_pika import ExchangeType
 
-from ..config.logging import PharmaceuticalLogger
+from ..config.logging import PharmaceuticalLogger, get_logger
 
 logger = structlog.get_logger(__name__)
 
 
+@dataclass
+class WorkMessage:
+    """
+    A reserved work item.
+
+    Attributes:
+        job_id: Idempotency key (e.g. the drug request ID)
+        payload: Job arguments
+        attempts: Delivery attempt number, starting at 1
+        receipt: Backend handle used to ack, extend or fail the item
+        expired: The lease lapsed on the final attempt; the item is already
+            dead-lettered and is only handed out so the failure is reported
+
+    Since:
+        Version 1.0.0
+    """
+
+    job_id: str
+    payload: Dict[str, Any]
+    attempts: int
+    receipt: Any = None
+    expired: bool = False
+
+
 class MessageQueueService:
     """
     Service for managing message queue operations.
@@ -60,6 +90,7 @@ class MessageQueueService:
         self.exchange = None
         self.dlx_exchange = None
         self.consumers = {}
+        self.work_queues = {}
 
     async def connect(self):
         """
@@ -515,6 +546,191 @@ class MessageQueueService:
             )
             return False
 
+    async def declare_work_queue(
+        self,
+        name: str,
+        visibility_timeout: float = 900,
+        max_attempts: int = 3
+    ):
+        """
+        Declare a durable work queue with a dead letter queue.
+
+        Unacknowledged items are redelivered when the worker's connection
+        drops. No per-queue consumer timeout is set, since a lease cannot be
+        renewed in RabbitMQ and a timeout would close the worker's channel
+        under every other in-flight job; the broker's consumer_timeout must
+        exceed the longest job.
+
+        Args:
+            name: Work queue name
+            visibility_timeout: Unused; leases last as long as the connection
+            max_attempts: Deliveries before an item is dead-lettered
+
+        Since:
+            Version 1.0.0
+        """
+        if not self.channel:
+            await self.connect()
+
+        dlq = await self.channel.declare_queue(f"work.dlq.{name}", durable=True)
+        await dlq.bind(self.dlx_exchange, routing_key=f"dlq.work.{name}")
+
+        queue = await self.channel.declare_queue(
+            f"work.{name}",
+            durable=True,
+            arguments={
+                'x-dead-letter-exchange': self.dead_letter_exchange,
+                'x-dead-letter-routing-key': f"dlq.work.{name}"
+            }
+        )
+        await queue.bind(self.exchange, routing_key=f"work.{name}")
+
+        self.work_queues[name] = {'queue': queue, 'max_attempts': max_attempts}
+        logger.info("Declared work queue", queue=name)
+
+    async def enqueue_work(
+        self,
+        name: str,
+        job_id: str,
+        payload: Dict[str, Any],
+        attempts: int = 0
+    ) -> bool:
+        """
+        Publish a persistent work item.
+
+        RabbitMQ cannot deduplicate by job_id, so consumers must be
+        idempotent per job_id.
+
+        Args:
+            name: Work queue name
+            job_id: Idempotency key
+            payload: Job arguments
+            attempts: Deliveries already made (used when retrying)
+
+        Returns:
+            True when the item was enqueued
+
+        Since:
+            Version 1.0.0
+        """
+        if not self.channel:
+            await self.connect()
+
+        await self.exchange.publish(
+            aio_pika.Message(
+                body=json.dumps(payload).encode(),
+                content_type='application/json',
+                message_id=job_id,
+                headers={'x-attempts': attempts},
+                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                timestamp=datetime.utcnow()
+            ),
+            routing_key=f"work.{name}"
+        )
+        return True
+
+    async def reserve_work(self, name: str) -> Optional[WorkMessage]:
+        """
+        Take the next work item without acknowledging it.
+
+        A redelivered item was held by a worker whose connection dropped, so
+        that delivery counts as an attempt: the item is republished with its
+        attempt count raised or, if it was the final attempt, dead-lettered
+        and returned with expired set so the caller can report the failure.
+
+        Args:
+            name: Work queue name
+
+        Returns:
+            WorkMessage or None if the queue is empty
+
+        Since:
+            Version 1.0.0
+        """
+        settings = self.work_queues[name]
+
+        while True:
+            message = await settings['queue'].get(no_ack=False, fail=False)
+            if message is None:
+                return None
+
+            job_id = message.message_id
+            payload = json.loads(message.body.decode())
+            attempts = int((message.headers or {}).get('x-attempts', 0)) + 1
+            if not message.redelivered:
+                return WorkMessage(job_id=job_id, payload=payload, attempts=attempts, receipt=(name, message))
+
+            # The delivery numbered `attempts` was lost with its worker
+            if attempts >= settings['max_attempts']:
+                await message.reject(requeue=False)
+                logger.error("Work item dead-lettered", queue=name, job_id=job_id,
+                             error="worker lost the final delivery")
+                return WorkMessage(job_id=job_id, payload=payload, attempts=attempts,
+                                   receipt=(name, message), expired=True)
+
+            await self.enqueue_work(name, job_id, payload, attempts=attempts)
+            await message.ack()
+
+    async def extend_work(self, message: WorkMessage):
+        """
+        Keep a reserved item invisible to other workers.
+
+        RabbitMQ holds unacknowledged deliveries for as long as the channel
+        is open (declare_work_queue sets no consumer timeout), so there is
+        nothing to renew.
+
+        Since:
+            Version 1.0.0
+        """
+
+    async def ack_work(self, message: WorkMessage):
+        """
+        Acknowledge a finished work item.
+
+        Since:
+            Version 1.0.0
+        """
+        _, delivery = message.receipt
+        await delivery.ack()
+
+    async def fail_work(self, message: WorkMessage, error: str) -> bool:
+        """
+        Retry a failed work item, or dead-letter it after max_attempts.
+
+        Args:
+            message: Reserved work item
+            error: Failure description
+
+        Returns:
+            True if the item was requeued, False if dead-lettered
+
+        Since:
+            Version 1.0.0
+        """
+        name, delivery = message.receipt
+
+        if message.attempts < self.work_queues[name]['max_attempts']:
+            await self.enqueue_work(name, message.job_id, message.payload, attempts=message.attempts)
+            await delivery.ack()
+            return True
+
+        await delivery.reject(requeue=False)
+        logger.error("Work item dead-lettered", queue=name, job_id=message.job_id, error=error)
+        return False
+
+    async def get_work_queue_stats(self, name: str) -> Dict[str, int]:
+        """
+        Count ready items in a work queue.
+
+        Returns:
+            Status -> count
+
+        Since:
+            Version 1.0.0
+        """
+        declared = await self.channel.declare_queue(f"work.{name}", passive=True)
+        return {'queued': declared.declaration_result.message_count}
+
     async def disconnect(self):
         """
         Close connection to message queue.
@@ -537,4 +753,308 @@ class MessageQueueService:
             logger.error(
                 "Error during disconnect",
                 error=str(e)
-            )
\ No newline at end of file
+            )
+
+
+class SQLiteMessageQueue:
+    """
+    SQLite-backed stand-in for MessageQueueService work queues.
+
+    Implements the same work queue methods so workers can run without
+    RabbitMQ. Items are leased: a reserved item becomes visible again once
+    its visibility timeout passes without an ack or extension, so work held
+    by a crashed worker is picked up by another. A file path makes the queue
+    durable and shareable between processes; ":memory:" is for tests.
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Initialize SQLite message queue.
+
+        Args:
+            path: Database file path, or ":memory:"
+
+        Since:
+            Version 1.0.0
+        """
+        self.path = path
+        self.work_queues = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS work_items (
+                queue TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                visible_at REAL NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (queue, job_id)
+            )
+        """)
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_work_items_ready ON work_items(queue, status, visible_at)"
+        )
+
+    async def _run(self, func: Callable, *args):
+        def locked():
+            with self._lock:
+                return func(*args)
+        return await asyncio.to_thread(locked)
+
+    async def declare_work_queue(
+        self,
+        name: str,
+        visibility_timeout: float = 900,
+        max_attempts: int = 3
+    ):
+        """
+        Register a work queue and its lease settings.
+
+        Args:
+            name: Work queue name
+            visibility_timeout: Seconds a reservation lasts without extension
+            max_attempts: Deliveries before an item is dead-lettered
+
+        Since:
+            Version 1.0.0
+        """
+        self.work_queues[name] = {
+            'visibility_timeout': visibility_timeout,
+            'max_attempts': max_attempts
+        }
+
+    async def enqueue_work(
+        self,
+        name: str,
+        job_id: str,
+        payload: Dict[str, Any],
+        attempts: int = 0
+    ) -> bool:
+        """
+        Add a work item unless the same job_id is already queued or running.
+
+        Args:
+            name: Work queue name
+            job_id: Idempotency key
+            payload: Job arguments
+            attempts: Deliveries already made
+
+        Returns:
+            True when the item was enqueued, False if it was already pending
+
+        Since:
+            Version 1.0.0
+        """
+        def enqueue() -> bool:
+            now = time.time()
+            cursor = self._db.execute("""
+                INSERT INTO work_items (queue, job_id, payload, status, attempts, visible_at, created_at, updated_at)
+                VALUES (?, ?, ?, 'queued', ?, ?, ?, ?)
+                ON CONFLICT (queue, job_id) DO UPDATE
+                SET payload = excluded.payload,
+                    status = 'queued',
+                    attempts = excluded.attempts,
+                    visible_at = excluded.visible_at,
+                    last_error = NULL,
+                    updated_at = excluded.updated_at
+                WHERE work_items.status IN ('done', 'dead')
+            """, (name, job_id, json.dumps(payload), attempts, now, now, now))
+            return cursor.rowcount > 0
+
+        return await self._run(enqueue)
+
+    async def reserve_work(self, name: str) -> Optional[WorkMessage]:
+        """
+        Lease the oldest visible work item.
+
+        An item whose lease lapsed on its final attempt is dead-lettered and
+        returned with expired set, so the caller can report the failure.
+
+        Args:
+            name: Work queue name
+
+        Returns:
+            WorkMessage or None if nothing is ready
+
+        Since:
+            Version 1.0.0
+        """
+        settings = self.work_queues[name]
+
+        def reserve() -> Optional[WorkMessage]:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    now = time.time()
+                    row = self._db.execute("""
+                        SELECT job_id, payload, status, attempts FROM work_items
+                        WHERE queue = ? AND status IN ('queued', 'reserved') AND visible_at <= ?
+                        ORDER BY created_at
+                        LIMIT 1
+                    """, (name, now)).fetchone()
+                    if row is None:
+                        self._db.execute("COMMIT")
+                        return None
+
+                    if row['status'] == 'reserved' and row['attempts'] >= settings['max_attempts']:
+                        # Lease expired on the final attempt: the worker died or hung
+                        self._db.execute("""
+                            UPDATE work_items
+                            SET status = 'dead', last_error = 'visibility timeout expired', updated_at = ?
+                            WHERE queue = ? AND job_id = ?
+                        """, (now, name, row['job_id']))
+                        self._db.execute("COMMIT")
+                        return WorkMessage(
+                            job_id=row['job_id'],
+                            payload=json.loads(row['payload']),
+                            attempts=row['attempts'],
+                            receipt=name,
+                            expired=True
+                        )
+
+                    attempts = row['attempts'] + 1
+                    self._db.execute("""
+                        UPDATE work_items
+                        SET status = 'reserved', attempts = ?, visible_at = ?, updated_at = ?
+                        WHERE queue = ? AND job_id = ?
+                    """, (attempts, now + settings['visibility_timeout'], now, name, row['job_id']))
+                    self._db.execute("COMMIT")
+                    return WorkMessage(
+                        job_id=row['job_id'],
+                        payload=json.loads(row['payload']),
+                        attempts=attempts,
+                        receipt=name
+                    )
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+        return await self._run(reserve)
+
+    async def _update_leased(self, message: WorkMessage, assignments: str, params: tuple) -> bool:
+        # Only the current lease holder (matching attempt) may change the item
+        def update() -> bool:
+            cursor = self._db.execute(f"""
+                UPDATE work_items SET {assignments}, updated_at = ?
+                WHERE queue = ? AND job_id = ? AND status = 'reserved' AND attempts = ?
+            """, (*params, time.time(), message.receipt, message.job_id, message.attempts))
+            return cursor.rowcount > 0
+
+        return await self._run(update)
+
+    async def extend_work(self, message: WorkMessage):
+        """
+        Renew the lease on a reserved item.
+
+        Since:
+            Version 1.0.0
+        """
+        timeout = self.work_queues[message.receipt]['visibility_timeout']
+        await self._update_leased(message, "visible_at = ?", (time.time() + timeout,))
+
+    async def ack_work(self, message: WorkMessage):
+        """
+        Mark a work item as done.
+
+        Since:
+            Version 1.0.0
+        """
+        await self._update_leased(message, "status = 'done'", ())
+
+    async def fail_work(self, message: WorkMessage, error: str) -> bool:
+        """
+        Requeue a failed work item, or dead-letter it after max_attempts.
+
+        Args:
+            message: Reserved work item
+            error: Failure description
+
+        Returns:
+            True if the item was requeued, False if dead-lettered
+
+        Since:
+            Version 1.0.0
+        """
+        if message.attempts < self.work_queues[message.receipt]['max_attempts']:
+            await self._update_leased(
+                message,
+                "status = 'queued', visible_at = ?, last_error = ?",
+                (time.time(), error[:2000])
+            )
+            return True
+
+        await self._update_leased(message, "status = 'dead', last_error = ?", (error[:2000],))
+        logger.error("Work item dead-lettered", queue=message.receipt, job_id=message.job_id, error=error)
+        return False
+
+    async def get_work_queue_stats(self, name: str) -> Dict[str, int]:
+        """
+        Count work items by status.
+
+        Returns:
+            Status -> count
+
+        Since:
+            Version 1.0.0
+        """
+        def stats() -> Dict[str, int]:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) AS count FROM work_items WHERE queue = ? GROUP BY status",
+                (name,)
+            ).fetchall()
+            return {row['status']: row['count'] for row in rows}
+
+        return await self._run(stats)
+
+    async def disconnect(self):
+        """
+        Close the database.
+
+        Since:
+            Version 1.0.0
+        """
+        await self._run(self._db.close)
+
+
+# Relative SQLite queue paths resolve against the backend directory, so the
+# API and workers share one file whatever directory they are started from
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_WORK_QUEUE_URL = 'sqlite:///work_queue.sqlite3'
+
+
+def create_work_queue(url: Optional[str] = None) -> Union[MessageQueueService, SQLiteMessageQueue]:
+    """
+    Create the work queue backend from WORK_QUEUE_URL.
+
+    amqp:// URLs use RabbitMQ through MessageQueueService; sqlite:///path
+    uses a SQLite file shared by the API and worker processes (relative
+    paths are taken from the backend directory); memory:// keeps the queue
+    in-process (tests and embedded workers only).
+
+    Args:
+        url: Queue URL (defaults to WORK_QUEUE_URL)
+
+    Returns:
+        Work queue backend
+
+    Since:
+        Version 1.0.0
+    """
+    url = url or os.getenv('WORK_QUEUE_URL', DEFAULT_WORK_QUEUE_URL)
+
+    if url.startswith(('amqp://', 'amqps://')):
+        return MessageQueueService(url, get_logger('message_queue'))
+    if url == 'memory://':
+        return SQLiteMessageQueue(':memory:')
+    if url.startswith('sqlite:///'):
+        return SQLiteMessageQueue(str(BACKEND_DIR / url[len('sqlite:///'):]))
+
+    raise ValueError(f"Unsupported WORK_QUEUE_URL: {url}")
@@ -1,28 +1,36 @@
 """
 Rate limiting for pharmaceutical analysis API.
 
-Implements token bucket algorithm for API rate limiting
-with Redis-based distributed tracking.
+Implements the generic cell rate algorithm (GCRA) for API rate
+limiting with Redis-based distributed tracking.
 
 Version: 1.0.0
 Author: CognitoAI Development Team
 """
 
-import time
-import asyncio
 from typing import Optional, Tuple
 import redis.asyncio as redis
 import structlog
 
+from ..integrations.rate_limiter import (
+    GCRA_SCRIPT,
+    GCRALimit,
+    InProcessGCRA,
+    gcra_script_args,
+    parse_gcra_reply
+)
+
 logger = structlog.get_logger(__name__)
 
 
 class RateLimiter:
     """
-    Token bucket rate limiter for API requests.
+    GCRA rate limiter for API requests.
     
     Implements distributed rate limiting using Redis for
-    pharmaceutical API compliance and fair usage.
+    pharmaceutical API compliance and fair usage. State is one
+    theoretical arrival time per identifier, checked and updated in a
+    single Lua script call.
     
     Since:
         Version 1.0.0
@@ -48,9 +56,13 @@ class RateLimiter:
         self.max_requests = max_requests
         self.time_window = time_window
         self.redis_client = redis_client
+        self.gcra_script = redis_client.register_script(GCRA_SCRIPT) if redis_client else None
         
         # In-memory fallback if Redis not available
-        self.memory_buckets = {}
+        self.memory_limiter = InProcessGCRA()
+    
+    def _limit(self, identifier: str) -> GCRALimit:
+        return GCRALimit(f"rate_limit:gcra:{identifier}", self.max_requests, self.time_window)
     
     async def check_rate_limit(
         self,
@@ -94,43 +106,8 @@ class RateLimiter:
             Version 1.0.0
         """
         try:
-            key = f"rate_limit:{identifier}"
-            current_time = int(time.time())
-            window_start = current_time - self.time_window
-            
-            # Use Redis pipeline for atomic operations
-            async with self.redis_client.pipeline() as pipe:
-                # Remove old entries
-                await pipe.zremrangebyscore(key, 0, window_start)
-                
-                # Count current requests
-                await pipe.zcard(key)
-                
-                # Execute pipeline
-                results = await pipe.execute()
-                current_count = results[1]
-                
-                # Check if limit exceeded
-                if current_count >= self.max_requests:
-                    # Get oldest entry to calculate retry time
-                    oldest = await self.redis_client.zrange(
-                        key, 0, 0, withscores=True
-                    )
-                    if oldest:
-                        retry_after = int(oldest[0][1]) + self.time_window - current_time
-                        return False, max(1, retry_after)
-                    return False, self.time_window
-                
-                # Add new request
-                await self.redis_client.zadd(
-                    key,
-                    {f"{identifier}:{current_time}:{increment}": current_time}
-                )
-                
-                # Set expiry
-                await self.redis_client.expire(key, self.time_window)
-                
-                return True, None
+            keys, args = gcra_script_args([[self._limit(identifier)]], cost=increment)
+            return parse_gcra_reply(await self.gcra_script(keys=keys, args=args))[0]
                 
         except Exception as e:
             logger.error(
@@ -158,40 +135,7 @@ class RateLimiter:
         Since:
             Version 1.0.0
         """
-        current_time = time.time()
-        
-        # Initialize bucket if not exists
-        if identifier not in self.memory_buckets:
-            self.memory_buckets[identifier] = {
-                "tokens": self.max_requests,
-                "last_refill": current_time
-            }
-        
-        bucket = self.memory_buckets[identifier]
-        
-        # Calculate tokens to add based on elapsed time
-        elapsed = current_time - bucket["last_refill"]
-        tokens_to_add = (elapsed / self.time_window) * self.max_requests
-        
-        # Refill bucket
-        bucket["tokens"] = min(
-            self.max_requests,
-            bucket["tokens"] + tokens_to_add
-        )
-        bucket["last_refill"] = current_time
-        
-        # Check if enough tokens
-        if bucket["tokens"] >= increment:
-            bucket["tokens"] -= increment
-            return True, None
-        
-        # Calculate retry time
-        tokens_needed = increment - bucket["tokens"]
-        seconds_until_tokens = (
-            tokens_needed / self.max_requests
-        ) * self.time_window
-        
-        return False, int(seconds_until_tokens) + 1
+        return self.memory_limiter.check([self._limit(identifier)], cost=increment)
     
     async def get_remaining_quota(
         self,
@@ -209,18 +153,15 @@ class RateLimiter:
         Since:
             Version 1.0.0
         """
+        limit = self._limit(identifier)
         if self.redis_client:
             try:
-                key = f"rate_limit:{identifier}"
-                current_time = int(time.time())
-                window_start = current_time - self.time_window
-                
-                # Remove old entries
-                await self.redis_client.zremrangebyscore(key, 0, window_start)
-                
-                # Count current requests
-                current_count = await self.redis_client.zcard(key)
-                remaining = max(0, self.max_requests - current_count)
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.time()
+                pipe.get(limit.key)
+                (seconds, microseconds), tat = await pipe.execute()
+                now = seconds + microseconds / 1_000_000
+                remaining = limit.remaining(float(tat) / 1000 if tat is not None else None, now)
                 
                 return remaining, self.time_window
                 
@@ -232,18 +173,7 @@ class RateLimiter:
                 )
         
         # Fallback to memory
-        if identifier in self.memory_buckets:
-            bucket = self.memory_buckets[identifier]
-            current_time = time.time()
-            elapsed = current_time - bucket["last_refill"]
-            tokens_to_add = (elapsed / self.time_window) * self.max_requests
-            current_tokens = min(
-                self.max_requests,
-                bucket["tokens"] + tokens_to_add
-            )
-            return int(current_tokens), self.time_window
-        
-        return self.max_requests, self.time_window
+        return self.memory_limiter.remaining(limit), self.time_window
     
     async def reset_limit(self, identifier: str) -> bool:
         """
@@ -260,8 +190,7 @@ class RateLimiter:
         """
         if self.redis_client:
             try:
-                key = f"rate_limit:{identifier}"
-                await self.redis_client.delete(key)
+                await self.redis_client.delete(self._limit(identifier).key)
                 logger.info("Rate limit reset via Redis", identifier=identifier)
                 return True
             except Exception as e:
@@ -272,8 +201,7 @@ class RateLimiter:
                 )
         
         # Reset in memory
-        if identifier in self.memory_buckets:
-            del self.memory_buckets[identifier]
-            logger.info("Rate limit reset in memory", identifier=identifier)
+        self.memory_limiter.reset([self._limit(identifier).key])
+        logger.info("Rate limit reset in memory", identifier=identifier)
         
         return True
\ No newline at end of file
@@ -0,0 +1,388 @@
+"""
+Content-addressed blob storage for raw API responses.
+
+Responses are serialized to canonical JSON, keyed by their SHA-256
+checksum and compressed (zstd when the ``zstandard`` package is installed,
+gzip otherwise). Identical responses share one blob with a reference
+count, so hot metadata rows only carry the checksum and the payload is
+loaded lazily when it is actually read.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import gzip
+import hashlib
+import json
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import structlog
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is used instead
+    zstandard = None
+
+logger = structlog.get_logger(__name__)
+
+ENCODING_ZSTD = "zstd"
+ENCODING_GZIP = "gzip"
+ENCODING_IDENTITY = "identity"
+
+# Serialized values smaller than this stay inline in their row
+DEFAULT_INLINE_THRESHOLD = 1024
+
+_UPSERT_BLOB = """
+    INSERT INTO response_blobs (
+        checksum, encoding, content, original_size, stored_size, ref_count
+    )
+    VALUES ($1, $2, $3, $4, $5, $6)
+    ON CONFLICT (checksum) DO UPDATE SET
+        ref_count = response_blobs.ref_count + EXCLUDED.ref_count,
+        last_referenced_at = NOW()
+"""
+
+
+@dataclass
+class PreparedBlob:
+    """
+    A serialized, compressed value ready to be stored.
+
+    Since:
+        Version 1.0.0
+    """
+    checksum: str
+    encoding: str
+    content: bytes
+    original_size: int
+
+    @property
+    def stored_size(self) -> int:
+        return len(self.content)
+
+
+def serialize_value(value: Any) -> bytes:
+    """
+    Serialize a value to canonical JSON bytes.
+
+    Args:
+        value: JSON-compatible value
+
+    Returns:
+        UTF-8 JSON with sorted keys
+
+    Since:
+        Version 1.0.0
+    """
+    return json.dumps(value, sort_keys=True, default=str).encode()
+
+
+def compress_blob(data: bytes) -> Tuple[str, bytes]:
+    """
+    Compress blob content with the best available codec.
+
+    Args:
+        data: Raw bytes
+
+    Returns:
+        tuple: (encoding, content); identity when compression does not help
+
+    Since:
+        Version 1.0.0
+    """
+    if zstandard is not None:
+        encoding, content = ENCODING_ZSTD, zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        encoding, content = ENCODING_GZIP, gzip.compress(data, compresslevel=6, mtime=0)
+
+    if len(content) >= len(data):
+        return ENCODING_IDENTITY, data
+    return encoding, content
+
+
+def decompress_blob(encoding: str, content: bytes) -> bytes:
+    """
+    Decompress blob content.
+
+    Args:
+        encoding: Encoding recorded with the blob
+        content: Stored bytes
+
+    Returns:
+        Raw bytes
+
+    Raises:
+        ValueError: If the encoding is unknown or unavailable
+
+    Since:
+        Version 1.0.0
+    """
+    if encoding == ENCODING_IDENTITY:
+        return bytes(content)
+    if encoding == ENCODING_GZIP:
+        return gzip.decompress(content)
+    if encoding == ENCODING_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstd blob found but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(content)
+    raise ValueError(f"Unknown blob encoding: {encoding}")
+
+
+def prepare_blob(value: Any, checksum: Optional[str] = None) -> PreparedBlob:
+    """
+    Serialize and compress a value for storage.
+
+    Args:
+        value: JSON-compatible value
+        checksum: Key to store under; defaults to the SHA-256 of the
+            serialized value
+
+    Returns:
+        PreparedBlob
+
+    Since:
+        Version 1.0.0
+    """
+    data = serialize_value(value)
+    encoding, content = compress_blob(data)
+    return PreparedBlob(
+        checksum=checksum or hashlib.sha256(data).hexdigest(),
+        encoding=encoding,
+        content=content,
+        original_size=len(data)
+    )
+
+
+def load_blob_value(encoding: str, content: bytes) -> Any:
+    """
+    Decode a stored blob back to its value.
+
+    Since:
+        Version 1.0.0
+    """
+    return json.loads(decompress_blob(encoding, content))
+
+
+def payload_checksum(
+    raw_response: Any = None,
+    encoding: Optional[str] = None,
+    content: Optional[bytes] = None
+) -> Optional[str]:
+    """
+    SHA-256 of a stored response payload, inline or in a blob.
+
+    Blob content is already canonical JSON, so it is hashed as stored
+    without decoding and re-serializing.
+
+    Args:
+        raw_response: Inline raw_response value
+        encoding: Blob encoding, when the payload is in a blob
+        content: Blob content
+
+    Returns:
+        Hex digest, or None if there is no payload
+
+    Since:
+        Version 1.0.0
+    """
+    if content is not None:
+        data = decompress_blob(encoding, content)
+    elif raw_response is not None:
+        data = json.dumps(raw_response, sort_keys=True).encode()
+    else:
+        return None
+    return hashlib.sha256(data).hexdigest()
+
+
+def find_checksum_mismatches(rows: List[tuple]) -> List[Tuple[str, Optional[str]]]:
+    """
+    Verify stored payloads against their recorded checksums.
+
+    Module-level and picklable so it can run in a process pool.
+
+    Args:
+        rows: (id, expected_checksum, raw_response, encoding, content) tuples
+
+    Returns:
+        (id, actual_checksum) for every row that does not match
+
+    Since:
+        Version 1.0.0
+    """
+    mismatches = []
+    for response_id, expected, raw_response, encoding, content in rows:
+        try:
+            actual = payload_checksum(raw_response, encoding, content)
+        except Exception:
+            actual = None
+        if actual != expected:
+            mismatches.append((response_id, actual))
+    return mismatches
+
+
+def upsert_args(blobs: Iterable[PreparedBlob]) -> List[tuple]:
+    """
+    Build upsert arguments, one row per distinct checksum.
+
+    Duplicates within the batch become a single row whose reference count
+    is the number of occurrences.
+
+    Args:
+        blobs: Blobs to store, one per referencing row
+
+    Returns:
+        Argument tuples for the upsert statement
+
+    Since:
+        Version 1.0.0
+    """
+    blobs = list(blobs)
+    counts = Counter(blob.checksum for blob in blobs)
+    unique = {blob.checksum: blob for blob in blobs}
+    return [
+        (blob.checksum, blob.encoding, blob.content, blob.original_size, blob.stored_size, counts[checksum])
+        for checksum, blob in unique.items()
+    ]
+
+
+class ResponseBlobStore:
+    """
+    asyncpg access to the response_blobs table.
+
+    Example:
+        >>> blob = prepare_blob(response_data)
+        >>> await store.put_many(conn, [blob])
+        >>> values = await store.get_many(conn, [blob.checksum])
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self, inline_threshold: int = DEFAULT_INLINE_THRESHOLD):
+        """
+        Initialize blob store.
+
+        Args:
+            inline_threshold: Serialized size below which values stay inline
+
+        Since:
+            Version 1.0.0
+        """
+        self.inline_threshold = inline_threshold
+        self.stats = {
+            "blobs_written": 0,
+            "references_added": 0,
+            "bytes_original": 0,
+            "bytes_stored": 0,
+            "blobs_loaded": 0
+        }
+
+    def prepare(self, value: Any) -> Optional[PreparedBlob]:
+        """
+        Prepare a value for offloading if it is large enough.
+
+        Args:
+            value: JSON-compatible value
+
+        Returns:
+            PreparedBlob, or None if the value should stay inline
+
+        Since:
+            Version 1.0.0
+        """
+        if value is None:
+            return None
+        blob = prepare_blob(value)
+        if blob.original_size < self.inline_threshold:
+            return None
+        return blob
+
+    async def put_many(self, conn, blobs: List[PreparedBlob]) -> None:
+        """
+        Store blobs, adding one reference per entry.
+
+        Args:
+            conn: asyncpg connection
+            blobs: Blobs to store, one per referencing row
+
+        Since:
+            Version 1.0.0
+        """
+        if not blobs:
+            return
+
+        args = upsert_args(blobs)
+        await conn.executemany(_UPSERT_BLOB, args)
+
+        self.stats["blobs_written"] += len(args)
+        self.stats["references_added"] += len(blobs)
+        self.stats["bytes_original"] += sum(blob.original_size for blob in blobs)
+        self.stats["bytes_stored"] += sum(row[4] for row in args)
+
+    async def get_many(self, conn, checksums: Iterable[str], as_json: bool = False) -> Dict[str, Any]:
+        """
+        Load blob values in one query.
+
+        Args:
+            conn: asyncpg connection
+            checksums: Blob checksums; duplicates and None are ignored
+            as_json: Return the JSON text (as asyncpg returns JSONB columns)
+                instead of the decoded value
+
+        Returns:
+            Dict mapping checksum to value (missing blobs are absent)
+
+        Since:
+            Version 1.0.0
+        """
+        wanted = sorted({checksum for checksum in checksums if checksum})
+        if not wanted:
+            return {}
+
+        rows = await conn.fetch(
+            "SELECT checksum, encoding, content FROM response_blobs WHERE checksum = ANY($1::char(64)[])",
+            wanted
+        )
+
+        values = {}
+        for row in rows:
+            try:
+                data = decompress_blob(row["encoding"], row["content"])
+                values[row["checksum"].strip()] = data.decode() if as_json else json.loads(data)
+            except Exception as e:
+                logger.error("Failed to decode response blob", checksum=row["checksum"], error=str(e))
+
+        self.stats["blobs_loaded"] += len(values)
+        return values
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get write/load counters and the achieved storage ratio.
+
+        Since:
+            Version 1.0.0
+        """
+        original = self.stats["bytes_original"]
+        return {
+            **self.stats,
+            "codec": ENCODING_ZSTD if zstandard is not None else ENCODING_GZIP,
+            "storage_ratio": round(self.stats["bytes_stored"] / original, 4) if original else None
+        }
+
+
+# Global blob store instance
+response_blob_store = ResponseBlobStore()
+
+
+def get_response_blob_store() -> ResponseBlobStore:
+    """
+    Get global response blob store instance.
+
+    Returns:
+        ResponseBlobStore instance
+
+    Since:
+        Version 1.0.0
+    """
+    return response_blob_store
@@ -0,0 +1,299 @@
+"""
+Search support for stored API responses.
+
+On PostgreSQL, compound names are matched through a pg_trgm GIN index and
+response text through a tsvector column filled when the response is
+stored (see migration 012). This module holds the pieces shared with that
+path (search text extraction and keyset cursors) and a pure-Python index
+with the same ranking contract for databases without those features
+(SQLite-backed tests and local runs).
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import base64
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Text indexed per response; tsvector values are limited to 1 MB
+MAX_SEARCH_TEXT_CHARS = 100_000
+
+_TOKEN = re.compile(r'\w+')
+
+
+def extract_search_text(standardized: Dict[str, Any]) -> str:
+    """
+    Build the searchable text of a standardized response.
+
+    Args:
+        standardized: StandardizedAPIResponse as a dict
+
+    Returns:
+        Query, result titles/content and source titles, truncated to
+        MAX_SEARCH_TEXT_CHARS
+
+    Since:
+        Version 1.0.0
+    """
+    parts = [str(standardized.get('query') or '')]
+    for result in standardized.get('results') or []:
+        parts.append(str(result.get('title') or ''))
+        parts.append(str(result.get('content') or ''))
+    for source in standardized.get('sources') or []:
+        parts.append(str(source.get('title') or ''))
+    return '\n'.join(part for part in parts if part)[:MAX_SEARCH_TEXT_CHARS]
+
+
+def encode_cursor(score: float, created_at: datetime, response_id: str) -> str:
+    """
+    Encode the keyset position after a result.
+
+    Args:
+        score: Result rank
+        created_at: Result creation time
+        response_id: Result ID
+
+    Returns:
+        Opaque URL-safe cursor
+
+    Since:
+        Version 1.0.0
+    """
+    raw = json.dumps([score, created_at.isoformat(), response_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, datetime, str]:
+    """
+    Decode a cursor from encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+
+    Since:
+        Version 1.0.0
+    """
+    try:
+        score, created_at, response_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), datetime.fromisoformat(created_at), str(response_id)
+    except Exception as e:
+        raise ValueError(f"Invalid search cursor: {e}") from e
+
+
+def trigrams(value: str) -> Set[str]:
+    """
+    Trigrams of a string, padded per word as pg_trgm does.
+
+    Since:
+        Version 1.0.0
+    """
+    grams = set()
+    for word in _TOKEN.findall(value.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def trigram_similarity(left: str, right: str) -> float:
+    """
+    pg_trgm-style similarity (shared trigrams over all trigrams).
+
+    Since:
+        Version 1.0.0
+    """
+    a, b = trigrams(left), trigrams(right)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class _IndexedResponse:
+    response_id: str
+    compound: str
+    category: Optional[str]
+    provider: Optional[str]
+    created_at: datetime
+    term_counts: Counter = field(default_factory=Counter)
+    length: int = 0
+    archived: bool = False
+
+
+class ResponseSearchIndex:
+    """
+    In-memory response search index.
+
+    Maintained incrementally as responses are stored, archived and
+    deleted. Ranks like the PostgreSQL path: compound trigram similarity
+    plus text relevance, ties broken by newest first, with the same keyset
+    cursors.
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self):
+        self._docs: Dict[str, _IndexedResponse] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(
+        self,
+        response_id: str,
+        compound: str,
+        text: str,
+        created_at: datetime,
+        category: Optional[str] = None,
+        provider: Optional[str] = None
+    ):
+        """
+        Index a stored response (replacing any previous entry).
+
+        Entries live in process memory only; responses stored by other
+        processes or before a restart are not searchable here.
+
+        Args:
+            response_id: Response ID
+            compound: Pharmaceutical compound
+            text: Searchable text (see extract_search_text)
+            created_at: Storage time
+            category: Category
+            provider: Provider
+
+        Since:
+            Version 1.0.0
+        """
+        self.remove(response_id)
+        terms = Counter(token.lower() for token in _TOKEN.findall(text))
+        self._docs[response_id] = _IndexedResponse(
+            response_id=response_id,
+            compound=compound,
+            category=category,
+            provider=provider,
+            created_at=created_at,
+            term_counts=terms,
+            length=sum(terms.values())
+        )
+        for term in terms:
+            self._postings.setdefault(term, set()).add(response_id)
+
+    def remove(self, response_id: str):
+        """Drop a response from the index."""
+        doc = self._docs.pop(response_id, None)
+        if doc is None:
+            return
+        for term in doc.term_counts:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(response_id)
+                if not postings:
+                    del self._postings[term]
+
+    def mark_archived(self, response_ids: Iterable[str]):
+        """Exclude archived responses from default searches."""
+        for response_id in response_ids:
+            doc = self._docs.get(response_id)
+            if doc is not None:
+                doc.archived = True
+
+    def search(
+        self,
+        compound: Optional[str] = None,
+        text_query: Optional[str] = None,
+        category: Optional[str] = None,
+        provider: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        include_archived: bool = False,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[str, float]], Optional[str]]:
+        """
+        Ranked search with keyset pagination.
+
+        Args:
+            compound: Compound substring (case-insensitive)
+            text_query: Terms that must all appear in the response text
+            category: Category filter
+            provider: Provider filter
+            start_date: Start of date range
+            end_date: End of date range
+            include_archived: Include archived responses
+            limit: Page size
+            cursor: Cursor from the previous page
+
+        Returns:
+            tuple: ([(response_id, score)], next_cursor or None)
+
+        Since:
+            Version 1.0.0
+        """
+        terms = [token.lower() for token in _TOKEN.findall(text_query or '')]
+        if terms:
+            candidate_ids = set.intersection(*(self._postings.get(term, set()) for term in terms))
+        elif text_query:
+            candidate_ids = set()
+        else:
+            candidate_ids = set(self._docs)
+
+        position = decode_cursor(cursor) if cursor else None
+        needle = compound.lower() if compound else None
+
+        ranked = []
+        for response_id in candidate_ids:
+            doc = self._docs[response_id]
+            if doc.archived and not include_archived:
+                continue
+            if needle and needle not in doc.compound.lower():
+                continue
+            if category and doc.category != category:
+                continue
+            if provider and doc.provider != provider:
+                continue
+            if start_date and doc.created_at < start_date:
+                continue
+            if end_date and doc.created_at > end_date:
+                continue
+
+            score = 0.0
+            if compound:
+                score += trigram_similarity(doc.compound, compound)
+            if terms:
+                score += sum(doc.term_counts[term] for term in terms) / (1 + doc.length)
+
+            key = (score, doc.created_at, response_id)
+            if position is not None and key >= position:
+                continue
+            ranked.append(key)
+
+        ranked.sort(reverse=True)
+        page = ranked[:limit]
+        next_cursor = encode_cursor(*page[-1]) if len(ranked) > limit else None
+        return [(response_id, score) for score, _, response_id in page], next_cursor
+
+
+# Fallback index for databases without pg_trgm/tsvector
+fallback_search_index = ResponseSearchIndex()
+
+
+def get_fallback_search_index() -> ResponseSearchIndex:
+    """
+    Get the process-wide fallback search index.
+
+    Returns:
+        ResponseSearchIndex instance
+
+    Since:
+        Version 1.0.0
+    """
+    return fallback_search_index
@@ -4,23 +4,41 @@ Data encryption service for pharmaceutical data security.
 Provides AES-256-GCM encryption for sensitive API response data,
 key management, and secure data handling for regulatory compliance.
 
+New payloads use envelope encryption: each context gets a random data
+encryption key (DEK), wrapped with a key encryption key derived once from
+the master key and cached in memory, so encrypting a payload costs one
+AES-GCM pass instead of a PBKDF2 derivation. Legacy per-payload PBKDF2
+payloads (version 1.0) remain readable.
+
 Version: 1.0.0
 Author: CognitoAI Development Team
 """
 
+import asyncio
 import base64
 import hashlib
 import json
 import os
-from typing import Dict, Any, Optional, Tuple
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes, hmac
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+LEGACY_VERSION = '1.0'
+ENVELOPE_VERSION = '2.0'
+
+# GCM tag length appended by AESGCM
+_TAG_LENGTH = 16
+
 
 class DataEncryptionService:
     """
@@ -36,7 +54,11 @@ class DataEncryptionService:
     def __init__(
         self,
         master_key: Optional[str] = None,
-        key_rotation_enabled: bool = True
+        key_rotation_enabled: bool = True,
+        envelope_encryption: bool = True,
+        dek_rotation_seconds: float = 3600,
+        dek_max_uses: int = 2 ** 20,
+        key_cache_size: int = 1024
     ):
         """
         Initialize encryption service.
@@ -44,6 +66,12 @@ class DataEncryptionService:
         Args:
             master_key: Master encryption key (from environment)
             key_rotation_enabled: Enable automatic key rotation
+            envelope_encryption: Encrypt new payloads with cached per-context
+                data keys; False writes legacy per-payload PBKDF2 payloads
+            dek_rotation_seconds: Age after which a context gets a new data key
+            dek_max_uses: Payloads encrypted under one data key before it is
+                replaced (keeps random GCM nonces far from collision)
+            key_cache_size: Unwrapped data keys kept for decryption
 
         Since:
             Version 1.0.0
@@ -53,8 +81,33 @@ class DataEncryptionService:
             raise ValueError("Encryption master key not configured")
 
         self.key_rotation_enabled = key_rotation_enabled
+        self.envelope_encryption = envelope_encryption
+        self.dek_rotation_seconds = dek_rotation_seconds
+        self.dek_max_uses = dek_max_uses
+        self.key_cache_size = key_cache_size
         self._validate_key_strength()
 
+        self._key_lock = threading.Lock()
+        self._reset_key_cache()
+
+    def _reset_key_cache(self):
+        """
+        Drop all cached key material.
+
+        Since:
+            Version 1.0.0
+        """
+        with self._key_lock:
+            # Salt of the key encryption key used for new data keys
+            self._kek_salt = os.urandom(16)
+            # key salt -> key encryption key
+            self._keks: Dict[bytes, bytes] = {}
+            # context -> active data key
+            self._active_keys: Dict[str, Dict[str, Any]] = {}
+            # key id -> unwrapped data key, bounded
+            self._data_keys: "OrderedDict[str, bytes]" = OrderedDict()
+            self.key_stats = {'derivations': 0, 'data_keys_created': 0, 'data_keys_unwrapped': 0}
+
     def _validate_key_strength(self):
         """
         Validate encryption key meets security requirements.
@@ -81,7 +134,7 @@ class DataEncryptionService:
         Since:
             Version 1.0.0
         """
-        kdf = PBKDF2(
+        kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
             salt=salt,
@@ -90,6 +143,232 @@ class DataEncryptionService:
         )
         return kdf.derive(self.master_key.encode() + info)
 
+    def _get_kek(self, salt: bytes) -> bytes:
+        """
+        Get the key encryption key for a salt, deriving it once.
+
+        Args:
+            salt: Key encryption key salt
+
+        Returns:
+            256-bit key encryption key
+
+        Since:
+            Version 1.0.0
+        """
+        kek = self._keks.get(salt)
+        if kek is None:
+            kek = self._derive_key(salt, b'envelope')
+            with self._key_lock:
+                self._keks[salt] = kek
+                self.key_stats['derivations'] += 1
+        return kek
+
+    def _cache_data_key(self, key_id: str, dek: bytes):
+        with self._key_lock:
+            self._data_keys[key_id] = dek
+            self._data_keys.move_to_end(key_id)
+            while len(self._data_keys) > self.key_cache_size:
+                self._data_keys.popitem(last=False)
+
+    def _active_key(self, context: str) -> Dict[str, Any]:
+        """
+        Get the context's current data key, creating or rotating it.
+
+        Args:
+            context: Encryption context
+
+        Returns:
+            Active key dict with key_id, dek, wrapped_key and key_salt
+
+        Since:
+            Version 1.0.0
+        """
+        with self._key_lock:
+            key = self._active_keys.get(context)
+            if self._is_fresh(key):
+                key['uses'] += 1
+                return key
+            salt = self._kek_salt
+
+        kek = self._get_kek(salt)
+        dek = AESGCM.generate_key(bit_length=256)
+        key_id = os.urandom(8).hex()
+        wrap_nonce = os.urandom(12)
+        wrapped = AESGCM(kek).encrypt(wrap_nonce, dek, f"{context}:{key_id}".encode())
+
+        key = {
+            'key_id': key_id,
+            'dek': dek,
+            'aead': AESGCM(dek),
+            'wrapped_key': base64.b64encode(wrap_nonce + wrapped).decode(),
+            'key_salt': base64.b64encode(salt).decode(),
+            'created': time.monotonic(),
+            'uses': 1
+        }
+        with self._key_lock:
+            self._active_keys[context] = key
+            self.key_stats['data_keys_created'] += 1
+        self._cache_data_key(key_id, dek)
+
+        logger.info("Data encryption key created", context=context, key_id=key_id)
+        return key
+
+    def _unwrap_data_key(self, encrypted_data: Dict[str, Any], context: str) -> bytes:
+        """
+        Get a payload's data key from cache, unwrapping it on a miss.
+
+        Args:
+            encrypted_data: Envelope payload
+            context: Payload context
+
+        Returns:
+            Data encryption key
+
+        Since:
+            Version 1.0.0
+        """
+        key_id = encrypted_data['key_id']
+        with self._key_lock:
+            dek = self._data_keys.get(key_id)
+            if dek is not None:
+                self._data_keys.move_to_end(key_id)
+                return dek
+
+        kek = self._get_kek(base64.b64decode(encrypted_data['key_salt']))
+        wrapped = base64.b64decode(encrypted_data['wrapped_key'])
+        dek = AESGCM(kek).decrypt(wrapped[:12], wrapped[12:], f"{context}:{key_id}".encode())
+
+        with self._key_lock:
+            self.key_stats['data_keys_unwrapped'] += 1
+        self._cache_data_key(key_id, dek)
+        return dek
+
+    def _is_fresh(self, key: Optional[Dict[str, Any]]) -> bool:
+        """Whether an active data key may still encrypt new payloads"""
+        return (
+            key is not None
+            and key['uses'] < self.dek_max_uses
+            and time.monotonic() - key['created'] < self.dek_rotation_seconds
+        )
+
+    def _encrypt_sync(self, data: Dict[str, Any], context: str) -> Dict[str, Any]:
+        """
+        Encrypt one payload (blocking).
+
+        Args:
+            data: Data to encrypt
+            context: Encryption context
+
+        Returns:
+            Encrypted payload
+
+        Since:
+            Version 1.0.0
+        """
+        # Serialize data
+        plaintext = json.dumps(data, sort_keys=True).encode()
+
+        if not self.envelope_encryption:
+            return self._encrypt_legacy(plaintext, context)
+
+        key = self._active_key(context)
+        nonce = os.urandom(12)
+        sealed = key['aead'].encrypt(nonce, plaintext, f"{context}:{key['key_id']}".encode())
+
+        return {
+            'encrypted': True,
+            'algorithm': 'AES-256-GCM',
+            'version': ENVELOPE_VERSION,
+            'context': context,
+            'key_id': key['key_id'],
+            'key_salt': key['key_salt'],
+            'wrapped_key': key['wrapped_key'],
+            'nonce': base64.b64encode(nonce).decode(),
+            'ciphertext': base64.b64encode(sealed[:-_TAG_LENGTH]).decode(),
+            'tag': base64.b64encode(sealed[-_TAG_LENGTH:]).decode()
+        }
+
+    def _encrypt_legacy(self, plaintext: bytes, context: str) -> Dict[str, Any]:
+        """
+        Encrypt with a per-payload PBKDF2 key (version 1.0 format).
+
+        Since:
+            Version 1.0.0
+        """
+        # Generate encryption parameters
+        salt = os.urandom(16)
+        nonce = os.urandom(12)
+
+        # Derive key with context
+        key = self._derive_key(salt, context.encode())
+
+        # Encrypt using AES-256-GCM
+        cipher = Cipher(
+            algorithms.AES(key),
+            modes.GCM(nonce),
+            backend=default_backend()
+        )
+        encryptor = cipher.encryptor()
+        ciphertext = encryptor.update(plaintext) + encryptor.finalize()
+
+        return {
+            'encrypted': True,
+            'algorithm': 'AES-256-GCM',
+            'version': LEGACY_VERSION,
+            'context': context,
+            'salt': base64.b64encode(salt).decode(),
+            'nonce': base64.b64encode(nonce).decode(),
+            'ciphertext': base64.b64encode(ciphertext).decode(),
+            'tag': base64.b64encode(encryptor.tag).decode()
+        }
+
+    def _decrypt_sync(self, encrypted_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decrypt one payload of either format (blocking).
+
+        Args:
+            encrypted_data: Encrypted data payload
+
+        Returns:
+            Decrypted original data
+
+        Since:
+            Version 1.0.0
+        """
+        if not encrypted_data.get('encrypted'):
+            return encrypted_data
+
+        # Extract encryption parameters
+        nonce = base64.b64decode(encrypted_data['nonce'])
+        ciphertext = base64.b64decode(encrypted_data['ciphertext'])
+        tag = base64.b64decode(encrypted_data['tag'])
+        context = encrypted_data.get('context', 'api_response')
+
+        if 'key_id' in encrypted_data:
+            dek = self._unwrap_data_key(encrypted_data, context)
+            plaintext = AESGCM(dek).decrypt(
+                nonce,
+                ciphertext + tag,
+                f"{context}:{encrypted_data['key_id']}".encode()
+            )
+        else:
+            # Legacy payload: key derived from its own salt
+            salt = base64.b64decode(encrypted_data['salt'])
+            key = self._derive_key(salt, context.encode())
+
+            # Decrypt using AES-256-GCM
+            cipher = Cipher(
+                algorithms.AES(key),
+                modes.GCM(nonce, tag),
+                backend=default_backend()
+            )
+            decryptor = cipher.decryptor()
+            plaintext = decryptor.update(ciphertext) + decryptor.finalize()
+
+        # Deserialize data
+        return json.loads(plaintext.decode())
+
     async def encrypt_data(
         self,
         data: Dict[str, Any],
@@ -98,6 +377,9 @@ class DataEncryptionService:
         """
         Encrypt sensitive pharmaceutical data.
 
+        Runs inline when the context's data key is cached; key derivation
+        and legacy-mode encryption run in a worker thread.
+
         Args:
             data: Data to encrypt
             context: Encryption context for key derivation
@@ -109,41 +391,15 @@ class DataEncryptionService:
             Version 1.0.0
         """
         try:
-            # Serialize data
-            plaintext = json.dumps(data, sort_keys=True).encode()
-
-            # Generate encryption parameters
-            salt = os.urandom(16)
-            nonce = os.urandom(12)
-
-            # Derive key with context
-            key = self._derive_key(salt, context.encode())
-
-            # Encrypt using AES-256-GCM
-            cipher = Cipher(
-                algorithms.AES(key),
-                modes.GCM(nonce),
-                backend=default_backend()
-            )
-            encryptor = cipher.encryptor()
-            ciphertext = encryptor.update(plaintext) + encryptor.finalize()
-
-            # Create encrypted payload
-            encrypted_data = {
-                'encrypted': True,
-                'algorithm': 'AES-256-GCM',
-                'version': '1.0',
-                'context': context,
-                'salt': base64.b64encode(salt).decode(),
-                'nonce': base64.b64encode(nonce).decode(),
-                'ciphertext': base64.b64encode(ciphertext).decode(),
-                'tag': base64.b64encode(encryptor.tag).decode()
-            }
+            if self.envelope_encryption and self._is_fresh(self._active_keys.get(context)):
+                encrypted_data = self._encrypt_sync(data, context)
+            else:
+                encrypted_data = await asyncio.to_thread(self._encrypt_sync, data, context)
 
-            logger.info(
+            logger.debug(
                 "Data encrypted successfully",
                 context=context,
-                size=len(plaintext)
+                size=len(encrypted_data['ciphertext'])
             )
 
             return encrypted_data
@@ -163,6 +419,9 @@ class DataEncryptionService:
         """
         Decrypt encrypted pharmaceutical data.
 
+        Reads both envelope (2.0) and legacy (1.0) payloads. Runs inline
+        when the payload's data key is cached, otherwise in a worker thread.
+
         Args:
             encrypted_data: Encrypted data payload
 
@@ -173,34 +432,14 @@ class DataEncryptionService:
             Version 1.0.0
         """
         try:
-            if not encrypted_data.get('encrypted'):
-                return encrypted_data
-
-            # Extract encryption parameters
-            salt = base64.b64decode(encrypted_data['salt'])
-            nonce = base64.b64decode(encrypted_data['nonce'])
-            ciphertext = base64.b64decode(encrypted_data['ciphertext'])
-            tag = base64.b64decode(encrypted_data['tag'])
-            context = encrypted_data.get('context', 'api_response')
+            if encrypted_data.get('key_id') in self._data_keys or not encrypted_data.get('encrypted'):
+                data = self._decrypt_sync(encrypted_data)
+            else:
+                data = await asyncio.to_thread(self._decrypt_sync, encrypted_data)
 
-            # Derive key
-            key = self._derive_key(salt, context.encode())
-
-            # Decrypt using AES-256-GCM
-            cipher = Cipher(
-                algorithms.AES(key),
-                modes.GCM(nonce, tag),
-                backend=default_backend()
-            )
-            decryptor = cipher.decryptor()
-            plaintext = decryptor.update(ciphertext) + decryptor.finalize()
-
-            # Deserialize data
-            data = json.loads(plaintext.decode())
-
-            logger.info(
+            logger.debug(
                 "Data decrypted successfully",
-                context=context
+                context=encrypted_data.get('context')
             )
 
             return data
@@ -212,6 +451,58 @@ class DataEncryptionService:
             )
             raise
 
+    async def encrypt_many(
+        self,
+        items: List[Dict[str, Any]],
+        context: str = "api_response"
+    ) -> List[Dict[str, Any]]:
+        """
+        Encrypt a batch of payloads in a worker thread.
+
+        Args:
+            items: Data to encrypt
+            context: Encryption context shared by the batch
+
+        Returns:
+            Encrypted payloads in input order
+
+        Since:
+            Version 1.0.0
+        """
+        def encrypt_batch() -> List[Dict[str, Any]]:
+            return [self._encrypt_sync(item, context) for item in items]
+
+        try:
+            return await asyncio.to_thread(encrypt_batch)
+        except Exception as e:
+            logger.error("Batch encryption failed", error=str(e), context=context, size=len(items))
+            raise
+
+    async def decrypt_many(
+        self,
+        items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Decrypt a batch of payloads (either format) in a worker thread.
+
+        Args:
+            items: Encrypted payloads
+
+        Returns:
+            Decrypted data in input order
+
+        Since:
+            Version 1.0.0
+        """
+        def decrypt_batch() -> List[Dict[str, Any]]:
+            return [self._decrypt_sync(item) for item in items]
+
+        try:
+            return await asyncio.to_thread(decrypt_batch)
+        except Exception as e:
+            logger.error("Batch decryption failed", error=str(e), size=len(items))
+            raise
+
     async def encrypt_field(
         self,
         value: str,
@@ -335,9 +626,10 @@ class DataEncryptionService:
         rotation_id = str(os.urandom(8).hex())
 
         try:
-            # Update master key
+            # Update master key; cached keys belong to the old one
             self.master_key = new_master_key
             self._validate_key_strength()
+            self._reset_key_cache()
 
             logger.info(
                 "Encryption key rotated",
@@ -354,6 +646,7 @@ class DataEncryptionService:
         except Exception as e:
             # Rollback on failure
             self.master_key = old_key
+            self._reset_key_cache()
             logger.error(
                 "Key rotation failed",
                 error=str(e),
@@ -362,6 +655,34 @@ class DataEncryptionService:
             raise
 
 
+# Shared instance, created on first use so importing does not require the key
+_data_encryption_service: Optional[DataEncryptionService] = None
+_data_encryption_lock = threading.Lock()
+
+
+def get_data_encryption_service() -> DataEncryptionService:
+    """
+    Get the shared data encryption service.
+
+    One instance per process keeps derived key encryption keys and data
+    keys cached across every caller.
+
+    Returns:
+        DataEncryptionService keyed by PHARMA_ENCRYPTION_KEY
+
+    Raises:
+        ValueError: If the master key is not configured
+
+    Since:
+        Version 1.0.0
+    """
+    global _data_encryption_service
+    with _data_encryption_lock:
+        if _data_encryption_service is None:
+            _data_encryption_service = DataEncryptionService()
+        return _data_encryption_service
+
+
 class DataMaskingService:
     """
     Data masking service for non-authorized access.
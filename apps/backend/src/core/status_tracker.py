@@ -9,13 +9,15 @@ Author: CognitoAI Development Team
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+import os
+import time
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, and_
 
-from ..database.models import ProcessTracking, DrugRequest, CategoryResult
+from ..database.models import ProcessTracking, DrugRequest, CategoryResult, AnalysisRequest
 from ..schemas.status import (
     ProcessingStatus,
     ProcessStatusResponse,
@@ -24,9 +26,35 @@ from ..schemas.status import (
     StatusUpdateRequest
 )
 from ..database.repositories.base import BaseRepository
+from ..services.progress_bus import get_progress_bus
 
 logger = structlog.get_logger(__name__)
 
+# Seconds a bulk status snapshot is shared between pollers
+STATUS_SNAPSHOT_TTL = float(os.getenv('STATUS_SNAPSHOT_TTL', '2.0'))
+STATUS_SNAPSHOT_MAX_ENTRIES = int(os.getenv('STATUS_SNAPSHOT_MAX_ENTRIES', '10000'))
+
+TERMINAL_STATUSES = {
+    ProcessingStatus.COMPLETED,
+    ProcessingStatus.FAILED,
+    ProcessingStatus.CANCELLED
+}
+
+# Average processing times per stage (in minutes)
+AVG_STAGE_MINUTES = {
+    ProcessingStatus.COLLECTING: 2.0,
+    ProcessingStatus.VERIFYING: 1.0,
+    ProcessingStatus.MERGING: 0.5,
+    ProcessingStatus.SUMMARIZING: 0.5
+}
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Convert timezone-aware database timestamps to naive UTC."""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 
 class StatusTracker:
     """
@@ -100,7 +128,7 @@ class StatusTracker:
         """
         self.db = db_session
         self.correlation_id = correlation_id
-        self.repo = BaseRepository(db_session)
+        self.repo = BaseRepository(ProcessTracking, db_session, correlation_id=correlation_id)
     
     async def create_process_tracking(
         self,
@@ -143,6 +171,7 @@ class StatusTracker:
         
         self.db.add(tracking)
         await self.db.commit()
+        get_status_snapshot_cache().invalidate(process_id)
         
         logger.info(
             "Process tracking created",
@@ -235,6 +264,14 @@ class StatusTracker:
             )
         
         await self.db.commit()
+        get_status_snapshot_cache().invalidate(process_id)
+        get_progress_bus().publish(tracking.request_id, process={
+            'processId': process_id,
+            'status': new_status.value,
+            'progressPercentage': update_request.progress_percentage,
+            'estimatedCompletion': tracking.estimated_completion.isoformat()
+            if tracking.estimated_completion else None
+        })
         
         # Log status change to audit trail
         await self._log_status_change(
@@ -268,43 +305,10 @@ class StatusTracker:
         Since:
             Version 1.0.0
         """
-        # Get tracking record
-        stmt = select(ProcessTracking).where(ProcessTracking.id == process_id)
-        result = await self.db.execute(stmt)
-        tracking = result.scalar_one_or_none()
-        
-        if not tracking:
+        statuses = await self._query_statuses([process_id])
+        if process_id not in statuses:
             raise ValueError(f"Process {process_id} not found")
-        
-        # Calculate processing duration
-        duration = self._calculate_duration(
-            tracking.submitted_at,
-            tracking.completed_at or datetime.utcnow()
-        )
-        
-        # Build audit summary
-        audit_summary = AuditSummary(
-            total_stages_completed=self._count_completed_stages(tracking),
-            current_stage_start_time=tracking.current_stage_start,
-            processing_duration=duration,
-            categories_completed=tracking.categories_completed or 0,
-            categories_total=tracking.categories_total or 17,
-            last_activity=tracking.updated_at or tracking.submitted_at
-        )
-        
-        # Build response
-        return ProcessStatusResponse(
-            process_id=tracking.id,
-            request_id=tracking.request_id,
-            current_stage=ProcessingStatus(tracking.current_status),
-            progress_percentage=tracking.progress_percentage,
-            estimated_completion=tracking.estimated_completion,
-            error_details=tracking.error_details,
-            audit_summary=audit_summary,
-            drug_names=tracking.drug_names or [],
-            created_at=tracking.submitted_at,
-            updated_at=tracking.updated_at or tracking.submitted_at
-        )
+        return statuses[process_id]
     
     async def get_process_history(
         self,
@@ -376,33 +380,70 @@ class StatusTracker:
     
     async def get_bulk_status(
         self,
-        process_ids: List[str]
+        process_ids: List[str],
+        use_snapshot: bool = True
     ) -> List[ProcessStatusResponse]:
         """
         Get status for multiple processes.
         
+        Statuses are computed from a single joined query. With
+        use_snapshot, results are shared through the process-wide
+        StatusSnapshotCache so concurrent pollers of the same processes
+        cost one query per TTL.
+        
         Args:
             process_ids: List of process identifiers
+            use_snapshot: Serve from the short-TTL snapshot
         
         Returns:
-            List of process statuses
+            List of process statuses, in request order, for found processes
         
         Since:
             Version 1.0.0
         """
-        # Query all processes at once
-        stmt = select(ProcessTracking).where(
-            ProcessTracking.id.in_(process_ids)
+        if use_snapshot:
+            statuses = await get_status_snapshot_cache().get_many(
+                process_ids, self._query_statuses
+            )
+        else:
+            statuses = await self._query_statuses(process_ids)
+        
+        return [statuses[pid] for pid in process_ids if statuses.get(pid) is not None]
+    
+    async def _query_statuses(
+        self,
+        process_ids: List[str]
+    ) -> Dict[str, ProcessStatusResponse]:
+        """
+        Build statuses for processes from one query.
+        
+        Joins analysis_requests (on request_id) for the live request
+        progress, then derives progress, duration and ETA per row in memory.
+        
+        Args:
+            process_ids: Process identifiers
+        
+        Returns:
+            Process ID -> status for processes that exist
+        
+        Since:
+            Version 1.0.0
+        """
+        if not process_ids:
+            return {}
+        
+        stmt = (
+            select(ProcessTracking, AnalysisRequest.progress_percentage)
+            .outerjoin(AnalysisRequest, AnalysisRequest.request_id == ProcessTracking.request_id)
+            .where(ProcessTracking.id.in_(list(process_ids)))
         )
         result = await self.db.execute(stmt)
-        trackings = result.scalars().all()
         
-        # Build status responses
-        statuses = []
-        for tracking in trackings:
+        now = datetime.utcnow()
+        statuses = {}
+        for tracking, request_progress in result.all():
             try:
-                status = await self.get_status(tracking.id)
-                statuses.append(status)
+                statuses[tracking.id] = self._build_status(tracking, request_progress, now)
             except Exception as e:
                 logger.error(
                     "Failed to get status for process",
@@ -412,6 +453,77 @@ class StatusTracker:
         
         return statuses
     
+    def _build_status(
+        self,
+        tracking: ProcessTracking,
+        request_progress: Optional[int],
+        now: datetime
+    ) -> ProcessStatusResponse:
+        """
+        Build a status response from a tracking row.
+        
+        Args:
+            tracking: Process tracking record
+            request_progress: Progress of the joined analysis request, if any
+            now: Reference time for duration and ETA
+        
+        Returns:
+            Process status
+        
+        Since:
+            Version 1.0.0
+        """
+        current_status = ProcessingStatus(tracking.current_status)
+        categories_completed = tracking.categories_completed or 0
+        categories_total = tracking.categories_total or 17
+        
+        progress = tracking.progress_percentage or 0
+        if current_status not in TERMINAL_STATUSES:
+            progress = max(
+                progress,
+                request_progress or 0,
+                self._stage_progress(current_status, categories_completed, categories_total) or 0
+            )
+        
+        estimated_completion = tracking.estimated_completion
+        if estimated_completion is None:
+            estimated_completion = self._estimate_completion(
+                current_status,
+                tracking.current_stage_start,
+                len(tracking.drug_names) if tracking.drug_names else 1,
+                now
+            )
+        
+        # Calculate processing duration
+        duration = self._calculate_duration(
+            tracking.submitted_at,
+            tracking.completed_at or now
+        )
+        
+        # Build audit summary
+        audit_summary = AuditSummary(
+            total_stages_completed=self._count_completed_stages(tracking),
+            current_stage_start_time=tracking.current_stage_start,
+            processing_duration=duration,
+            categories_completed=categories_completed,
+            categories_total=categories_total,
+            last_activity=tracking.updated_at or tracking.submitted_at
+        )
+        
+        # Build response
+        return ProcessStatusResponse(
+            process_id=tracking.id,
+            request_id=tracking.request_id,
+            current_stage=current_status,
+            progress_percentage=min(100, progress),
+            estimated_completion=estimated_completion,
+            error_details=tracking.error_details,
+            audit_summary=audit_summary,
+            drug_names=tracking.drug_names or [],
+            created_at=tracking.submitted_at,
+            updated_at=tracking.updated_at or tracking.submitted_at
+        )
+    
     async def calculate_progress(
         self,
         process_id: str,
@@ -439,35 +551,58 @@ class StatusTracker:
             return 0
         
         status = ProcessingStatus(tracking.current_status)
+        progress = self._stage_progress(
+            status, categories_completed, tracking.categories_total
+        )
+        
+        if progress is None:
+            return tracking.progress_percentage
+        
+        return progress
+    
+    def _stage_progress(
+        self,
+        status: ProcessingStatus,
+        categories_completed: int,
+        categories_total: int
+    ) -> Optional[int]:
+        """
+        Progress percentage for a stage and category count.
+        
+        Args:
+            status: Current stage
+            categories_completed: Number of categories completed
+            categories_total: Total categories
+        
+        Returns:
+            Progress (0-100), or None for failed/cancelled processes
+        
+        Since:
+            Version 1.0.0
+        """
         base_progress = self.STAGE_PROGRESS.get(status, 0)
         
         if base_progress is None:
-            return tracking.progress_percentage
+            return None
+        
+        fraction = categories_completed / categories_total if categories_total else 0
         
         # Calculate stage-specific progress
         if status == ProcessingStatus.COLLECTING:
             # 20% base + up to 60% for category completion
-            category_progress = (categories_completed / tracking.categories_total) * 60
-            return min(80, base_progress + int(category_progress))
+            return min(80, base_progress + int(fraction * 60))
         
         elif status == ProcessingStatus.VERIFYING:
             # 80% base + up to 10% for verification
-            verification_progress = (
-                categories_completed / tracking.categories_total
-            ) * 10
-            return min(90, base_progress + int(verification_progress))
+            return min(90, base_progress + int(fraction * 10))
         
         elif status == ProcessingStatus.MERGING:
             # 90% base + up to 5% for merging
-            merge_progress = (categories_completed / tracking.categories_total) * 5
-            return min(95, base_progress + int(merge_progress))
+            return min(95, base_progress + int(fraction * 5))
         
         elif status == ProcessingStatus.SUMMARIZING:
             # 95% base + up to 4% for summarization
-            summary_progress = (
-                categories_completed / tracking.categories_total
-            ) * 4
-            return min(99, base_progress + int(summary_progress))
+            return min(99, base_progress + int(fraction * 4))
         
         return base_progress
     
@@ -487,49 +622,61 @@ class StatusTracker:
         Since:
             Version 1.0.0
         """
-        # Average processing times per stage (in minutes)
-        avg_stage_times = {
-            ProcessingStatus.COLLECTING: 2.0,
-            ProcessingStatus.VERIFYING: 1.0,
-            ProcessingStatus.MERGING: 0.5,
-            ProcessingStatus.SUMMARIZING: 0.5
-        }
+        return self._estimate_completion(
+            ProcessingStatus(tracking.current_status),
+            tracking.current_stage_start,
+            len(tracking.drug_names) if tracking.drug_names else 1,
+            datetime.utcnow()
+        )
+    
+    def _estimate_completion(
+        self,
+        current_status: ProcessingStatus,
+        current_stage_start: Optional[datetime],
+        drug_count: int,
+        now: datetime
+    ) -> Optional[datetime]:
+        """
+        Estimate completion from the current stage and drug count.
         
-        current_status = ProcessingStatus(tracking.current_status)
+        Args:
+            current_status: Current stage
+            current_stage_start: When the current stage started
+            drug_count: Number of drugs in the request
+            now: Reference time
+        
+        Returns:
+            Estimated completion timestamp, or None for finished processes
         
+        Since:
+            Version 1.0.0
+        """
         # If already completed or failed
-        if current_status in [
-            ProcessingStatus.COMPLETED,
-            ProcessingStatus.FAILED,
-            ProcessingStatus.CANCELLED
-        ]:
+        if current_status in TERMINAL_STATUSES:
             return None
         
         # Calculate remaining time
         remaining_minutes = 0.0
         found_current = False
         
-        for status, avg_time in avg_stage_times.items():
+        for status, avg_time in AVG_STAGE_MINUTES.items():
             if status == current_status:
                 found_current = True
                 # Add remaining time for current stage
-                if tracking.current_stage_start:
-                    elapsed = (
-                        datetime.utcnow() - tracking.current_stage_start
-                    ).total_seconds() / 60
+                if current_stage_start:
+                    elapsed = (now - _naive_utc(current_stage_start)).total_seconds() / 60
                     remaining_minutes += max(0, avg_time - elapsed)
             elif found_current:
                 # Add full time for future stages
                 remaining_minutes += avg_time
         
         # Adjust for number of drugs
-        drug_multiplier = len(tracking.drug_names) if tracking.drug_names else 1
-        remaining_minutes *= (1 + (drug_multiplier - 1) * 0.5)
+        remaining_minutes *= (1 + (max(drug_count, 1) - 1) * 0.5)
         
         # Add buffer for system load
         remaining_minutes *= 1.2
         
-        return datetime.utcnow() + timedelta(minutes=remaining_minutes)
+        return now + timedelta(minutes=remaining_minutes)
     
     def _calculate_duration(
         self,
@@ -549,7 +696,7 @@ class StatusTracker:
         Since:
             Version 1.0.0
         """
-        duration = end_time - start_time
+        duration = _naive_utc(end_time) - _naive_utc(start_time)
         hours, remainder = divmod(duration.total_seconds(), 3600)
         minutes, seconds = divmod(remainder, 60)
         return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d}"
@@ -610,4 +757,158 @@ class StatusTracker:
             new_status=new_status.value,
             message=message,
             correlation_id=self.correlation_id
-        )
\ No newline at end of file
+        )
+
+
+class StatusSnapshotCache:
+    """
+    Short-TTL snapshot of process statuses shared across pollers.
+    
+    Dashboards poll the same processes repeatedly; within the TTL they
+    are served from memory, and processes missing from the snapshot are
+    loaded once per batch even when several requests ask for them at the
+    same time (later requests wait for the in-flight load). Unknown
+    process IDs are cached too, so repeated polls for them do not reach
+    the database either.
+    
+    Since:
+        Version 1.0.0
+    """
+    
+    def __init__(
+        self,
+        ttl: float = STATUS_SNAPSHOT_TTL,
+        max_entries: int = STATUS_SNAPSHOT_MAX_ENTRIES
+    ):
+        """
+        Initialize snapshot cache.
+        
+        Args:
+            ttl: Seconds an entry is served before it is reloaded
+            max_entries: Entry bound; expired entries are evicted first
+        
+        Since:
+            Version 1.0.0
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Optional[ProcessStatusResponse]]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'shared_loads': 0, 'loads': 0}
+    
+    async def get_many(
+        self,
+        process_ids: List[str],
+        loader: Callable[[List[str]], Awaitable[Dict[str, ProcessStatusResponse]]]
+    ) -> Dict[str, Optional[ProcessStatusResponse]]:
+        """
+        Get statuses, loading only those not in the snapshot.
+        
+        Args:
+            process_ids: Process identifiers
+            loader: Loads statuses for a list of IDs (absent IDs are unknown)
+        
+        Returns:
+            Process ID -> status, or None for unknown processes
+        
+        Since:
+            Version 1.0.0
+        """
+        now = time.monotonic()
+        statuses: Dict[str, Optional[ProcessStatusResponse]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        missing: List[str] = []
+        
+        for pid in process_ids:
+            entry = self._entries.get(pid)
+            if entry is not None and now - entry[0] < self.ttl:
+                statuses[pid] = entry[1]
+                self._stats['hits'] += 1
+            elif pid in self._inflight:
+                waiting[pid] = self._inflight[pid]
+                self._stats['shared_loads'] += 1
+            else:
+                missing.append(pid)
+                self._stats['misses'] += 1
+        
+        if missing:
+            statuses.update(await self._load(missing, loader))
+        
+        for pid, future in waiting.items():
+            statuses[pid] = await asyncio.shield(future)
+        
+        return statuses
+    
+    async def _load(
+        self,
+        process_ids: List[str],
+        loader: Callable[[List[str]], Awaitable[Dict[str, ProcessStatusResponse]]]
+    ) -> Dict[str, Optional[ProcessStatusResponse]]:
+        loop = asyncio.get_running_loop()
+        futures = {pid: loop.create_future() for pid in process_ids}
+        self._inflight.update(futures)
+        self._stats['loads'] += 1
+        
+        try:
+            loaded = await loader(process_ids)
+        except BaseException as e:
+            for future in futures.values():
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # waiters re-raise; don't log as unretrieved
+            raise
+        finally:
+            for pid in process_ids:
+                if self._inflight.get(pid) is futures[pid]:
+                    del self._inflight[pid]
+        
+        stamp = time.monotonic()
+        self._evict(stamp, len(process_ids))
+        statuses = {}
+        for pid in process_ids:
+            status = loaded.get(pid)
+            self._entries[pid] = (stamp, status)
+            futures[pid].set_result(status)
+            statuses[pid] = status
+        return statuses
+    
+    def _evict(self, now: float, incoming: int):
+        if len(self._entries) + incoming <= self.max_entries:
+            return
+        self._entries = {
+            pid: entry for pid, entry in self._entries.items()
+            if now - entry[0] < self.ttl
+        }
+        while self._entries and len(self._entries) + incoming > self.max_entries:
+            # Dicts keep insertion order: drop the oldest
+            del self._entries[next(iter(self._entries))]
+    
+    def invalidate(self, process_id: str):
+        """Drop a process from the snapshot after it changes."""
+        self._entries.pop(process_id, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and snapshot size."""
+        return {**self._stats, 'entries': len(self._entries), 'ttl': self.ttl}
+
+
+# Global snapshot cache instance
+status_snapshot_cache: Optional[StatusSnapshotCache] = None
+
+
+def get_status_snapshot_cache() -> StatusSnapshotCache:
+    """
+    Get global status snapshot cache.
+    
+    Returns:
+        StatusSnapshotCache instance
+    
+    Since:
+        Version 1.0.0
+    """
+    global status_snapshot_cache
+    if status_snapshot_cache is None:
+        status_snapshot_cache = StatusSnapshotCache()
+    return status_snapshot_cache
@@ -20,6 +20,7 @@ from ..integrations.providers.base import APIProvider, StandardizedAPIResponse
 from ..database.models import APIResponse, PharmaceuticalCategory
 from ..core.data_persistence import DataPersistenceManager
 from ..config.logging import PharmaceuticalLogger
+from ..integrations.response_cache import LocalLRUCache
 
 logger = structlog.get_logger(__name__)
 
@@ -121,7 +122,8 @@ class TemperatureSearchManager:
         self,
         persistence_manager: DataPersistenceManager,
         audit_logger: PharmaceuticalLogger,
-        cache_ttl_minutes: int = 60
+        cache_ttl_minutes: int = 60,
+        cache_max_entries: int = 1000
     ):
         """
         Initialize temperature search manager.
@@ -130,6 +132,7 @@ class TemperatureSearchManager:
             persistence_manager: Data persistence service
             audit_logger: Audit logging service
             cache_ttl_minutes: Cache TTL in minutes
+            cache_max_entries: Maximum number of cached query results
 
         Since:
             Version 1.0.0
@@ -137,7 +140,7 @@ class TemperatureSearchManager:
         self.persistence = persistence_manager
         self.audit_logger = audit_logger
         self.cache_ttl = timedelta(minutes=cache_ttl_minutes)
-        self.query_cache = {}
+        self.query_cache = LocalLRUCache(max_entries=cache_max_entries)
 
     async def execute_temperature_searches(
         self,
@@ -383,17 +386,7 @@ class TemperatureSearchManager:
         Since:
             Version 1.0.0
         """
-        if cache_key in self.query_cache:
-            cached = self.query_cache[cache_key]
-
-            # Check if still valid
-            if datetime.utcnow() - cached['timestamp'] <= self.cache_ttl:
-                return cached
-            else:
-                # Expired, remove from cache
-                del self.query_cache[cache_key]
-
-        return None
+        return self.query_cache.get(cache_key)
 
     async def _update_cache(self, result: TemperatureResult):
         """
@@ -412,13 +405,13 @@ class TemperatureSearchManager:
             result.response.metadata.get('category', '')
         )
 
-        self.query_cache[cache_key] = {
+        self.query_cache.set(cache_key, {
             'response': result.response,
             'response_id': result.response_id,
             'relevance_score': result.relevance_score,
             'result_count': result.result_count,
             'timestamp': datetime.utcnow()
-        }
+        }, self.cache_ttl.total_seconds())
 
     async def analyze_temperature_effectiveness(
         self,
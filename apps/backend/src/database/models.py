@@ -14,11 +14,11 @@ from typing import List, Dict, Optional, Any
 from uuid import uuid4
 import sqlalchemy as sa
 from sqlalchemy import (
-    String, Text, Integer, Float, Boolean, DateTime, JSON,
+    String, Text, Integer, Float, Boolean, DateTime, JSON, LargeBinary,
     ForeignKey, Index, CheckConstraint, UniqueConstraint,
     text, func, event
 )
-from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -1487,6 +1487,81 @@ class AuditEvent(Base):
     )
 
 
+class AuditEventRollup(Base):
+    """
+    Hourly audit event counts per event type, entity type and user.
+
+    Maintained incrementally from audit_events (see
+    AuditRepository.refresh_rollups) for compliance reporting.
+
+    Since:
+        Version 1.0.0
+    """
+    __tablename__ = "audit_event_rollups"
+
+    bucket_hour: Mapped[datetime] = mapped_column(
+        DateTime,
+        primary_key=True,
+        doc="Start of the hour (UTC)"
+    )
+    event_type: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+        doc="Audit event type as stored"
+    )
+    entity_type: Mapped[str] = mapped_column(
+        String(100),
+        primary_key=True,
+        doc="Type of entity audited"
+    )
+    user_id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        default="",
+        doc="User who performed the actions ('' for none)"
+    )
+    event_count: Mapped[int] = mapped_column(
+        sa.BigInteger,
+        nullable=False,
+        doc="Events in the hour"
+    )
+
+    __table_args__ = (
+        Index('idx_audit_event_rollups_entity_hour', 'entity_type', 'bucket_hour'),
+    )
+
+
+class AuditRollupState(Base):
+    """
+    Watermark of the audit event rollups.
+
+    Records the end of the last hour rolled up into audit_event_rollups,
+    including hours without events, so refreshes resume from it.
+
+    Since:
+        Version 1.0.0
+    """
+    __tablename__ = "audit_rollup_state"
+
+    rollup_name: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+        doc="Rollup identifier"
+    )
+    rolled_up_to: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        doc="End of the last rolled-up hour (UTC)"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+        doc="Last watermark update"
+    )
+
+
 # Database triggers for immutable audit logging
 @event.listens_for(DrugRequest, 'after_insert')
 def audit_drug_request_insert(mapper, connection, target):
@@ -1944,16 +2019,26 @@ class APIResponse(Base):
         doc="Complete query parameters sent to API"
     )
 
-    # Response data (encrypted in production)
-    raw_response: Mapped[Dict[str, Any]] = mapped_column(
+    # Response data (encrypted in production); new rows keep it in
+    # response_blobs and leave these columns empty
+    raw_response: Mapped[Optional[Dict[str, Any]]] = mapped_column(
         JSONB,
-        nullable=False,
-        doc="Complete raw API response (encrypted)"
+        nullable=True,
+        doc="Complete raw API response (encrypted), for rows stored inline"
     )
-    standardized_response: Mapped[Dict[str, Any]] = mapped_column(
+    standardized_response: Mapped[Optional[Dict[str, Any]]] = mapped_column(
         JSONB,
-        nullable=False,
-        doc="Standardized response format"
+        nullable=True,
+        doc="Standardized response format, for rows stored inline"
+    )
+    response_blob_checksum: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        doc="response_blobs key holding the raw response"
+    )
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        deferred=True,
+        doc="Full-text vector of the response text (see core.response_search)"
     )
 
     # Metadata
@@ -2071,12 +2156,151 @@ class APIResponse(Base):
         Index('ix_api_responses_compound_category', 'pharmaceutical_compound', 'category'),
         Index('ix_api_responses_created_at', 'created_at'),
         Index('ix_api_responses_provider_created', 'provider', 'created_at'),
+        Index(
+            'idx_api_responses_compound_trgm', 'pharmaceutical_compound',
+            postgresql_using='gin',
+            postgresql_ops={'pharmaceutical_compound': 'gin_trgm_ops'}
+        ),
+        Index('idx_api_responses_search_vector', 'search_vector', postgresql_using='gin'),
         CheckConstraint('relevance_score >= 0 AND relevance_score <= 1', name='check_relevance_range'),
         CheckConstraint('quality_score >= 0 AND quality_score <= 1', name='check_quality_range'),
         CheckConstraint('confidence_score >= 0 AND confidence_score <= 1', name='check_confidence_range'),
     )
 
 
+class ResponseBlob(Base):
+    """
+    Compressed, content-addressed raw API response.
+
+    Shared by every api_responses/api_usage_logs row holding the same
+    response; ref_count tracks how many rows reference it.
+
+    Since:
+        Version 1.0.0
+    """
+    __tablename__ = "response_blobs"
+
+    checksum: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        doc="SHA-256 checksum of the response JSON"
+    )
+    encoding: Mapped[str] = mapped_column(
+        String(10),
+        nullable=False,
+        doc="Compression codec (zstd, gzip or identity)"
+    )
+    content: Mapped[bytes] = mapped_column(
+        LargeBinary,
+        nullable=False,
+        doc="Compressed response JSON"
+    )
+    original_size: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        doc="Uncompressed size in bytes"
+    )
+    stored_size: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        doc="Compressed size in bytes"
+    )
+    ref_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        doc="Number of rows referencing this blob"
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        doc="First storage timestamp"
+    )
+    last_referenced_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        doc="Most recent reference timestamp"
+    )
+
+
+class IntegrityScanState(Base):
+    """
+    Persisted progress of the api_responses checksum scan.
+
+    Holds the keyset cursor of the last verified row so scans resume
+    where the previous run stopped.
+
+    Since:
+        Version 1.0.0
+    """
+    __tablename__ = "integrity_scan_state"
+
+    scan_name: Mapped[str] = mapped_column(
+        String(50),
+        primary_key=True,
+        doc="Scan identifier"
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="idle",
+        doc="idle, running, completed or failed"
+    )
+    cursor_created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        doc="created_at of the last verified row"
+    )
+    cursor_id: Mapped[Optional[str]] = mapped_column(
+        String(36),
+        doc="ID of the last verified row"
+    )
+    rows_scanned: Mapped[int] = mapped_column(
+        sa.BigInteger,
+        nullable=False,
+        default=0,
+        doc="Rows verified in the current pass"
+    )
+    valid_count: Mapped[int] = mapped_column(
+        sa.BigInteger,
+        nullable=False,
+        default=0,
+        doc="Rows whose checksum matched in the current pass"
+    )
+    invalid_count: Mapped[int] = mapped_column(
+        sa.BigInteger,
+        nullable=False,
+        default=0,
+        doc="Rows flagged invalid in the current pass"
+    )
+    passes_completed: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Full passes over the table"
+    )
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        doc="Start of the current pass"
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+        doc="Last progress update"
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        doc="End of the last completed pass"
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text,
+        doc="Error that stopped the last run"
+    )
+
+
 class APIResponseMetadata(Base):
     """
     Extended metadata for API responses.
@@ -8,18 +8,25 @@ Version: 1.0.0
 Author: CognitoAI Development Team
 """
 
+import time
+from collections import Counter
 from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy import select, update, delete, and_, or_, func, text
+from sqlalchemy import select, update, delete, and_, or_, func, text, cast, literal, tuple_, Float
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 import structlog
 
-from ..models import APIResponse, APIResponseMetadata
+from ...core.response_blobs import PreparedBlob, find_checksum_mismatches, load_blob_value
+from ...core.response_search import decode_cursor, encode_cursor, get_fallback_search_index
+from ..models import APIResponse, APIResponseMetadata, IntegrityScanState, ResponseBlob
 from .base import BaseRepository
 
 logger = structlog.get_logger(__name__)
 
+DEFAULT_INTEGRITY_SCAN = "api_responses"
+
 
 class RawDataRepository(BaseRepository[APIResponse]):
     """
@@ -125,34 +132,203 @@ class RawDataRepository(BaseRepository[APIResponse]):
             limit: Maximum results
 
         Returns:
-            List of matching responses
+            List of matching responses, best compound match first
 
         Since:
             Version 1.0.0
         """
-        conditions = [
-            self.model.pharmaceutical_compound.ilike(f'%{compound}%'),
-            self.model.is_valid == True,
-            self.model.archived_at.is_(None)
-        ]
+        responses, _ = await self.search_indexed(
+            compound=compound,
+            category=category,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit
+        )
+        return responses
+
+    def uses_native_search(self) -> bool:
+        """
+        Whether the database provides pg_trgm/tsvector search.
+
+        Other databases (SQLite in tests) use the in-memory fallback index.
+
+        Since:
+            Version 1.0.0
+        """
+        return self.db.get_bind().dialect.name == 'postgresql'
+
+    def search_vector(self, search_text: str):
+        """
+        Value for a new row's search_vector column.
+
+        Args:
+            search_text: Text from extract_search_text
+
+        Returns:
+            to_tsvector() expression, or None without native search
+
+        Since:
+            Version 1.0.0
+        """
+        if not self.uses_native_search():
+            return None
+        return func.to_tsvector('english', search_text)
+
+    def index_fallback(
+        self,
+        response_id: str,
+        compound: str,
+        search_text: str,
+        category: Optional[str] = None,
+        provider: Optional[str] = None,
+        created_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Add a committed response to the fallback index (no-op on PostgreSQL).
+
+        Since:
+            Version 1.0.0
+        """
+        if self.uses_native_search():
+            return
+        get_fallback_search_index().add(
+            response_id,
+            compound,
+            search_text,
+            created_at or datetime.utcnow(),
+            category=category,
+            provider=provider
+        )
+
+    async def search_indexed(
+        self,
+        compound: Optional[str] = None,
+        text_query: Optional[str] = None,
+        category: Optional[str] = None,
+        provider: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        include_archived: bool = False,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[APIResponse], Optional[str]]:
+        """
+        Ranked compound/content search with keyset pagination.
+
+        On PostgreSQL the compound filter uses the pg_trgm index and
+        text_query the search_vector index; the rank is trigram similarity
+        plus ts_rank_cd, ties broken by newest first.
+
+        Args:
+            compound: Compound substring (case-insensitive)
+            text_query: Web-search style query over response text
+            category: Category filter
+            provider: Provider filter
+            start_date: Start of date range
+            end_date: End of date range
+            include_archived: Include archived responses
+            limit: Page size
+            cursor: Cursor returned with the previous page
+
+        Returns:
+            tuple: (responses, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor is invalid
+
+        Since:
+            Version 1.0.0
+        """
+        if not self.uses_native_search():
+            return await self._search_fallback(
+                compound, text_query, category, provider,
+                start_date, end_date, include_archived, limit, cursor
+            )
+
+        conditions = [self.model.is_valid == True]
+        score = literal(0.0)
+
+        if compound:
+            conditions.append(self.model.pharmaceutical_compound.ilike(f'%{compound}%'))
+            score = score + func.similarity(self.model.pharmaceutical_compound, compound)
+
+        if text_query:
+            tsquery = func.websearch_to_tsquery('english', text_query)
+            conditions.append(self.model.search_vector.op('@@')(tsquery))
+            score = score + func.ts_rank_cd(self.model.search_vector, tsquery)
 
         if category:
             conditions.append(self.model.category == category)
 
+        if provider:
+            conditions.append(self.model.provider == provider)
+
         if start_date:
             conditions.append(self.model.created_at >= start_date)
 
         if end_date:
             conditions.append(self.model.created_at <= end_date)
 
-        query = select(self.model).where(
+        if not include_archived:
+            conditions.append(self.model.archived_at.is_(None))
+
+        score = cast(score, Float)
+        if cursor:
+            last_score, last_created_at, last_id = decode_cursor(cursor)
+            conditions.append(
+                tuple_(score, self.model.created_at, self.model.id)
+                < tuple_(literal(last_score, Float), literal(last_created_at), literal(last_id))
+            )
+
+        query = select(self.model, score.label('score')).where(
             and_(*conditions)
         ).order_by(
-            self.model.created_at.desc()
-        ).limit(limit)
+            score.desc(),
+            self.model.created_at.desc(),
+            self.model.id.desc()
+        ).limit(limit + 1)
 
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        rows = (await self.db.execute(query)).all()
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last, last_score = page[-1]
+            next_cursor = encode_cursor(last_score, last.created_at, last.id)
+
+        return [response for response, _ in page], next_cursor
+
+    async def _search_fallback(
+        self,
+        compound: Optional[str],
+        text_query: Optional[str],
+        category: Optional[str],
+        provider: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        include_archived: bool,
+        limit: int,
+        cursor: Optional[str]
+    ) -> Tuple[List[APIResponse], Optional[str]]:
+        hits, next_cursor = get_fallback_search_index().search(
+            compound=compound,
+            text_query=text_query,
+            category=category,
+            provider=provider,
+            start_date=start_date,
+            end_date=end_date,
+            include_archived=include_archived,
+            limit=limit,
+            cursor=cursor
+        )
+        if not hits:
+            return [], next_cursor
+
+        query = select(self.model).where(
+            self.model.id.in_([response_id for response_id, _ in hits]),
+            self.model.is_valid == True
+        )
+        by_id = {response.id: response for response in (await self.db.execute(query)).scalars().all()}
+        return [by_id[response_id] for response_id, _ in hits if response_id in by_id], next_cursor
 
     async def get_by_correlation_id(self, correlation_id: str) -> List[APIResponse]:
         """
@@ -325,6 +501,8 @@ class RawDataRepository(BaseRepository[APIResponse]):
         )
 
         result = await self.db.execute(stmt)
+        if not self.uses_native_search():
+            get_fallback_search_index().mark_archived(response_ids)
 
         # Log archival for audit trail
         await self.log_audit_trail(
@@ -341,6 +519,9 @@ class RawDataRepository(BaseRepository[APIResponse]):
         """
         Delete responses past retention period.
 
+        Releases the deleted rows' blob references; blobs no longer
+        referenced are deleted with them.
+
         Returns:
             Number of responses deleted
 
@@ -348,25 +529,35 @@ class RawDataRepository(BaseRepository[APIResponse]):
             Version 1.0.0
         """
         # Only delete if past 7-year retention AND archived
-        stmt = delete(self.model).where(
-            and_(
-                self.model.retention_expires_at < datetime.utcnow(),
-                self.model.archived_at.isnot(None)
-            )
+        expired = and_(
+            self.model.retention_expires_at < datetime.utcnow(),
+            self.model.archived_at.isnot(None)
+        )
+        stmt = delete(self.model).where(expired).returning(
+            self.model.id,
+            self.model.response_blob_checksum
         )
 
         result = await self.db.execute(stmt)
+        deleted = result.all()
+        released = [checksum for _, checksum in deleted if checksum]
+        await self.release_blobs(released)
 
-        if result.rowcount > 0:
+        if not self.uses_native_search():
+            index = get_fallback_search_index()
+            for response_id, _ in deleted:
+                index.remove(response_id)
+
+        if deleted:
             await self.log_audit_trail(
                 entity_type="APIResponse",
                 entity_id="retention_cleanup",
                 action="delete",
-                changes={'count': result.rowcount}
+                changes={'count': len(deleted)}
             )
 
         await self.db.commit()
-        return result.rowcount
+        return len(deleted)
 
     async def get_duplicate_responses(
         self,
@@ -412,7 +603,10 @@ class RawDataRepository(BaseRepository[APIResponse]):
         batch_size: int = 100
     ) -> Tuple[int, int]:
         """
-        Validate data integrity for a batch of responses.
+        Validate data integrity for the next batch of responses.
+
+        Continues the persisted integrity scan, so repeated calls walk
+        the whole table instead of re-checking the same rows.
 
         Args:
             batch_size: Number of responses to validate
@@ -423,40 +617,291 @@ class RawDataRepository(BaseRepository[APIResponse]):
         Since:
             Version 1.0.0
         """
-        import hashlib
-        import json
+        batch = await self.verify_next_batch(batch_size)
+        return batch['valid'], batch['invalid']
 
-        # Get unvalidated responses
-        query = select(self.model).where(
-            self.model.is_valid == True
-        ).limit(batch_size)
+    async def get_scan_state(self, scan_name: str = DEFAULT_INTEGRITY_SCAN) -> IntegrityScanState:
+        """
+        Get an integrity scan's persisted state, creating it if missing.
+
+        Args:
+            scan_name: Scan identifier
+
+        Returns:
+            Scan state row
+
+        Since:
+            Version 1.0.0
+        """
+        state = await self.db.get(IntegrityScanState, scan_name)
+        if state is None:
+            state = IntegrityScanState(
+                scan_name=scan_name,
+                status='idle',
+                rows_scanned=0,
+                valid_count=0,
+                invalid_count=0,
+                passes_completed=0
+            )
+            self.db.add(state)
+            await self.db.flush()
+        return state
+
+    async def fetch_integrity_batch(
+        self,
+        after_created_at: Optional[datetime],
+        after_id: Optional[str],
+        limit: int
+    ) -> List[tuple]:
+        """
+        Fetch the next rows to verify in (created_at, id) order.
+
+        Only the checksum and payload columns are loaded, with blob
+        content joined in the same query.
+
+        Args:
+            after_created_at: created_at of the last verified row
+            after_id: ID of the last verified row
+            limit: Maximum rows
+
+        Returns:
+            (id, created_at, checksum, raw_response, encoding, content) tuples
+
+        Since:
+            Version 1.0.0
+        """
+        conditions = [self.model.is_valid == True]
+        if after_id is not None:
+            conditions.append(
+                tuple_(self.model.created_at, self.model.id) > tuple_(literal(after_created_at), literal(after_id))
+            )
+
+        query = select(
+            self.model.id,
+            self.model.created_at,
+            self.model.checksum,
+            self.model.raw_response,
+            ResponseBlob.encoding,
+            ResponseBlob.content
+        ).outerjoin(
+            ResponseBlob, ResponseBlob.checksum == self.model.response_blob_checksum
+        ).where(
+            and_(*conditions)
+        ).order_by(
+            self.model.created_at,
+            self.model.id
+        ).limit(limit)
 
         result = await self.db.execute(query)
-        responses = result.scalars().all()
+        return [tuple(row) for row in result.all()]
 
-        valid_count = 0
-        invalid_count = 0
+    async def verify_next_batch(
+        self,
+        batch_size: int = 500,
+        scan_name: str = DEFAULT_INTEGRITY_SCAN,
+        find_mismatches=None
+    ) -> Dict[str, Any]:
+        """
+        Verify the next batch of an integrity scan and save its cursor.
 
-        for response in responses:
-            # Recalculate checksum
-            raw_json = json.dumps(response.raw_response, sort_keys=True)
-            current_checksum = hashlib.sha256(raw_json.encode()).hexdigest()
+        Rows whose checksum no longer matches are marked invalid. The
+        cursor and counters are committed with the batch, so an
+        interrupted scan resumes after the last committed batch. When the
+        end of the table is reached the pass completes and the next call
+        starts a new pass.
 
-            if current_checksum == response.checksum:
-                valid_count += 1
-            else:
-                invalid_count += 1
-                response.is_valid = False
+        Args:
+            batch_size: Rows per batch
+            scan_name: Scan identifier
+            find_mismatches: Async callable taking the rows for
+                find_checksum_mismatches (e.g. to hash in a process pool);
+                hashes inline when omitted
+
+        Returns:
+            Batch summary: rows, valid, invalid, fetch_ms and completed
+
+        Since:
+            Version 1.0.0
+        """
+        state = await self.get_scan_state(scan_name)
+        now = datetime.utcnow()
+
+        if state.cursor_id is None and state.status != 'running':
+            # Start a new pass
+            state.started_at = now
+            state.rows_scanned = 0
+            state.valid_count = 0
+            state.invalid_count = 0
+        state.status = 'running'
+        state.last_error = None
+
+        fetch_started = time.perf_counter()
+        rows = await self.fetch_integrity_batch(state.cursor_created_at, state.cursor_id, batch_size)
+        fetch_ms = (time.perf_counter() - fetch_started) * 1000
+
+        if not rows:
+            state.status = 'completed'
+            state.completed_at = now
+            state.passes_completed += 1
+            state.cursor_created_at = None
+            state.cursor_id = None
+            await self.db.commit()
+            return {'rows': 0, 'valid': 0, 'invalid': 0, 'fetch_ms': fetch_ms, 'completed': True}
+
+        hash_rows = [(row[0], row[2], row[3], row[4], row[5]) for row in rows]
+        if find_mismatches is not None:
+            mismatches = await find_mismatches(hash_rows)
+        else:
+            mismatches = find_checksum_mismatches(hash_rows)
+
+        if mismatches:
+            expected = {row[0]: row[2] for row in rows}
+            for response_id, actual in mismatches:
                 logger.warning(
                     "Data integrity validation failed",
-                    response_id=response.id,
-                    expected=response.checksum,
-                    actual=current_checksum
+                    response_id=response_id,
+                    expected=expected[response_id],
+                    actual=actual
                 )
+            await self.db.execute(
+                update(self.model).where(
+                    self.model.id.in_([response_id for response_id, _ in mismatches])
+                ).values(is_valid=False)
+            )
 
+        invalid = len(mismatches)
+        valid = len(rows) - invalid
+        state.cursor_id = rows[-1][0]
+        state.cursor_created_at = rows[-1][1]
+        state.rows_scanned += len(rows)
+        state.valid_count += valid
+        state.invalid_count += invalid
         await self.db.commit()
 
-        return valid_count, invalid_count
+        return {'rows': len(rows), 'valid': valid, 'invalid': invalid, 'fetch_ms': fetch_ms, 'completed': False}
+
+    async def store_blob(self, blob: PreparedBlob) -> None:
+        """
+        Store a response blob or add a reference to the existing one.
+
+        Does not commit; the caller commits with the referencing row.
+
+        Args:
+            blob: Prepared blob
+
+        Since:
+            Version 1.0.0
+        """
+        stmt = pg_insert(ResponseBlob).values(
+            checksum=blob.checksum,
+            encoding=blob.encoding,
+            content=blob.content,
+            original_size=blob.original_size,
+            stored_size=blob.stored_size,
+            ref_count=1
+        ).on_conflict_do_update(
+            index_elements=[ResponseBlob.checksum],
+            set_={
+                'ref_count': ResponseBlob.ref_count + 1,
+                'last_referenced_at': func.now()
+            }
+        )
+        await self.db.execute(stmt)
+
+    async def load_blobs(self, checksums) -> Dict[str, Any]:
+        """
+        Load response blobs in one query.
+
+        Args:
+            checksums: Blob checksums; duplicates and None are ignored
+
+        Returns:
+            Dict mapping checksum to decoded response
+
+        Since:
+            Version 1.0.0
+        """
+        wanted = {checksum for checksum in checksums if checksum}
+        if not wanted:
+            return {}
+
+        result = await self.db.execute(
+            select(ResponseBlob.checksum, ResponseBlob.encoding, ResponseBlob.content)
+            .where(ResponseBlob.checksum.in_(wanted))
+        )
+        return {
+            row.checksum.strip(): load_blob_value(row.encoding, row.content)
+            for row in result
+        }
+
+    async def load_payloads(self, responses: List[APIResponse]) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve raw and standardized payloads for responses in one query.
+
+        Rows stored before blob storage keep their inline columns. For blob
+        rows the standardized payload is the raw one unless it was stored
+        encrypted.
+
+        Args:
+            responses: API response rows
+
+        Returns:
+            Dict mapping response ID to raw_response/standardized_response
+
+        Since:
+            Version 1.0.0
+        """
+        blobs = await self.load_blobs(
+            response.response_blob_checksum for response in responses
+            if response.raw_response is None
+        )
+
+        payloads = {}
+        for response in responses:
+            if response.raw_response is not None or not response.response_blob_checksum:
+                raw = response.raw_response
+                standardized = response.standardized_response
+            else:
+                raw = blobs.get(response.response_blob_checksum)
+                encrypted = isinstance(raw, dict) and raw.get('encrypted')
+                standardized = None if encrypted else raw
+            payloads[response.id] = {'raw_response': raw, 'standardized_response': standardized}
+        return payloads
+
+    async def release_blobs(self, checksums: List[str]) -> int:
+        """
+        Drop one reference per entry and delete unreferenced blobs.
+
+        Does not commit.
+
+        Args:
+            checksums: Checksums of deleted referencing rows
+
+        Returns:
+            Number of blobs deleted
+
+        Since:
+            Version 1.0.0
+        """
+        if not checksums:
+            return 0
+
+        for checksum, count in Counter(checksums).items():
+            await self.db.execute(
+                update(ResponseBlob)
+                .where(ResponseBlob.checksum == checksum)
+                .values(ref_count=ResponseBlob.ref_count - count)
+            )
+
+        result = await self.db.execute(
+            delete(ResponseBlob).where(
+                and_(
+                    ResponseBlob.checksum.in_(set(checksums)),
+                    ResponseBlob.ref_count <= 0
+                )
+            )
+        )
+        return result.rowcount
 
     async def get_storage_statistics(self) -> Dict[str, Any]:
         """
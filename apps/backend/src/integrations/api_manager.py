@@ -21,6 +21,7 @@ from .providers import (
     PROVIDER_CLASSES
 )
 from .rate_limiter import RateLimiter
+from .provider_latency import get_latency_tracker
 from ..database.repositories.api_repo import APIProviderConfigRepository
 from ..config.logging import PharmaceuticalLogger
 from ..core.temperature_strategy import (
@@ -29,6 +30,7 @@ from ..core.temperature_strategy import (
     TemperatureResult
 )
 from ..core.data_persistence import DataPersistenceManager
+from ..core.security.data_encryption import get_data_encryption_service
 from ..core.source_priority import (
     SourceClassifier,
     HierarchicalProcessor,
@@ -87,6 +89,7 @@ class MultiAPIManager:
         self.audit_logger = audit_logger
         self.providers: Dict[str, APIProvider] = {}
         self.rate_limiter = RateLimiter(redis_client)
+        self.latency = get_latency_tracker()
         self.config_repo = APIProviderConfigRepository(db)
         self._initialized = False
         self.temperature_manager = None  # Initialize when needed
@@ -176,19 +179,32 @@ class MultiAPIManager:
             logger.warning(f"No active providers for category: {category}")
             return []
 
+        # Check every provider's rate limits in one round trip
+        active_providers = [name for name in active_providers if name in self.providers]
+        rate_checks = await self.rate_limiter.check_rate_limits(
+            [(provider_name, category) for provider_name in active_providers]
+        )
+
         # Execute parallel searches with rate limiting
+        searched_providers = []
         tasks = []
-        for provider_name in active_providers:
-            if provider_name in self.providers:
-                provider = self.providers[provider_name]
-                tasks.append(
-                    self._search_provider_with_limits(
-                        provider,
-                        query,
-                        category,
-                        config
-                    )
+        for provider_name, (allowed, retry_after) in zip(active_providers, rate_checks):
+            if not allowed:
+                logger.warning(
+                    f"Rate limit exceeded for {provider_name}",
+                    retry_after=retry_after
+                )
+                continue
+            searched_providers.append(provider_name)
+            tasks.append(
+                self._search_provider_with_limits(
+                    self.providers[provider_name],
+                    query,
+                    category,
+                    config,
+                    rate_checked=True
                 )
+            )
 
         # Gather results with timeout
         timeout = config.get('timeout', 30)
@@ -196,7 +212,7 @@ class MultiAPIManager:
 
         # Process results and handle exceptions
         successful_results = []
-        for provider_name, result in zip(active_providers, results):
+        for provider_name, result in zip(searched_providers, results):
             if isinstance(result, Exception):
                 await self.audit_logger.log_api_call(
                     provider=provider_name,
@@ -274,7 +290,8 @@ class MultiAPIManager:
         provider: APIProvider,
         query: str,
         category: str,
-        config: Dict[str, Any]
+        config: Dict[str, Any],
+        rate_checked: bool = False
     ) -> Optional[StandardizedAPIResponse]:
         """
         Execute provider search with rate limiting and error handling.
@@ -284,6 +301,7 @@ class MultiAPIManager:
             query: Search query
             category: Pharmaceutical category
             config: Search configuration
+            rate_checked: Rate limits were already consumed by a batch check
 
         Returns:
             Standardized response or None
@@ -295,17 +313,18 @@ class MultiAPIManager:
 
         try:
             # Check rate limits
-            allowed, retry_after = await self.rate_limiter.check_rate_limit(
-                provider_name,
-                category
-            )
-
-            if not allowed:
-                logger.warning(
-                    f"Rate limit exceeded for {provider_name}",
-                    retry_after=retry_after
+            if not rate_checked:
+                allowed, retry_after = await self.rate_limiter.check_rate_limit(
+                    provider_name,
+                    category
                 )
-                return None
+
+                if not allowed:
+                    logger.warning(
+                        f"Rate limit exceeded for {provider_name}",
+                        retry_after=retry_after
+                    )
+                    return None
 
             # Check provider health with circuit breaker
             if not await self._check_provider_health(provider_name):
@@ -319,18 +338,23 @@ class MultiAPIManager:
                 provider_name
             )
 
-            # Execute search with timeout
+            # Execute search under the provider's adaptive timeout; with
+            # config['hedge'] a slow call is duplicated after its p95 latency
             timeout = config.get('timeout', provider.timeout)
             temperature = config.get('temperature', 0.7)
             max_results = config.get('max_results', 10)
 
-            result = await asyncio.wait_for(
-                provider.search(
+            result = await self.latency.run(
+                provider_name,
+                lambda: provider.search(
                     query=enhanced_query,
                     temperature=temperature,
                     max_results=max_results
                 ),
-                timeout=timeout
+                default_timeout=timeout,
+                hedge=config.get('hedge', False),
+                succeeded=lambda response: response is not None,
+                cost=lambda response: response.cost
             )
 
             # Record successful call for circuit breaker
@@ -622,7 +646,8 @@ Category: {category}"""
             if not self.persistence_manager:
                 self.persistence_manager = DataPersistenceManager(
                     self.db,
-                    self.audit_logger
+                    self.audit_logger,
+                    encryption_service=get_data_encryption_service()
                 )
             self.temperature_manager = TemperatureSearchManager(
                 self.persistence_manager,
@@ -707,7 +732,8 @@ Category: {category}"""
             if not self.persistence_manager:
                 self.persistence_manager = DataPersistenceManager(
                     self.db,
-                    self.audit_logger
+                    self.audit_logger,
+                    encryption_service=get_data_encryption_service()
                 )
             self.temperature_manager = TemperatureSearchManager(
                 self.persistence_manager,
@@ -2,19 +2,35 @@
 Connection pooling for API providers.
 
 Manages HTTP connection pools for efficient API communication with
-connection reuse, limits, and health monitoring.
+connection reuse, limits, and health monitoring. Provider clients are
+built when a provider is initialized, so the request path only does a
+dictionary lookup.
 
 Version: 1.0.0
 Author: CognitoAI Development Team
 """
 
 import asyncio
+import time
 from typing import Dict, Optional, Any, List
 from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
+import aiohttp
 import httpx
 import structlog
 
+try:
+    import h2
+except ImportError:  # optional; clients fall back to HTTP/1.1
+    h2 = None
+
+from .provider_latency import (
+    LatencyHistogram,
+    backoff_delay,
+    get_latency_tracker,
+    retry_after_seconds
+)
+
 logger = structlog.get_logger(__name__)
 
 
@@ -40,7 +56,9 @@ class ConnectionPool:
         max_keepalive_connections: int = 20,
         keepalive_expiry: int = 300,  # 5 minutes
         timeout: int = 30,
-        enable_http2: bool = True
+        enable_http2: bool = True,
+        max_connections_per_host: int = 20,
+        dns_cache_ttl: int = 300
     ):
         """
         Initialize connection pool manager.
@@ -51,6 +69,8 @@ class ConnectionPool:
             keepalive_expiry: Seconds before closing idle connections
             timeout: Default timeout for requests
             enable_http2: Enable HTTP/2 support
+            max_connections_per_host: Concurrent connection cap per upstream host
+            dns_cache_ttl: Seconds to cache resolved provider hostnames
 
         Since:
             Version 1.0.0
@@ -60,6 +80,8 @@ class ConnectionPool:
         self.keepalive_expiry = keepalive_expiry
         self.timeout = timeout
         self.enable_http2 = enable_http2
+        self.max_connections_per_host = max_connections_per_host
+        self.dns_cache_ttl = dns_cache_ttl
 
         # Provider-specific clients
         self._clients: Dict[str, httpx.AsyncClient] = {}
@@ -67,8 +89,16 @@ class ConnectionPool:
         self._health_status: Dict[str, Dict[str, Any]] = {}
         self._connection_metrics: Dict[str, Dict[str, Any]] = {}
 
-        # Lock for thread-safe client creation
-        self._lock = asyncio.Lock()
+        # Provider-specific aiohttp sessions (long-lived, shared across calls)
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._session_config: Dict[str, Dict[str, Any]] = {}
+        self._session_metrics: Dict[str, Dict[str, Any]] = {}
+
+        # Time from sending a request to getting a connection for it
+        self._acquire_latency: Dict[str, LatencyHistogram] = {}
+
+        # Latency histograms for adaptive timeouts and hedging
+        self.latency = get_latency_tracker()
 
     async def initialize_provider(
         self,
@@ -106,6 +136,10 @@ class ConnectionPool:
             'http2': kwargs.get('http2', self.enable_http2)
         }
 
+        if config['http2'] and h2 is None:
+            logger.warning(f"HTTP/2 requested for {provider} but the h2 package is not installed; using HTTP/1.1")
+            config['http2'] = False
+
         self._client_config[provider] = config
 
         # Initialize metrics
@@ -124,31 +158,84 @@ class ConnectionPool:
             'consecutive_failures': 0
         }
 
+        # Build the client now so get_client never has to
+        previous = self._clients.pop(provider, None)
+        self._build_client(provider)
+        if previous is not None:
+            await previous.aclose()
+
         logger.info(f"Initialized connection pool for {provider}", config=config)
 
+    def _build_client(self, provider: str) -> httpx.AsyncClient:
+        """
+        Create and register the HTTP client for a provider.
+
+        Synchronous, so creating and registering the client cannot be
+        interleaved with another task on the event loop.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            New httpx.AsyncClient
+
+        Raises:
+            ValueError: If the provider was not initialized
+
+        Since:
+            Version 1.0.0
+        """
+        if provider not in self._client_config:
+            raise ValueError(f"Provider {provider} not initialized")
+
+        histogram = self._acquire_latency.setdefault(provider, LatencyHistogram())
+
+        async def on_request(request: httpx.Request):
+            # Connection acquisition ends when the request headers go out
+            started = time.monotonic()
+            caller_trace = request.extensions.get('trace')
+            acquired = False
+
+            async def trace(event_name: str, info: Dict[str, Any]):
+                nonlocal acquired
+                if not acquired and event_name.endswith('send_request_headers.started'):
+                    acquired = True
+                    histogram.record(time.monotonic() - started)
+                if caller_trace is not None:
+                    await caller_trace(event_name, info)
+
+            request.extensions['trace'] = trace
+
+        client = httpx.AsyncClient(
+            **self._client_config[provider],
+            event_hooks={'request': [on_request]}
+        )
+        self._clients[provider] = client
+        return client
+
     @asynccontextmanager
     async def get_client(self, provider: str):
         """
         Get HTTP client for a provider with connection pooling.
 
+        Lock-free: clients are built in ``initialize_provider``, and only
+        rebuilt here if the provider was closed since.
+
         Args:
             provider: Provider name
 
         Yields:
             httpx.AsyncClient instance
 
+        Raises:
+            ValueError: If the provider was not initialized
+
         Since:
             Version 1.0.0
         """
-        async with self._lock:
-            if provider not in self._clients:
-                if provider not in self._client_config:
-                    raise ValueError(f"Provider {provider} not initialized")
-
-                config = self._client_config[provider]
-                self._clients[provider] = httpx.AsyncClient(**config)
-
-        client = self._clients[provider]
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._build_client(provider)
 
         # Track active connections
         self._connection_metrics[provider]['active_connections'] += 1
@@ -158,22 +245,221 @@ class ConnectionPool:
         finally:
             self._connection_metrics[provider]['active_connections'] -= 1
 
+    def configure_session(self, provider: str, **kwargs):
+        """
+        Register pooled aiohttp session settings for a provider.
+
+        Settings only take effect the next time the provider session is
+        created, so call this before ``open_session``/``get_session``.
+
+        Args:
+            provider: Provider name
+            **kwargs: Overrides for max_connections, max_connections_per_host,
+                keepalive_expiry, dns_cache_ttl and timeout
+
+        Since:
+            Version 1.0.0
+        """
+        self._session_config[provider] = {
+            'max_connections': kwargs.get('max_connections', self.max_connections),
+            'max_connections_per_host': kwargs.get(
+                'max_connections_per_host', self.max_connections_per_host
+            ),
+            'keepalive_expiry': kwargs.get('keepalive_expiry', self.keepalive_expiry),
+            'dns_cache_ttl': kwargs.get('dns_cache_ttl', self.dns_cache_ttl),
+            'timeout': kwargs.get('timeout', self.timeout)
+        }
+
+    def _build_session(self, provider: str) -> aiohttp.ClientSession:
+        """
+        Create the aiohttp session backing a provider's connection pool.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            New aiohttp.ClientSession with a tuned TCPConnector
+
+        Since:
+            Version 1.0.0
+        """
+        if provider not in self._session_config:
+            self.configure_session(provider)
+        config = self._session_config[provider]
+
+        metrics = self._session_metrics.setdefault(provider, {
+            'requests_total': 0,
+            'active_requests': 0,
+            'peak_active_requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0,
+            'sessions_created': 0
+        })
+        metrics['sessions_created'] += 1
+
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, ctx, params):
+            metrics['connections_created'] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            metrics['connections_reused'] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            metrics['dns_cache_hits'] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            metrics['dns_cache_misses'] += 1
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+
+        connector = aiohttp.TCPConnector(
+            limit=config['max_connections'],
+            limit_per_host=config['max_connections_per_host'],
+            keepalive_timeout=config['keepalive_expiry'],
+            ttl_dns_cache=config['dns_cache_ttl'],
+            use_dns_cache=True,
+            enable_cleanup_closed=True
+        )
+
+        logger.info(f"Created pooled HTTP session for {provider}", config=config)
+
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=config['timeout']),
+            trace_configs=[trace_config]
+        )
+
+    async def open_session(self, provider: str, **kwargs) -> aiohttp.ClientSession:
+        """
+        Eagerly create the pooled session for a provider.
+
+        Intended for application startup so the first provider call does not
+        pay for session construction.
+
+        Args:
+            provider: Provider name
+            **kwargs: Session settings, see ``configure_session``
+
+        Returns:
+            The provider's shared aiohttp.ClientSession
+
+        Since:
+            Version 1.0.0
+        """
+        if kwargs or provider not in self._session_config:
+            self.configure_session(provider, **kwargs)
+
+        session = self._sessions.get(provider)
+        if session is None or session.closed:
+            session = self._build_session(provider)
+            self._sessions[provider] = session
+
+        return session
+
+    @asynccontextmanager
+    async def get_session(self, provider: str):
+        """
+        Borrow the long-lived aiohttp session for a provider.
+
+        The session is shared and is not closed when the context exits;
+        it stays open until ``close_provider``/``close_all``. Sessions are
+        created on first use if ``open_session`` was not called at startup.
+
+        Args:
+            provider: Provider name
+
+        Yields:
+            aiohttp.ClientSession instance
+
+        Example:
+            >>> async with pool.get_session('openai') as session:
+            ...     async with session.post(url, json=payload) as response:
+            ...         data = await response.json()
+
+        Since:
+            Version 1.0.0
+        """
+        session = self._sessions.get(provider)
+        if session is None or session.closed:
+            session = await self.open_session(provider)
+
+        metrics = self._session_metrics[provider]
+        metrics['requests_total'] += 1
+        metrics['active_requests'] += 1
+        metrics['peak_active_requests'] = max(
+            metrics['peak_active_requests'], metrics['active_requests']
+        )
+
+        try:
+            yield session
+        finally:
+            metrics['active_requests'] -= 1
+
+    def get_session_metrics(self, provider: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get pool utilisation metrics for the pooled aiohttp sessions.
+
+        Args:
+            provider: Specific provider or None for all
+
+        Returns:
+            Metrics dictionary
+
+        Since:
+            Version 1.0.0
+        """
+        if provider is None:
+            return {p: self.get_session_metrics(p) for p in self._session_metrics}
+
+        metrics = dict(self._session_metrics.get(provider, {}))
+        config = self._session_config.get(provider, {})
+        session = self._sessions.get(provider)
+
+        if metrics:
+            opened = metrics['connections_created'] + metrics['connections_reused']
+            metrics['connection_reuse_rate'] = (
+                metrics['connections_reused'] / opened if opened else 0
+            )
+            limit = config.get('max_connections_per_host') or config.get('max_connections')
+            metrics['utilisation'] = metrics['active_requests'] / limit if limit else 0
+
+        return {
+            'provider': provider,
+            'open': session is not None and not session.closed,
+            'config': config,
+            'metrics': metrics
+        }
+
     async def execute_request(
         self,
         provider: str,
         method: str,
         url: str,
         retry_count: int = 3,
+        hedge: bool = False,
         **kwargs
     ) -> httpx.Response:
         """
         Execute HTTP request with retries and metrics.
 
+        Each attempt runs under the provider's adaptive timeout (observed
+        p99 x factor, capped at the pool timeout) and, with ``hedge``, is
+        duplicated once it runs past the provider's p95 latency. Retries
+        wait for the delay requested by Retry-After / rate-limit reset
+        headers, falling back to jittered exponential backoff.
+
         Args:
             provider: Provider name
             method: HTTP method (GET, POST, etc.)
             url: Request URL
             retry_count: Number of retry attempts
+            hedge: Send a duplicate request when an attempt is slow
             **kwargs: Additional request parameters
 
         Returns:
@@ -188,34 +474,46 @@ class ConnectionPool:
         start_time = datetime.utcnow()
         last_exception = None
 
+        async def send() -> httpx.Response:
+            async with self.get_client(provider) as client:
+                response = await client.request(method, url, **kwargs)
+                response.raise_for_status()
+                return response
+
         for attempt in range(retry_count):
             try:
-                async with self.get_client(provider) as client:
-                    response = await client.request(method, url, **kwargs)
-                    response.raise_for_status()
+                response = await self.latency.run(
+                    provider, send, default_timeout=self.timeout, hedge=hedge
+                )
 
-                    # Update metrics
-                    elapsed = (datetime.utcnow() - start_time).total_seconds()
-                    metrics['requests_success'] += 1
-                    metrics['total_response_time'] += elapsed
+                # Update metrics
+                elapsed = (datetime.utcnow() - start_time).total_seconds()
+                metrics['requests_success'] += 1
+                metrics['total_response_time'] += elapsed
 
-                    # Update health status
-                    self._update_health(provider, success=True)
+                # Update health status
+                self._update_health(provider, success=True)
 
-                    return response
+                return response
 
-            except (httpx.TimeoutException, httpx.ConnectError) as e:
+            except (httpx.TimeoutException, httpx.ConnectError, asyncio.TimeoutError) as e:
                 last_exception = e
                 logger.warning(f"Connection error for {provider} (attempt {attempt + 1}): {e}")
 
                 if attempt < retry_count - 1:
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                    await asyncio.sleep(backoff_delay(attempt))
 
             except httpx.HTTPStatusError as e:
                 last_exception = e
                 if e.response.status_code in [429, 503]:  # Rate limit or service unavailable
                     if attempt < retry_count - 1:
-                        await asyncio.sleep(2 ** attempt)
+                        delay = backoff_delay(attempt, retry_after_seconds(e.response.headers))
+                        logger.warning(
+                            f"{provider} returned {e.response.status_code}, retrying",
+                            attempt=attempt + 1,
+                            delay=round(delay, 2)
+                        )
+                        await asyncio.sleep(delay)
                 else:
                     break  # Don't retry on client errors
 
@@ -327,7 +625,9 @@ class ConnectionPool:
             return {
                 'provider': provider,
                 'metrics': metrics,
-                'health': health
+                'health': health,
+                'latency': self.latency.get_metrics(provider).get(provider, {}),
+                'connections': self._get_connection_stats(provider)
             }
 
         # Return all metrics
@@ -337,6 +637,55 @@ class ConnectionPool:
 
         return all_metrics
 
+    def _get_connection_stats(self, provider: str) -> Dict[str, Any]:
+        """
+        Connection-level state of a provider's HTTP client.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            in_use, idle and http2 connection counts, requests waiting
+            for a connection, and acquire latency percentiles/histogram
+
+        Since:
+            Version 1.0.0
+        """
+        config = self._client_config.get(provider, {})
+        histogram = self._acquire_latency.get(provider, LatencyHistogram())
+        stats = {
+            'http2_enabled': bool(config.get('http2')),
+            'in_use': 0,
+            'idle': 0,
+            'http2': 0,
+            'waiters': 0,
+            'acquire_samples': histogram.total,
+            'acquire_histogram_ms': {
+                str(round(bound * 1000, 1)): count for bound, count in histogram.buckets()
+            }
+        }
+        for quantile in (0.5, 0.95, 0.99):
+            value = LatencyHistogram.percentile([histogram], quantile)
+            stats[f'acquire_p{int(quantile * 100)}_ms'] = round(value * 1000, 1) if value is not None else None
+
+        client = self._clients.get(provider)
+        # httpx does not expose its pool publicly; read it defensively
+        pool = getattr(getattr(client, '_transport', None), '_pool', None)
+        if pool is None:
+            return stats
+
+        for connection in pool.connections:
+            if connection.is_closed():
+                continue
+            if connection.is_idle():
+                stats['idle'] += 1
+            else:
+                stats['in_use'] += 1
+            if 'HTTP/2' in connection.info():
+                stats['http2'] += 1
+        stats['waiters'] = sum(1 for request in getattr(pool, '_requests', []) if request.is_queued())
+        return stats
+
     async def close_provider(self, provider: str):
         """
         Close connection pool for a provider.
@@ -353,6 +702,12 @@ class ConnectionPool:
 
             logger.info(f"Closed connection pool for {provider}")
 
+        session = self._sessions.pop(provider, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+            logger.info(f"Closed pooled HTTP session for {provider}")
+
     async def close_all(self):
         """
         Close all connection pools.
@@ -360,7 +715,7 @@ class ConnectionPool:
         Since:
             Version 1.0.0
         """
-        for provider in list(self._clients.keys()):
+        for provider in set(self._clients) | set(self._sessions):
             await self.close_provider(provider)
 
     async def __aenter__(self):
@@ -0,0 +1,541 @@
+"""
+Latency tracking, adaptive timeouts and request hedging for API providers.
+
+Each provider keeps a rolling latency histogram. Timeouts follow the
+observed tail (p99 x factor) instead of a fixed value, and a call can
+optionally be hedged: if it has not answered by the provider's p95
+latency, a duplicate is sent and the first good response wins. Hedges
+draw from a per-provider budget so they stay a small fraction of traffic.
+Also provides Retry-After / rate-limit header parsing for retry backoff.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import bisect
+import math
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, TypeVar
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar('T')
+
+# Histogram bucket upper bounds: 10ms growing by 25% per bucket to ~12 minutes
+_BUCKET_BOUNDS = [0.01 * 1.25 ** i for i in range(51)]
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+class LatencyHistogram:
+    """
+    Fixed log-scale latency histogram.
+
+    Recording is O(1) in memory; percentiles resolve to bucket upper
+    bounds, so they over-estimate by at most one bucket (25%).
+
+    Since:
+        Version 1.0.0
+    """
+
+    __slots__ = ('counts', 'total')
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.total = 0
+
+    def record(self, seconds: float):
+        """
+        Record one latency sample.
+
+        Args:
+            seconds: Observed latency
+
+        Since:
+            Version 1.0.0
+        """
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.total += 1
+
+    def buckets(self) -> List[tuple]:
+        """
+        Non-empty buckets as (upper bound in seconds, count).
+
+        The last bucket's bound is infinity (samples beyond the largest bound).
+
+        Since:
+            Version 1.0.0
+        """
+        bounds = _BUCKET_BOUNDS + [math.inf]
+        return [(bounds[i], count) for i, count in enumerate(self.counts) if count]
+
+    @staticmethod
+    def percentile(histograms: List['LatencyHistogram'], quantile: float) -> Optional[float]:
+        """
+        Percentile over the union of several histograms.
+
+        Args:
+            histograms: Histograms to combine
+            quantile: Quantile between 0 and 1
+
+        Returns:
+            Latency in seconds, or None without samples
+
+        Since:
+            Version 1.0.0
+        """
+        total = sum(h.total for h in histograms)
+        if not total:
+            return None
+
+        rank = max(1, math.ceil(total * quantile))
+        seen = 0
+        for index in range(len(_BUCKET_BOUNDS) + 1):
+            seen += sum(h.counts[index] for h in histograms)
+            if seen >= rank:
+                return _BUCKET_BOUNDS[min(index, len(_BUCKET_BOUNDS) - 1)]
+        return _BUCKET_BOUNDS[-1]
+
+
+class _ProviderLatency:
+    """Rolling latency window, hedge budget and counters for one provider."""
+
+    def __init__(self, window: float, now: float):
+        self.window = window
+        self.current = LatencyHistogram()
+        self.previous = LatencyHistogram()
+        self.rotated_at = now
+        self.hedge_tokens = 1.0
+
+        self.metrics = {
+            'calls': 0,
+            'timeouts': 0,
+            'failures': 0,
+            'hedges_sent': 0,
+            'hedges_skipped_budget': 0,
+            'hedge_wins': 0,
+            'primary_wins': 0,
+            'wasted_calls': 0,
+            'wasted_cost': 0.0
+        }
+
+    def histograms(self, now: float) -> List[LatencyHistogram]:
+        """Samples from the current and previous window (one to two windows)."""
+        elapsed = now - self.rotated_at
+        if elapsed >= 2 * self.window:
+            self.previous, self.current = LatencyHistogram(), LatencyHistogram()
+            self.rotated_at = now
+        elif elapsed >= self.window:
+            self.previous, self.current = self.current, LatencyHistogram()
+            self.rotated_at = now
+        return [self.current, self.previous]
+
+    def record(self, seconds: float, now: float):
+        self.histograms(now)
+        self.current.record(seconds)
+
+
+class LatencyTracker:
+    """
+    Per-provider latency histograms driving adaptive timeouts and hedging.
+
+    Example:
+        >>> tracker = get_latency_tracker()
+        >>> result = await tracker.run(
+        ...     "perplexity", lambda: call_perplexity(prompt),
+        ...     default_timeout=90, hedge=True
+        ... )
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(
+        self,
+        timeout_quantile: float = 0.99,
+        timeout_factor: float = 2.0,
+        min_timeout: float = 5.0,
+        hedge_quantile: float = 0.95,
+        hedge_budget: float = 0.1,
+        min_samples: int = 20,
+        window: float = 300.0
+    ):
+        """
+        Initialize latency tracker.
+
+        Args:
+            timeout_quantile: Latency quantile the timeout is derived from
+            timeout_factor: Multiplier applied to that quantile
+            min_timeout: Lower bound for adaptive timeouts in seconds
+            hedge_quantile: Latency quantile after which a hedge is sent
+            hedge_budget: Hedges allowed per call (0.1 = at most ~10% extra requests)
+            min_samples: Samples required before timeouts and hedging adapt
+            window: Seconds per histogram window; percentiles cover the last
+                one to two windows
+
+        Since:
+            Version 1.0.0
+        """
+        self.timeout_quantile = timeout_quantile
+        self.timeout_factor = timeout_factor
+        self.min_timeout = min_timeout
+        self.hedge_quantile = hedge_quantile
+        self.hedge_budget = hedge_budget
+        self.min_samples = min_samples
+        self.window = window
+        self._providers: Dict[str, _ProviderLatency] = {}
+
+    def _get(self, provider: str) -> _ProviderLatency:
+        state = self._providers.get(provider)
+        if state is None:
+            state = _ProviderLatency(self.window, time.monotonic())
+            self._providers[provider] = state
+        return state
+
+    def percentile(self, provider: str, quantile: float) -> Optional[float]:
+        """
+        Observed latency percentile for a provider.
+
+        Args:
+            provider: Provider identifier
+            quantile: Quantile between 0 and 1
+
+        Returns:
+            Latency in seconds, or None until min_samples are recorded
+
+        Since:
+            Version 1.0.0
+        """
+        histograms = self._get(provider).histograms(time.monotonic())
+        if sum(h.total for h in histograms) < self.min_samples:
+            return None
+        return LatencyHistogram.percentile(histograms, quantile)
+
+    def record(self, provider: str, seconds: float):
+        """
+        Record the latency of a completed provider call.
+
+        Args:
+            provider: Provider identifier
+            seconds: Observed latency
+
+        Since:
+            Version 1.0.0
+        """
+        self._get(provider).record(seconds, time.monotonic())
+
+    def timeout(self, provider: str, default: float) -> float:
+        """
+        Adaptive timeout for a provider.
+
+        The timeout only tightens: it never exceeds the configured default.
+
+        Args:
+            provider: Provider identifier
+            default: Configured timeout, used until enough samples exist
+
+        Returns:
+            Timeout in seconds
+
+        Since:
+            Version 1.0.0
+        """
+        tail = self.percentile(provider, self.timeout_quantile)
+        if tail is None:
+            return default
+        return min(default, max(self.min_timeout, tail * self.timeout_factor))
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """
+        Delay after which a still-pending call is hedged.
+
+        Args:
+            provider: Provider identifier
+
+        Returns:
+            Seconds, or None until enough samples exist
+
+        Since:
+            Version 1.0.0
+        """
+        return self.percentile(provider, self.hedge_quantile)
+
+    async def run(
+        self,
+        provider: str,
+        call: Callable[[], Awaitable[T]],
+        default_timeout: float,
+        hedge: bool = False,
+        succeeded: Optional[Callable[[T], bool]] = None,
+        cost: Optional[Callable[[T], float]] = None
+    ) -> T:
+        """
+        Run a provider call under an adaptive timeout, optionally hedged.
+
+        Args:
+            provider: Provider identifier
+            call: Zero-argument coroutine factory; called again for the hedge
+            default_timeout: Configured timeout in seconds
+            hedge: Send a duplicate once the call exceeds the provider's p95
+            succeeded: Decides whether a result is good enough to win; a bad
+                result waits for the other attempt if one is running
+            cost: Cost of a result, used to account wasted hedge spend
+
+        Returns:
+            Result of the first successful attempt (or the primary's result
+            when no attempt succeeded)
+
+        Raises:
+            asyncio.TimeoutError: If no attempt finished within the timeout
+            Exception: The primary attempt's error if every attempt failed
+
+        Since:
+            Version 1.0.0
+        """
+        state = self._get(provider)
+        state.metrics['calls'] += 1
+        state.hedge_tokens = min(10.0, state.hedge_tokens + self.hedge_budget)
+
+        timeout = self.timeout(provider, default_timeout)
+        delay = self.hedge_delay(provider) if hedge else None
+        start = time.monotonic()
+        deadline = start + timeout
+
+        async def attempt():
+            began = time.monotonic()
+            result = await call()
+            if succeeded is None or succeeded(result):
+                self.record(provider, time.monotonic() - began)
+            return result
+
+        primary = asyncio.ensure_future(attempt())
+        attempts = {primary: 'primary'}
+        outcomes: Dict[str, Any] = {}
+        hedge_pending = delay is not None and delay < timeout
+
+        try:
+            while attempts:
+                wait_until = start + delay if hedge_pending else deadline
+                done, _ = await asyncio.wait(
+                    attempts, timeout=max(0.0, wait_until - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    if hedge_pending:
+                        hedge_pending = False
+                        if state.hedge_tokens >= 1.0:
+                            state.hedge_tokens -= 1.0
+                            state.metrics['hedges_sent'] += 1
+                            attempts[asyncio.ensure_future(attempt())] = 'hedge'
+                            logger.debug("Hedging slow provider call", provider=provider, after_s=round(delay, 3))
+                        else:
+                            state.metrics['hedges_skipped_budget'] += 1
+                        continue
+
+                    state.metrics['timeouts'] += 1
+                    # Censored sample: keeps the tail estimate from collapsing
+                    self.record(provider, timeout)
+                    raise asyncio.TimeoutError(f"{provider} did not respond within {timeout:.1f}s")
+
+                for task in done:
+                    role = attempts.pop(task)
+                    if task.exception() is not None:
+                        outcomes[role] = task.exception()
+                        continue
+                    result = task.result()
+                    if succeeded is not None and not succeeded(result):
+                        outcomes[role] = result
+                        continue
+
+                    state.metrics[f'{role}_wins'] += 1
+                    self._account_waste(state, attempts, outcomes, result, cost)
+                    return result
+
+                # A failure before the hedge point is not hedged; retries handle it
+                hedge_pending = False
+
+            state.metrics['failures'] += 1
+            first = outcomes.get('primary', outcomes.get('hedge'))
+            if isinstance(first, BaseException):
+                raise first
+            return first
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    @staticmethod
+    def _account_waste(
+        state: _ProviderLatency,
+        pending: Dict[asyncio.Future, str],
+        outcomes: Dict[str, Any],
+        result: Any,
+        cost: Optional[Callable[[Any], float]]
+    ):
+        """Count the losing attempt of a hedged pair as wasted spend."""
+        # A hedge that replaced a failed primary acted as a retry, not waste
+        losers = len(pending) + ('hedge' in outcomes)
+        if not losers:
+            return
+        state.metrics['wasted_calls'] += losers
+        if cost is not None:
+            try:
+                # A cancelled duplicate is billed like the request that won
+                state.metrics['wasted_cost'] += losers * float(cost(result))
+            except Exception:
+                pass
+
+    def get_metrics(self, provider: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get latency, timeout and hedging metrics.
+
+        Args:
+            provider: Specific provider or None for all
+
+        Returns:
+            Metrics per provider
+
+        Since:
+            Version 1.0.0
+        """
+        now = time.monotonic()
+        metrics = {}
+        for name, state in self._providers.items():
+            if provider and name != provider:
+                continue
+            histograms = state.histograms(now)
+            percentiles = {
+                f'p{int(q * 100)}_ms': (
+                    round(value * 1000, 1)
+                    if (value := LatencyHistogram.percentile(histograms, q)) is not None else None
+                )
+                for q in (0.5, 0.95, 0.99)
+            }
+            hedges = state.metrics['hedges_sent']
+            metrics[name] = {
+                **state.metrics,
+                **percentiles,
+                'samples': sum(h.total for h in histograms),
+                'hedge_win_rate': state.metrics['hedge_wins'] / hedges if hedges else 0.0,
+                'hedge_rate': hedges / state.metrics['calls'] if state.metrics['calls'] else 0.0
+            }
+        return metrics
+
+
+def retry_after_seconds(headers: Mapping[str, str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Delay requested by a provider's rate-limit headers.
+
+    Understands Retry-After (seconds or HTTP date), retry-after-ms,
+    OpenAI-style x-ratelimit-reset-* durations ("1s", "6m0s", "20ms") and
+    Anthropic-style *-reset RFC 3339 timestamps; the longest delay wins.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+        now: Current time, for date-valued headers
+
+    Returns:
+        Seconds to wait, or None if no header applies
+
+    Since:
+        Version 1.0.0
+    """
+    now = now or datetime.now(timezone.utc)
+    lowered = {str(k).lower(): str(v).strip() for k, v in headers.items()}
+    delays = []
+
+    value = lowered.get('retry-after-ms')
+    if value:
+        try:
+            delays.append(float(value) / 1000)
+        except ValueError:
+            pass
+
+    value = lowered.get('retry-after')
+    if value:
+        try:
+            delays.append(float(value))
+        except ValueError:
+            try:
+                delays.append((parsedate_to_datetime(value) - now).total_seconds())
+            except (TypeError, ValueError):
+                pass
+
+    for name, value in lowered.items():
+        if 'ratelimit' not in name or not (name.endswith('-reset') or '-reset-' in name) or not value:
+            continue
+        try:
+            number = float(value)
+            # Either an epoch timestamp or seconds from now
+            delays.append(number - now.timestamp() if number > 1e9 else number)
+            continue
+        except ValueError:
+            pass
+        parts = _DURATION_PART.findall(value)
+        if parts and ''.join(n + u for n, u in parts) == value:
+            delays.append(sum(float(n) * _DURATION_UNITS[u] for n, u in parts))
+            continue
+        try:
+            delays.append((datetime.fromisoformat(value.replace('Z', '+00:00')) - now).total_seconds())
+        except ValueError:
+            pass
+
+    delays = [d for d in delays if d >= 0]
+    return max(delays) if delays else None
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after: Optional[float] = None,
+    base: float = 1.0,
+    cap: float = 60.0
+) -> float:
+    """
+    Delay before the next retry.
+
+    Honours a provider-requested delay when given; otherwise uses
+    exponential backoff with full jitter so retries do not synchronise.
+
+    Args:
+        attempt: Zero-based attempt that just failed
+        retry_after: Delay requested by the provider, if any
+        base: Backoff base in seconds
+        cap: Upper bound in seconds
+
+    Returns:
+        Seconds to sleep
+
+    Since:
+        Version 1.0.0
+    """
+    if retry_after is not None:
+        return min(cap, retry_after)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+# Global tracker instance
+global_latency_tracker = LatencyTracker(
+    timeout_factor=float(os.getenv('PROVIDER_TIMEOUT_FACTOR', '2.0')),
+    hedge_budget=float(os.getenv('PROVIDER_HEDGE_BUDGET', '0.1'))
+)
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """
+    Get global latency tracker instance.
+
+    Returns:
+        LatencyTracker instance
+
+    Since:
+        Version 1.0.0
+    """
+    return global_latency_tracker
@@ -0,0 +1,464 @@
+"""
+Global scheduler for outbound API provider calls.
+
+Every provider call acquires a slot from the scheduler before it is sent.
+Slots are bounded per provider by a concurrency limit and by sliding
+one-minute request and token budgets. Callers wait for capacity rather than
+being rejected, are served in priority order, and within a priority are
+served round-robin across tenants (drug requests) so one large request
+cannot starve the others.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+import structlog
+
+from .rate_limiter import RateLimiter
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar('T')
+
+# Priority lanes (lower value is served first)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITIES = (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW)
+
+_WINDOW_SECONDS = 60.0
+
+
+class ProviderBudget:
+    """
+    Capacity limits for one provider.
+
+    Args:
+        max_concurrency: Maximum calls in flight at once
+        rpm: Requests per minute (0 disables the check)
+        tpm: Tokens per minute (0 disables the check)
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self, max_concurrency: int, rpm: int, tpm: int):
+        self.max_concurrency = max_concurrency
+        self.rpm = rpm
+        self.tpm = tpm
+
+
+class SchedulerGrant:
+    """
+    A granted call slot.
+
+    Lets the caller replace the token estimate reserved at admission with the
+    actual usage once the response is known.
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self, lane: '_ProviderLane', entry: List[float]):
+        self._lane = lane
+        self._entry = entry  # [admitted_at, tokens]
+
+    def record_tokens(self, tokens: int):
+        """
+        Record actual token usage for this call.
+
+        Args:
+            tokens: Tokens consumed by the call
+
+        Since:
+            Version 1.0.0
+        """
+        if self._entry[0] >= time.monotonic() - _WINDOW_SECONDS:
+            self._lane.tokens_in_window += tokens - self._entry[1]
+        self._entry[1] = tokens
+
+
+class _Waiter:
+    """A queued call waiting for a slot."""
+
+    __slots__ = ('future', 'tenant', 'tokens', 'enqueued_at')
+
+    def __init__(self, future: asyncio.Future, tenant: str, tokens: int):
+        self.future = future
+        self.tenant = tenant
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+
+
+class _ProviderLane:
+    """Queues, budgets and counters for one provider."""
+
+    def __init__(self, provider: str, budget: ProviderBudget):
+        self.provider = provider
+        self.budget = budget
+
+        # priority -> tenant -> FIFO of waiters; tenant order rotates for fairness
+        self.queues: Dict[int, 'OrderedDict[str, Deque[_Waiter]]'] = {
+            priority: OrderedDict() for priority in PRIORITIES
+        }
+        self.queued = 0
+        self.in_flight = 0
+        self.request_times: Deque[float] = deque()
+        self.token_log: Deque[List[float]] = deque()
+        self.tokens_in_window = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+        self.metrics = {
+            'granted': 0,
+            'cancelled': 0,
+            'rate_limited_waits': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
+            'peak_in_flight': 0,
+            'peak_queued': 0
+        }
+
+    def enqueue(self, waiter: _Waiter, priority: int):
+        self.queues[priority].setdefault(waiter.tenant, deque()).append(waiter)
+        self.queued += 1
+        self.metrics['peak_queued'] = max(self.metrics['peak_queued'], self.queued)
+
+    def peek(self) -> Optional[_Waiter]:
+        for priority in PRIORITIES:
+            tenants = self.queues[priority]
+            if tenants:
+                return next(iter(tenants.values()))[0]
+        return None
+
+    def pop(self) -> _Waiter:
+        for priority in PRIORITIES:
+            tenants = self.queues[priority]
+            if tenants:
+                tenant, waiters = next(iter(tenants.items()))
+                waiter = waiters.popleft()
+                if waiters:
+                    tenants.move_to_end(tenant)
+                else:
+                    del tenants[tenant]
+                self.queued -= 1
+                return waiter
+        raise IndexError("no waiters queued")
+
+    def prune(self, now: float):
+        cutoff = now - _WINDOW_SECONDS
+        while self.request_times and self.request_times[0] < cutoff:
+            self.request_times.popleft()
+        while self.token_log and self.token_log[0][0] < cutoff:
+            self.tokens_in_window -= self.token_log.popleft()[1]
+
+    def capacity_wait(self, tokens: int, now: float) -> Optional[float]:
+        """
+        Seconds until a call needing ``tokens`` fits the budgets, or None
+        if it is blocked on concurrency (a release will re-dispatch).
+        """
+        budget = self.budget
+        if self.in_flight >= budget.max_concurrency:
+            return None
+        if budget.rpm and len(self.request_times) >= budget.rpm:
+            return self.request_times[0] + _WINDOW_SECONDS - now
+        # An empty window always admits, so oversized calls cannot deadlock
+        if budget.tpm and self.token_log and self.tokens_in_window + tokens > budget.tpm:
+            return self.token_log[0][0] + _WINDOW_SECONDS - now
+        return 0.0
+
+    def admit(self, tokens: int, now: float) -> List[float]:
+        self.in_flight += 1
+        self.request_times.append(now)
+        entry = [now, tokens]
+        self.token_log.append(entry)
+        self.tokens_in_window += tokens
+        self.metrics['granted'] += 1
+        self.metrics['peak_in_flight'] = max(self.metrics['peak_in_flight'], self.in_flight)
+        return entry
+
+
+class ProviderScheduler:
+    """
+    Central admission control for provider API calls.
+
+    Example:
+        >>> scheduler = get_provider_scheduler()
+        >>> result = await scheduler.run(
+        ...     "openai", lambda: call_openai(prompt),
+        ...     tenant=request_id, estimated_tokens=1500
+        ... )
+
+    Since:
+        Version 1.0.0
+    """
+
+    # Token-per-minute budgets; RateLimiter only tracks request counts
+    DEFAULT_TPM = {
+        'chatgpt': 200000,
+        'anthropic': 80000,
+        'perplexity': 100000,
+        'grok': 100000,
+        'gemini': 120000,
+        'tavily': 0
+    }
+
+    # ProviderService ids -> RateLimiter provider names
+    PROVIDER_ALIASES = {
+        'openai': 'chatgpt',
+        'claude': 'anthropic'
+    }
+
+    def __init__(
+        self,
+        default_max_concurrency: int = 8,
+        default_rpm: int = 50,
+        default_tpm: int = 100000
+    ):
+        """
+        Initialize provider scheduler.
+
+        Args:
+            default_max_concurrency: In-flight cap for providers without overrides
+            default_rpm: Requests per minute for providers unknown to RateLimiter
+            default_tpm: Tokens per minute for providers without a known budget
+
+        Since:
+            Version 1.0.0
+        """
+        self.default_max_concurrency = default_max_concurrency
+        self.default_rpm = default_rpm
+        self.default_tpm = default_tpm
+        self._lanes: Dict[str, _ProviderLane] = {}
+
+    def _default_budget(self, provider: str) -> ProviderBudget:
+        """Seed a provider budget from RateLimiter's per-minute limits."""
+        name = self.PROVIDER_ALIASES.get(provider, provider)
+        limits = RateLimiter.DEFAULT_PROVIDER_LIMITS.get(name, {})
+        return ProviderBudget(
+            max_concurrency=self.default_max_concurrency,
+            rpm=limits.get('rpm', self.default_rpm),
+            tpm=self.DEFAULT_TPM.get(name, self.default_tpm)
+        )
+
+    def _get_lane(self, provider: str) -> _ProviderLane:
+        lane = self._lanes.get(provider)
+        if lane is None:
+            lane = _ProviderLane(provider, self._default_budget(provider))
+            self._lanes[provider] = lane
+        return lane
+
+    def configure(
+        self,
+        provider: str,
+        max_concurrency: Optional[int] = None,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None
+    ):
+        """
+        Override the budget for a provider.
+
+        Args:
+            provider: Provider identifier
+            max_concurrency: Maximum calls in flight
+            rpm: Requests per minute (0 disables)
+            tpm: Tokens per minute (0 disables)
+
+        Since:
+            Version 1.0.0
+        """
+        budget = self._get_lane(provider).budget
+        if max_concurrency is not None:
+            budget.max_concurrency = max(1, max_concurrency)
+        if rpm is not None:
+            budget.rpm = rpm
+        if tpm is not None:
+            budget.tpm = tpm
+
+        logger.info("Provider schedule configured", provider=provider,
+                    max_concurrency=budget.max_concurrency, rpm=budget.rpm, tpm=budget.tpm)
+
+    def _dispatch(self, lane: _ProviderLane):
+        """Grant slots to queued callers while capacity allows."""
+        if lane.timer is not None:
+            lane.timer.cancel()
+            lane.timer = None
+
+        now = time.monotonic()
+        lane.prune(now)
+
+        while True:
+            waiter = lane.peek()
+            if waiter is None:
+                return
+
+            if waiter.future.done():  # caller cancelled while queued
+                lane.pop()
+                lane.metrics['cancelled'] += 1
+                continue
+
+            wait = lane.capacity_wait(waiter.tokens, now)
+            if wait is None:
+                return
+            if wait > 0:
+                lane.metrics['rate_limited_waits'] += 1
+                lane.timer = asyncio.get_running_loop().call_later(wait, self._dispatch, lane)
+                return
+
+            lane.pop()
+            entry = lane.admit(waiter.tokens, now)
+            wait_ms = (now - waiter.enqueued_at) * 1000
+            lane.metrics['total_wait_ms'] += wait_ms
+            lane.metrics['max_wait_ms'] = max(lane.metrics['max_wait_ms'], wait_ms)
+            waiter.future.set_result(SchedulerGrant(lane, entry))
+
+    def _release(self, lane: _ProviderLane):
+        lane.in_flight -= 1
+        self._dispatch(lane)
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        provider: str,
+        tenant: str = "default",
+        priority: int = PRIORITY_NORMAL,
+        estimated_tokens: int = 0
+    ):
+        """
+        Wait for a call slot and hold it for the duration of the block.
+
+        Args:
+            provider: Provider identifier
+            tenant: Fairness key, normally the drug request ID
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+            estimated_tokens: Tokens reserved against the TPM budget
+
+        Yields:
+            SchedulerGrant for recording actual token usage
+
+        Since:
+            Version 1.0.0
+        """
+        lane = self._get_lane(provider)
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), tenant, estimated_tokens)
+        lane.enqueue(waiter, priority)
+        self._dispatch(lane)
+
+        try:
+            grant = await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(lane)  # granted just before cancellation
+            else:
+                self._dispatch(lane)
+            raise
+
+        try:
+            yield grant
+        finally:
+            self._release(lane)
+
+    async def run(
+        self,
+        provider: str,
+        call: Callable[[], Awaitable[T]],
+        tenant: str = "default",
+        priority: int = PRIORITY_NORMAL,
+        estimated_tokens: int = 0,
+        count_tokens: Optional[Callable[[T], int]] = None
+    ) -> T:
+        """
+        Run a provider call once a slot is available.
+
+        Args:
+            provider: Provider identifier
+            call: Zero-argument coroutine factory performing the request
+            tenant: Fairness key, normally the drug request ID
+            priority: Priority lane
+            estimated_tokens: Tokens reserved against the TPM budget
+            count_tokens: Optional function returning actual tokens from the result
+
+        Returns:
+            Result of the call
+
+        Since:
+            Version 1.0.0
+        """
+        async with self.acquire(provider, tenant, priority, estimated_tokens) as grant:
+            result = await call()
+            if count_tokens is not None:
+                try:
+                    grant.record_tokens(int(count_tokens(result)))
+                except Exception:
+                    pass  # keep the estimate
+            return result
+
+    def get_metrics(self, provider: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get queueing and budget metrics.
+
+        Args:
+            provider: Specific provider or None for all
+
+        Returns:
+            Metrics per provider
+
+        Since:
+            Version 1.0.0
+        """
+        now = time.monotonic()
+        metrics = {}
+        for name, lane in self._lanes.items():
+            if provider and name != provider:
+                continue
+            lane.prune(now)
+            granted = lane.metrics['granted']
+            metrics[name] = {
+                **lane.metrics,
+                'max_concurrency': lane.budget.max_concurrency,
+                'rpm': lane.budget.rpm,
+                'tpm': lane.budget.tpm,
+                'in_flight': lane.in_flight,
+                'queued': lane.queued,
+                'requests_last_minute': len(lane.request_times),
+                'tokens_last_minute': lane.tokens_in_window,
+                'avg_wait_ms': lane.metrics['total_wait_ms'] / granted if granted else 0.0
+            }
+        return metrics
+
+
+def estimate_tokens(text: Any) -> int:
+    """
+    Rough token estimate (about four characters per token).
+
+    Args:
+        text: Prompt or response text
+
+    Returns:
+        Estimated token count
+
+    Since:
+        Version 1.0.0
+    """
+    return len(str(text)) // 4 if text else 0
+
+
+# Global scheduler instance
+global_provider_scheduler = ProviderScheduler()
+
+
+def get_provider_scheduler() -> ProviderScheduler:
+    """
+    Get global provider scheduler instance.
+
+    Returns:
+        ProviderScheduler instance
+
+    Since:
+        Version 1.0.0
+    """
+    return global_provider_scheduler
@@ -0,0 +1,344 @@
+"""
+Streaming support for provider completions.
+
+Providers can return completions incrementally (SSE for OpenAI, Anthropic
+and Perplexity, chunked iteration for the Gemini SDK). This module turns
+those transports into plain text deltas, hands every delta to a callback as
+it arrives so downstream work (e.g. table parsing) can start before the
+completion finishes, and records time-to-first-token and tokens/second per
+call.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+import aiohttp
+import structlog
+
+from .provider_scheduler import estimate_tokens
+
+logger = structlog.get_logger(__name__)
+
+# Callback receiving each text delta as it arrives
+ChunkCallback = Callable[[str], None]
+
+# Streams may run longer than a buffered call; bound the idle gap instead
+STREAM_TIMEOUT = aiohttp.ClientTimeout(total=300, sock_read=60)
+
+
+def openai_delta(event: Dict[str, Any]) -> Optional[str]:
+    """Extract text from an OpenAI-compatible chat completion chunk (also Perplexity)."""
+    choices = event.get("choices") or []
+    if not choices:
+        return None
+    return (choices[0].get("delta") or {}).get("content")
+
+
+def anthropic_delta(event: Dict[str, Any]) -> Optional[str]:
+    """Extract text from an Anthropic messages stream event."""
+    if event.get("type") != "content_block_delta":
+        return None
+    delta = event.get("delta") or {}
+    if delta.get("type") != "text_delta":
+        return None
+    return delta.get("text")
+
+
+async def iter_sse_deltas(
+    response: aiohttp.ClientResponse,
+    extract: Callable[[Dict[str, Any]], Optional[str]]
+) -> AsyncIterator[str]:
+    """
+    Read a server-sent events body and yield text deltas.
+
+    Args:
+        response: Open streaming response
+        extract: Function mapping a decoded event to its text delta
+
+    Yields:
+        Non-empty text deltas in arrival order
+
+    Since:
+        Version 1.0.0
+    """
+    async for raw_line in response.content:
+        line = raw_line.decode("utf-8", errors="replace").strip()
+        if not line.startswith("data:"):
+            continue
+
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+
+        try:
+            event = json.loads(data)
+        except ValueError:
+            continue
+
+        if event.get("type") == "error" or ("error" in event and not event.get("choices")):
+            raise RuntimeError(f"Stream error: {str(event.get('error', event))[:200]}")
+
+        text = extract(event)
+        if text:
+            yield text
+
+
+class StreamMetrics:
+    """
+    Timing for a single streamed call.
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self, provider: str):
+        """
+        Initialize stream metrics.
+
+        Args:
+            provider: Provider identifier
+
+        Since:
+            Version 1.0.0
+        """
+        self.provider = provider
+        self.started_at = time.monotonic()
+        self.first_chunk_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.chunks = 0
+        self.output_tokens = 0
+
+    def record_chunk(self):
+        """Record an incoming delta."""
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.monotonic()
+        self.chunks += 1
+
+    def finish(self, text: str):
+        """Mark the stream complete with its full text."""
+        self.finished_at = time.monotonic()
+        self.output_tokens = estimate_tokens(text)
+
+    @property
+    def time_to_first_token_ms(self) -> Optional[float]:
+        if self.first_chunk_at is None:
+            return None
+        return (self.first_chunk_at - self.started_at) * 1000
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        if self.first_chunk_at is None or self.finished_at is None:
+            return None
+        generation_seconds = self.finished_at - self.first_chunk_at
+        if generation_seconds <= 0:
+            return None
+        return self.output_tokens / generation_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for request payload logging."""
+        ttft = self.time_to_first_token_ms
+        tps = self.tokens_per_second
+        end = self.finished_at or time.monotonic()
+        return {
+            "time_to_first_token_ms": round(ttft, 1) if ttft is not None else None,
+            "duration_ms": round((end - self.started_at) * 1000, 1),
+            "chunks": self.chunks,
+            "output_tokens": self.output_tokens,
+            "tokens_per_second": round(tps, 1) if tps is not None else None
+        }
+
+
+class StreamStats:
+    """
+    Aggregated streaming metrics per provider.
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self):
+        self._providers: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, metrics: StreamMetrics):
+        """
+        Fold a finished call into its provider's totals.
+
+        Args:
+            metrics: Completed stream metrics
+
+        Since:
+            Version 1.0.0
+        """
+        stats = self._providers.setdefault(metrics.provider, {
+            "streams": 0,
+            "ttft_ms_total": 0.0,
+            "ttft_samples": 0,
+            "tps_total": 0.0,
+            "tps_samples": 0,
+            "last": None
+        })
+        stats["streams"] += 1
+
+        ttft = metrics.time_to_first_token_ms
+        if ttft is not None:
+            stats["ttft_ms_total"] += ttft
+            stats["ttft_samples"] += 1
+
+        tps = metrics.tokens_per_second
+        if tps is not None:
+            stats["tps_total"] += tps
+            stats["tps_samples"] += 1
+
+        stats["last"] = metrics.to_dict()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get average time-to-first-token and tokens/second per provider.
+
+        Returns:
+            Metrics dict keyed by provider
+
+        Since:
+            Version 1.0.0
+        """
+        result = {}
+        for provider, stats in self._providers.items():
+            result[provider] = {
+                "streams": stats["streams"],
+                "avg_time_to_first_token_ms": (
+                    round(stats["ttft_ms_total"] / stats["ttft_samples"], 1)
+                    if stats["ttft_samples"] else None
+                ),
+                "avg_tokens_per_second": (
+                    round(stats["tps_total"] / stats["tps_samples"], 1)
+                    if stats["tps_samples"] else None
+                ),
+                "last": stats["last"]
+            }
+        return result
+
+
+# Global stream statistics instance
+global_stream_stats = StreamStats()
+
+
+def get_stream_stats() -> StreamStats:
+    """
+    Get global stream statistics instance.
+
+    Returns:
+        StreamStats instance
+
+    Since:
+        Version 1.0.0
+    """
+    return global_stream_stats
+
+
+async def collect_stream(
+    provider: str,
+    deltas: AsyncIterator[str],
+    on_chunk: Optional[ChunkCallback] = None
+) -> tuple:
+    """
+    Drain a delta stream, forwarding each delta and recording metrics.
+
+    Args:
+        provider: Provider identifier
+        deltas: Async iterator of text deltas
+        on_chunk: Callback invoked with each delta as it arrives
+
+    Returns:
+        tuple: (full_text, metrics_dict)
+
+    Since:
+        Version 1.0.0
+    """
+    metrics = StreamMetrics(provider)
+    parts = []
+
+    async for text in deltas:
+        metrics.record_chunk()
+        parts.append(text)
+        if on_chunk:
+            try:
+                on_chunk(text)
+            except Exception as e:
+                # Consumers must never break the provider call
+                logger.warning("Stream chunk consumer failed", provider=provider, error=str(e))
+                on_chunk = None
+
+    full_text = "".join(parts)
+    metrics.finish(full_text)
+    global_stream_stats.record(metrics)
+    return full_text, metrics.to_dict()
+
+
+_STREAM_END = object()
+
+
+class ProviderStream:
+    """
+    Async iterator over the text deltas of one provider call.
+
+    Iteration yields deltas as they arrive. Responses that were not streamed
+    (cache hits, providers without streaming) are yielded as a single chunk.
+    After iteration, ``response`` and ``request_payload`` hold the same
+    values the buffered call would have returned.
+
+    Example:
+        >>> stream = provider_service.stream_provider_with_prompt("openai", prompt, 0.7)
+        >>> async for text in stream:
+        ...     parser.feed(text)
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self, call: Callable[[ChunkCallback], Awaitable[tuple]]):
+        """
+        Initialize provider stream.
+
+        Args:
+            call: Function starting the provider call with a chunk callback,
+                returning (response_text, request_payload)
+
+        Since:
+            Version 1.0.0
+        """
+        self._call = call
+        self.response: Any = None
+        self.request_payload: Dict[str, Any] = {}
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def produce() -> tuple:
+            try:
+                return await self._call(queue.put_nowait)
+            finally:
+                queue.put_nowait(_STREAM_END)
+
+        task = asyncio.create_task(produce())
+        streamed = False
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is _STREAM_END:
+                    break
+                streamed = True
+                yield chunk
+
+            self.response, self.request_payload = await task
+            if not streamed and self.response:
+                yield self.response
+        finally:
+            if not task.done():
+                task.cancel()
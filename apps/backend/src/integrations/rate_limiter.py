@@ -1,28 +1,197 @@
 """
 Rate limiting implementation for API providers.
 
-Implements token bucket algorithm with Redis for distributed rate limiting
-across multiple API providers and pharmaceutical categories.
+Implements the generic cell rate algorithm (GCRA) with Redis for
+distributed rate limiting across multiple API providers and
+pharmaceutical categories. Each limit keeps a single theoretical arrival
+time (TAT) per provider and window, and all windows of a check are
+evaluated atomically in one Lua script, so a check costs one round trip
+and denied requests consume nothing.
 
 Version: 1.0.0
 Author: CognitoAI Development Team
 """
 
+import math
 import time
-from typing import Dict, Tuple, Optional
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
 import redis.asyncio as redis
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
+# KEYS: one TAT key per limit, grouped by check
+# ARGV: number of checks, then per check the number of limits followed by
+#       emission interval (ms), burst tolerance (ms) and cost per limit
+# Returns: allowed (1/0) and retry-after (ms) per check. A check either
+#          updates all of its limits or none of them.
+GCRA_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local arg = 2
+local key = 1
+local result = {}
+for c = 1, tonumber(ARGV[1]) do
+    local n = tonumber(ARGV[arg])
+    arg = arg + 1
+    local new_tats = {}
+    local wait = 0
+    for i = 1, n do
+        local interval = tonumber(ARGV[arg])
+        local tolerance = tonumber(ARGV[arg + 1])
+        local cost = tonumber(ARGV[arg + 2])
+        arg = arg + 3
+        local tat = tonumber(redis.call('GET', KEYS[key + i - 1]) or now)
+        if tat < now then tat = now end
+        new_tats[i] = tat + cost * interval
+        wait = math.max(wait, new_tats[i] - tolerance - now)
+    end
+    if wait <= 0 then
+        for i = 1, n do
+            redis.call('SET', KEYS[key + i - 1], tostring(new_tats[i]),
+                       'PX', math.max(math.ceil(new_tats[i] - now), 1))
+        end
+    end
+    key = key + n
+    result[#result + 1] = wait <= 0 and 1 or 0
+    result[#result + 1] = math.ceil(math.max(wait, 0))
+end
+return result
+"""
+
+
+@dataclass(frozen=True)
+class GCRALimit:
+    """
+    One rate limit: ``limit`` requests per ``period`` seconds
+
+    ``burst_scale`` lets a caller use only part of a shared TAT: the
+    call is denied once the key's backlog exceeds ``limit * burst_scale``
+    requests, while other callers may still use the rest.
+
+    Since:
+        Version 1.0.0
+    """
+    key: str
+    limit: float
+    period: float
+    burst_scale: float = 1.0
+
+    @property
+    def interval(self) -> float:
+        """Seconds one request adds to the TAT"""
+        return self.period / max(self.limit, 1e-9)
+
+    @property
+    def tolerance(self) -> float:
+        """How far the TAT may run ahead of now, in seconds"""
+        return max(self.period * self.burst_scale, self.interval)
+
+    def remaining(self, tat: Optional[float], now: float) -> int:
+        """Requests still allowed right now given the stored TAT"""
+        backlog = max((tat or now) - now, 0.0)
+        return max(0, min(int(self.limit), int((self.tolerance - backlog) / self.interval)))
+
+
+def gcra_script_args(checks: Sequence[Sequence[GCRALimit]], cost: float = 1) -> Tuple[List[str], List[float]]:
+    """
+    Build KEYS and ARGV for GCRA_SCRIPT
+
+    Args:
+        checks: Limits per independent check
+        cost: Requests each check consumes
+
+    Returns:
+        Tuple of (keys, args)
+    """
+    keys: List[str] = []
+    args: List[float] = [len(checks)]
+    for limits in checks:
+        args.append(len(limits))
+        for limit in limits:
+            keys.append(limit.key)
+            args.extend((limit.interval * 1000, limit.tolerance * 1000, cost))
+    return keys, args
+
+
+def parse_gcra_reply(reply: Sequence) -> List[Tuple[bool, Optional[int]]]:
+    """Convert GCRA_SCRIPT's flat reply to (allowed, retry_after_seconds) per check"""
+    results = []
+    for i in range(0, len(reply), 2):
+        allowed = int(reply[i]) == 1
+        results.append((True, None) if allowed else (False, max(1, math.ceil(int(reply[i + 1]) / 1000))))
+    return results
+
+
+class InProcessGCRA:
+    """
+    In-process GCRA with the same semantics as GCRA_SCRIPT
+
+    Used when Redis is unavailable. Holds one TAT per key; keys whose TAT
+    has passed carry no state and are pruned once ``max_keys`` is reached.
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self.tats: Dict[str, float] = {}
+
+    def check(
+        self,
+        limits: Sequence[GCRALimit],
+        cost: float = 1,
+        now: Optional[float] = None
+    ) -> Tuple[bool, Optional[int]]:
+        """
+        Consume ``cost`` from every limit if all of them allow it
+
+        Args:
+            limits: Limits to check together
+            cost: Requests to consume
+            now: Current time in seconds (defaults to time.time())
+
+        Returns:
+            Tuple of (allowed, retry_after_seconds)
+        """
+        now = time.time() if now is None else now
+        new_tats = []
+        wait = 0.0
+        for limit in limits:
+            tat = max(self.tats.get(limit.key, now), now)
+            new_tats.append(tat + cost * limit.interval)
+            wait = max(wait, new_tats[-1] - limit.tolerance - now)
+
+        if wait > 0:
+            return False, max(1, math.ceil(wait))
+
+        if len(self.tats) >= self.max_keys:
+            self.tats = {key: tat for key, tat in self.tats.items() if tat > now}
+        for limit, new_tat in zip(limits, new_tats):
+            self.tats[limit.key] = new_tat
+        return True, None
+
+    def remaining(self, limit: GCRALimit, now: Optional[float] = None) -> int:
+        """Requests still allowed right now for a limit"""
+        return limit.remaining(self.tats.get(limit.key), time.time() if now is None else now)
+
+    def reset(self, keys: Sequence[str]):
+        """Forget the state of keys"""
+        for key in keys:
+            self.tats.pop(key, None)
+
+
 class RateLimiter:
     """
     API rate limiting with pharmaceutical cost optimization.
 
-    Implements token bucket algorithm for rate limiting with support for
-    provider-specific and category-specific limits.
+    Applies per-minute, per-hour and per-day GCRA limits with support for
+    provider-specific and category-specific limits. Falls back to an
+    in-process limiter when Redis is unavailable.
 
     Example:
         >>> limiter = RateLimiter(redis_client)
@@ -55,6 +224,9 @@ class RateLimiter:
         'Real-World Evidence': 0.8
     }
 
+    # (window, limits field, period in seconds)
+    WINDOWS = (('minute', 'rpm', 60), ('hour', 'rph', 3600), ('day', 'rpd', 86400))
+
     def __init__(self, redis_client: redis.Redis):
         """
         Initialize rate limiter.
@@ -67,6 +239,8 @@ class RateLimiter:
         """
         self.redis = redis_client
         self.limits_cache = {}
+        self.gcra_script = redis_client.register_script(GCRA_SCRIPT)
+        self.local_limiter = InProcessGCRA()
 
     async def check_rate_limit(
         self,
@@ -76,6 +250,9 @@ class RateLimiter:
         """
         Check if API call is allowed under current rate limits.
 
+        The minute, hour and day limits are checked and consumed together
+        in one Redis round trip; a denied call consumes nothing.
+
         Args:
             provider: API provider name
             category: Pharmaceutical category
@@ -86,152 +263,85 @@ class RateLimiter:
         Since:
             Version 1.0.0
         """
-        # Get provider limits
-        limits = await self._get_provider_limits(provider)
-
-        # Apply category multiplier
-        multiplier = self.CATEGORY_MULTIPLIERS.get(category, 1.0)
-
-        # Check all rate limit levels
-        checks = [
-            await self._check_minute_limit(provider, limits['rpm'] * multiplier),
-            await self._check_hour_limit(provider, limits['rph'] * multiplier),
-            await self._check_day_limit(provider, limits['rpd'] * multiplier)
-        ]
+        return (await self.check_rate_limits([(provider, category)]))[0]
 
-        # If any check fails, return the longest retry time
-        for allowed, retry_after in checks:
-            if not allowed:
-                return False, retry_after
-
-        return True, None
-
-    async def _check_minute_limit(
+    async def check_rate_limits(
         self,
-        provider: str,
-        limit: float
-    ) -> Tuple[bool, Optional[int]]:
+        checks: Sequence[Tuple[str, str]]
+    ) -> List[Tuple[bool, Optional[int]]]:
         """
-        Check per-minute rate limit using sliding window.
-
-        Args:
-            provider: Provider name
-            limit: Requests per minute limit
-
-        Returns:
-            Tuple of (allowed, retry_after)
-
-        Since:
-            Version 1.0.0
-        """
-        key = f"rate_limit:minute:{provider}"
-        current_time = time.time()
-        window_start = current_time - 60
-
-        # Use Redis sorted set for sliding window
-        pipe = self.redis.pipeline()
-
-        # Remove old entries
-        pipe.zremrangebyscore(key, 0, window_start)
-
-        # Count current entries
-        pipe.zcard(key)
-
-        # Add current request
-        pipe.zadd(key, {str(current_time): current_time})
-
-        # Set expiry
-        pipe.expire(key, 60)
-
-        results = await pipe.execute()
-        count = results[1]
-
-        if count >= limit:
-            # Get oldest entry to calculate retry time
-            oldest = await self.redis.zrange(key, 0, 0, withscores=True)
-            if oldest:
-                retry_after = int(60 - (current_time - oldest[0][1]))
-                return False, max(retry_after, 1)
-            return False, 60
-
-        return True, None
+        Check several (provider, category) calls in one round trip.
 
-    async def _check_hour_limit(
-        self,
-        provider: str,
-        limit: float
-    ) -> Tuple[bool, Optional[int]]:
-        """
-        Check per-hour rate limit.
+        Each check is independent: a denied provider does not affect the
+        others.
 
         Args:
-            provider: Provider name
-            limit: Requests per hour limit
+            checks: (provider, category) pairs
 
         Returns:
-            Tuple of (allowed, retry_after)
+            (allowed, retry_after_seconds) per check, in order
 
         Since:
             Version 1.0.0
         """
-        key = f"rate_limit:hour:{provider}"
-        current_hour = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-        hour_key = f"{key}:{current_hour.isoformat()}"
-
-        # Increment counter
-        count = await self.redis.incr(hour_key)
+        if not checks:
+            return []
 
-        # Set expiry on first request
-        if count == 1:
-            await self.redis.expire(hour_key, 3600)
-
-        if count > limit:
-            # Calculate retry time (start of next hour)
-            next_hour = current_hour + timedelta(hours=1)
-            retry_after = int((next_hour - datetime.utcnow()).total_seconds())
-            return False, max(retry_after, 1)
+        groups = [
+            self._gcra_limits(provider, await self._get_provider_limits(provider), category)
+            for provider, category in checks
+        ]
+        keys, args = gcra_script_args(groups)
 
-        return True, None
+        try:
+            return parse_gcra_reply(await self.gcra_script(keys=keys, args=args))
+        except redis.RedisError as e:
+            logger.error("Redis rate limit check failed, falling back to memory", error=str(e))
+            return [self.local_limiter.check(limits) for limits in groups]
 
-    async def _check_day_limit(
+    def _gcra_limits(
         self,
         provider: str,
-        limit: float
-    ) -> Tuple[bool, Optional[int]]:
+        limits: Dict[str, int],
+        category: Optional[str] = None
+    ) -> List[GCRALimit]:
         """
-        Check per-day rate limit.
+        Build the minute, hour and day limits for a provider.
+
+        A category multiplier below 1.0 keeps its original meaning of
+        scaling the provider limits for that category: the category may
+        only use ``limit * multiplier`` of the provider's shared windows,
+        and its own per-category windows hold its sustained rate to
+        ``limit * multiplier`` requests per period.
 
         Args:
             provider: Provider name
-            limit: Requests per day limit
+            limits: Provider limits (rpm, rph, rpd)
+            category: Pharmaceutical category
 
         Returns:
-            Tuple of (allowed, retry_after)
+            GCRALimits for the provider windows, plus the category windows
+            when the category is scaled
 
         Since:
             Version 1.0.0
         """
-        key = f"rate_limit:day:{provider}"
-        today = datetime.utcnow().date()
-        day_key = f"{key}:{today.isoformat()}"
-
-        # Increment counter
-        count = await self.redis.incr(day_key)
-
-        # Set expiry on first request
-        if count == 1:
-            await self.redis.expire(day_key, 86400)
-
-        if count > limit:
-            # Calculate retry time (start of next day)
-            tomorrow = datetime.combine(
-                today + timedelta(days=1),
-                datetime.min.time()
+        multiplier = self.CATEGORY_MULTIPLIERS.get(category, 1.0)
+        gcra_limits = [
+            GCRALimit(self._gcra_key(window, provider), limits[field], period, multiplier)
+            for window, field, period in self.WINDOWS
+        ]
+        if multiplier < 1.0:
+            gcra_limits.extend(
+                GCRALimit(self._gcra_key(window, provider, category), limits[field] * multiplier, period)
+                for window, field, period in self.WINDOWS
             )
-            retry_after = int((tomorrow - datetime.utcnow()).total_seconds())
-            return False, max(retry_after, 1)
+        return gcra_limits
 
-        return True, None
+    @staticmethod
+    def _gcra_key(window: str, provider: str, category: Optional[str] = None) -> str:
+        key = f"rate_limit:gcra:{window}:{provider}"
+        return f"{key}:{category}" if category else key
 
     async def _get_provider_limits(self, provider: str) -> Dict[str, int]:
         """
@@ -250,33 +360,41 @@ class RateLimiter:
         if provider in self.limits_cache:
             return self.limits_cache[provider]
 
+        default_limits = self.DEFAULT_PROVIDER_LIMITS.get(
+            provider,
+            {'rpm': 30, 'rph': 300, 'rpd': 3000}
+        )
+
         # Check Redis cache
         cache_key = f"provider_limits:{provider}"
-        cached = await self.redis.hgetall(cache_key)
-
-        if cached:
-            limits = {
-                'rpm': int(cached.get(b'rpm', 60)),
-                'rph': int(cached.get(b'rph', 1000)),
-                'rpd': int(cached.get(b'rpd', 10000))
-            }
-        else:
-            # Use defaults
-            limits = self.DEFAULT_PROVIDER_LIMITS.get(
-                provider,
-                {'rpm': 30, 'rph': 300, 'rpd': 3000}
-            )
-
-            # Cache in Redis for 1 hour
-            await self.redis.hset(
-                cache_key,
-                mapping={
-                    'rpm': limits['rpm'],
-                    'rph': limits['rph'],
-                    'rpd': limits['rpd']
+        try:
+            cached = await self.redis.hgetall(cache_key)
+
+            if cached:
+                limits = {
+                    'rpm': int(cached.get(b'rpm', 60)),
+                    'rph': int(cached.get(b'rph', 1000)),
+                    'rpd': int(cached.get(b'rpd', 10000))
                 }
-            )
-            await self.redis.expire(cache_key, 3600)
+            else:
+                # Use defaults
+                limits = default_limits
+
+                # Cache in Redis for 1 hour
+                await self.redis.hset(
+                    cache_key,
+                    mapping={
+                        'rpm': limits['rpm'],
+                        'rph': limits['rph'],
+                        'rpd': limits['rpd']
+                    }
+                )
+                await self.redis.expire(cache_key, 3600)
+        except redis.RedisError as e:
+            # Not cached locally, so stored limits are picked up once Redis is back
+            logger.warning("Failed to load provider limits from Redis, using defaults",
+                           error=str(e), provider=provider)
+            return default_limits
 
         # Update local cache
         self.limits_cache[provider] = limits
@@ -298,29 +416,23 @@ class RateLimiter:
         Since:
             Version 1.0.0
         """
-        limits = await self._get_provider_limits(provider)
-        current_time = time.time()
-        current_hour = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-        today = datetime.utcnow().date()
-
-        # Check minute window
-        minute_key = f"rate_limit:minute:{provider}"
-        await self.redis.zremrangebyscore(minute_key, 0, current_time - 60)
-        minute_count = await self.redis.zcard(minute_key)
-
-        # Check hour window
-        hour_key = f"rate_limit:hour:{provider}:{current_hour.isoformat()}"
-        hour_count = int(await self.redis.get(hour_key) or 0)
-
-        # Check day window
-        day_key = f"rate_limit:day:{provider}:{today.isoformat()}"
-        day_count = int(await self.redis.get(day_key) or 0)
-
-        return {
-            'minute': max(0, limits['rpm'] - minute_count),
-            'hour': max(0, limits['rph'] - hour_count),
-            'day': max(0, limits['rpd'] - day_count)
-        }
+        limits = self._gcra_limits(provider, await self._get_provider_limits(provider))
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.time()
+            pipe.mget([limit.key for limit in limits])
+            (seconds, microseconds), tats = await pipe.execute()
+            now = seconds + microseconds / 1_000_000
+            remaining = [
+                limit.remaining(float(tat) / 1000 if tat is not None else None, now)
+                for limit, tat in zip(limits, tats)
+            ]
+        except redis.RedisError as e:
+            logger.error("Failed to get quota from Redis", error=str(e), provider=provider)
+            remaining = [self.local_limiter.remaining(limit) for limit in limits]
+
+        return {window: count for (window, _, _), count in zip(self.WINDOWS, remaining)}
 
     async def reset_limits(self, provider: str):
         """
@@ -332,24 +444,13 @@ class RateLimiter:
         Since:
             Version 1.0.0
         """
-        patterns = [
-            f"rate_limit:minute:{provider}*",
-            f"rate_limit:hour:{provider}*",
-            f"rate_limit:day:{provider}*"
+        keys = [
+            self._gcra_key(window, provider, category)
+            for window, _, _ in self.WINDOWS
+            for category in (None, *self.CATEGORY_MULTIPLIERS)
         ]
-
-        for pattern in patterns:
-            cursor = 0
-            while True:
-                cursor, keys = await self.redis.scan(
-                    cursor,
-                    match=pattern,
-                    count=100
-                )
-                if keys:
-                    await self.redis.delete(*keys)
-                if cursor == 0:
-                    break
+        await self.redis.delete(*keys)
+        self.local_limiter.reset(keys)
 
         logger.info(f"Reset rate limits for provider: {provider}")
 
@@ -0,0 +1,497 @@
+"""
+Content-addressed cache for provider responses.
+
+Identical prompts sent to the same provider, model and temperature return
+the same kind of answer, so re-running or reprocessing a drug should not pay
+for them again. Responses are keyed by a hash of (provider, model,
+temperature, prompt hash, system-prompt hash) and stored in two tiers: a
+bounded in-process LRU and a durable Postgres table shared by all workers.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import structlog
+
+from ..core.metrics_collector import metrics_collector
+from ..utils.db_connection import DatabaseConnection
+
+logger = structlog.get_logger(__name__)
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate memory footprint of a cached value in bytes."""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class LocalLRUCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+
+    Bounded both by entry count and by approximate total size; the least
+    recently used entries are evicted first.
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize LRU cache.
+
+        Args:
+            max_entries: Maximum number of entries
+            max_bytes: Maximum approximate total size of cached values
+
+        Since:
+            Version 1.0.0
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[Any, float, int]]' = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a live entry and mark it most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if missing or expired
+
+        Since:
+            Version 1.0.0
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        """
+        Store an entry, evicting least recently used entries as needed.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl_seconds: Seconds until the entry expires
+
+        Since:
+            Version 1.0.0
+        """
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        self.delete(key)
+        self._entries[key] = (value, time.monotonic() + ttl_seconds, size)
+        self._bytes += size
+
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key: str):
+        """Remove an entry if present."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
+        self._bytes = 0
+
+
+class ResponseCache:
+    """
+    Two-tier provider response cache.
+
+    Lookups check the local LRU first, then the durable
+    ``provider_response_cache`` table (promoting hits into the LRU).
+    Concurrent misses for the same key share one upstream call. Durable-tier
+    failures are logged and treated as misses so caching never fails a call.
+
+    Example:
+        >>> cache = get_response_cache()
+        >>> key = cache.make_key("openai", "gpt-4o", 0.7, prompt, system_prompt)
+        >>> response = await cache.get_or_call(key, call, category="Market Overview")
+
+    Since:
+        Version 1.0.0
+    """
+
+    def __init__(
+        self,
+        default_ttl_seconds: int = 86400,
+        category_ttls: Optional[Dict[str, int]] = None,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        durable: bool = True
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            default_ttl_seconds: TTL for categories without an override
+            category_ttls: Category name -> TTL seconds (0 disables caching)
+            max_entries: Local tier entry bound
+            max_bytes: Local tier size bound
+            durable: Whether to use the Postgres tier
+
+        Since:
+            Version 1.0.0
+        """
+        self.default_ttl_seconds = default_ttl_seconds
+        self.category_ttls = dict(category_ttls or {})
+        self.durable = durable
+        self.local = LocalLRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.metrics = {
+            'local_hits': 0,
+            'durable_hits': 0,
+            'misses': 0,
+            'bypassed': 0,
+            'coalesced': 0,
+            'writes': 0,
+            'durable_errors': 0
+        }
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        temperature: float,
+        prompt: str,
+        system_prompt: str = ""
+    ) -> str:
+        """
+        Build the content address for a provider call.
+
+        Args:
+            provider: Provider identifier
+            model: Model name
+            temperature: Sampling temperature
+            prompt: User prompt
+            system_prompt: System prompt
+
+        Returns:
+            Hex SHA-256 cache key
+
+        Since:
+            Version 1.0.0
+        """
+        parts = [
+            provider,
+            model or "",
+            f"{float(temperature):.3f}",
+            hashlib.sha256(prompt.encode()).hexdigest(),
+            hashlib.sha256((system_prompt or "").encode()).hexdigest()
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+    def ttl_for(self, category: Optional[str]) -> int:
+        """
+        Get the TTL for a category.
+
+        Args:
+            category: Category name
+
+        Returns:
+            TTL in seconds
+
+        Since:
+            Version 1.0.0
+        """
+        return self.category_ttls.get(category, self.default_ttl_seconds)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached response in both tiers.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response or None
+
+        Since:
+            Version 1.0.0
+        """
+        value = self.local.get(key)
+        if value is not None:
+            self.metrics['local_hits'] += 1
+            metrics_collector.record_cache_hit()
+            return value
+
+        if self.durable:
+            value, remaining = await self._durable_get(key)
+            if value is not None:
+                self.local.set(key, value, remaining)
+                self.metrics['durable_hits'] += 1
+                metrics_collector.record_cache_hit()
+                return value
+
+        self.metrics['misses'] += 1
+        metrics_collector.record_cache_miss()
+        return None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        category: Optional[str] = None,
+        provider: Optional[str] = None,
+        model: Optional[str] = None
+    ):
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Cache key from make_key
+            value: JSON-serializable response
+            category: Category name, used for the TTL
+            provider: Provider identifier (stored for inspection)
+            model: Model name (stored for inspection)
+
+        Since:
+            Version 1.0.0
+        """
+        ttl = self.ttl_for(category)
+        if ttl <= 0:
+            return
+
+        self.local.set(key, value, ttl)
+        self.metrics['writes'] += 1
+
+        if self.durable:
+            await self._durable_set(key, value, ttl, category, provider, model)
+
+    async def get_or_call(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Any]],
+        category: Optional[str] = None,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        bypass: bool = False,
+        cacheable: Callable[[Any], bool] = lambda value: value is not None
+    ) -> Any:
+        """
+        Return a cached response or perform the call and cache its result.
+
+        Args:
+            key: Cache key from make_key
+            call: Zero-argument coroutine factory performing the provider call
+            category: Category name, used for the TTL
+            provider: Provider identifier
+            model: Model name
+            bypass: Skip the lookup but still refresh the cache with the result
+            cacheable: Predicate deciding whether a result may be cached
+
+        Returns:
+            Response
+
+        Since:
+            Version 1.0.0
+        """
+        if self.ttl_for(category) <= 0:
+            return await call()
+
+        if bypass:
+            self.metrics['bypassed'] += 1
+        else:
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self.metrics['coalesced'] += 1
+                return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        if not bypass:
+            self._inflight[key] = future
+
+        try:
+            value = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody is waiting
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        future.set_result(value)
+        if cacheable(value):
+            await self.set(key, value, category, provider, model)
+        return value
+
+    async def _durable_get(self, key: str) -> Tuple[Optional[Any], float]:
+        """Read a live entry from Postgres; returns (value, remaining_seconds)."""
+        try:
+            async with DatabaseConnection() as conn:
+                row = await conn.fetchrow("""
+                    UPDATE provider_response_cache
+                    SET hit_count = hit_count + 1, last_hit_at = NOW()
+                    WHERE cache_key = $1 AND expires_at > NOW()
+                    RETURNING response, EXTRACT(EPOCH FROM (expires_at - NOW())) AS remaining
+                """, key)
+        except Exception as e:
+            self.metrics['durable_errors'] += 1
+            logger.warning("Response cache read failed", error=str(e))
+            return None, 0
+
+        if row is None:
+            return None, 0
+        return json.loads(row['response']), float(row['remaining'])
+
+    async def _durable_set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int,
+        category: Optional[str],
+        provider: Optional[str],
+        model: Optional[str]
+    ):
+        """Upsert an entry into Postgres."""
+        now = datetime.utcnow()
+        try:
+            async with DatabaseConnection() as conn:
+                await conn.execute("""
+                    INSERT INTO provider_response_cache (
+                        cache_key, provider, model, category_name,
+                        response, created_at, expires_at
+                    )
+                    VALUES ($1, $2, $3, $4, $5::jsonb, $6, $7)
+                    ON CONFLICT (cache_key) DO UPDATE
+                    SET response = EXCLUDED.response,
+                        created_at = EXCLUDED.created_at,
+                        expires_at = EXCLUDED.expires_at
+                """,
+                    key,
+                    provider,
+                    model,
+                    category,
+                    json.dumps(value, default=str),
+                    now,
+                    now + timedelta(seconds=ttl)
+                )
+        except Exception as e:
+            self.metrics['durable_errors'] += 1
+            logger.warning("Response cache write failed", error=str(e))
+
+    async def purge_expired(self) -> int:
+        """
+        Delete expired rows from the durable tier.
+
+        Returns:
+            Number of rows deleted
+
+        Since:
+            Version 1.0.0
+        """
+        async with DatabaseConnection() as conn:
+            result = await conn.execute(
+                "DELETE FROM provider_response_cache WHERE expires_at <= NOW()"
+            )
+        return int(result.split()[-1])
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters and local tier utilisation.
+
+        Returns:
+            Metrics dict
+
+        Since:
+            Version 1.0.0
+        """
+        hits = self.metrics['local_hits'] + self.metrics['durable_hits']
+        lookups = hits + self.metrics['misses']
+        return {
+            **self.metrics,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'local_entries': len(self.local),
+            'local_bytes': self.local.size_bytes,
+            'local_evictions': self.local.evictions,
+            'default_ttl_seconds': self.default_ttl_seconds,
+            'category_ttls': dict(self.category_ttls)
+        }
+
+
+def _load_category_ttls() -> Dict[str, int]:
+    """Read RESPONSE_CACHE_CATEGORY_TTLS, a JSON object of category -> seconds."""
+    raw = os.getenv('RESPONSE_CACHE_CATEGORY_TTLS')
+    if not raw:
+        return {}
+    try:
+        return {name: int(ttl) for name, ttl in json.loads(raw).items()}
+    except (ValueError, AttributeError) as e:
+        logger.warning("Invalid RESPONSE_CACHE_CATEGORY_TTLS, ignoring", error=str(e))
+        return {}
+
+
+# Global response cache instance
+global_response_cache = ResponseCache(
+    default_ttl_seconds=int(os.getenv('RESPONSE_CACHE_TTL', '86400')),
+    category_ttls=_load_category_ttls(),
+    max_entries=int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1000')),
+    max_bytes=int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+    durable=os.getenv('RESPONSE_CACHE_DURABLE', 'true').lower() != 'false'
+)
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get global response cache instance.
+
+    Returns:
+        ResponseCache instance
+
+    Since:
+        Version 1.0.0
+    """
+    return global_response_cache
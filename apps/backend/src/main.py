@@ -3,15 +3,12 @@ Refactored main application with proper OOP structure.
 All business logic is in service classes.
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
-import asyncio
-import aiohttp
-import asyncpg
-from datetime import datetime
+import os
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,7 +21,13 @@ from .services.request_db_service import RequestDatabaseService
 from .services.pipeline_service import PipelineService
 from .services.pipeline_db_service import PipelineDatabaseService
 from .services.analysis_service import AnalysisService
-from .services.audit_service import AuditService
+from .services.buffered_log_writer import start_log_writers, stop_log_writers, get_log_writer_stats
+from .services.drug_processing_service import DrugProcessingService
+from .services.drug_processing_worker import DrugProcessingWorker, enqueue_drug_processing
+from .services.progress_bus import get_progress_bus
+from .core.message_queue import SQLiteMessageQueue, create_work_queue
+from .core.response_blobs import get_response_blob_store
+from .utils.db_connection import get_db_connection, init_db_pool, close_db_pool, get_db_pool_metrics
 
 # Import API routers
 from .api.v1.processing import router as processing_router
@@ -33,6 +36,7 @@ from .api.v1.summary_config import router as summary_config_router
 from .api.v1.technology_scoring import router as technology_scoring_router
 from .api.v1.phase2_reprocess import router as phase2_reprocess_router
 from .api.v1.results import router as results_router
+from .api.v1.progress import router as progress_router
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -61,6 +65,15 @@ analysis_service = AnalysisService()
 from .services.category_postgres_service import CategoryPostgresService
 category_service = CategoryPostgresService()
 
+# Drug processing jobs go to the durable work queue (WORK_QUEUE_URL) and are
+# consumed by run_worker.py and/or EMBEDDED_WORKERS job slots in this process.
+# With a SQLite queue (the default) the API embeds a worker unless
+# EMBEDDED_WORKERS=0, so a plain `uvicorn src.main:app` still processes
+# requests; RabbitMQ deployments are expected to run run_worker.py. The queue
+# is opened on startup.
+work_queue = None
+embedded_worker = None
+
 # Include routers
 app.include_router(processing_router)
 app.include_router(pipeline_categories_router)
@@ -68,6 +81,7 @@ app.include_router(summary_config_router)  # Summary configuration management
 app.include_router(technology_scoring_router)  # Technology Go/No-Go scoring matrix
 app.include_router(phase2_reprocess_router)  # Phase 2 reprocessing for testing
 app.include_router(results_router)  # Final output results retrieval
+app.include_router(progress_router)  # Live request progress (SSE/WebSocket)
 
 
 # Pydantic models for requests
@@ -91,7 +105,7 @@ class RegisterRequest(BaseModel):
 # Startup event to log all routes
 @app.on_event("startup")
 async def startup_event():
-    """Log all registered routes on startup."""
+    """Log all registered routes and open shared connection pools on startup."""
     print("=" * 80)
     print("REGISTERED ROUTES:")
     for route in app.routes:
@@ -99,12 +113,59 @@ async def startup_event():
             print(f"  {list(route.methods)} {route.path}")
     print("=" * 80)
 
+    await provider_service.open_sessions()
+
+    try:
+        await init_db_pool()
+    except ConnectionError as e:
+        # Pool is created lazily on first use if the database is not up yet
+        logger.warning(f"Database pool not initialized at startup: {e}")
+
+    await start_log_writers()
+    await PipelineConfigService.start_listener()
+    await get_progress_bus().start()
+
+    global work_queue, embedded_worker
+    work_queue = create_work_queue()
+    default_workers = os.getenv("WORKER_CONCURRENCY", "2") if isinstance(work_queue, SQLiteMessageQueue) else "0"
+    embedded_workers = int(os.getenv("EMBEDDED_WORKERS", default_workers))
+    if embedded_workers > 0:
+        embedded_worker = DrugProcessingWorker(
+            work_queue,
+            DrugProcessingService(provider_service, request_db_service),
+            concurrency=embedded_workers
+        )
+        await embedded_worker.start()
+    else:
+        logger.warning("No embedded workers: queued requests are only processed while run_worker.py is running")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered logs and close shared connection pools on shutdown."""
+    if embedded_worker:
+        await embedded_worker.stop(timeout=30)
+    if work_queue:
+        await work_queue.disconnect()
+    await provider_service.close_sessions()
+    await PipelineConfigService.stop_listener()
+    await get_progress_bus().stop()
+    await stop_log_writers()
+    await close_db_pool()
+    shutdown_table_parse_pool()
+
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "CognitoAI API v2.0"}
+    return {
+        "status": "healthy",
+        "service": "CognitoAI API v2.0",
+        "database_pool": get_db_pool_metrics(),
+        "log_writers": get_log_writer_stats(),
+        "progress_bus": get_progress_bus().get_stats()
+    }
 
 
 # Authentication endpoints
@@ -197,6 +258,36 @@ async def get_provider_stats():
     }
 
 
+@app.get("/api/v1/providers/stats/pool")
+async def get_provider_pool_stats():
+    """Get HTTP connection pool utilisation per provider."""
+    return provider_service.get_pool_metrics()
+
+
+@app.get("/api/v1/providers/stats/scheduler")
+async def get_provider_scheduler_stats():
+    """Get provider call queueing, concurrency and rate budget usage."""
+    return provider_service.get_scheduler_metrics()
+
+
+@app.get("/api/v1/providers/stats/cache")
+async def get_provider_cache_stats():
+    """Get provider response cache hit/miss metrics."""
+    return provider_service.get_cache_metrics()
+
+
+@app.get("/api/v1/providers/stats/latency")
+async def get_provider_latency_stats():
+    """Get provider latency percentiles, adaptive timeouts and hedge wins/waste."""
+    return provider_service.get_latency_metrics()
+
+
+@app.get("/api/v1/providers/stats/streaming")
+async def get_provider_streaming_stats():
+    """Get time-to-first-token and tokens/second metrics for streamed provider calls."""
+    return provider_service.get_stream_metrics()
+
+
 @app.post("/api/v1/providers/{provider_id}/temperatures")
 async def add_temperature(provider_id: str, temperature_data: Dict[str, Any]):
     """Add a new temperature configuration to a provider."""
@@ -244,113 +335,25 @@ async def create_request(request_data: DrugRequest):
 
 
 @app.post("/api/v1/requests/{request_id}/process")
-async def process_request(request_id: str, background_tasks: BackgroundTasks):
-    """Start processing a request with full database storage."""
+async def process_request(request_id: str, bypass_cache: bool = False):
+    """
+    Queue a request for processing by the worker pool (see run_worker.py).
+
+    Pass bypass_cache=true to force fresh provider calls instead of reusing
+    cached responses for identical prompts.
+    """
     # Get request from database - request_id is the database UUID
     request = await request_db_service.get_request(request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
 
-    drug_name = request["drugName"]
-
-    # Process in background
-    async def process_async():
-        try:
-            # Log processing started
-            try:
-                await AuditService.log_event(
-                    event_type="process_start",
-                    entity_type="drug_request",
-                    entity_id=request_id,
-                    event_description=f"Started processing {drug_name}",
-                    request_id=request_id,
-                    audit_metadata={"drug_name": drug_name}
-                )
-            except Exception:
-                pass  # Don't fail on audit errors
-
-            # Update request status to processing
-            await request_db_service.update_request(request_id, {
-                "status": "processing",
-                "progressPercentage": 10
-            })
-
-            # Call providers with category-based prompts - THIS STORES TO DB
-            # provider_service will store category_results, source_references, and api_usage_logs
-            api_responses = await provider_service.process_drug_with_categories(drug_name, request_id)
-
-            await request_db_service.update_request(request_id, {"progressPercentage": 50})
-
-            # Simulate additional processing stages
-            await asyncio.sleep(2)
-            await request_db_service.update_request(request_id, {"progressPercentage": 75})
-
-            await asyncio.sleep(2)
-            await request_db_service.update_request(request_id, {"progressPercentage": 95})
-
-            # Complete request
-            await request_db_service.update_request(request_id, {
-                "status": "completed",
-                "progressPercentage": 100,
-                "completedAt": datetime.now().isoformat()
-            })
-
-            # Log processing completed
-            try:
-                await AuditService.log_event(
-                    event_type="process_complete",
-                    entity_type="drug_request",
-                    entity_id=request_id,
-                    event_description=f"Completed processing {drug_name}",
-                    request_id=request_id,
-                    audit_metadata={"drug_name": drug_name}
-                )
-            except Exception:
-                pass
-
-            # Send webhook if configured
-            if request.get("webhookUrl"):
-                await send_webhook(
-                    request["webhookUrl"],
-                    {
-                        "requestId": request_id,
-                        "status": "completed",
-                        "drugName": drug_name,
-                        "completedAt": datetime.now().isoformat()
-                    }
-                )
-
-        except Exception as e:
-            import traceback
-            error_msg = f"Error processing request {request_id}: {str(e)}\n{traceback.format_exc()}"
-            print(error_msg)
-
-            # Update request to failed
-            await request_db_service.update_request(request_id, {
-                "status": "failed",
-                "progressPercentage": 0
-            })
-
-            # Log processing failed
-            try:
-                await AuditService.log_event(
-                    event_type="process_error",
-                    entity_type="drug_request",
-                    entity_id=request_id,
-                    event_description=f"Failed processing {drug_name}: {str(e)}",
-                    request_id=request_id,
-                    audit_metadata={"drug_name": drug_name, "error": str(e)}
-                )
-            except Exception:
-                pass
-
-    background_tasks.add_task(process_async)
+    enqueued = await enqueue_drug_processing(work_queue, request_id, bypass_cache=bypass_cache)
 
     return {
-        "message": "Processing started",
+        "message": "Processing queued" if enqueued else "Processing already queued",
         "requestId": request_id,
-        "drugName": drug_name,
-        "status": "processing"
+        "drugName": request["drugName"],
+        "status": "queued"
     }
 
 
@@ -392,16 +395,6 @@ async def get_analysis(analysis_id: str):
 
 
 # Webhook helper
-async def send_webhook(url: str, data: Dict[str, Any]):
-    """Send webhook notification."""
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=data, timeout=10) as response:
-                print(f"Webhook sent to {url}: {response.status}")
-    except Exception as e:
-        print(f"Webhook error: {e}")
-
-
 # Category endpoints
 @app.get("/api/v1/categories")
 async def get_categories():
@@ -462,13 +455,13 @@ pipeline_config_service = PipelineConfigService()
 @app.get("/api/v1/pipeline/stages")
 async def get_pipeline_stages():
     """Get all pipeline stages configuration."""
-    return pipeline_config_service.get_pipeline_summary()
+    return await pipeline_config_service.get_pipeline_summary()
 
 
 @app.get("/api/v1/pipeline/stages/{stage_name}")
 async def get_pipeline_stage(stage_name: str):
     """Get specific pipeline stage configuration."""
-    stage = pipeline_config_service.get_stage_config(stage_name)
+    stage = await pipeline_config_service.get_stage_config(stage_name)
     if not stage:
         raise HTTPException(status_code=404, detail="Pipeline stage not found")
     return {
@@ -483,11 +476,11 @@ async def get_pipeline_stage(stage_name: str):
 @app.put("/api/v1/pipeline/stages/{stage_name}")
 async def update_pipeline_stage(stage_name: str, enabled: bool):
     """Enable or disable a pipeline stage."""
-    success = pipeline_config_service.update_stage_enabled(stage_name, enabled)
+    success = await pipeline_config_service.update_stage_enabled(stage_name, enabled)
     if not success:
         raise HTTPException(status_code=404, detail="Pipeline stage not found")
 
-    stage = pipeline_config_service.get_stage_config(stage_name)
+    stage = await pipeline_config_service.get_stage_config(stage_name)
     return {
         "name": stage.stage_name,
         "enabled": stage.enabled,
@@ -498,7 +491,7 @@ async def update_pipeline_stage(stage_name: str, enabled: bool):
 @app.put("/api/v1/pipeline/phase2-categories/{category_id}")
 async def update_phase2_category(category_id: int, enabled: bool):
     """Enable or disable a Phase 2 category."""
-    success = pipeline_config_service.update_phase2_category_enabled(category_id, enabled)
+    success = await pipeline_config_service.update_phase2_category_enabled(category_id, enabled)
     if not success:
         raise HTTPException(status_code=404, detail="Phase 2 category not found")
 
@@ -513,7 +506,7 @@ async def update_phase2_category(category_id: int, enabled: bool):
 from .services.pipeline_stage_logger import PipelineStageLogger
 
 # Category validation endpoints
-from .services.category_validation_engine import CategoryValidationEngine
+from .services.category_validation_engine import CategoryValidationEngine, shutdown_table_parse_pool
 validation_engine = CategoryValidationEngine()
 
 # Categories endpoint - Must be before other {param} routes
@@ -522,13 +515,7 @@ async def get_request_categories_for_pipeline(request_id: str):
     """Get all categories for a request."""
     logger.info(f"Fetching categories for request_id: {request_id}")
     try:
-        conn = await asyncpg.connect(
-            host='localhost',
-            port=5432,
-            user='postgres',
-            password='postgres',
-            database='cognito-engine'
-        )
+        conn = await get_db_connection()
 
         try:
             rows = await conn.fetch(
@@ -594,17 +581,16 @@ async def get_category_pipeline_executions(category_result_id: str):
 
 
 @app.get("/api/v1/pipeline/api-calls/{request_id}")
-async def get_api_calls_for_request(request_id: str):
-    """Get all API calls/usage logs for a request (Stage 1: Data Collection)."""
+async def get_api_calls_for_request(request_id: str, include_response_data: bool = True):
+    """
+    Get all API calls/usage logs for a request (Stage 1: Data Collection).
+
+    Offloaded response_data is loaded from response_blobs in one query;
+    pass include_response_data=false to skip loading it.
+    """
     logger.info(f"Fetching API calls for request_id: {request_id}")
     try:
-        conn = await asyncpg.connect(
-            host='localhost',
-            port=5432,
-            user='postgres',
-            password='postgres',
-            database='cognito-engine'
-        )
+        conn = await get_db_connection()
 
         try:
             # Query with all columns including category_name, prompt_text, response_data
@@ -616,7 +602,8 @@ async def get_api_calls_for_request(request_id: str):
                     response_status, response_time_ms,
                     token_count, cost_per_token, total_cost,
                     timestamp, error_message, rate_limit_remaining,
-                    correlation_id, category_name, prompt_text, response_data
+                    correlation_id, category_name, prompt_text, response_data,
+                    response_blob
                 FROM api_usage_logs
                 WHERE request_id = $1::uuid
                 ORDER BY timestamp ASC
@@ -626,8 +613,18 @@ async def get_api_calls_for_request(request_id: str):
 
             logger.info(f"Found {len(rows)} API calls for request {request_id}")
 
+            blobs = {}
+            if include_response_data:
+                blobs = await get_response_blob_store().get_many(
+                    conn, (row['response_blob'] for row in rows), as_json=True
+                )
+
             api_calls = []
             for row in rows:
+                response_data = row['response_data'] if include_response_data else None
+                if include_response_data and row['response_blob']:
+                    response_data = blobs.get(row['response_blob'].strip())
+
                 api_calls.append({
                     "id": str(row['id']),
                     "request_id": str(row['request_id']),
@@ -637,7 +634,7 @@ async def get_api_calls_for_request(request_id: str):
                     "category_name": row['category_name'],
                     "prompt_text": row['prompt_text'],
                     "request_payload": row['request_payload'],
-                    "response_data": row['response_data'],
+                    "response_data": response_data,
                     "response_status": row['response_status'],
                     "response_time_ms": row['response_time_ms'],
                     "token_count": row['token_count'],
@@ -12,6 +12,7 @@ from sqlalchemy import text
 import structlog
 
 from ..database.connection import get_db_session
+from .audit_sink import get_audit_sink
 
 logger = structlog.get_logger(__name__)
 
@@ -36,7 +37,10 @@ class AuditService:
         session_id: Optional[str] = None
     ) -> str:
         """
-        Log an audit event to the database.
+        Log an audit event.
+
+        The event is handed to the write-behind audit sink and written to
+        audit_events in a later batch (see services.audit_sink).
 
         Args:
             event_type: Type of audit event (e.g., 'DATA_CREATED', 'DATA_UPDATED')
@@ -63,50 +67,36 @@ class AuditService:
         if not event_description:
             event_description = f"{event_type} on {entity_type} {entity_id}"
 
-        try:
-            async for session in get_db_session():
-                await session.execute(text("""
-                    INSERT INTO audit_events (
-                        id, event_type, event_description, entity_type, entity_id,
-                        user_id, request_id, timestamp,
-                        ip_address, user_agent, old_values, new_values,
-                        audit_metadata, correlation_id, session_id
-                    )
-                    VALUES (
-                        :id, :event_type, :description, :entity_type, :entity_id,
-                        :user_id, :request_id, :timestamp,
-                        :ip_address, :user_agent, :old_values, :new_values,
-                        :metadata, :correlation_id, :session_id
-                    )
-                """), {
-                    "id": audit_id,
-                    "event_type": event_type,
-                    "description": event_description,
-                    "entity_type": entity_type,
-                    "entity_id": entity_id,
-                    "user_id": user_id,
-                    "request_id": request_id,
-                    "timestamp": now,
-                    "ip_address": ip_address,
-                    "user_agent": user_agent,
-                    "old_values": json.dumps(old_values) if old_values else None,
-                    "new_values": json.dumps(new_values) if new_values else None,
-                    "metadata": json.dumps(audit_metadata) if audit_metadata else None,
-                    "correlation_id": correlation_id or str(uuid.uuid4()),
-                    "session_id": session_id
-                })
+        record = {
+            "id": audit_id,
+            "event_type": event_type,
+            "event_description": event_description,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "user_id": user_id,
+            "request_id": request_id,
+            "timestamp": now.isoformat(),
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "old_values": json.dumps(old_values, default=str) if old_values else None,
+            "new_values": json.dumps(new_values, default=str) if new_values else None,
+            "audit_metadata": json.dumps(audit_metadata, default=str) if audit_metadata else None,
+            "correlation_id": correlation_id or str(uuid.uuid4()),
+            "session_id": session_id
+        }
 
-                await session.commit()
-
-                logger.info(
-                    "Audit event logged",
-                    audit_id=audit_id,
-                    event_type=event_type,
-                    entity_type=entity_type,
-                    entity_id=entity_id
-                )
+        try:
+            # Queued in order and written in batches; only waits when the
+            # sink is at capacity
+            await get_audit_sink().submit(record)
 
-                break
+            logger.debug(
+                "Audit event queued",
+                audit_id=audit_id,
+                event_type=event_type,
+                entity_type=entity_type,
+                entity_id=entity_id
+            )
 
             return audit_id
 
@@ -138,6 +128,12 @@ class AuditService:
         Returns:
             List of audit events
         """
+        try:
+            # Read your own writes: push queued events out first
+            await get_audit_sink().flush()
+        except Exception as e:
+            logger.warning("Audit sink flush before read failed", error=str(e))
+
         try:
             query_parts = ["SELECT * FROM audit_events WHERE 1=1"]
             params = {}
@@ -0,0 +1,601 @@
+"""
+Audit Event Sink
+Write-behind pipeline for audit_events: events are queued in order, written
+in multi-row INSERT batches off the request path, and spilled to an
+append-only file on disk while the database is slow or unavailable.
+"""
+import os
+import json
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import structlog
+
+from ..database.connection import get_engine
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = structlog.get_logger(__name__)
+
+AUDIT_COLUMNS = [
+    "id", "event_type", "event_description", "entity_type", "entity_id",
+    "user_id", "request_id", "timestamp",
+    "ip_address", "user_agent", "old_values", "new_values",
+    "audit_metadata", "correlation_id", "session_id"
+]
+AUDIT_JSON_COLUMNS = {"old_values", "new_values", "audit_metadata"}
+
+# PostgreSQL allows 32767 bind parameters per statement
+MAX_ROWS_PER_INSERT = 32767 // len(AUDIT_COLUMNS)
+
+# Spill files are claimed per process; a restarted process adopts the first
+# unclaimed file and replays whatever it still holds
+MAX_SPILL_SLOTS = 64
+
+
+class DatabaseConnection:
+    """
+    asyncpg connection borrowed from the SQLAlchemy engine
+
+    Audit events are written through the same engine (and so the same
+    DATABASE_URL / DATABASE_* settings) that AuditService reads the trail
+    through, so flushing before a read is visible to that read.
+    """
+
+    def __init__(self):
+        self._conn = None
+
+    async def __aenter__(self):
+        self._conn = await get_engine().connect()
+        try:
+            raw = await self._conn.get_raw_connection()
+            return raw.driver_connection
+        except BaseException:
+            await self._conn.close()
+            raise
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+def _insert_sql(rows: int) -> str:
+    """Multi-row INSERT for ``rows`` audit events; replays are idempotent"""
+    values = []
+    for row in range(rows):
+        base = row * len(AUDIT_COLUMNS)
+        values.append("(" + ", ".join(
+            f"${base + i}::jsonb" if column in AUDIT_JSON_COLUMNS else f"${base + i}"
+            for i, column in enumerate(AUDIT_COLUMNS, start=1)
+        ) + ")")
+    return (
+        f"INSERT INTO audit_events ({', '.join(AUDIT_COLUMNS)}) "
+        f"VALUES {', '.join(values)} ON CONFLICT (id) DO NOTHING"
+    )
+
+
+def _to_row(record: Dict[str, Any]) -> tuple:
+    """Convert a queued record (JSON-safe values) to insert parameters"""
+    row = []
+    for column in AUDIT_COLUMNS:
+        value = record.get(column)
+        if column == "timestamp" and isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        row.append(value)
+    return tuple(row)
+
+
+class SpillFile:
+    """
+    Append-only JSON-lines file holding the tail of the audit queue.
+
+    Records are appended as they overflow the in-memory buffer and read
+    back in order. The offset of the last record known to be in the
+    database is kept in a sidecar file, so after a crash the file is
+    replayed from there; replayed rows that were already written are
+    ignored by the idempotent INSERT. The file is truncated once fully
+    written.
+
+    File I/O blocks, so the sink calls these methods through
+    ``asyncio.to_thread``; a lock keeps concurrent calls from interleaving.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset_path = f"{path}.offset"
+        self._file = None
+        self.size = 0
+        self.read_offset = 0
+        self.committed_offset = 0
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def open(self, blocking: bool = True) -> bool:
+        """
+        Open and lock the file
+
+        Args:
+            blocking: Wait for the lock instead of giving up
+
+        Returns:
+            True if the file is now owned by this process
+        """
+        handle = open(self.path, "a+b")
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except OSError:
+                handle.close()
+                return False
+
+        self._file = handle
+        self._truncate_torn_tail()
+        try:
+            with open(self.offset_path, "r") as f:
+                self.committed_offset = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            self.committed_offset = 0
+        self.committed_offset = min(self.committed_offset, self.size)
+        self.read_offset = self.committed_offset
+        return True
+
+    def _truncate_torn_tail(self):
+        """Drop a partial last line left by a crash mid-append"""
+        self._file.seek(0, os.SEEK_END)
+        self.size = self._file.tell()
+        if self.size == 0:
+            return
+        self._file.seek(max(self.size - 65536, 0))
+        tail = self._file.read()
+        if tail.endswith(b"\n"):
+            return
+        cut = tail.rfind(b"\n")
+        self.size = self.size - len(tail) + cut + 1 if cut >= 0 else (
+            0 if self.size <= 65536 else self.size
+        )
+        self._file.truncate(self.size)
+
+    @property
+    def has_unread(self) -> bool:
+        return self.read_offset < self.size
+
+    @property
+    def bytes_pending(self) -> int:
+        return self.size - self.committed_offset
+
+    def append(self, records: List[Dict[str, Any]]):
+        """Append records and flush them to the OS"""
+        with self._lock:
+            data = b"".join(json.dumps(record, default=str).encode() + b"\n" for record in records)
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(data)
+            self._file.flush()
+            self.size += len(data)
+            self._dirty = True
+
+    def sync(self):
+        """fsync pending appends"""
+        with self._lock:
+            if self._dirty and self._file is not None:
+                os.fsync(self._file.fileno())
+                self._dirty = False
+
+    def read(self, max_records: int) -> List[Tuple[Dict[str, Any], int]]:
+        """
+        Read the next unread records
+
+        Returns:
+            (record, end offset) pairs; the end offset is passed to
+            commit() once the record is in the database
+        """
+        with self._lock:
+            self._file.seek(self.read_offset)
+            records = []
+            while len(records) < max_records and self.read_offset < self.size:
+                line = self._file.readline()
+                if not line:
+                    break
+                self.read_offset += len(line)
+                try:
+                    records.append((json.loads(line), self.read_offset))
+                except ValueError:
+                    logger.error("Skipping corrupt audit spill line", path=self.path,
+                                 offset=self.read_offset - len(line))
+            return records
+
+    def commit(self, offset: int):
+        """Record that everything before offset is in the database"""
+        with self._lock:
+            self.committed_offset = max(self.committed_offset, offset)
+            if self.committed_offset >= self.size and not self.has_unread:
+                # Fully drained: start over with an empty file
+                self._file.truncate(0)
+                self.size = self.read_offset = self.committed_offset = 0
+                self._dirty = True
+            self.sync()
+            self._write_offset()
+
+    def _write_offset(self):
+        tmp_path = f"{self.offset_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(self.committed_offset))
+        os.replace(tmp_path, self.offset_path)
+
+    def prepend(self, records: List[Dict[str, Any]]):
+        """Rewrite the file as records followed by the uncommitted tail"""
+        with self._lock:
+            self._file.seek(self.committed_offset)
+            tail = self._file.read(self.size - self.committed_offset)
+            data = b"".join(json.dumps(record, default=str).encode() + b"\n" for record in records)
+            self._file.seek(0)
+            self._file.truncate(0)
+            self._file.write(data + tail)
+            self._file.flush()
+            self.size = len(data) + len(tail)
+            self.read_offset = self.committed_offset = 0
+            self._dirty = True
+            self.sync()
+            self._write_offset()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self.sync()
+                self._file.close()  # releases the lock
+                self._file = None
+
+
+class AuditEventSink:
+    """
+    Ordered, bounded write-behind sink for audit events.
+
+    The queue is the in-memory buffer followed by the spill file. Once the
+    buffer is full, new events go to the spill file (and keep going there
+    until it has been read back), and a single consumer writes from the
+    head in multi-row INSERT batches, so events reach the database in
+    submission order and per-correlation_id ordering is preserved. A
+    failed batch stays at the head and is retried with back-off. When the
+    spill file reaches ``max_spill_bytes`` (or spilling is disabled and the
+    buffer is full) submit() waits for space; events are never dropped.
+
+    Rows the database rejects while it is otherwise reachable are written to
+    ``audit-rejected.jsonl`` next to the spill files instead of blocking
+    the queue.
+    """
+
+    def __init__(
+        self,
+        spill_dir: Optional[str] = None,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_buffer_size: int = 5000,
+        max_spill_bytes: int = 512 * 1024 * 1024,
+        retry_backoff: float = 0.5,
+        max_retry_backoff: float = 30.0
+    ):
+        """
+        Initialize audit sink
+
+        Args:
+            spill_dir: Directory for spill files; None disables spilling
+            batch_size: Events per INSERT statement
+            flush_interval: Maximum seconds an event waits before being flushed
+            max_buffer_size: In-memory events before spilling to disk
+            max_spill_bytes: Spill file size at which submit() waits
+            retry_backoff: First delay after a failed write
+            max_retry_backoff: Delay cap for repeated failures
+        """
+        self.spill_dir = spill_dir
+        self.batch_size = max(1, min(batch_size, MAX_ROWS_PER_INSERT))
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.max_spill_bytes = max_spill_bytes
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+
+        # (record, spill end offset or None)
+        self._buffer: deque = deque()
+        self._spill: Optional[SpillFile] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._space_available: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._backoff = 0.0
+
+        self._stats = {
+            'events_submitted': 0,
+            'events_written': 0,
+            'events_spilled': 0,
+            'events_replayed': 0,
+            'events_rejected': 0,
+            'batches_written': 0,
+            'write_failures': 0,
+            'backpressure_waits': 0,
+            'buffer_high_water_mark': 0,
+            'last_flush_at': None,
+            'last_flush_ms': 0.0,
+            'last_error': None
+        }
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+
+    async def start(self):
+        """Claim a spill file, then start the background flush task"""
+        if self._task is not None and not self._task.done():
+            return
+
+        self._stopping = False
+        self._init_primitives()
+        if self.spill_dir and self._spill is None:
+            self._spill = await asyncio.to_thread(self._claim_spill_file)
+            if self._spill is not None and self._spill.bytes_pending:
+                logger.info("Replaying spilled audit events", path=self._spill.path,
+                            bytes_pending=self._spill.bytes_pending)
+        self._task = asyncio.create_task(self._run(), name="audit-event-sink")
+        logger.info("Audit event sink started", batch_size=self.batch_size,
+                    spill_dir=self.spill_dir)
+
+    async def stop(self):
+        """Stop the background task, write what the database accepts and persist the rest"""
+        self._stopping = True
+
+        if self._task is not None:
+            self._flush_requested.set()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning("Final audit flush failed", error=str(e))
+
+        pending = [record for record, offset in self._buffer if offset is None]
+        if pending:
+            if self._spill is not None:
+                if self._buffer[0][1] is None:
+                    # Buffered events are older than the spill tail
+                    await asyncio.to_thread(self._spill.prepend, pending)
+                else:
+                    await asyncio.to_thread(self._spill.append, pending)
+                logger.warning("Audit events persisted to spill file for replay",
+                               events=len(pending), path=self._spill.path)
+            else:
+                logger.error("Audit events lost on shutdown (spilling disabled)",
+                             events=len(pending))
+        self._buffer.clear()
+
+        if self._spill is not None:
+            await asyncio.to_thread(self._spill.close)
+            self._spill = None
+        logger.info("Audit event sink stopped",
+                    events_written=self._stats['events_written'],
+                    events_spilled=self._stats['events_spilled'],
+                    events_rejected=self._stats['events_rejected'])
+
+    def _init_primitives(self):
+        if self._flush_requested is None or self._task is None:
+            self._flush_requested = asyncio.Event()
+            self._space_available = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+
+    def _claim_spill_file(self) -> Optional[SpillFile]:
+        """Open the first spill file no other live process holds"""
+        os.makedirs(self.spill_dir, exist_ok=True)
+        for slot in range(MAX_SPILL_SLOTS):
+            spill = SpillFile(os.path.join(self.spill_dir, f"audit-spill-{slot}.jsonl"))
+            if spill.open(blocking=False):
+                return spill
+        logger.error("No free audit spill slot, spilling disabled", spill_dir=self.spill_dir)
+        return None
+
+    # ------------------------------------------------------------------ #
+    # Producer side
+    # ------------------------------------------------------------------ #
+
+    async def submit(self, record: Dict[str, Any]):
+        """
+        Queue an event for writing.
+
+        Returns without touching the database unless the queue is at
+        capacity, in which case it waits until the consumer makes room.
+
+        Args:
+            record: Audit column -> JSON-serializable value (JSON columns
+                already encoded, timestamp as an ISO string)
+        """
+        self._stats['events_submitted'] += 1
+        if self._task is None or self._task.done():
+            if not self._stopping:
+                self._ensure_started()
+
+        while True:
+            spill = self._spill
+            overflowing = len(self._buffer) >= self.max_buffer_size
+            if spill is not None and (spill.has_unread or overflowing):
+                if spill.bytes_pending < self.max_spill_bytes:
+                    await asyncio.to_thread(spill.append, [record])
+                    self._stats['events_spilled'] += 1
+                    if self._stats['events_spilled'] % 1000 == 1:
+                        logger.warning("Audit database behind, spilling events to disk",
+                                       path=spill.path, spilled=self._stats['events_spilled'])
+                    return
+            elif not overflowing:
+                self._buffer.append((record, None))
+                self._stats['buffer_high_water_mark'] = max(
+                    self._stats['buffer_high_water_mark'], len(self._buffer)
+                )
+                if len(self._buffer) >= self.batch_size and self._flush_requested is not None:
+                    self._flush_requested.set()
+                return
+
+            # Back-pressure: wait for the consumer instead of dropping
+            self._stats['backpressure_waits'] += 1
+            if self._space_available is None:
+                self._init_primitives()
+            self._space_available.clear()
+            self._flush_requested.set()
+            try:
+                await asyncio.wait_for(self._space_available.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _ensure_started(self):
+        """Start the flush task lazily when events arrive before startup"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._init_primitives()
+        self._task = asyncio.create_task(self._run(), name="audit-event-sink")
+
+    # ------------------------------------------------------------------ #
+    # Consumer side
+    # ------------------------------------------------------------------ #
+
+    async def _run(self):
+        """Flush on size trigger or interval until stopped, backing off on failures"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(),
+                                       timeout=self._backoff or self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:  # keep the sink alive no matter what
+                logger.error("Audit sink flush loop error", error=str(e))
+
+    async def flush(self) -> int:
+        """
+        Write queued events, including spilled ones, until the queue is empty
+        or a write fails
+
+        Returns:
+            Number of events written
+        """
+        if self._flush_lock is None:
+            self._init_primitives()
+
+        written = 0
+        async with self._flush_lock:
+            while True:
+                if not self._buffer and self._spill is not None and self._spill.has_unread:
+                    replay = await asyncio.to_thread(self._spill.read, self.batch_size)
+                    self._buffer.extend(replay)
+                    self._stats['events_replayed'] += len(replay)
+                if not self._buffer:
+                    if self._spill is not None:
+                        await asyncio.to_thread(self._spill.sync)
+                    break
+
+                batch = [self._buffer[i] for i in range(min(self.batch_size, len(self._buffer)))]
+                if not await self._write_batch([record for record, _ in batch]):
+                    self._backoff = min(max(self._backoff * 2, self.retry_backoff),
+                                        self.max_retry_backoff)
+                    break
+
+                for _ in batch:
+                    self._buffer.popleft()
+                offsets = [offset for _, offset in batch if offset is not None]
+                if offsets and self._spill is not None:
+                    await asyncio.to_thread(self._spill.commit, max(offsets))
+                written += len(batch)
+                self._backoff = 0.0
+                if self._space_available is not None:
+                    self._space_available.set()
+        return written
+
+    async def _write_batch(self, records: List[Dict[str, Any]]) -> bool:
+        """
+        Write one batch with a multi-row INSERT
+
+        Returns:
+            True if every event was written or set aside as rejected,
+            False if the database is unavailable and the batch must be retried
+        """
+        start = datetime.now()
+        rows = [_to_row(record) for record in records]
+        try:
+            async with DatabaseConnection() as conn:
+                try:
+                    await conn.execute(_insert_sql(len(rows)), *[v for row in rows for v in row])
+                except Exception as e:
+                    # Tell a bad row apart from an unavailable database
+                    await conn.fetchval("SELECT 1")
+                    logger.warning("Audit batch rejected, isolating rows", error=str(e))
+                    await self._insert_rows(conn, records, rows)
+        except Exception as e:
+            self._stats['write_failures'] += 1
+            self._stats['last_error'] = str(e)
+            logger.error("Failed to write audit batch", events=len(rows), error=str(e))
+            return False
+
+        self._stats['events_written'] += len(rows)
+        self._stats['batches_written'] += 1
+        self._stats['last_flush_at'] = datetime.now().isoformat()
+        self._stats['last_flush_ms'] = (datetime.now() - start).total_seconds() * 1000
+        return True
+
+    async def _insert_rows(self, conn, records: List[Dict[str, Any]], rows: List[tuple]):
+        """Insert rows one at a time, setting aside rows the database rejects"""
+        query = _insert_sql(1)
+        rejected = []
+        for record, row in zip(records, rows):
+            try:
+                await conn.execute(query, *row)
+            except Exception as e:
+                logger.error("Audit event rejected by database", audit_id=record.get("id"),
+                             error=str(e))
+                rejected.append({**record, '_error': str(e)})
+
+        if rejected:
+            self._stats['events_rejected'] += len(rejected)
+            self._stats['events_written'] -= len(rejected)
+            if self.spill_dir:
+                path = os.path.join(self.spill_dir, "audit-rejected.jsonl")
+                with open(path, "ab") as f:
+                    f.write(b"".join(json.dumps(r, default=str).encode() + b"\n" for r in rejected))
+
+    # ------------------------------------------------------------------ #
+    # Introspection
+    # ------------------------------------------------------------------ #
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, spill and back-pressure counters"""
+        return {
+            **self._stats,
+            'running': self._task is not None and not self._task.done(),
+            'buffered': len(self._buffer),
+            'buffer_capacity': self.max_buffer_size,
+            'spill_path': self._spill.path if self._spill is not None else None,
+            'spill_bytes_pending': self._spill.bytes_pending if self._spill is not None else 0,
+            'retry_backoff': self._backoff
+        }
+
+
+audit_event_sink = AuditEventSink(
+    spill_dir=os.getenv('AUDIT_SPILL_DIR', 'audit_spill') or None,
+    batch_size=int(os.getenv('AUDIT_SINK_BATCH_SIZE', '500')),
+    flush_interval=float(os.getenv('AUDIT_SINK_FLUSH_INTERVAL', '0.5')),
+    max_buffer_size=int(os.getenv('AUDIT_SINK_MAX_BUFFER', '5000')),
+    max_spill_bytes=int(os.getenv('AUDIT_SPILL_MAX_BYTES', str(512 * 1024 * 1024)))
+)
+
+
+def get_audit_sink() -> AuditEventSink:
+    """Get the process-wide audit event sink"""
+    return audit_event_sink
@@ -0,0 +1,366 @@
+"""
+Buffered Log Writer
+Write-behind sink that batches high-volume log rows (API usage logs and
+pipeline stage executions) into bulk COPY writes off the request path.
+"""
+import os
+import json
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence
+import structlog
+
+from ..core.response_blobs import PreparedBlob, ResponseBlobStore, get_response_blob_store
+from ..utils.db_connection import DatabaseConnection
+from .audit_sink import get_audit_sink
+
+logger = structlog.get_logger(__name__)
+
+
+class BufferedLogWriter:
+    """
+    Bounded, batching write-behind sink for a single log table.
+
+    Records are appended to an in-memory buffer without awaiting the
+    database. A background task flushes the buffer when it reaches
+    ``batch_size`` records or every ``flush_interval`` seconds, whichever
+    comes first, using a single COPY per batch. When the buffer is full new
+    records are dropped (and counted) so callers are never blocked.
+
+    Large JSON values in ``blob_columns`` are moved to the shared
+    response_blobs table at flush time; the row keeps only the checksum in
+    the paired reference column.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        columns: Sequence[str],
+        json_columns: Sequence[str] = (),
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        max_buffer_size: int = 10000,
+        blob_columns: Optional[Dict[str, str]] = None,
+        blob_store: Optional[ResponseBlobStore] = None
+    ):
+        """
+        Initialize log writer
+
+        Args:
+            table_name: Target table
+            columns: Column names, in the order records are written
+            json_columns: Columns whose values are serialized to JSON at flush time
+            batch_size: Flush once this many records are buffered
+            flush_interval: Maximum seconds a record waits before being flushed
+            max_buffer_size: Buffer bound; records beyond it are dropped
+            blob_columns: JSON column -> reference column for values offloaded
+                to response_blobs
+            blob_store: Blob store for offloaded values (default: global store)
+        """
+        self.table_name = table_name
+        self.columns = list(columns)
+        self.json_columns = set(json_columns)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.blob_columns = dict(blob_columns or {})
+        self.blob_store = blob_store or get_response_blob_store()
+
+        self._buffer: deque = deque()
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+
+        self._stats = {
+            'records_submitted': 0,
+            'records_written': 0,
+            'records_dropped': 0,
+            'records_failed': 0,
+            'batches_written': 0,
+            'copy_fallbacks': 0,
+            'values_offloaded': 0,
+            'buffer_high_water_mark': 0,
+            'last_flush_at': None,
+            'last_flush_ms': 0.0
+        }
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+
+    async def start(self):
+        """Start the background flush task"""
+        if self._task is not None and not self._task.done():
+            return
+
+        self._stopping = False
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run(), name=f"log-writer-{self.table_name}")
+        logger.info("Buffered log writer started", table=self.table_name,
+                    batch_size=self.batch_size, flush_interval=self.flush_interval)
+
+    async def stop(self):
+        """Stop the background task and flush everything still buffered"""
+        self._stopping = True
+
+        if self._task is not None:
+            self._flush_requested.set()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+        logger.info("Buffered log writer stopped", table=self.table_name,
+                    records_written=self._stats['records_written'],
+                    records_dropped=self._stats['records_dropped'],
+                    records_failed=self._stats['records_failed'])
+
+    # ------------------------------------------------------------------ #
+    # Producer side
+    # ------------------------------------------------------------------ #
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Buffer a record for writing. Never awaits the database.
+
+        Args:
+            record: Column name -> value; JSON columns may hold dicts/lists
+
+        Returns:
+            True if buffered, False if dropped because the buffer is full
+        """
+        self._stats['records_submitted'] += 1
+
+        if len(self._buffer) >= self.max_buffer_size:
+            self._stats['records_dropped'] += 1
+            if self._stats['records_dropped'] % 1000 == 1:
+                logger.warning("Log buffer full, dropping records", table=self.table_name,
+                               dropped=self._stats['records_dropped'])
+            return False
+
+        self._buffer.append(record)
+        self._stats['buffer_high_water_mark'] = max(
+            self._stats['buffer_high_water_mark'], len(self._buffer)
+        )
+
+        if self._task is None or self._task.done():
+            if not self._stopping:
+                self._ensure_started()
+        elif len(self._buffer) >= self.batch_size:
+            self._flush_requested.set()
+
+        return True
+
+    def _ensure_started(self):
+        """Start the flush task lazily when records arrive before startup"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run(), name=f"log-writer-{self.table_name}")
+
+    # ------------------------------------------------------------------ #
+    # Consumer side
+    # ------------------------------------------------------------------ #
+
+    async def _run(self):
+        """Flush on size trigger or interval until stopped"""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:  # keep the writer alive no matter what
+                logger.error("Log writer flush loop error", table=self.table_name, error=str(e))
+
+    async def flush(self) -> int:
+        """
+        Write all currently buffered records
+
+        Returns:
+            Number of records written
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                written += await self._write_batch(batch)
+        return written
+
+    def _to_row(self, record: Dict[str, Any]) -> tuple:
+        """Convert a record dict to a row tuple, serializing JSON columns"""
+        row = []
+        for column in self.columns:
+            value = record.get(column)
+            if column in self.json_columns and not isinstance(value, str):
+                value = json.dumps(value, default=str) if value else None
+            row.append(value)
+        return tuple(row)
+
+    def _offload_blobs(self, batch: List[Dict[str, Any]]) -> tuple:
+        """Replace large blob column values with references"""
+        records = []
+        blobs: List[PreparedBlob] = []
+        for record in batch:
+            for column, ref_column in self.blob_columns.items():
+                blob = self.blob_store.prepare(record.get(column))
+                if blob is not None:
+                    record = {**record, column: None, ref_column: blob.checksum}
+                    blobs.append(blob)
+            records.append(record)
+        return records, blobs
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """Write one batch with COPY, falling back to per-row INSERT on error"""
+        start = datetime.now()
+        records, blobs = self._offload_blobs(batch) if self.blob_columns else (batch, [])
+        rows = [self._to_row(record) for record in records]
+
+        try:
+            async with DatabaseConnection() as conn:
+                if blobs:
+                    try:
+                        # Blobs first so every stored reference resolves
+                        await self.blob_store.put_many(conn, blobs)
+                        self._stats['values_offloaded'] += len(blobs)
+                    except Exception as e:
+                        logger.warning("Blob write failed, storing values inline",
+                                       table=self.table_name, error=str(e))
+                        rows = [self._to_row(record) for record in batch]
+                try:
+                    await conn.copy_records_to_table(
+                        self.table_name, records=rows, columns=self.columns
+                    )
+                    written = len(rows)
+                except Exception as e:
+                    # A single bad row fails the whole COPY; salvage the rest
+                    self._stats['copy_fallbacks'] += 1
+                    logger.warning("COPY failed, falling back to row inserts",
+                                   table=self.table_name, error=str(e))
+                    written = await self._insert_rows(conn, rows)
+        except Exception as e:
+            logger.error("Failed to write log batch", table=self.table_name,
+                         records=len(rows), error=str(e))
+            written = 0
+
+        self._stats['records_written'] += written
+        self._stats['records_failed'] += len(rows) - written
+        self._stats['batches_written'] += 1
+        self._stats['last_flush_at'] = datetime.now().isoformat()
+        self._stats['last_flush_ms'] = (datetime.now() - start).total_seconds() * 1000
+        return written
+
+    async def _insert_rows(self, conn, rows: List[tuple]) -> int:
+        """Insert rows one at a time, skipping rows that fail"""
+        placeholders = ", ".join(
+            f"${i}::jsonb" if column in self.json_columns else f"${i}"
+            for i, column in enumerate(self.columns, start=1)
+        )
+        query = f"INSERT INTO {self.table_name} ({', '.join(self.columns)}) VALUES ({placeholders})"
+
+        written = 0
+        for row in rows:
+            try:
+                await conn.execute(query, *row)
+                written += 1
+            except Exception as e:
+                logger.error("Failed to write log row", table=self.table_name, error=str(e))
+        return written
+
+    # ------------------------------------------------------------------ #
+    # Introspection
+    # ------------------------------------------------------------------ #
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer depth, back-pressure and drop counters"""
+        stats = {
+            **self._stats,
+            'table': self.table_name,
+            'running': self._task is not None and not self._task.done(),
+            'buffered': len(self._buffer),
+            'buffer_capacity': self.max_buffer_size,
+            'buffer_utilisation': len(self._buffer) / self.max_buffer_size if self.max_buffer_size else 0
+        }
+        if self.blob_columns:
+            stats['blob_store'] = self.blob_store.get_stats()
+        return stats
+
+
+def _writer_settings() -> Dict[str, Any]:
+    """Read writer tuning from environment variables"""
+    return {
+        'batch_size': int(os.getenv('LOG_WRITER_BATCH_SIZE', '200')),
+        'flush_interval': float(os.getenv('LOG_WRITER_FLUSH_INTERVAL', '1.0')),
+        'max_buffer_size': int(os.getenv('LOG_WRITER_MAX_BUFFER', '10000'))
+    }
+
+
+api_usage_log_writer = BufferedLogWriter(
+    "api_usage_logs",
+    columns=[
+        "id", "request_id", "category_result_id",
+        "api_provider", "endpoint",
+        "response_status", "response_time_ms",
+        "token_count", "cost_per_token", "total_cost",
+        "timestamp", "error_message",
+        "category_name", "prompt_text", "response_data", "request_payload",
+        "response_blob"
+    ],
+    json_columns=["response_data", "request_payload"],
+    blob_columns={"response_data": "response_blob"},
+    **_writer_settings()
+)
+
+stage_log_writer = BufferedLogWriter(
+    "pipeline_stage_executions",
+    columns=[
+        "id", "request_id", "category_result_id",
+        "stage_name", "stage_order",
+        "executed", "skipped",
+        "input_data", "output_data", "stage_metadata",
+        "execution_time_ms",
+        "started_at", "completed_at"
+    ],
+    json_columns=["input_data", "output_data", "stage_metadata"],
+    **_writer_settings()
+)
+
+_WRITERS = {
+    "api_usage_logs": api_usage_log_writer,
+    "pipeline_stage_executions": stage_log_writer
+}
+
+
+async def start_log_writers():
+    """Start all buffered log writers and the audit sink (application startup)"""
+    for writer in _WRITERS.values():
+        await writer.start()
+    await get_audit_sink().start()
+
+
+async def stop_log_writers():
+    """Flush and stop all buffered log writers and the audit sink (application shutdown)"""
+    for writer in _WRITERS.values():
+        await writer.stop()
+    await get_audit_sink().stop()
+
+
+def get_log_writer_stats() -> Dict[str, Dict[str, Any]]:
+    """Get stats for all buffered log writers and the audit sink"""
+    stats = {name: writer.get_stats() for name, writer in _WRITERS.items()}
+    stats['audit_events'] = get_audit_sink().get_stats()
+    return stats
@@ -0,0 +1,302 @@
+"""
+Category Dependency Scheduler
+Runs a request's categories as a dependency graph instead of phase by phase.
+
+Each category starts as soon as the categories it depends on have finished,
+up to ``max_concurrency`` at a time. Two kinds of edges are supported:
+
+- ``requires``: the dependency must succeed; if it fails or is skipped, the
+  dependent is skipped
+- ``after``: ordering only; the dependent waits for the dependency to
+  finish but runs whatever its outcome
+
+When more categories are ready than slots are free, the one with the
+longest remaining chain of dependents starts first. After a run, the
+report names the critical path: the chain of categories, each gated by the
+last of its dependencies to finish, that determined end-to-end latency.
+"""
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+COMPLETED = "completed"
+FAILED = "failed"
+SKIPPED = "skipped"
+RESUMED = "resumed"
+
+
+@dataclass
+class CategoryNode:
+    """A category in the graph and how to run it"""
+    key: Hashable
+    name: str
+    run: Optional[Callable[[], Awaitable[Any]]]
+    requires: Set[Hashable] = field(default_factory=set)
+    after: Set[Hashable] = field(default_factory=set)
+    succeeded: Callable[[Any], bool] = lambda result: result is not None
+    order: int = 0
+
+    # Set while running
+    status: Optional[str] = None
+    result: Any = None
+    error: Optional[BaseException] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    gated_by: Optional[Hashable] = None
+
+    @property
+    def dependencies(self) -> Set[Hashable]:
+        return self.requires | self.after
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+class CategoryGraphError(ValueError):
+    """Raised when category dependencies contain a cycle"""
+
+
+class CategoryScheduler:
+    """
+    Dependency-driven executor for one request's categories
+
+    Add every category with ``add``, then ``run`` them; ``on_finish`` is
+    awaited for each category as it completes, fails or is skipped.
+    """
+
+    def __init__(self, max_concurrency: int = 16):
+        self.max_concurrency = max(1, max_concurrency)
+        self.nodes: Dict[Hashable, CategoryNode] = {}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    def add(
+        self,
+        key: Hashable,
+        name: str,
+        run: Callable[[], Awaitable[Any]],
+        requires: Optional[Set[Hashable]] = None,
+        after: Optional[Set[Hashable]] = None,
+        succeeded: Optional[Callable[[Any], bool]] = None
+    ) -> CategoryNode:
+        """
+        Add a category
+
+        Args:
+            key: Unique category key (category id)
+            name: Category name for logging and reports
+            run: Coroutine factory that processes the category
+            requires: Keys that must succeed before this category runs
+            after: Keys that must finish (in any state) before it runs
+            succeeded: Decides from the result whether the category succeeded
+
+        Returns:
+            The graph node
+        """
+        node = CategoryNode(
+            key=key, name=name, run=run,
+            requires=set(requires or ()), after=set(after or ()),
+            order=len(self.nodes)
+        )
+        if succeeded is not None:
+            node.succeeded = succeeded
+        self.nodes[key] = node
+        return node
+
+    def mark_resumed(self, key: Hashable, name: str) -> CategoryNode:
+        """Add a category that already completed in an earlier attempt"""
+        node = CategoryNode(key=key, name=name, run=None, order=len(self.nodes), status=RESUMED)
+        self.nodes[key] = node
+        return node
+
+    def _prune_unknown(self):
+        """Drop edges to categories that are not part of this run (disabled)"""
+        for node in self.nodes.values():
+            unknown = node.dependencies - self.nodes.keys()
+            if unknown:
+                logger.warning("Ignoring dependencies on categories not in this run",
+                               category=node.name, dependencies=sorted(map(str, unknown)))
+                node.requires -= unknown
+                node.after -= unknown
+
+    def validate(self) -> List[Hashable]:
+        """
+        Drop edges to categories outside this run and order the graph
+
+        Returns:
+            Category keys in dependency order
+
+        Raises:
+            CategoryGraphError: If dependencies contain a cycle
+        """
+        self._prune_unknown()
+        remaining = {key: len(node.dependencies) for key, node in self.nodes.items()}
+        dependents = self._dependents()
+        ready = [key for key, count in remaining.items() if count == 0]
+        ordered = []
+        while ready:
+            key = ready.pop()
+            ordered.append(key)
+            for dependent in dependents[key]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(ordered) < len(self.nodes):
+            cycle = sorted(self.nodes[key].name for key in self.nodes if key not in ordered)
+            raise CategoryGraphError(f"Category dependencies contain a cycle among: {', '.join(cycle)}")
+        return ordered
+
+    def _dependents(self) -> Dict[Hashable, List[Hashable]]:
+        dependents: Dict[Hashable, List[Hashable]] = {key: [] for key in self.nodes}
+        for node in self.nodes.values():
+            for dependency in node.dependencies:
+                dependents[dependency].append(node.key)
+        return dependents
+
+    def _ranks(self, ordered: List[Hashable]) -> Dict[Hashable, int]:
+        """Length of the longest chain of dependents below each category"""
+        dependents = self._dependents()
+        ranks: Dict[Hashable, int] = {}
+        for key in reversed(ordered):
+            ranks[key] = 1 + max((ranks[d] for d in dependents[key]), default=0)
+        return ranks
+
+    async def run(self, on_finish: Optional[Callable[[CategoryNode], Awaitable[None]]] = None) -> Dict[str, Any]:
+        """
+        Run all categories respecting dependencies
+
+        Args:
+            on_finish: Awaited with each node when it completes, fails or
+                is skipped
+
+        Returns:
+            Schedule report (see ``report``)
+
+        Raises:
+            CategoryGraphError: If dependencies contain a cycle
+        """
+        ordered = self.validate()
+        ranks = self._ranks(ordered)
+        dependents = self._dependents()
+
+        waiting = {key: len(node.dependencies) for key, node in self.nodes.items()}
+        ready: List[Hashable] = []
+        running: Dict[asyncio.Task, CategoryNode] = {}
+        self._started_at = time.monotonic()
+
+        async def finish(node: CategoryNode):
+            node.finished_at = node.finished_at or time.monotonic()
+            if on_finish:
+                try:
+                    await on_finish(node)
+                except Exception as e:
+                    logger.error("Category completion handler failed", category=node.name, error=str(e))
+            for key in dependents[node.key]:
+                waiting[key] -= 1
+                if waiting[key] == 0:
+                    await release(self.nodes[key])
+
+        async def release(node: CategoryNode):
+            """All dependencies finished: skip the node or queue it"""
+            finished = [self.nodes[key] for key in node.dependencies]
+            if finished:
+                node.gated_by = max(finished, key=lambda dep: dep.finished_at).key
+            failed = [dep.name for dep in finished
+                      if dep.key in node.requires and dep.status not in (COMPLETED, RESUMED)]
+            if failed:
+                node.status = SKIPPED
+                logger.warning("Skipping category, required categories did not complete",
+                               category=node.name, failed=failed)
+                await finish(node)
+            else:
+                ready.append(node.key)
+
+        # Resumed categories count as finished from the start
+        for key in ordered:
+            node = self.nodes[key]
+            if node.status == RESUMED:
+                node.started_at = node.finished_at = self._started_at
+        for key in ordered:
+            node = self.nodes[key]
+            if node.status == RESUMED:
+                await finish(node)
+            elif waiting[key] == 0 and node.status is None and key not in ready:
+                ready.append(key)
+
+        try:
+            while ready or running:
+                ready.sort(key=lambda k: (ranks[k], -self.nodes[k].order))
+                while ready and len(running) < self.max_concurrency:
+                    node = self.nodes[ready.pop()]
+                    node.started_at = time.monotonic()
+                    running[asyncio.ensure_future(node.run())] = node
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node = running.pop(task)
+                    node.finished_at = time.monotonic()
+                    if task.exception() is not None:
+                        node.status, node.error = FAILED, task.exception()
+                    else:
+                        node.result = task.result()
+                        node.status = COMPLETED if node.succeeded(node.result) else FAILED
+                    await finish(node)
+        finally:
+            for task in running:
+                task.cancel()
+            self._finished_at = time.monotonic()
+
+        report = self.report()
+        logger.info("Category graph finished", wall_time=report["wall_time"],
+                    critical_path=[step["name"] for step in report["critical_path"]],
+                    sequential_time=report["sequential_time"])
+        return report
+
+    def critical_path(self) -> List[CategoryNode]:
+        """Chain of categories that determined when the run finished"""
+        finished = [node for node in self.nodes.values() if node.finished_at is not None]
+        if not finished:
+            return []
+
+        path = [max(finished, key=lambda node: (node.finished_at, -node.order))]
+        while path[-1].gated_by is not None:
+            path.append(self.nodes[path[-1].gated_by])
+        path.reverse()
+        return [node for node in path if node.status != RESUMED]
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Summarize a run
+
+        Returns:
+            wall_time, sequential_time (sum of category durations),
+            critical_path (name, status, start offset and duration per
+            step) and per-status category names
+        """
+        start = self._started_at or 0.0
+        by_status: Dict[str, List[str]] = {}
+        for node in self.nodes.values():
+            by_status.setdefault(node.status or "pending", []).append(node.name)
+
+        return {
+            "wall_time": round((self._finished_at or start) - start, 3),
+            "sequential_time": round(sum(node.duration for node in self.nodes.values()), 3),
+            "critical_path": [
+                {
+                    "name": node.name,
+                    "status": node.status,
+                    "started_at": round((node.started_at or start) - start, 3),
+                    "duration": round(node.duration, 3)
+                }
+                for node in self.critical_path()
+            ],
+            "categories": by_status
+        }
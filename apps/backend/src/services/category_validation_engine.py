@@ -3,31 +3,297 @@ Category Validation Engine
 Executes validation schemas stored in database to validate category results
 """
 
+import asyncio
 import json
-import asyncpg
+import multiprocessing
+import os
+import re
 import structlog
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+from ..utils.db_connection import get_db_connection
+
 logger = structlog.get_logger(__name__)
 
+# Sources validated at once per category
+SOURCE_VALIDATION_CONCURRENCY = int(os.getenv('SOURCE_VALIDATION_CONCURRENCY', '4'))
+
+# Processes parsing large responses off the event loop (0 parses inline)
+TABLE_PARSE_PROCESSES = int(os.getenv('TABLE_PARSE_PROCESSES', '2'))
+
+# Smaller responses parse faster inline than the round trip to a process
+TABLE_PARSE_OFFLOAD_MIN_CHARS = int(os.getenv('TABLE_PARSE_OFFLOAD_MIN_CHARS', '20000'))
+
+_table_parse_pool: Optional[ProcessPoolExecutor] = None
+
+_TABLE_SEPARATOR = re.compile(r'\|[\s]*[-:]+')
+_MARKDOWN_SEPARATOR = re.compile(r'\|[\s]*[-:]+[\s]*\|')
+_PIPE_ROW = re.compile(r'\|[^|]+\|[^|]+\|')
+_TAB_ROW = re.compile(r'\t.*\t')
+
+
+class RowSourceClassifier:
+    """
+    Classifies the source citation of a table row.
+
+    Built once per engine: the priority table, the keyword list (flattened in
+    priority order) and the citation regexes are precompiled, so classifying
+    a row is one regex search, a scan of plain substring checks and at most
+    one more regex search.
+    """
+
+    # Source priority hierarchy (from SYSTEM_PROMPT)
+    SOURCE_PRIORITIES = {
+        'PAID_APIS': 1,          # Pharmacircle, GlobalData, Evaluate Pharma, Cortellis, IQVIA
+        'GOVERNMENT': 2,         # .gov, .edu, FDA, EMA, PMDA, ClinicalTrials.gov
+        'PEER_REVIEWED': 3,      # journals with DOI/PMID, PubMed
+        'INDUSTRY': 4,           # pharma associations, industry databases
+        'COMPANY': 5,            # official pharma websites, press releases
+        'NEWS': 6                # news sources
+    }
+
+    SOURCE_KEYWORDS = {
+        'PAID_APIS': ['pharmacircle', 'globaldata', 'evaluate pharma', 'cortellis', 'iqvia'],
+        'GOVERNMENT': ['.gov', '.edu', 'fda', 'ema', 'pmda', 'clinicaltrials', 'government'],
+        'PEER_REVIEWED': ['pubmed', 'doi:', 'pmid:', 'journal', 'peer-reviewed'],
+        'INDUSTRY': ['association', 'white paper', 'industry report'],
+        'COMPANY': ['press release', 'corporate', 'company website'],
+        'NEWS': ['news', 'report', 'article']
+    }
+
+    # Any citation-like pattern (year in parentheses, URLs, etc.)
+    CITATION_PATTERNS = [
+        r'\(\d{4}\)',  # (2025)
+        r'https?://',   # URLs
+        r'\d{4}\s+report',  # "2025 report"
+        r'study\s+\d{4}',  # "study 2025"
+    ]
+
+    def __init__(self):
+        self._priority_pattern = re.compile(r'\[priority\s+(\d+):\s*([^\]]+)\]', re.IGNORECASE)
+        self._citation_pattern = re.compile('|'.join(f'(?:{p})' for p in self.CITATION_PATTERNS))
+        self._source_type_by_priority = {}
+        for source_type, priority in self.SOURCE_PRIORITIES.items():
+            self._source_type_by_priority.setdefault(priority, source_type)
+
+        # Prebuilt results in priority order; the first keyword found wins.
+        # Plain substring checks beat a combined regex for a list this short.
+        self._keyword_results = [
+            (keyword, {
+                'has_source': True,
+                'priority': self.SOURCE_PRIORITIES[source_type],
+                'source_type': source_type,
+                'source_name': f'Detected: {keyword}'
+            })
+            for source_type, keywords in self.SOURCE_KEYWORDS.items()
+            for keyword in keywords
+        ]
+
+    def classify(self, row_cells: List[str]) -> Dict[str, Any]:
+        """
+        Classify a row's source citation.
+
+        Args:
+            row_cells: Row cell values
+
+        Returns:
+            Dict with has_source, priority, source_type and source_name (or reason)
+        """
+        # Join all cells in the row to check for source citations
+        row_text = ' '.join(row_cells).lower()
+
+        # Pattern 1: [Priority X: Source Name]
+        priority_match = self._priority_pattern.search(row_text)
+        if priority_match:
+            priority_num = int(priority_match.group(1))
+            return {
+                'has_source': True,
+                'priority': priority_num,
+                'source_type': self._source_type_by_priority.get(priority_num, 'UNKNOWN'),
+                'source_name': priority_match.group(2).strip()
+            }
+
+        # Pattern 2: Direct source keywords
+        for keyword, result in self._keyword_results:
+            if keyword in row_text:
+                return dict(result)
+
+        # Pattern 3: Generic citation patterns
+        if self._citation_pattern.search(row_text):
+            return {
+                'has_source': True,
+                'priority': 6,  # Lowest priority for generic citations
+                'source_type': 'GENERIC_CITATION',
+                'source_name': 'Generic citation found'
+            }
+
+        # No source found
+        return {
+            'has_source': False,
+            'priority': None,
+            'source_type': None,
+            'reason': 'No source citation detected'
+        }
+
+
+class StreamingTableParser:
+    """
+    Incremental markdown table parser.
+
+    Accepts text in arbitrary chunks (e.g. streamed provider deltas) and
+    emits table rows as soon as their line is complete, so row-level work can
+    run while the rest of the response is still arriving. Produces the same
+    tables as parsing the full text in one pass.
+
+    Also the single tokenizer behind table detection: while parsing, each
+    line is counted once as a markdown separator, pipe row or tab row, so
+    detection and parsing share one pass over the content.
+    """
+
+    def __init__(self):
+        self.tables: List[Dict[str, Any]] = []
+        self.separator_count = 0
+        self.pipe_line_count = 0
+        self.tab_line_count = 0
+        self._buffer = ""
+        self._candidate_header: Optional[str] = None
+        self._current: Optional[Dict[str, Any]] = None
+
+    def feed(self, chunk: str) -> List[Tuple[Dict[str, Any], List[str]]]:
+        """
+        Consume a chunk of text.
+
+        Args:
+            chunk: Next piece of the response
+
+        Returns:
+            (table, row_cells) for every row completed by this chunk; the
+            table dict is the one that will appear in ``tables``
+        """
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+
+        completed = []
+        for line in lines:
+            row = self._consume_raw_line(line)
+            if row:
+                completed.append(row)
+        return completed
+
+    def close(self) -> List[Tuple[Dict[str, Any], List[str]]]:
+        """
+        Flush the trailing partial line and finish any open table.
+
+        Returns:
+            (table, row_cells) for rows completed by the trailing line
+        """
+        completed = []
+        row = self._consume_raw_line(self._buffer)
+        if row:
+            completed.append(row)
+        self._buffer = ""
+        self._finish_table()
+        return completed
+
+    def detection(self) -> Dict[str, Any]:
+        """
+        Summarize which table format the consumed text contains.
+
+        Returns:
+            Dict with has_tables, count and format
+        """
+        if self.separator_count > 0:
+            return {'has_tables': True, 'count': self.separator_count, 'format': 'markdown'}
+        elif self.pipe_line_count >= 3:  # At least header + separator + 1 row
+            return {'has_tables': True, 'count': 1, 'format': 'pipe-separated'}
+        elif self.tab_line_count >= 2:  # At least 2 rows with tabs
+            return {'has_tables': True, 'count': 1, 'format': 'tab-separated'}
+
+        return {'has_tables': False, 'count': 0, 'format': None}
+
+    def _consume_raw_line(self, raw_line: str) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+        if '\t' in raw_line and _TAB_ROW.search(raw_line):
+            self.tab_line_count += 1
+
+        line = raw_line.strip()
+        if '|' in line:
+            self.separator_count += len(_MARKDOWN_SEPARATOR.findall(raw_line))
+            if _PIPE_ROW.match(line):
+                self.pipe_line_count += 1
+
+        return self._consume_line(line)
+
+    def _consume_line(self, line: str) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+        if self._current is not None:
+            if '|' in line and not _TABLE_SEPARATOR.match(line):
+                row_cells = [cell.strip() for cell in line.split('|') if cell.strip()]
+                if not row_cells:
+                    return None
+                self._current['rows'].append(row_cells)
+                if len(self._current['rows']) == 1:
+                    self.tables.append(self._current)
+                return self._current, row_cells
+
+            # Non-table line ends the table and may start the next one
+            self._finish_table()
+            self._candidate_header = line
+            return None
+
+        header = self._candidate_header
+        if header is not None and '|' in header and _TABLE_SEPARATOR.match(line):
+            self._current = {
+                'headers': [cell.strip() for cell in header.split('|') if cell.strip()],
+                'rows': []
+            }
+            self._candidate_header = None
+        else:
+            self._candidate_header = line
+        return None
+
+    def _finish_table(self):
+        # Tables without rows are never added to ``tables``
+        self._current = None
+
+
+_INSERT_VALIDATION_RESULT = """
+    INSERT INTO validation_results (
+        category_result_id,
+        validation_schema_id,
+        validation_passed,
+        validation_score,
+        confidence_penalty,
+        step_results,
+        failed_steps,
+        data_quality_issues,
+        recommendations
+    ) VALUES ($1, $2, $3, $4, $5, $6::jsonb, $7, $8::jsonb, $9::jsonb)
+    RETURNING id
+"""
+
+_INSERT_SOURCE_VALIDATION = """
+    INSERT INTO source_validation_results (
+        id, category_result_id, source_index,
+        provider, model, authority_score,
+        tables_json, total_tables, total_rows, validated_rows,
+        validation_score, validation_passed, pass_rate,
+        validated_at
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
+"""
+
 
 class CategoryValidationEngine:
     """Engine for executing category-specific validation rules"""
 
     def __init__(self):
-        """Initialize validation engine"""
-        self.db_config = {
-            'host': 'localhost',
-            'port': 5432,
-            'user': 'postgres',
-            'password': 'postgres',
-            'database': 'cognito-engine'
-        }
+        self.row_classifier = RowSourceClassifier()
 
     async def _get_connection(self):
-        """Get database connection"""
-        return await asyncpg.connect(**self.db_config)
+        """Get database connection from the shared pool"""
+        return await get_db_connection()
 
     async def get_validation_schema(self, category_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -73,7 +339,8 @@ class CategoryValidationEngine:
         category_result_id: str,
         category_id: int,
         category_data: Dict[str, Any],
-        source_references: List[Dict[str, Any]]
+        source_references: List[Dict[str, Any]],
+        store: bool = True
     ) -> Dict[str, Any]:
         """
         Validate a category result using its validation schema
@@ -83,6 +350,8 @@ class CategoryValidationEngine:
             category_id: Category ID
             category_data: Extracted data for the category
             source_references: List of source references used
+            store: Store the result now; pass False to batch it with
+                store_validations
 
         Returns:
             Validation result with score, passed status, and details
@@ -172,7 +441,8 @@ class CategoryValidationEngine:
             'recommendations': recommendations
         }
 
-        await self._store_validation_result(validation_result)
+        if store:
+            await self._store_validation_result(validation_result)
 
         logger.info(
             "Validation completed",
@@ -338,7 +608,8 @@ class CategoryValidationEngine:
 
         # If no structured tables, parse from text
         if not tables and content:
-            table_indicators = self._detect_text_tables(content)
+            scan = self._scan_text_tables(content)
+            table_indicators = scan.detection()
 
             if not table_indicators['has_tables']:
                 return {
@@ -349,8 +620,8 @@ class CategoryValidationEngine:
                     'metadata': {'table_count': 0}
                 }
 
-            # Parse and validate tables from text
-            validation_result = self._validate_text_table_rows(content)
+            # Validate the tables found by the same scan
+            validation_result = self._validate_table_rows(scan.tables)
 
             return {
                 'step_name': step_name,
@@ -382,53 +653,27 @@ class CategoryValidationEngine:
             }
         }
 
+    def _scan_text_tables(self, content: str) -> StreamingTableParser:
+        """Tokenize content once for both table detection and parsing"""
+        parser = StreamingTableParser()
+        parser.feed(content)
+        parser.close()
+        return parser
+
     def _detect_text_tables(self, content: str) -> Dict[str, Any]:
         """Detect tables in text format (markdown, pipe-separated, etc.)"""
-        import re
-
         if not content:
             return {'has_tables': False, 'count': 0, 'format': None}
 
-        # Check for markdown tables (|---|---|)
-        markdown_pattern = r'\|[\s]*[-:]+[\s]*\|'
-        markdown_matches = re.findall(markdown_pattern, content)
-
-        # Check for pipe-separated tables (| col1 | col2 |)
-        pipe_pattern = r'\|[^|]+\|[^|]+\|'
-        pipe_lines = [line for line in content.split('\n') if re.match(pipe_pattern, line.strip())]
-
-        # Check for tab-separated or multi-column data
-        tab_pattern = r'\t.*\t'
-        tab_lines = [line for line in content.split('\n') if re.search(tab_pattern, line)]
-
-        if len(markdown_matches) > 0:
-            return {
-                'has_tables': True,
-                'count': len(markdown_matches),
-                'format': 'markdown'
-            }
-        elif len(pipe_lines) >= 3:  # At least header + separator + 1 row
-            return {
-                'has_tables': True,
-                'count': 1,
-                'format': 'pipe-separated'
-            }
-        elif len(tab_lines) >= 2:  # At least 2 rows with tabs
-            return {
-                'has_tables': True,
-                'count': 1,
-                'format': 'tab-separated'
-            }
-
-        return {'has_tables': False, 'count': 0, 'format': None}
+        return self._scan_text_tables(content).detection()
 
     def _validate_text_table_rows(self, content: str) -> Dict[str, Any]:
         """Validate each row in text tables for source citations"""
-        import re
-
         # Parse all markdown/pipe-separated tables in content
-        tables = self._parse_markdown_tables(content)
+        return self._validate_table_rows(self._parse_markdown_tables(content))
 
+    def _validate_table_rows(self, tables: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Validate each row of parsed tables for source citations"""
         if not tables:
             return {
                 'passed': False,
@@ -488,133 +733,11 @@ class CategoryValidationEngine:
 
     def _parse_markdown_tables(self, content: str) -> List[Dict[str, Any]]:
         """Parse markdown tables from content"""
-        import re
-
-        tables = []
-        lines = content.split('\n')
-
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Check if this is a table header (contains pipes)
-            if '|' in line and i + 1 < len(lines):
-                # Check next line for separator (---|---|)
-                next_line = lines[i + 1].strip()
-                if re.match(r'\|[\s]*[-:]+', next_line):
-                    # Found a table!
-                    header = [cell.strip() for cell in line.split('|') if cell.strip()]
-                    rows = []
-
-                    # Parse rows until we hit a non-table line
-                    j = i + 2
-                    while j < len(lines):
-                        row_line = lines[j].strip()
-                        if '|' in row_line and not re.match(r'\|[\s]*[-:]+', row_line):
-                            row_cells = [cell.strip() for cell in row_line.split('|') if cell.strip()]
-                            if row_cells:
-                                rows.append(row_cells)
-                            j += 1
-                        else:
-                            break
-
-                    if rows:
-                        tables.append({
-                            'headers': header,
-                            'rows': rows
-                        })
-
-                    i = j
-                    continue
-
-            i += 1
-
-        return tables
+        return self._scan_text_tables(content).tables
 
     def _validate_row_source(self, row_cells: List[str], row_number: int) -> Dict[str, Any]:
         """Validate if a row has proper source citation"""
-        import re
-
-        # Source priority hierarchy (from SYSTEM_PROMPT)
-        source_priorities = {
-            'PAID_APIS': 1,          # Pharmacircle, GlobalData, Evaluate Pharma, Cortellis, IQVIA
-            'GOVERNMENT': 2,         # .gov, .edu, FDA, EMA, PMDA, ClinicalTrials.gov
-            'PEER_REVIEWED': 3,      # journals with DOI/PMID, PubMed
-            'INDUSTRY': 4,           # pharma associations, industry databases
-            'COMPANY': 5,            # official pharma websites, press releases
-            'NEWS': 6                # news sources
-        }
-
-        source_keywords = {
-            'PAID_APIS': ['pharmacircle', 'globaldata', 'evaluate pharma', 'cortellis', 'iqvia'],
-            'GOVERNMENT': ['.gov', '.edu', 'fda', 'ema', 'pmda', 'clinicaltrials', 'government'],
-            'PEER_REVIEWED': ['pubmed', 'doi:', 'pmid:', 'journal', 'peer-reviewed'],
-            'INDUSTRY': ['association', 'white paper', 'industry report'],
-            'COMPANY': ['press release', 'corporate', 'company website'],
-            'NEWS': ['news', 'report', 'article']
-        }
-
-        # Join all cells in the row to check for source citations
-        row_text = ' '.join(row_cells).lower()
-
-        # Check for source citation patterns
-        # Pattern 1: [Priority X: Source Name]
-        priority_pattern = r'\[priority\s+(\d+):\s*([^\]]+)\]'
-        priority_match = re.search(priority_pattern, row_text, re.IGNORECASE)
-
-        if priority_match:
-            priority_num = int(priority_match.group(1))
-            source_name = priority_match.group(2).strip()
-
-            # Determine source type from priority number
-            source_type = None
-            for stype, prio in source_priorities.items():
-                if prio == priority_num:
-                    source_type = stype
-                    break
-
-            return {
-                'has_source': True,
-                'priority': priority_num,
-                'source_type': source_type or 'UNKNOWN',
-                'source_name': source_name
-            }
-
-        # Pattern 2: Direct source keywords
-        for source_type, keywords in source_keywords.items():
-            for keyword in keywords:
-                if keyword in row_text:
-                    return {
-                        'has_source': True,
-                        'priority': source_priorities[source_type],
-                        'source_type': source_type,
-                        'source_name': f'Detected: {keyword}'
-                    }
-
-        # Pattern 3: Check for any citation-like patterns (year in parentheses, URLs, etc.)
-        citation_patterns = [
-            r'\(\d{4}\)',  # (2025)
-            r'https?://',   # URLs
-            r'\d{4}\s+report',  # "2025 report"
-            r'study\s+\d{4}',  # "study 2025"
-        ]
-
-        for pattern in citation_patterns:
-            if re.search(pattern, row_text):
-                return {
-                    'has_source': True,
-                    'priority': 6,  # Lowest priority for generic citations
-                    'source_type': 'GENERIC_CITATION',
-                    'source_name': 'Generic citation found'
-                }
-
-        # No source found
-        return {
-            'has_source': False,
-            'priority': None,
-            'source_type': None,
-            'reason': 'No source citation detected'
-        }
+        return self.row_classifier.classify(row_cells)
 
     async def _validate_calculations(
         self,
@@ -757,30 +880,9 @@ class CategoryValidationEngine:
         """
         conn = await self._get_connection()
         try:
-            # Convert JSONB fields to JSON strings for asyncpg
-            row = await conn.fetchrow("""
-                INSERT INTO validation_results (
-                    category_result_id,
-                    validation_schema_id,
-                    validation_passed,
-                    validation_score,
-                    confidence_penalty,
-                    step_results,
-                    failed_steps,
-                    data_quality_issues,
-                    recommendations
-                ) VALUES ($1, $2, $3, $4, $5, $6::jsonb, $7, $8::jsonb, $9::jsonb)
-                RETURNING id
-            """,
-                result['category_result_id'],
-                result.get('validation_schema_id'),
-                result['validation_passed'],
-                result['validation_score'],
-                result['confidence_penalty'],
-                json.dumps(result['step_results']),
-                result['failed_steps'],
-                json.dumps(result['data_quality_issues']),
-                json.dumps(result['recommendations'])
+            row = await conn.fetchrow(
+                _INSERT_VALIDATION_RESULT,
+                *self._validation_result_args(result)
             )
 
             validation_id = str(row['id'])
@@ -790,6 +892,21 @@ class CategoryValidationEngine:
         finally:
             await conn.close()
 
+    def _validation_result_args(self, result: Dict[str, Any]) -> Tuple:
+        """Build _INSERT_VALIDATION_RESULT arguments for a validation result"""
+        # Convert JSONB fields to JSON strings for asyncpg
+        return (
+            result['category_result_id'],
+            result.get('validation_schema_id'),
+            result['validation_passed'],
+            result['validation_score'],
+            result['confidence_penalty'],
+            json.dumps(result['step_results']),
+            result['failed_steps'],
+            json.dumps(result['data_quality_issues']),
+            json.dumps(result['recommendations'])
+        )
+
     async def get_validation_results(
         self,
         category_result_id: str
@@ -819,6 +936,160 @@ class CategoryValidationEngine:
         finally:
             await conn.close()
 
+    async def validate_source_responses(
+        self,
+        category_result_id: str,
+        category_id: int,
+        source_responses: List[Dict[str, Any]],
+        concurrency: int = SOURCE_VALIDATION_CONCURRENCY,
+        store: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate all sources of a category concurrently
+
+        The schema is loaded once, at most ``concurrency`` sources are
+        converted at a time (large responses in the table parse process
+        pool) and the results are stored in one batched write.
+
+        Args:
+            category_result_id: Category result ID
+            category_id: Category ID
+            source_responses: Sources' response data, in source order
+            concurrency: Sources validated at once
+            store: Store the results now; pass False to batch them with
+                store_validations
+
+        Returns:
+            Per-source validation results in source order; sources whose
+            validation raised are logged and left out
+        """
+        schema = await self.get_validation_schema(category_id)
+        if not schema:
+            return [
+                self._create_source_validation_default(
+                    category_result_id,
+                    source_response,
+                    source_index,
+                    "no_schema"
+                )
+                for source_index, source_response in enumerate(source_responses)
+            ]
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def validate(source_index: int, source_response: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                tables_json = source_response.get("tables_json")
+                if tables_json is None:
+                    tables_json = await self.convert_tables_offloaded(
+                        str(source_response.get("response", ""))
+                    )
+                return self._build_source_validation(
+                    category_result_id,
+                    source_response,
+                    source_index,
+                    tables_json
+                )
+
+        results = await asyncio.gather(
+            *(validate(index, response) for index, response in enumerate(source_responses)),
+            return_exceptions=True
+        )
+
+        source_validations = []
+        for source_index, result in enumerate(results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Source validation failed",
+                    source_index=source_index,
+                    provider=source_responses[source_index].get("provider"),
+                    error=str(result)
+                )
+                continue
+            source_validations.append(result)
+
+        if store:
+            await self.store_validations(source_validations)
+
+        return source_validations
+
+    async def store_validations(
+        self,
+        source_validations: List[Dict[str, Any]],
+        validation_result: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Store a category's per-source validations and its aggregated
+        validation result in one transaction
+
+        Args:
+            source_validations: Results from validate_source_responses
+            validation_result: Result from validate_category_result; defaults
+                for categories without a schema are not stored
+        """
+        import uuid
+
+        # Defaults for sources without a schema are never stored
+        source_validations = [sv for sv in source_validations if "reason" not in sv]
+        if validation_result is not None and validation_result.get('validation_schema_id') is None:
+            validation_result = None
+
+        if not source_validations and validation_result is None:
+            return
+
+        now = datetime.utcnow()
+        conn = await self._get_connection()
+        try:
+            async with conn.transaction():
+                if source_validations:
+                    await conn.executemany(
+                        _INSERT_SOURCE_VALIDATION,
+                        [
+                            self._source_validation_args(str(uuid.uuid4()), sv, now)
+                            for sv in source_validations
+                        ]
+                    )
+                if validation_result is not None:
+                    await conn.execute(
+                        _INSERT_VALIDATION_RESULT,
+                        *self._validation_result_args(validation_result)
+                    )
+
+            logger.info(
+                "Validations stored",
+                category_result_id=(
+                    source_validations[0]["category_result_id"] if source_validations
+                    else validation_result['category_result_id']
+                ),
+                sources=len(source_validations),
+                category_result=validation_result is not None
+            )
+        finally:
+            await conn.close()
+
+    async def convert_tables_offloaded(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Convert tables to JSON without blocking the event loop on large content
+
+        Args:
+            content: Text content containing tables
+
+        Returns:
+            Same result as _convert_tables_to_json_with_validation
+        """
+        pool = get_table_parse_pool() if len(content) >= TABLE_PARSE_OFFLOAD_MIN_CHARS else None
+        if pool is None:
+            return self._convert_tables_to_json_with_validation(content)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, convert_tables_to_json, content
+            )
+        except BrokenProcessPool:
+            logger.warning("Table parse pool broken, parsing inline")
+            shutdown_table_parse_pool(wait=False)
+            return self._convert_tables_to_json_with_validation(content)
+
     async def validate_source_response(
         self,
         category_result_id: str,
@@ -858,9 +1129,32 @@ class CategoryValidationEngine:
         # Extract response content
         response_content = str(source_response.get("response", ""))
 
-        # Convert tables to JSON with row validation
-        tables_json = self._convert_tables_to_json_with_validation(response_content)
+        # Convert tables to JSON with row validation (reuse the conversion
+        # done while the response was streaming, if any)
+        tables_json = source_response.get("tables_json")
+        if tables_json is None:
+            tables_json = self._convert_tables_to_json_with_validation(response_content)
+
+        source_validation = self._build_source_validation(
+            category_result_id,
+            source_response,
+            source_index,
+            tables_json
+        )
+
+        # Store per-source validation
+        await self._store_source_validation(source_validation)
 
+        return source_validation
+
+    def _build_source_validation(
+        self,
+        category_result_id: str,
+        source_response: Dict[str, Any],
+        source_index: int,
+        tables_json: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Score a source's converted tables into its validation result"""
         # Calculate overall validation score based on table row validation
         total_rows = sum(t.get("total_rows", 0) for t in tables_json)
         validated_rows = sum(t.get("validated_rows", 0) for t in tables_json)
@@ -888,9 +1182,6 @@ class CategoryValidationEngine:
             "pass_rate": f"{validation_score * 100:.1f}%" if total_rows > 0 else "0.0%"
         }
 
-        # Store per-source validation
-        await self._store_source_validation(source_validation)
-
         logger.info(
             "Source validation completed",
             provider=source_response.get("provider"),
@@ -912,61 +1203,43 @@ class CategoryValidationEngine:
         Returns:
             List of JSON table structures with validation metadata
         """
-        import re
-
-        tables = self._parse_markdown_tables(content)
-        tables_json = []
+        converter = self.start_table_conversion()
+        converter.feed(content)
+        return converter.close()
 
-        for table_idx, table in enumerate(tables):
-            # Build JSON structure for table
-            table_json = {
-                "table_index": table_idx + 1,
-                "headers": table.get("headers", []),
-                "rows": [],
-                "total_rows": len(table.get("rows", [])),
-                "validated_rows": 0,
-                "failed_rows": 0,
-                "pass_rate": "0.0%"
-            }
-
-            # Validate and convert each row to JSON
-            for row_idx, row_cells in enumerate(table.get("rows", [])):
-                # Validate row source
-                source_validation = self._validate_row_source(row_cells, row_idx + 1)
-
-                # Build row JSON with validation metadata
-                row_json = {
-                    "row_number": row_idx + 1,
-                    "data": {
-                        table["headers"][i]: cell
-                        for i, cell in enumerate(row_cells)
-                        if i < len(table["headers"])
-                    },
-                    "validation": {
-                        "status": "PASS" if source_validation["has_source"] else "FAIL",
-                        "has_source": source_validation["has_source"],
-                        "source_priority": source_validation.get("priority"),
-                        "source_type": source_validation.get("source_type"),
-                        "source_name": source_validation.get("source_name"),
-                        "reason": source_validation.get("reason", "")
-                    }
-                }
-
-                table_json["rows"].append(row_json)
+    def start_table_conversion(self) -> "StreamingTableConverter":
+        """
+        Start an incremental table-to-JSON conversion.
 
-                if source_validation["has_source"]:
-                    table_json["validated_rows"] += 1
-                else:
-                    table_json["failed_rows"] += 1
+        Feed response text as it streams in; each row is validated as soon
+        as its line is complete. The finished tables_json can be passed to
+        validate_source_response in source_response["tables_json"].
 
-            # Calculate pass rate for this table
-            if table_json["total_rows"] > 0:
-                pass_rate = table_json["validated_rows"] / table_json["total_rows"]
-                table_json["pass_rate"] = f"{pass_rate * 100:.1f}%"
+        Returns:
+            StreamingTableConverter bound to this engine
+        """
+        return StreamingTableConverter(self)
 
-            tables_json.append(table_json)
+    def _row_to_json(self, headers: List[str], row_cells: List[str], row_number: int) -> Dict[str, Any]:
+        """Build a row's JSON structure with source validation metadata"""
+        source_validation = self._validate_row_source(row_cells, row_number)
 
-        return tables_json
+        return {
+            "row_number": row_number,
+            "data": {
+                headers[i]: cell
+                for i, cell in enumerate(row_cells)
+                if i < len(headers)
+            },
+            "validation": {
+                "status": "PASS" if source_validation["has_source"] else "FAIL",
+                "has_source": source_validation["has_source"],
+                "source_priority": source_validation.get("priority"),
+                "source_type": source_validation.get("source_type"),
+                "source_name": source_validation.get("source_name"),
+                "reason": source_validation.get("reason", "")
+            }
+        }
 
     async def _store_source_validation(self, source_validation: Dict[str, Any]) -> None:
         """
@@ -976,38 +1249,15 @@ class CategoryValidationEngine:
             source_validation: Source validation data
         """
         import uuid
-        import json
-        from datetime import datetime
 
         result_id = str(uuid.uuid4())
         now = datetime.utcnow()
 
         conn = await self._get_connection()
         try:
-            await conn.execute("""
-                INSERT INTO source_validation_results (
-                    id, category_result_id, source_index,
-                    provider, model, authority_score,
-                    tables_json, total_tables, total_rows, validated_rows,
-                    validation_score, validation_passed, pass_rate,
-                    validated_at
-                )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14)
-            """,
-                result_id,
-                source_validation["category_result_id"],
-                source_validation["source_index"],
-                source_validation["provider"],
-                source_validation["model"],
-                source_validation["authority_score"],
-                json.dumps(source_validation["tables_json"]),
-                source_validation["total_tables"],
-                source_validation["total_rows"],
-                source_validation["validated_rows"],
-                source_validation["validation_score"],
-                source_validation["validation_passed"],
-                source_validation["pass_rate"],
-                now
+            await conn.execute(
+                _INSERT_SOURCE_VALIDATION,
+                *self._source_validation_args(result_id, source_validation, now)
             )
 
             logger.info(
@@ -1025,6 +1275,30 @@ class CategoryValidationEngine:
         finally:
             await conn.close()
 
+    def _source_validation_args(
+        self,
+        result_id: str,
+        source_validation: Dict[str, Any],
+        validated_at: datetime
+    ) -> Tuple:
+        """Build _INSERT_SOURCE_VALIDATION arguments for a source validation"""
+        return (
+            result_id,
+            source_validation["category_result_id"],
+            source_validation["source_index"],
+            source_validation["provider"],
+            source_validation["model"],
+            source_validation["authority_score"],
+            json.dumps(source_validation["tables_json"]),
+            source_validation["total_tables"],
+            source_validation["total_rows"],
+            source_validation["validated_rows"],
+            source_validation["validation_score"],
+            source_validation["validation_passed"],
+            source_validation["pass_rate"],
+            validated_at
+        )
+
     def _create_source_validation_default(
         self,
         category_result_id: str,
@@ -1048,3 +1322,105 @@ class CategoryValidationEngine:
             "pass_rate": "0.0%",
             "reason": reason
         }
+
+
+class StreamingTableConverter:
+    """
+    Incremental table-to-JSON conversion with row validation.
+
+    Wraps StreamingTableParser so rows are validated while a provider
+    response is still streaming. ``close()`` returns the same structure as
+    CategoryValidationEngine._convert_tables_to_json_with_validation.
+    """
+
+    def __init__(self, engine: CategoryValidationEngine):
+        self.engine = engine
+        self.parser = StreamingTableParser()
+        self.content = ""
+        self._tables_json: List[Dict[str, Any]] = []
+        self._table_index: Dict[int, Dict[str, Any]] = {}
+
+    def feed(self, chunk: str):
+        """Consume the next piece of the response."""
+        self.content += chunk
+        self._add_rows(self.parser.feed(chunk))
+
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Finish parsing and return the converted tables.
+
+        Returns:
+            List of JSON table structures with validation metadata
+        """
+        self._add_rows(self.parser.close())
+        return self._tables_json
+
+    def _add_rows(self, rows: List[Tuple[Dict[str, Any], List[str]]]):
+        for table, row_cells in rows:
+            table_json = self._table_index.get(id(table))
+            if table_json is None:
+                table_json = {
+                    "table_index": len(self._tables_json) + 1,
+                    "headers": table.get("headers", []),
+                    "rows": [],
+                    "total_rows": 0,
+                    "validated_rows": 0,
+                    "failed_rows": 0,
+                    "pass_rate": "0.0%"
+                }
+                self._tables_json.append(table_json)
+                self._table_index[id(table)] = table_json
+
+            row_json = self.engine._row_to_json(
+                table_json["headers"],
+                row_cells,
+                table_json["total_rows"] + 1
+            )
+            table_json["rows"].append(row_json)
+            table_json["total_rows"] += 1
+
+            if row_json["validation"]["has_source"]:
+                table_json["validated_rows"] += 1
+            else:
+                table_json["failed_rows"] += 1
+
+            pass_rate = table_json["validated_rows"] / table_json["total_rows"]
+            table_json["pass_rate"] = f"{pass_rate * 100:.1f}%"
+
+
+_worker_engine: Optional[CategoryValidationEngine] = None
+
+
+def convert_tables_to_json(content: str) -> List[Dict[str, Any]]:
+    """Table parse pool entry point; runs in a worker process"""
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = CategoryValidationEngine()
+    return _worker_engine._convert_tables_to_json_with_validation(content)
+
+
+def get_table_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the shared table parse process pool, starting it on first use.
+
+    Returns:
+        ProcessPoolExecutor, or None when TABLE_PARSE_PROCESSES is 0
+    """
+    global _table_parse_pool
+    if TABLE_PARSE_PROCESSES <= 0:
+        return None
+    if _table_parse_pool is None:
+        # Spawn rather than fork: the parent runs an event loop and threads
+        _table_parse_pool = ProcessPoolExecutor(
+            max_workers=TABLE_PARSE_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _table_parse_pool
+
+
+def shutdown_table_parse_pool(wait: bool = True):
+    """Stop the table parse process pool, if started"""
+    global _table_parse_pool
+    pool, _table_parse_pool = _table_parse_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
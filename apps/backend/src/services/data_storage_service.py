@@ -5,14 +5,13 @@ Handles storing category results, source references, and API usage logs to Postg
 """
 
 import uuid
-import json
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from sqlalchemy import text
+from typing import Dict, List, Optional, Any, Set
 import structlog
 
-from ..database.connection import get_db_session
+from ..utils.db_connection import DatabaseConnection
 from .audit_service import AuditService
+from .buffered_log_writer import api_usage_log_writer
 
 logger = structlog.get_logger(__name__)
 
@@ -20,6 +19,9 @@ logger = structlog.get_logger(__name__)
 class DataStorageService:
     """Service for storing processing results to database."""
 
+    # Summary of a category result whose pipeline has not finished yet
+    PENDING_SUMMARY = "Processing through pipeline..."
+
     @staticmethod
     async def store_category_result(
         request_id: str,
@@ -55,8 +57,8 @@ class DataStorageService:
         now = datetime.utcnow()
 
         try:
-            async for session in get_db_session():
-                await session.execute(text("""
+            async with DatabaseConnection() as conn:
+                await conn.execute("""
                     INSERT INTO category_results (
                         id, request_id, category_id, category_name,
                         summary, confidence_score, data_quality_score,
@@ -65,31 +67,29 @@ class DataStorageService:
                         processing_time_ms, retry_count
                     )
                     VALUES (
-                        :id, :request_id, :category_id, :category_name,
-                        :summary, :confidence, :quality,
-                        :status, :started, :completed,
-                        :api_calls, :tokens, :cost,
-                        :processing_time, :retry_count
+                        $1, $2, $3, $4,
+                        $5, $6, $7,
+                        $8, $9, $10,
+                        $11, $12, $13,
+                        $14, $15
                     )
-                """), {
-                    "id": result_id,
-                    "request_id": request_id,
-                    "category_id": category_id,
-                    "category_name": category_name,
-                    "summary": summary,
-                    "confidence": confidence_score,
-                    "quality": data_quality_score,
-                    "status": "completed",
-                    "started": now,
-                    "completed": now,
-                    "api_calls": api_calls_made,
-                    "tokens": token_count,
-                    "cost": cost_estimate,
-                    "processing_time": processing_time_ms,
-                    "retry_count": 0
-                })
-
-                await session.commit()
+                """,
+                    result_id,
+                    request_id,
+                    category_id,
+                    category_name,
+                    summary,
+                    confidence_score,
+                    data_quality_score,
+                    "completed",
+                    now,
+                    now,
+                    api_calls_made,
+                    token_count,
+                    cost_estimate,
+                    processing_time_ms,
+                    0
+                )
 
                 logger.info(
                     "Category result stored",
@@ -98,8 +98,6 @@ class DataStorageService:
                     request_id=request_id
                 )
 
-                break
-
             # Log audit event
             try:
                 await AuditService.log_event(
@@ -147,23 +145,21 @@ class DataStorageService:
             True if successful, False otherwise
         """
         try:
-            async for session in get_db_session():
-                await session.execute(text("""
+            async with DatabaseConnection() as conn:
+                await conn.execute("""
                     UPDATE category_results
-                    SET summary = :summary,
-                        confidence_score = :confidence,
-                        data_quality_score = :quality,
-                        completed_at = :completed
-                    WHERE id = :id
-                """), {
-                    "id": category_result_id,
-                    "summary": summary,
-                    "confidence": confidence_score,
-                    "quality": data_quality_score,
-                    "completed": datetime.utcnow()
-                })
-
-                await session.commit()
+                    SET summary = $2,
+                        confidence_score = $3,
+                        data_quality_score = $4,
+                        completed_at = $5
+                    WHERE id = $1
+                """,
+                    category_result_id,
+                    summary,
+                    confidence_score,
+                    data_quality_score,
+                    datetime.utcnow()
+                )
 
                 logger.info(
                     "Category result updated",
@@ -171,8 +167,6 @@ class DataStorageService:
                     confidence_score=confidence_score
                 )
 
-                break
-
             return True
 
         except Exception as e:
@@ -183,6 +177,32 @@ class DataStorageService:
             )
             return False
 
+    @staticmethod
+    async def get_completed_category_ids(request_id: str) -> Set[int]:
+        """
+        Get categories whose results were fully processed for a request.
+
+        Used to resume a request without repeating finished categories.
+        Results still carrying PENDING_SUMMARY were interrupted mid-pipeline
+        and do not count.
+
+        Args:
+            request_id: Drug request ID
+
+        Returns:
+            Set of category IDs
+        """
+        async with DatabaseConnection() as conn:
+            rows = await conn.fetch("""
+                SELECT DISTINCT category_id
+                FROM category_results
+                WHERE request_id = $1
+                  AND status = 'completed'
+                  AND summary IS DISTINCT FROM $2
+            """, request_id, DataStorageService.PENDING_SUMMARY)
+
+        return {row['category_id'] for row in rows}
+
     @staticmethod
     async def store_source_reference(
         category_result_id: str,
@@ -214,8 +234,8 @@ class DataStorageService:
         now = datetime.utcnow()
 
         try:
-            async for session in get_db_session():
-                await session.execute(text("""
+            async with DatabaseConnection() as conn:
+                await conn.execute("""
                     INSERT INTO source_references (
                         id, category_result_id, api_provider,
                         source_url, source_title, source_type,
@@ -223,25 +243,23 @@ class DataStorageService:
                         extracted_at
                     )
                     VALUES (
-                        :id, :result_id, :provider,
-                        :url, :title, :type,
-                        :snippet, :relevance, :credibility,
-                        :extracted
+                        $1, $2, $3,
+                        $4, $5, $6,
+                        $7, $8, $9,
+                        $10
                     )
-                """), {
-                    "id": source_id,
-                    "result_id": category_result_id,
-                    "provider": api_provider,
-                    "url": source_url,
-                    "title": source_title,
-                    "type": source_type,
-                    "snippet": content_snippet[:500] if content_snippet else None,
-                    "relevance": relevance_score,
-                    "credibility": credibility_score,
-                    "extracted": now
-                })
-
-                await session.commit()
+                """,
+                    source_id,
+                    category_result_id,
+                    api_provider,
+                    source_url,
+                    source_title,
+                    source_type,
+                    content_snippet[:500] if content_snippet else None,
+                    relevance_score,
+                    credibility_score,
+                    now
+                )
 
                 logger.debug(
                     "Source reference stored",
@@ -250,8 +268,6 @@ class DataStorageService:
                     category_result_id=category_result_id
                 )
 
-                break
-
             return source_id
 
         except Exception as e:
@@ -280,7 +296,7 @@ class DataStorageService:
         request_payload: Optional[Dict[str, Any]] = None
     ) -> Optional[str]:
         """
-        Store API usage log to database.
+        Queue API usage log for a batched write to the database.
 
         Args:
             request_id: Drug request ID
@@ -299,76 +315,44 @@ class DataStorageService:
             request_payload: Full request payload sent to API
 
         Returns:
-            API usage log ID if successful, None otherwise
+            API usage log ID if queued, None if dropped
         """
         log_id = str(uuid.uuid4())
-        now = datetime.utcnow()
 
-        # DEBUG: Log what we're receiving
-        logger.info(
-            "Storing API usage log - request_payload value",
+        # Written behind by the buffered log writer so provider fan-out never
+        # waits on this INSERT; JSON serialization also happens at flush time.
+        buffered = api_usage_log_writer.submit({
+            'id': log_id,
+            'request_id': request_id,
+            'category_result_id': category_result_id,
+            'api_provider': api_provider,
+            'endpoint': endpoint,
+            'response_status': response_status,
+            'response_time_ms': response_time_ms,
+            'token_count': token_count,
+            'cost_per_token': cost_per_token,
+            'total_cost': total_cost,
+            'timestamp': datetime.utcnow(),
+            'error_message': error_message,
+            'category_name': category_name,
+            'prompt_text': prompt_text,
+            'response_data': response_data,
+            'request_payload': request_payload
+        })
+
+        if not buffered:
+            logger.warning(
+                "API usage log dropped, log buffer full",
+                api_provider=api_provider,
+                request_id=request_id
+            )
+            return None
+
+        logger.debug(
+            "API usage log queued",
             log_id=log_id,
-            request_payload_type=type(request_payload).__name__,
-            request_payload_value=request_payload,
-            request_payload_is_none=request_payload is None,
-            request_payload_is_empty=not bool(request_payload) if request_payload else True
+            api_provider=api_provider,
+            request_id=request_id
         )
 
-        try:
-            async for session in get_db_session():
-                await session.execute(text("""
-                    INSERT INTO api_usage_logs (
-                        id, request_id, category_result_id,
-                        api_provider, endpoint,
-                        response_status, response_time_ms,
-                        token_count, cost_per_token, total_cost,
-                        timestamp, error_message,
-                        category_name, prompt_text, response_data, request_payload
-                    )
-                    VALUES (
-                        :id, :request_id, :result_id,
-                        :provider, :endpoint,
-                        :status, :response_time,
-                        :tokens, :cost_per_token, :cost,
-                        :timestamp, :error,
-                        :category_name, :prompt_text, CAST(:response_data AS jsonb), CAST(:request_payload AS jsonb)
-                    )
-                """), {
-                    "id": log_id,
-                    "request_id": request_id,
-                    "result_id": category_result_id,
-                    "provider": api_provider,
-                    "endpoint": endpoint,
-                    "status": response_status,
-                    "response_time": response_time_ms,
-                    "tokens": token_count,
-                    "cost_per_token": cost_per_token,
-                    "cost": total_cost,
-                    "timestamp": now,
-                    "error": error_message,
-                    "category_name": category_name,
-                    "prompt_text": prompt_text,
-                    "response_data": json.dumps(response_data) if response_data else None,
-                    "request_payload": json.dumps(request_payload) if request_payload else None
-                })
-
-                await session.commit()
-
-                logger.debug(
-                    "API usage log stored",
-                    log_id=log_id,
-                    api_provider=api_provider,
-                    request_id=request_id
-                )
-
-                break
-
-            return log_id
-
-        except Exception as e:
-            logger.error(
-                "Failed to store API usage log",
-                api_provider=api_provider,
-                error=str(e)
-            )
-            return None
\ No newline at end of file
+        return log_id
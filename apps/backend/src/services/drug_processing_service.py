@@ -0,0 +1,148 @@
+"""
+Drug request processing.
+
+Runs a drug request through all enabled categories and keeps the request's
+status and progress in step with the categories actually completed. Safe to
+run more than once for the same request: completed requests are skipped and
+interrupted ones resume from the categories already stored.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+import aiohttp
+import structlog
+
+from .audit_service import AuditService
+from .data_storage_service import DataStorageService
+from .provider_service import ProviderService
+from .request_db_service import RequestDatabaseService
+
+logger = structlog.get_logger(__name__)
+
+
+async def send_webhook(url: str, data: Dict[str, Any]):
+    """Send webhook notification."""
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(url, json=data, timeout=10) as response:
+                print(f"Webhook sent to {url}: {response.status}")
+    except Exception as e:
+        print(f"Webhook error: {e}")
+
+
+class DrugProcessingService:
+    """Service that processes a single drug request end to end."""
+
+    def __init__(
+        self,
+        provider_service: ProviderService,
+        request_db_service: RequestDatabaseService
+    ):
+        self.provider_service = provider_service
+        self.request_db_service = request_db_service
+
+    async def _audit(self, event_type: str, request_id: str, description: str, metadata: Dict[str, Any]):
+        try:
+            await AuditService.log_event(
+                event_type=event_type,
+                entity_type="drug_request",
+                entity_id=request_id,
+                event_description=description,
+                request_id=request_id,
+                audit_metadata=metadata
+            )
+        except Exception:
+            pass  # Don't fail on audit errors
+
+    async def process(self, request_id: str, bypass_cache: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Process a drug request, resuming if it was interrupted.
+
+        Args:
+            request_id: Drug request ID
+            bypass_cache: Force fresh provider calls instead of cached responses
+
+        Returns:
+            Processing summary, or None if the request is missing or already completed
+
+        Raises:
+            Exception: Processing errors are propagated so the caller can retry
+        """
+        request = await self.request_db_service.get_request(request_id)
+        if not request:
+            logger.warning("Request not found, skipping", request_id=request_id)
+            return None
+
+        if request["status"] == "completed":
+            logger.info("Request already completed, skipping", request_id=request_id)
+            return None
+
+        drug_name = request["drugName"]
+        completed_category_ids = await DataStorageService.get_completed_category_ids(request_id)
+        resuming = bool(completed_category_ids)
+
+        await self._audit(
+            "process_start",
+            request_id,
+            f"{'Resumed' if resuming else 'Started'} processing {drug_name}",
+            {"drug_name": drug_name, "resumed_categories": len(completed_category_ids)}
+        )
+        await self.request_db_service.update_request(request_id, {"status": "processing"})
+
+        async def report_progress(completed: int, total: int):
+            await self.request_db_service.update_request(request_id, {
+                "completedCategories": completed,
+                "totalCategories": total
+            })
+
+        # Call providers with category-based prompts - THIS STORES TO DB
+        # provider_service will store category_results, source_references, and api_usage_logs
+        summary = await self.provider_service.process_drug_with_categories(
+            drug_name,
+            request_id,
+            bypass_cache=bypass_cache,
+            skip_category_ids=completed_category_ids,
+            progress_callback=report_progress
+        )
+
+        completed_at = datetime.now().isoformat()
+        await self.request_db_service.update_request(request_id, {
+            "status": "completed",
+            "completedAt": completed_at
+        })
+        await self._audit(
+            "process_complete",
+            request_id,
+            f"Completed processing {drug_name}",
+            {"drug_name": drug_name}
+        )
+
+        # Send webhook if configured
+        if request.get("webhookUrl"):
+            await send_webhook(
+                request["webhookUrl"],
+                {
+                    "requestId": request_id,
+                    "status": "completed",
+                    "drugName": drug_name,
+                    "completedAt": completed_at
+                }
+            )
+
+        return summary
+
+    async def mark_failed(self, request_id: str, error: str):
+        """
+        Mark a request as failed after its final attempt.
+
+        Args:
+            request_id: Drug request ID
+            error: Failure description
+        """
+        await self.request_db_service.update_request(request_id, {"status": "failed"})
+        await self._audit(
+            "process_error",
+            request_id,
+            f"Failed processing request: {error[:500]}",
+            {"error": error[:2000]}
+        )
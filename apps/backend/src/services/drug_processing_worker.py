@@ -0,0 +1,286 @@
+"""
+Worker pool consuming drug processing jobs from the durable work queue.
+
+The API only enqueues jobs (keyed by request ID). Workers run in separate
+processes (see run_worker.py), each with a fixed number of concurrent job
+slots. A slot keeps its job's lease alive while it runs; if the worker
+dies, the lease lapses after the visibility timeout and another worker
+resumes the request from the categories already stored.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+from typing import List, Optional
+import structlog
+
+from ..core.message_queue import WorkMessage, create_work_queue
+from .drug_processing_service import DrugProcessingService
+
+logger = structlog.get_logger(__name__)
+
+DRUG_PROCESSING_QUEUE = "drug_processing"
+
+# Seconds a job stays invisible to other workers without a heartbeat
+DEFAULT_VISIBILITY_TIMEOUT = float(os.getenv('WORKER_VISIBILITY_TIMEOUT', '600'))
+DEFAULT_MAX_ATTEMPTS = int(os.getenv('WORKER_MAX_ATTEMPTS', '3'))
+
+
+class DrugProcessingWorker:
+    """Consumes drug processing jobs with a fixed number of concurrent slots."""
+
+    def __init__(
+        self,
+        queue,
+        processing_service: DrugProcessingService,
+        concurrency: int = 2,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        poll_interval: float = 1.0
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            queue: Work queue backend (MessageQueueService or SQLiteMessageQueue)
+            processing_service: Service that processes one request
+            concurrency: Jobs processed at the same time
+            visibility_timeout: Lease length in seconds; renewed every third of it
+            max_attempts: Attempts before a job is dead-lettered and the request failed
+            poll_interval: Seconds to wait when the queue is empty
+        """
+        self.queue = queue
+        self.processing_service = processing_service
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self._running = False
+        self._slots: List[asyncio.Task] = []
+        self.stats = {"processed": 0, "retried": 0, "failed": 0}
+
+    async def start(self):
+        """Declare the queue and start the job slots."""
+        await self.queue.declare_work_queue(
+            DRUG_PROCESSING_QUEUE,
+            visibility_timeout=self.visibility_timeout,
+            max_attempts=self.max_attempts
+        )
+        self._running = True
+        self._slots = [
+            asyncio.create_task(self._run_slot(slot))
+            for slot in range(self.concurrency)
+        ]
+        logger.info("Drug processing worker started", concurrency=self.concurrency)
+
+    async def stop(self, timeout: Optional[float] = None):
+        """
+        Stop taking jobs and wait for running ones to finish.
+
+        Args:
+            timeout: Seconds to wait before cancelling running jobs; cancelled
+                jobs become visible again once their lease lapses
+        """
+        self._running = False
+        if not self._slots:
+            return
+
+        _, pending = await asyncio.wait(self._slots, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._slots = []
+        logger.info("Drug processing worker stopped", **self.stats)
+
+    async def _run_slot(self, slot: int):
+        while self._running:
+            try:
+                message = await self.queue.reserve_work(DRUG_PROCESSING_QUEUE)
+            except Exception as e:
+                logger.error("Failed to reserve job", slot=slot, error=str(e))
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if message is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            await self.handle(message)
+
+    async def _keep_lease(self, message: WorkMessage):
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                await self.queue.extend_work(message)
+            except Exception as e:
+                logger.warning("Failed to extend job lease", job_id=message.job_id, error=str(e))
+
+    async def handle(self, message: WorkMessage):
+        """
+        Process one job, then ack it, retry it or dead-letter it.
+
+        A job whose lease expired on its final attempt is already
+        dead-lettered; its request is only marked failed.
+
+        Args:
+            message: Reserved job
+        """
+        request_id = message.payload["request_id"]
+        if message.expired:
+            # The last worker died or hung holding the final attempt
+            logger.error("Job lease expired on final attempt", request_id=request_id, attempt=message.attempts)
+            self.stats["failed"] += 1
+            await self.processing_service.mark_failed(
+                request_id, f"Worker lease expired on attempt {message.attempts}"
+            )
+            return
+
+        logger.info("Processing job", request_id=request_id, attempt=message.attempts)
+
+        heartbeat = asyncio.create_task(self._keep_lease(message))
+        try:
+            await self.processing_service.process(
+                request_id,
+                bypass_cache=message.payload.get("bypass_cache", False)
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            import traceback
+            error = f"{str(e)}\n{traceback.format_exc()}"
+            logger.error("Job failed", request_id=request_id, attempt=message.attempts, error=str(e))
+
+            if await self.queue.fail_work(message, error):
+                self.stats["retried"] += 1
+            else:
+                self.stats["failed"] += 1
+                await self.processing_service.mark_failed(request_id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        await self.queue.ack_work(message)
+        self.stats["processed"] += 1
+
+
+async def enqueue_drug_processing(queue, request_id: str, bypass_cache: bool = False) -> bool:
+    """
+    Enqueue a drug request for processing.
+
+    Args:
+        queue: Work queue backend
+        request_id: Drug request ID (also the job's idempotency key)
+        bypass_cache: Force fresh provider calls
+
+    Returns:
+        True if enqueued, False if the request is already queued or running
+    """
+    if DRUG_PROCESSING_QUEUE not in queue.work_queues:
+        await queue.declare_work_queue(
+            DRUG_PROCESSING_QUEUE,
+            visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT,
+            max_attempts=DEFAULT_MAX_ATTEMPTS
+        )
+    return await queue.enqueue_work(
+        DRUG_PROCESSING_QUEUE,
+        request_id,
+        {"request_id": request_id, "bypass_cache": bypass_cache}
+    )
+
+
+async def run_worker(concurrency: int):
+    """
+    Run one worker process until SIGINT/SIGTERM.
+
+    Opens the same shared pools as the API process, consumes jobs, and on
+    shutdown lets running jobs finish before flushing buffered logs.
+
+    Args:
+        concurrency: Concurrent job slots in this process
+    """
+    from ..utils.db_connection import init_db_pool, close_db_pool
+    from .buffered_log_writer import start_log_writers, stop_log_writers
+    from .category_validation_engine import shutdown_table_parse_pool
+    from .pipeline_config_service import PipelineConfigService
+    from .progress_bus import get_progress_bus
+    from .provider_service import ProviderService
+    from .request_db_service import RequestDatabaseService
+
+    provider_service = ProviderService()
+    await provider_service.open_sessions()
+    try:
+        await init_db_pool()
+    except ConnectionError as e:
+        logger.warning("Database pool not initialized at startup", error=str(e))
+    await start_log_writers()
+    await PipelineConfigService.start_listener()
+    await get_progress_bus().start()
+
+    queue = create_work_queue()
+    worker = DrugProcessingWorker(
+        queue,
+        DrugProcessingService(provider_service, RequestDatabaseService()),
+        concurrency=concurrency
+    )
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            pass  # Windows: rely on KeyboardInterrupt
+
+    await worker.start()
+    try:
+        await stop_event.wait()
+    finally:
+        await worker.stop(timeout=float(os.getenv('WORKER_SHUTDOWN_TIMEOUT', '30')))
+        await queue.disconnect()
+        await provider_service.close_sessions()
+        await PipelineConfigService.stop_listener()
+        await get_progress_bus().stop()
+        await stop_log_writers()
+        await close_db_pool()
+        shutdown_table_parse_pool()
+
+
+def _worker_process_main(concurrency: int):
+    try:
+        asyncio.run(run_worker(concurrency))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_worker_pool(processes: int, concurrency: int):
+    """
+    Start worker processes and wait for them to exit.
+
+    Args:
+        processes: Number of worker processes
+        concurrency: Concurrent job slots per process
+    """
+    if processes <= 1:
+        _worker_process_main(concurrency)
+        return
+
+    workers = [
+        multiprocessing.Process(
+            target=_worker_process_main,
+            args=(concurrency,),
+            name=f"drug-worker-{index}"
+        )
+        for index in range(processes)
+    ]
+    for process in workers:
+        process.start()
+
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+        for process in workers:
+            process.join()
@@ -18,6 +18,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from ..utils.db_connection import get_db_connection, DatabaseConnection
 from ..core.llm_service import LLMService
+from .phase1_snapshot import get_phase1_snapshots
 
 logger = logging.getLogger(__name__)
 
@@ -176,85 +177,22 @@ class FinalOutputGenerator:
         """
         Gather all Phase 1 category data from merged_data_results and category_results.
 
+        Reads the request's shared Phase 1 snapshot rather than querying again.
+
         Returns dict keyed by category name with structured_data + LLM summary.
         """
-        print("\n" + "="*100)
-        print("METHOD CALLED: _gather_phase1_categories")
-        print(f"Request ID: {request_id}")
-        print("="*100 + "\n")
-
         logger.info(f"[FINAL_OUTPUT] Gathering Phase 1 categories for {request_id}")
 
-        async with DatabaseConnection() as conn:
-            # Join merged_data_results with category_results to get LLM summary
-            results = await conn.fetch("""
-                SELECT
-                    mdr.category_name,
-                    mdr.merged_content,
-                    mdr.structured_data,
-                    mdr.merge_confidence_score,
-                    mdr.data_quality_score,
-                    cr.summary as llm_summary
-                FROM merged_data_results mdr
-                LEFT JOIN category_results cr ON cr.request_id = mdr.request_id
-                    AND cr.category_name = mdr.category_name
-                WHERE mdr.request_id = $1
-                ORDER BY mdr.created_at
-            """, request_id)
-
-            categories = {}
-            for row in results:
-                category_name = row['category_name']
-
-                # Parse structured_data if it's a string
-                structured_data = row['structured_data']
-                if isinstance(structured_data, str):
-                    try:
-                        structured_data = json.loads(structured_data)
-                    except (json.JSONDecodeError, TypeError):
-                        structured_data = {}
-                elif structured_data is None:
-                    structured_data = {}
-
-                # Use LLM summary only, do not fall back to merged_content
-                # DEBUG: Check what keys are in the row
-                print(f"\n{'='*80}")
-                print(f"DEBUG - Category: {category_name}")
-                print(f"  Row keys: {list(row.keys())}")
-
-                llm_summary_value = row.get('llm_summary')
-                merged_content_value = row.get('merged_content')
-
-                print(f"  llm_summary: {'YES' if llm_summary_value else 'NO'} ({len(llm_summary_value) if llm_summary_value else 0} chars)")
-                print(f"  merged_content: {'YES' if merged_content_value else 'NO'} ({len(merged_content_value) if merged_content_value else 0} chars)")
-
-                # Use LLM summary instead of merged_content
-                if llm_summary_value:
-                    summary_text = llm_summary_value
-                    print(f"  USING: LLM Summary ({len(summary_text)} chars)")
-                else:
-                    summary_text = ""  # Empty string if no LLM summary available
-                    print(f"  WARNING: No LLM summary available for {category_name}")
-
-                # Double-check we're NOT using merged_content
-                if llm_summary_value and llm_summary_value == merged_content_value:
-                    print(f"  WARNING: LLM summary matches merged_content!")
-
-                print(f"{'='*80}\n")
-
-                logger.info(f"[FINAL_OUTPUT] Category: {category_name}, LLM Summary: {bool(llm_summary_value)}, Len: {len(summary_text)}")
-
-                # Build category dict with LLM summary + structured fields
-                # Put summary AFTER spreading structured_data won't overwrite
-                category_dict = {
-                    **structured_data,  # Spread the structured data FIRST
-                    "summary": summary_text  # Then set summary - this overwrites any 'summary' in structured_data
-                }
+        snapshot = await get_phase1_snapshots().get(request_id)
+        categories = snapshot.output_categories()
 
-                categories[category_name] = category_dict
-                logger.info(f"[FINAL_OUTPUT] Loaded category: {category_name}")
+        for category_name, category_dict in categories.items():
+            # LLM summary only, never merged_content
+            if not category_dict["summary"]:
+                logger.warning(f"[FINAL_OUTPUT] No LLM summary available for {category_name}")
+            logger.info(f"[FINAL_OUTPUT] Loaded category: {category_name}, Len: {len(category_dict['summary'])}")
 
-            return categories
+        return categories
 
     async def _build_suitability_matrix(self, request_id: str, delivery_method: str) -> Dict[str, Any]:
         """
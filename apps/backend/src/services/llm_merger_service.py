@@ -1,15 +1,21 @@
 """
 LLM-Assisted Data Merger Service
 Uses GPT-5-nano to intelligently merge conflicting pharmaceutical data from multiple sources
+
+Inputs larger than one prompt budget are merged and extracted map-reduce
+style in token-budgeted chunks (see merge_engine) instead of being truncated.
 """
 
 import json
 import os
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from openai import AsyncOpenAI
 import structlog
 from .data_storage_service import DataStorageService
+from .merge_engine import MergeEngine, merge_structured, split_text
+from ..integrations.provider_scheduler import get_provider_scheduler, estimate_tokens
+from ..integrations.response_cache import get_response_cache
 
 logger = structlog.get_logger(__name__)
 
@@ -22,6 +28,63 @@ class LLMMergerService:
         self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.model = "gpt-5-nano"  # Fast, cheap model for merge assistance
         self.temperature = 1  # Default temperature (some models only support this)
+        self.scheduler = get_provider_scheduler()
+        self.response_cache = get_response_cache()
+
+        # Prompt token budgets; larger inputs are split and merged in parallel
+        self.merge_chunk_tokens = int(os.getenv("MERGE_CHUNK_TOKENS", "16000"))
+        self.extract_chunk_tokens = int(os.getenv("EXTRACT_CHUNK_TOKENS", "8000"))
+        self.max_parallel = int(os.getenv("MERGE_MAX_PARALLEL", "4"))
+
+    async def _complete_json(
+        self,
+        system_prompt: str,
+        prompt: str,
+        request_id: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], int]:
+        """Run one JSON-mode completion; returns (parsed response, total tokens)"""
+        completion = await self.scheduler.run(
+            "openai",
+            lambda: self.client.chat.completions.create(
+                model=self.model,
+                temperature=self.temperature,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": system_prompt
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                response_format={"type": "json_object"}
+            ),
+            tenant=request_id or "default",
+            estimated_tokens=estimate_tokens(prompt),
+            count_tokens=lambda c: c.usage.total_tokens
+        )
+        return json.loads(completion.choices[0].message.content), completion.usage.total_tokens
+
+    def _create_engine(
+        self,
+        system_prompt: str,
+        category_name: str,
+        chunk_tokens: int,
+        request_id: Optional[str] = None
+    ) -> MergeEngine:
+        """Merge engine whose chunk results are cached by prompt content"""
+        return MergeEngine(
+            complete=lambda prompt: self._complete_json(system_prompt, prompt, request_id),
+            cache_key=lambda prompt: self.response_cache.make_key(
+                "openai", self.model, self.temperature, prompt, system_prompt
+            ),
+            chunk_tokens=chunk_tokens,
+            max_parallel=self.max_parallel,
+            cache=self.response_cache,
+            category=category_name,
+            model=self.model
+        )
 
     async def merge_conflicting_responses(
         self,
@@ -49,40 +112,28 @@ class LLMMergerService:
             response_count=len(responses)
         )
 
-        # Prepare data for LLM
-        merge_prompt = self._create_merge_prompt(
-            category_name,
-            drug_name,
-            responses
-        )
+        engine = self._create_engine(self._get_system_prompt(), category_name, self.merge_chunk_tokens, request_id)
 
         try:
-            # Call GPT-5-nano for merge assistance
+            # Call GPT-5-nano for merge assistance, map-reduce style when the
+            # sources do not fit one prompt
             start_time = time.time()
-            completion = await self.client.chat.completions.create(
-                model=self.model,
-                temperature=self.temperature,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt()
-                    },
-                    {
-                        "role": "user",
-                        "content": merge_prompt
-                    }
-                ],
-                response_format={"type": "json_object"}
+            llm_response = await engine.map_reduce(
+                [resp.get("response", "") for resp in responses],
+                lambda sources: self._create_merge_prompt(category_name, drug_name, sources)
             )
             response_time_ms = int((time.time() - start_time) * 1000)
-
-            # Parse LLM response
-            llm_response = json.loads(completion.choices[0].message.content)
+            report = engine.report()
+            tokens_used = report["tokens_used"]
 
             logger.info(
                 "LLM merge completed",
                 confidence=llm_response.get("overall_confidence", 0),
-                conflicts_resolved=len(llm_response.get("conflicts_resolved", []))
+                conflicts_resolved=len(llm_response.get("conflicts_resolved", [])),
+                chunks=report["chunks"],
+                levels=report["levels"],
+                cache_hits=report["cache_hits"],
+                stages=report["stages"]
             )
 
             # Log API usage
@@ -95,12 +146,12 @@ class LLMMergerService:
                         endpoint=self.model,
                         response_status=200,
                         response_time_ms=response_time_ms,
-                        token_count=completion.usage.total_tokens,
-                        total_cost=self._calculate_cost(completion.usage.total_tokens),
+                        token_count=tokens_used,
+                        total_cost=self._calculate_cost(tokens_used),
                         category_name=category_name,
                         prompt_text=f"Merge {len(responses)} sources for {drug_name}",
-                        response_data={"confidence": llm_response.get("overall_confidence"), "conflicts": len(llm_response.get("conflicts_resolved", []))},
-                        request_payload={"drug_name": drug_name, "sources": len(responses), "operation": "merge"}
+                        response_data={"confidence": llm_response.get("overall_confidence"), "conflicts": len(llm_response.get("conflicts_resolved", [])), "stages": report["stages"]},
+                        request_payload={"drug_name": drug_name, "sources": len(responses), "operation": "merge", "chunks": report["chunks"]}
                     )
                 except Exception as log_error:
                     logger.warning("Failed to log API usage", error=str(log_error))
@@ -115,8 +166,9 @@ class LLMMergerService:
                     "merge_method": "llm_assisted",
                     "model": self.model,
                     "sources_merged": len(responses),
-                    "tokens_used": completion.usage.total_tokens,
-                    "cost_estimate": self._calculate_cost(completion.usage.total_tokens)
+                    "tokens_used": tokens_used,
+                    "cost_estimate": self._calculate_cost(tokens_used),
+                    "merge_plan": report
                 }
             }
 
@@ -194,22 +246,15 @@ class LLMMergerService:
         self,
         category_name: str,
         drug_name: str,
-        responses: List[Dict[str, Any]]
+        sources: List[str]
     ) -> str:
-        """Create merge prompt for LLM"""
+        """Create merge prompt for LLM (sources are already within the token budget)"""
 
-        prompt = f"""Merge the following {len(responses)} data sources about {category_name} for {drug_name}:
+        prompt = f"""Merge the following {len(sources)} data sources about {category_name} for {drug_name}:
 
 """
 
-        for i, resp in enumerate(responses, 1):
-            content = resp.get("response", "")
-
-            # Truncate only extremely long responses to fit in context window
-            # Increased limit to preserve maximum detail for consolidation
-            if len(str(content)) > 15000:
-                content = str(content)[:15000] + "... [truncated]"
-
+        for i, content in enumerate(sources, 1):
             prompt += f"""
 === DATA SOURCE {i} ===
 {content}
@@ -397,37 +442,20 @@ Return JSON only with comprehensive merged_content."""
         }
         return schemas.get(category_name, {})
 
-    async def extract_structured_data(
-        self,
-        merged_content: str,
-        category_name: str,
-        request_id: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """
-        Extract structured data from merged content
-
-        Args:
-            merged_content: Merged text content
-            category_name: Category for extraction schema
-            request_id: Optional request ID for API logging
-
-        Returns:
-            Structured data dictionary
-        """
-        schema = self._get_category_schema(category_name)
-
+    def _create_extraction_prompt(self, text: str, category_name: str, schema: Dict[str, Any]) -> str:
+        """Create structured extraction prompt for one chunk of merged content"""
         if not schema:
             # Fallback to generic extraction for unknown categories
             extraction_prompt = f"""Extract structured data from this {category_name} text:
 
-{merged_content[:3000]}
+{text}
 
 Return JSON with relevant fields for {category_name}."""
         else:
             extraction_prompt = f"""Extract structured data from this {category_name} text and format it according to the schema structure.
 
 TEXT TO EXTRACT FROM:
-{merged_content[:20000]}
+{text}
 
 REQUIRED OUTPUT SCHEMA STRUCTURE (the "<string: ...>" parts are placeholders showing data types - REPLACE them with actual extracted values):
 {json.dumps(schema, indent=2)}
@@ -483,31 +511,65 @@ CRITICAL INSTRUCTIONS - READ CAREFULLY:
 
 6. Return ONLY valid JSON matching the schema structure with ACTUAL EXTRACTED VALUES."""
 
+        return extraction_prompt
+
+    def _get_extraction_system_prompt(self) -> str:
+        """Get system prompt for structured extraction"""
+        return "You are a data extraction expert. Extract pharmaceutical data from text and format it according to the provided schema structure. CRITICAL: The schema shows placeholders like '<string: ...>' - you MUST replace these with ACTUAL values extracted from the text. NEVER use placeholder text as actual data. Return valid JSON only."
+
+    async def extract_structured_data(
+        self,
+        merged_content: str,
+        category_name: str,
+        request_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract structured data from merged content
+
+        Args:
+            merged_content: Merged text content
+            category_name: Category for extraction schema
+            request_id: Optional request ID for API logging
+
+        Returns:
+            Structured data dictionary
+        """
+        schema = self._get_category_schema(category_name)
+        engine = self._create_engine(
+            self._get_extraction_system_prompt(), category_name, self.extract_chunk_tokens, request_id
+        )
+
+        # Long content is extracted chunk by chunk in parallel and the
+        # partial extractions are combined, instead of cutting the text
+        budget = engine.piece_budget(lambda texts: self._create_extraction_prompt("", category_name, schema))
+        chunks = split_text(merged_content, budget) or [""]
+
         try:
             start_time = time.time()
-            completion = await self.client.chat.completions.create(
-                model=self.model,
-                temperature=1,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a data extraction expert. Extract pharmaceutical data from text and format it according to the provided schema structure. CRITICAL: The schema shows placeholders like '<string: ...>' - you MUST replace these with ACTUAL values extracted from the text. NEVER use placeholder text as actual data. Return valid JSON only."
-                    },
-                    {
-                        "role": "user",
-                        "content": extraction_prompt
-                    }
-                ],
-                response_format={"type": "json_object"}
+            results = await engine.run_many(
+                "extract",
+                [self._create_extraction_prompt(chunk, category_name, schema) for chunk in chunks]
             )
             response_time_ms = int((time.time() - start_time) * 1000)
 
-            structured_data = json.loads(completion.choices[0].message.content)
+            extracted = [result for result in results if not isinstance(result, BaseException)]
+            if not extracted:
+                raise results[0]
+            if len(extracted) < len(results):
+                logger.warning("Some extraction chunks failed", category=category_name,
+                               failed=len(results) - len(extracted), chunks=len(results))
+
+            structured_data = extracted[0] if len(extracted) == 1 else merge_structured(extracted)
+            report = engine.report()
+            tokens_used = report["tokens_used"]
 
             logger.info(
                 "Structured data extracted",
                 category=category_name,
-                fields=len(structured_data.keys())
+                fields=len(structured_data.keys()),
+                chunks=len(chunks),
+                cache_hits=report["cache_hits"],
+                stages=report["stages"]
             )
 
             # Log API usage
@@ -520,12 +582,12 @@ CRITICAL INSTRUCTIONS - READ CAREFULLY:
                         endpoint=self.model,
                         response_status=200,
                         response_time_ms=response_time_ms,
-                        token_count=completion.usage.total_tokens,
-                        total_cost=self._calculate_cost(completion.usage.total_tokens),
+                        token_count=tokens_used,
+                        total_cost=self._calculate_cost(tokens_used),
                         category_name=category_name,
                         prompt_text=f"Extract structured data for {category_name}",
-                        response_data={"fields_extracted": len(structured_data.keys())},
-                        request_payload={"category": category_name, "operation": "extract"}
+                        response_data={"fields_extracted": len(structured_data.keys()), "stages": report["stages"]},
+                        request_payload={"category": category_name, "operation": "extract", "chunks": len(chunks)}
                     )
                 except Exception as log_error:
                     logger.warning("Failed to log API usage", error=str(log_error))
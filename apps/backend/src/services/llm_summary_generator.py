@@ -8,6 +8,7 @@ from openai import AsyncOpenAI
 import anthropic
 import structlog
 from .data_storage_service import DataStorageService
+from ..integrations.provider_scheduler import get_provider_scheduler, estimate_tokens
 
 logger = structlog.get_logger(__name__)
 
@@ -18,6 +19,7 @@ class LLMSummaryGenerator:
     def __init__(self, summary_config_service):
         """Initialize with summary configuration service"""
         self.config_service = summary_config_service
+        self.scheduler = get_provider_scheduler()
 
     async def generate_summary(
         self,
@@ -154,7 +156,8 @@ CRITICAL DATA QUALITY REQUIREMENTS:
                 provider_config=provider_config,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
-                override_max_tokens=effective_max_tokens
+                override_max_tokens=effective_max_tokens,
+                request_id=request_id
             )
 
             generation_time_ms = int((time.time() - start_time) * 1000)
@@ -279,9 +282,10 @@ CRITICAL DATA QUALITY REQUIREMENTS:
         provider_config: Dict[str, Any],
         system_prompt: str,
         user_prompt: str,
-        override_max_tokens: Optional[int] = None
+        override_max_tokens: Optional[int] = None,
+        request_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Call the configured LLM provider"""
+        """Call the configured LLM provider through the provider scheduler"""
         provider_key = provider_config['key']
         model = provider_config['model']
         temperature = provider_config['temperature']
@@ -289,28 +293,27 @@ CRITICAL DATA QUALITY REQUIREMENTS:
         api_key = provider_config['api_key']
 
         if provider_key == 'openai':
-            return await self._call_openai(
-                api_key, model, system_prompt, user_prompt,
-                temperature, max_tokens
-            )
+            call = self._call_openai
         elif provider_key == 'claude':
-            return await self._call_anthropic(
-                api_key, model, system_prompt, user_prompt,
-                temperature, max_tokens
-            )
+            call = self._call_anthropic
         elif provider_key == 'gemini':
-            return await self._call_gemini(
-                api_key, model, system_prompt, user_prompt,
-                temperature, max_tokens
-            )
+            call = self._call_gemini
         elif provider_key == 'perplexity':
-            return await self._call_perplexity(
-                api_key, model, system_prompt, user_prompt,
-                temperature, max_tokens
-            )
+            call = self._call_perplexity
         else:
             raise ValueError(f"Unsupported provider: {provider_key}")
 
+        return await self.scheduler.run(
+            provider_key,
+            lambda: call(
+                api_key, model, system_prompt, user_prompt,
+                temperature, max_tokens
+            ),
+            tenant=request_id or "default",
+            estimated_tokens=estimate_tokens(system_prompt) + estimate_tokens(user_prompt) + max_tokens,
+            count_tokens=lambda result: result.get("tokens_used", 0)
+        )
+
     async def _call_openai(
         self,
         api_key: str,
@@ -0,0 +1,337 @@
+"""
+Map-Reduce Merge Engine
+Token-budgeted LLM merging for inputs too large for one prompt.
+
+Sources are split at paragraph/line boundaries into pieces that fit a token
+budget and packed into groups. Each group is merged by its own LLM call
+(map, in parallel), then the partial merges are merged again (reduce) until
+one call covers everything. Group boundaries are partly content-defined, so
+an edited source usually only changes its own group. Every call is cached
+by a hash of its prompt, so a re-run only pays for groups whose content
+changed. Calls, cache hits, tokens and latency are accounted per stage.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import structlog
+
+from ..integrations.provider_scheduler import estimate_tokens
+from ..integrations.response_cache import ResponseCache
+
+try:
+    import tiktoken
+except ImportError:  # optional; the four-characters-per-token estimate is used instead
+    tiktoken = None
+
+logger = structlog.get_logger(__name__)
+
+_encoding = None
+
+# Split oversized text at the coarsest boundary that works
+_SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+# On average every RESYNC-th piece starts a new group regardless of space
+_RESYNC = 4
+
+# (parsed JSON result, total tokens used)
+CompletionCall = Callable[[str], Awaitable[Tuple[Dict[str, Any], int]]]
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        try:
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:  # encoding files unavailable offline
+            logger.warning("Tokenizer unavailable, estimating tokens", error=str(e))
+            _encoding = False
+    return _encoding or None
+
+
+def count_tokens(text: Any) -> int:
+    """Count tokens with tiktoken when available, otherwise estimate"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(str(text), disallowed_special=()))
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into pieces of at most max_tokens
+
+    Paragraph boundaries are preferred, then lines, sentences and words;
+    text with no usable boundary is cut by length.
+    """
+    text = str(text or "")
+    if not text.strip():
+        return []
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    for separator in _SEPARATORS:
+        units = [unit for unit in text.split(separator) if unit.strip()]
+        if len(units) < 2:
+            continue
+
+        pieces, current = [], ""
+        for unit in units:
+            candidate = f"{current}{separator}{unit}" if current else unit
+            if current and count_tokens(candidate) > max_tokens:
+                pieces.append(current)
+                current = unit
+            else:
+                current = candidate
+        pieces.append(current)
+        return [part for piece in pieces for part in split_text(piece, max_tokens)]
+
+    width = max(1, max_tokens * 4)
+    return [text[i:i + width] for i in range(0, len(text), width)]
+
+
+def plan_groups(pieces: List[str], max_tokens: int) -> List[List[str]]:
+    """
+    Pack pieces, in order, into groups of at most max_tokens
+
+    A group also closes before a piece whose content hash marks a boundary,
+    so boundaries after an edit realign instead of all shifting.
+    """
+    sizes = [count_tokens(piece) for piece in pieces]
+    if sum(sizes) <= max_tokens:
+        return [list(pieces)] if pieces else []
+
+    groups: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for piece, tokens in zip(pieces, sizes):
+        boundary = int(hashlib.sha256(piece.encode()).hexdigest()[:8], 16) % _RESYNC == 0
+        if current and (used + tokens > max_tokens or boundary):
+            groups.append(current)
+            current, used = [], 0
+        current.append(piece)
+        used += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _union(items: List[Any]) -> List[Any]:
+    """Order-preserving de-duplication of JSON-serializable items"""
+    seen, unique = set(), []
+    for item in items:
+        key = json.dumps(item, sort_keys=True, default=str)
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+class MergeEngine:
+    """
+    Runs the LLM calls of one merge or extraction operation
+
+    Create one per operation; ``report`` then describes that operation.
+    """
+
+    def __init__(
+        self,
+        complete: CompletionCall,
+        cache_key: Callable[[str], str],
+        chunk_tokens: int,
+        max_parallel: int = 4,
+        cache: Optional[ResponseCache] = None,
+        category: Optional[str] = None,
+        model: Optional[str] = None,
+        max_levels: int = 4
+    ):
+        """
+        Args:
+            complete: Performs one LLM call for a prompt
+            cache_key: Content address of a prompt
+            chunk_tokens: Token budget of one prompt, template included
+            max_parallel: Calls in flight at once within a stage
+            cache: Response cache for call results (None disables caching)
+            category: Category name, used for the cache TTL
+            model: Model name, stored with cached results
+            max_levels: Reduce levels before partials are concatenated
+        """
+        self.complete = complete
+        self.cache_key = cache_key
+        self.chunk_tokens = chunk_tokens
+        self.cache = cache
+        self.category = category
+        self.model = model
+        self.max_levels = max_levels
+        self._semaphore = asyncio.Semaphore(max(1, max_parallel))
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.chunks = 0
+        self.levels = 0
+
+    def _stage(self, name: str) -> Dict[str, Any]:
+        return self.stages.setdefault(name, {
+            'calls': 0,
+            'cache_hits': 0,
+            'prompt_tokens': 0,
+            'tokens_used': 0,
+            'latency_ms': 0
+        })
+
+    async def run(self, stage: str, prompt: str) -> Dict[str, Any]:
+        """
+        Run one prompt, served from the cache when its content is unchanged
+
+        Returns:
+            Parsed JSON result
+        """
+        stats = self._stage(stage)
+        stats['calls'] += 1
+        stats['prompt_tokens'] += count_tokens(prompt)
+        called = False
+
+        async def call() -> Dict[str, Any]:
+            nonlocal called
+            called = True
+            result, tokens = await self.complete(prompt)
+            stats['tokens_used'] += tokens
+            return {"result": result, "tokens": tokens}
+
+        async with self._semaphore:
+            if self.cache is None:
+                value = await call()
+            else:
+                value = await self.cache.get_or_call(
+                    self.cache_key(prompt), call,
+                    category=self.category, provider="openai", model=self.model,
+                    cacheable=lambda v: bool(v["result"])
+                )
+        if not called:
+            stats['cache_hits'] += 1
+        return value["result"]
+
+    async def run_many(self, stage: str, prompts: List[str]) -> List[Any]:
+        """
+        Run prompts in parallel (bounded by max_parallel)
+
+        Returns:
+            Results in prompt order; a failed call's entry is its exception
+        """
+        started = time.monotonic()
+        results = await asyncio.gather(*(self.run(stage, prompt) for prompt in prompts), return_exceptions=True)
+        self._stage(stage)['latency_ms'] += int((time.monotonic() - started) * 1000)
+        return results
+
+    def piece_budget(self, render: Callable[[List[str]], str]) -> int:
+        """Tokens left for source text once the prompt template is rendered"""
+        return max(256, self.chunk_tokens - count_tokens(render([])))
+
+    async def map_reduce(self, sources: List[str], render: Callable[[List[str]], str]) -> Dict[str, Any]:
+        """
+        Merge sources of any size within the prompt budget
+
+        Args:
+            sources: Source texts
+            render: Builds the merge prompt for a list of texts
+
+        Returns:
+            Final merge result; conflicts_resolved and key_findings include
+            those found by the partial merges
+        """
+        budget = self.piece_budget(render)
+        texts = [text for text in (str(s or "") for s in sources) if text.strip()]
+        conflicts: List[Any] = []
+        findings: List[Any] = []
+
+        while True:
+            groups = plan_groups([piece for text in texts for piece in split_text(text, budget)], budget) or [[]]
+            if self.levels == 0:
+                self.chunks = len(groups)
+
+            if len(groups) == 1:
+                stage = "reduce" if self.levels else "merge"
+                results = await self.run_many(stage, [render(groups[0])])
+                if isinstance(results[0], BaseException):
+                    raise results[0]
+                final = dict(results[0])
+                break
+
+            if self.levels >= self.max_levels or (self.levels and len(groups) >= len(texts)):
+                # Partials no longer shrink: keep them all rather than drop data
+                logger.warning("Merge did not converge, concatenating partial merges",
+                               levels=self.levels, partials=len(texts))
+                final = {"merged_content": "\n\n".join(texts)}
+                break
+
+            stage = "reduce" if self.levels else "map"
+            results = await self.run_many(stage, [render(group) for group in groups])
+            texts = []
+            for group, result in zip(groups, results):
+                if isinstance(result, BaseException) or not result.get("merged_content"):
+                    logger.warning("Partial merge failed, carrying its sources forward",
+                                   stage=stage, error=str(result) if isinstance(result, BaseException) else None)
+                    texts.append("\n\n".join(group))
+                    continue
+                texts.append(str(result["merged_content"]))
+                conflicts.extend(result.get("conflicts_resolved", []))
+                findings.extend(result.get("key_findings", []))
+            self.levels += 1
+
+        final["conflicts_resolved"] = _union(conflicts + list(final.get("conflicts_resolved", [])))
+        final["key_findings"] = _union(findings + list(final.get("key_findings", [])))
+        return final
+
+    def report(self) -> Dict[str, Any]:
+        """Per-stage calls, cache hits, tokens and latency of this operation"""
+        return {
+            "chunks": self.chunks,
+            "levels": self.levels,
+            "stages": {name: dict(stats) for name, stats in self.stages.items()},
+            "tokens_used": sum(stats['tokens_used'] for stats in self.stages.values()),
+            "cache_hits": sum(stats['cache_hits'] for stats in self.stages.values())
+        }
+
+
+def _is_missing(value: Any) -> bool:
+    return value in (None, "", [], {}) or (isinstance(value, str) and value.strip().lower() in ("not available", "n/a"))
+
+
+def _row_key(row: Any) -> str:
+    """Identity of a table row: its first field's value"""
+    if isinstance(row, dict) and row:
+        first = next(iter(row.values()))
+        if isinstance(first, str) and first.strip():
+            return first.strip().lower()
+    return json.dumps(row, sort_keys=True, default=str)
+
+
+def merge_structured(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduce structured extractions of several chunks into one
+
+    Lists of rows are unioned, rows with the same identity (first field)
+    are combined preferring values that are not "Not available", and
+    scalar fields keep the first available value.
+    """
+    merged: Dict[str, Any] = {}
+    for part in parts:
+        if not isinstance(part, dict):
+            continue
+        for key, value in part.items():
+            current = merged.get(key)
+            if key not in merged or _is_missing(current):
+                merged[key] = value
+            elif isinstance(current, dict) and isinstance(value, dict):
+                merged[key] = merge_structured([current, value])
+            elif isinstance(current, list) and isinstance(value, list):
+                rows: Dict[str, Any] = {}
+                for row in current + value:
+                    identity = _row_key(row)
+                    if identity in rows and isinstance(row, dict) and isinstance(rows[identity], dict):
+                        rows[identity] = merge_structured([rows[identity], row])
+                    elif identity not in rows:
+                        rows[identity] = row
+                merged[key] = list(rows.values())
+    return merged
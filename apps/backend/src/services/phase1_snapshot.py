@@ -0,0 +1,354 @@
+"""
+Phase 1 Snapshot
+Request-scoped, immutable view of a request's completed Phase 1 results.
+
+The snapshot is built from a single query over category_results and
+merged_data_results the first time a Phase 2 category or the final output
+generator asks for it, and shared by all of them; the category scheduler
+discards it whenever another Phase 1 category finishes. It carries the per-category data,
+the pre-rendered prompt context for each Phase 2 service together with its
+estimated token count, and the category view used by the final output.
+Snapshots are held in a small bounded cache keyed by request_id; concurrent
+readers of a request that is not cached share one build.
+"""
+import os
+import json
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+import structlog
+
+from ..integrations.provider_scheduler import estimate_tokens
+from ..utils.db_connection import DatabaseConnection
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ContextProfile:
+    """How a Phase 2 service renders Phase 1 summaries into prompt context"""
+    name: str
+    priority_categories: Tuple[str, ...]
+    template: str
+    priority_limit: Optional[int]
+    other_limit: int
+    max_chars: int
+
+
+# Parameter extraction: physicochemical and PK data in full
+SCORING_CONTEXT = ContextProfile(
+    name="scoring",
+    priority_categories=('Physicochemical Profile', 'Pharmacokinetics', 'Dosage Forms', 'Current Formulations'),
+    template="## {name}\n{summary}\n",
+    priority_limit=None,
+    other_limit=500,
+    max_chars=15000
+)
+
+# Strategic analysis: market and regulatory context first
+ANALYSIS_CONTEXT = ContextProfile(
+    name="analysis",
+    priority_categories=(
+        'Market Overview',
+        'Competitive Landscape',
+        'Regulatory & Patent Status',
+        'Commercial Opportunities',
+        'Physicochemical Profile',
+        'Pharmacokinetics'
+    ),
+    template="### {name}\n\n{summary}\n",
+    priority_limit=2000,
+    other_limit=1000,
+    max_chars=20000
+)
+
+CONTEXT_PROFILES = (SCORING_CONTEXT, ANALYSIS_CONTEXT)
+
+
+def render_phase1_context(phase1_data: Mapping[str, Any], profile: ContextProfile) -> str:
+    """
+    Render Phase 1 summaries as LLM context
+
+    Priority categories come first in profile order, then the remaining
+    categories with shorter summaries; the result is capped at
+    ``profile.max_chars``.
+
+    Args:
+        phase1_data: Category name -> category data with a 'summary'
+        profile: Rendering profile
+
+    Returns:
+        Context text
+    """
+    context_parts = []
+
+    for cat_name in profile.priority_categories:
+        summary = phase1_data[cat_name].get('summary', '') if cat_name in phase1_data else ''
+        if summary:
+            if profile.priority_limit is not None:
+                summary = summary[:profile.priority_limit]
+            context_parts.append(profile.template.format(name=cat_name, summary=summary))
+
+    for category_name, category_data in phase1_data.items():
+        if category_name not in profile.priority_categories:
+            summary = category_data.get('summary', '')
+            if summary:
+                context_parts.append(profile.template.format(
+                    name=category_name, summary=summary[:profile.other_limit]
+                ))
+
+    return "\n".join(context_parts)[:profile.max_chars]
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively convert a frozen value back to plain dicts and lists"""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+def _parse_json(value: Any) -> Optional[Any]:
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return None
+    return value
+
+
+class Phase1Snapshot(Mapping):
+    """
+    Immutable Phase 1 results for one request
+
+    Behaves as a read-only mapping of category name -> {summary,
+    confidence_score, structured_data?, merged_content?}, so it can be
+    passed wherever Phase 1 data was passed as a dict.
+    """
+
+    __slots__ = ('request_id', 'created_at', '_categories', '_output_categories',
+                 '_contexts', '_context_tokens')
+
+    def __init__(self, request_id: str, rows: Any = ()):
+        """
+        Build a snapshot from Phase 1 rows
+
+        Args:
+            request_id: Request the rows belong to
+            rows: Rows with category_name, summary, confidence_score,
+                structured_data and merged_content, oldest merge first
+        """
+        categories = {}
+        output_categories = {}
+        for row in rows:
+            category_data = {
+                "summary": row['summary'],
+                "confidence_score": float(row['confidence_score']) if row['confidence_score'] else 0.0
+            }
+            structured_data = _parse_json(row['structured_data'])
+            if structured_data:
+                category_data['structured_data'] = structured_data
+            if row['merged_content']:
+                category_data['merged_content'] = row['merged_content']
+            categories[row['category_name']] = category_data
+
+            # Final output only covers categories that went through merging
+            if row['has_merged_data']:
+                output_categories[row['category_name']] = {
+                    **(structured_data if isinstance(structured_data, dict) else {}),
+                    "summary": row['summary'] or ""
+                }
+
+        object.__setattr__(self, 'request_id', request_id)
+        object.__setattr__(self, 'created_at', time.time())
+        object.__setattr__(self, '_categories', freeze(categories))
+        object.__setattr__(self, '_output_categories', freeze(output_categories))
+
+        contexts = {profile.name: render_phase1_context(categories, profile) for profile in CONTEXT_PROFILES}
+        object.__setattr__(self, '_contexts', MappingProxyType(contexts))
+        object.__setattr__(self, '_context_tokens', MappingProxyType(
+            {name: estimate_tokens(text) for name, text in contexts.items()}
+        ))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Phase1Snapshot is immutable")
+
+    def __getitem__(self, category_name: str) -> Mapping[str, Any]:
+        return self._categories[category_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._categories)
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    def context(self, profile: ContextProfile) -> str:
+        """Pre-rendered prompt context for a profile"""
+        text = self._contexts.get(profile.name)
+        return text if text is not None else render_phase1_context(self._categories, profile)
+
+    def context_tokens(self, profile: ContextProfile) -> int:
+        """Estimated token count of a profile's context"""
+        tokens = self._context_tokens.get(profile.name)
+        return tokens if tokens is not None else estimate_tokens(self.context(profile))
+
+    def output_categories(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Category data for the final output (structured fields plus LLM summary)
+
+        Returns:
+            Mutable copy, safe for the caller to modify
+        """
+        return thaw(self._output_categories)
+
+
+PHASE1_SNAPSHOT_QUERY = """
+    SELECT
+        cr.category_name,
+        cr.summary,
+        cr.confidence_score,
+        md.structured_data,
+        md.merged_content,
+        md.id IS NOT NULL AS has_merged_data
+    FROM category_results cr
+    LEFT JOIN merged_data_results md ON cr.id = md.category_result_id
+    JOIN pharmaceutical_categories pc ON cr.category_name = pc.name
+    WHERE cr.request_id = $1::uuid
+    AND pc.phase = 1
+    AND cr.status = 'completed'
+    ORDER BY md.created_at NULLS FIRST
+"""
+
+
+class Phase1SnapshotCache:
+    """
+    Bounded, request-scoped cache of Phase 1 snapshots
+
+    Entries expire after ``ttl`` seconds and the least recently used entry
+    is evicted beyond ``max_entries``. Empty snapshots are returned but not
+    cached, so a request whose Phase 1 has not finished is re-read.
+    """
+
+    def __init__(self, ttl: float = 1800.0, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Phase1Snapshot, float]]" = OrderedDict()
+        self._builds: Dict[str, asyncio.Future] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'builds': 0, 'shared_builds': 0, 'evictions': 0}
+
+    async def get(self, request_id: str) -> Phase1Snapshot:
+        """
+        Get the snapshot for a request, building it if not cached
+
+        Args:
+            request_id: Request ID
+
+        Returns:
+            Phase1Snapshot (empty if no Phase 1 results exist yet)
+        """
+        entry = self._entries.get(request_id)
+        if entry is not None:
+            snapshot, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(request_id)
+                self._stats['hits'] += 1
+                return snapshot
+            del self._entries[request_id]
+
+        self._stats['misses'] += 1
+        return await self._build_shared(request_id)
+
+    async def build(self, request_id: str) -> Phase1Snapshot:
+        """
+        Rebuild and cache the snapshot for a request
+
+        Called when Phase 1 completes so Phase 2 starts from fresh data.
+
+        Args:
+            request_id: Request ID
+
+        Returns:
+            New Phase1Snapshot
+        """
+        self.discard(request_id)
+        return await self._build_shared(request_id)
+
+    def discard(self, request_id: str):
+        """
+        Drop the cached snapshot for a request
+
+        A build already in flight still answers its current waiters but is
+        not cached, so Phase 1 results stored after it started are picked
+        up by the next reader.
+        """
+        self._entries.pop(request_id, None)
+        self._builds.pop(request_id, None)
+
+    async def _build_shared(self, request_id: str) -> Phase1Snapshot:
+        pending = self._builds.get(request_id)
+        if pending is not None:
+            self._stats['shared_builds'] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._builds[request_id] = future
+        try:
+            snapshot = await self._load(request_id)
+            self._stats['builds'] += 1
+            if snapshot and self._builds.get(request_id) is future:
+                self._store(request_id, snapshot)
+            future.set_result(snapshot)
+            logger.info("Built Phase 1 snapshot", request_id=request_id, categories=len(snapshot),
+                        context_tokens={p.name: snapshot.context_tokens(p) for p in CONTEXT_PROFILES})
+            return snapshot
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else awaited is not logged
+            future.exception()
+            raise
+        finally:
+            if self._builds.get(request_id) is future:
+                del self._builds[request_id]
+
+    async def _load(self, request_id: str) -> Phase1Snapshot:
+        async with DatabaseConnection() as conn:
+            rows = await conn.fetch(PHASE1_SNAPSHOT_QUERY, request_id)
+        return Phase1Snapshot(request_id, rows)
+
+    def _store(self, request_id: str, snapshot: Phase1Snapshot):
+        self._entries[request_id] = (snapshot, time.monotonic() + self.ttl)
+        self._entries.move_to_end(request_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {**self._stats, 'entries': len(self._entries)}
+
+
+phase1_snapshots = Phase1SnapshotCache(
+    ttl=float(os.getenv('PHASE1_SNAPSHOT_TTL', '1800')),
+    max_entries=int(os.getenv('PHASE1_SNAPSHOT_MAX_ENTRIES', '256'))
+)
+
+
+def get_phase1_snapshots() -> Phase1SnapshotCache:
+    """Get the process-wide Phase 1 snapshot cache"""
+    return phase1_snapshots
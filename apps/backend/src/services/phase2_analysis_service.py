@@ -17,6 +17,7 @@ from datetime import datetime
 
 from ..core.llm_service import LLMService
 from .data_storage_service import DataStorageService
+from .phase1_snapshot import ANALYSIS_CONTEXT, Phase1Snapshot, render_phase1_context
 
 logger = structlog.get_logger(__name__)
 
@@ -619,42 +620,12 @@ Generate the investment analysis:"""
         """
         Prepare Phase 1 data as context for LLM.
 
-        Prioritizes key categories and formats data for analysis.
+        Prioritizes key categories and formats data for analysis. A
+        Phase1Snapshot already carries the rendered context.
         """
-        context_parts = []
-
-        # Priority categories for strategic analysis
-        priority_categories = [
-            'Market Overview',
-            'Competitive Landscape',
-            'Regulatory & Patent Status',
-            'Commercial Opportunities',
-            'Physicochemical Profile',
-            'Pharmacokinetics'
-        ]
-
-        # Add priority categories first
-        for cat_name in priority_categories:
-            if cat_name in phase1_data:
-                category_data = phase1_data[cat_name]
-                summary = category_data.get('summary', '')
-
-                if summary:
-                    # Truncate very long summaries
-                    truncated_summary = summary[:2000] if len(summary) > 2000 else summary
-                    context_parts.append(f"### {cat_name}\n\n{truncated_summary}\n")
-
-        # Add other categories (with more aggressive truncation)
-        for category_name, category_data in phase1_data.items():
-            if category_name not in priority_categories:
-                summary = category_data.get('summary', '')
-                if summary:
-                    truncated_summary = summary[:1000] if len(summary) > 1000 else summary
-                    context_parts.append(f"### {category_name}\n\n{truncated_summary}\n")
-
-        # Limit total context to avoid token limits
-        full_context = "\n".join(context_parts)
-        return full_context[:20000]  # Limit to 20K chars
+        if isinstance(phase1_data, Phase1Snapshot):
+            return phase1_data.context(ANALYSIS_CONTEXT)
+        return render_phase1_context(phase1_data, ANALYSIS_CONTEXT)
 
     def _format_scoring_results(self, scoring_results: Optional[Dict[str, Any]]) -> str:
         """Format scoring results for prompt context."""
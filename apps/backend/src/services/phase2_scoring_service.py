@@ -14,6 +14,7 @@ from datetime import datetime
 from ..utils.db_connection import DatabaseConnection
 from ..config.llm_config import get_llm_config
 from .data_storage_service import DataStorageService
+from .phase1_snapshot import SCORING_CONTEXT, Phase1Snapshot, render_phase1_context
 
 logger = structlog.get_logger(__name__)
 
@@ -566,33 +567,12 @@ Do not include any explanation, only the JSON object."""
         NOTE: Currently using summaries because merged_data_results table
         has no structured_data stored. This is a Phase 1 pipeline bug that
         needs to be fixed separately.
+
+        A Phase1Snapshot already carries the rendered context.
         """
-        context_parts = []
-
-        # Prioritize categories most likely to have parameter data
-        priority_categories = ['Physicochemical Profile', 'Pharmacokinetics', 'Dosage Forms', 'Current Formulations']
-
-        # Add priority categories first (using summaries due to Phase 1 bug)
-        for cat_name in priority_categories:
-            if cat_name in phase1_data:
-                category_data = phase1_data[cat_name]
-                summary = category_data.get('summary', '')
-
-                if summary:
-                    part = f"## {cat_name}\n{summary}\n"
-                    context_parts.append(part)
-
-        # Add other categories (truncated summaries)
-        for category_name, category_data in phase1_data.items():
-            if category_name not in priority_categories:
-                summary = category_data.get('summary', '')
-                if summary:
-                    part = f"## {category_name}\n{summary[:500]}\n"
-                    context_parts.append(part)
-
-        # Limit total context to avoid token limits
-        full_context = "\n".join(context_parts)
-        return full_context[:15000]  # Limit to 15K chars
+        if isinstance(phase1_data, Phase1Snapshot):
+            return phase1_data.context(SCORING_CONTEXT)
+        return render_phase1_context(phase1_data, SCORING_CONTEXT)
 
     async def _calculate_scores(
         self,
@@ -1,15 +1,25 @@
 """
 Pipeline Stage Configuration Service
 Manages enable/disable state of processing pipeline stages from database.
+
+Stage, Phase 2 category and category dependency configuration is served
+from a process-wide in-memory snapshot so lookups on the processing hot path are dictionary
+reads. The snapshot is reloaded after a TTL, immediately after local
+updates, and on Postgres NOTIFY from other processes.
 """
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from typing import Dict, List, Optional
 import os
-from dotenv import load_dotenv
+import time
+import asyncio
+import asyncpg
+from typing import Dict, List, Optional
+import structlog
+
+from ..utils.db_connection import DatabaseConnection, get_db_settings
 
-load_dotenv()
+logger = structlog.get_logger(__name__)
+
+CONFIG_CHANGED_CHANNEL = "pipeline_config_changed"
 
 
 class PipelineStageConfig:
@@ -23,26 +33,125 @@ class PipelineStageConfig:
         self.progress_weight = progress_weight
 
 
+class _ConfigSnapshot:
+    """Immutable view of stage, Phase 2 category and dependency configuration"""
+    def __init__(self, stages: List[PipelineStageConfig], phase2_categories: List[Dict],
+                 category_dependencies: Optional[Dict[int, List[int]]] = None):
+        self.stages = stages
+        self.stages_by_name = {stage.stage_name: stage for stage in stages}
+        self.enabled_stages = [stage for stage in stages if stage.enabled]
+        self.phase2_categories = phase2_categories
+        self.active_phase2_names = frozenset(
+            cat['name'] for cat in phase2_categories if cat['enabled']
+        )
+        self.category_dependencies = category_dependencies or {}
+        self.loaded_at = time.monotonic()
+
+
+# Process-wide snapshot state, shared by every PipelineConfigService instance
+_snapshot: Optional[_ConfigSnapshot] = None
+_snapshot_loop: Optional[asyncio.AbstractEventLoop] = None
+_snapshot_lock: Optional[asyncio.Lock] = None
+_listener_conn: Optional[asyncpg.Connection] = None
+_generation = 0
+
+
+def _snapshot_ttl() -> float:
+    """Seconds before the snapshot is reloaded (PIPELINE_CONFIG_TTL, default 60)"""
+    return float(os.getenv('PIPELINE_CONFIG_TTL', '60'))
+
+
+def invalidate_config_snapshot(*_args):
+    """Drop the cached snapshot; the next lookup reloads it (also a NOTIFY callback)"""
+    global _snapshot, _generation
+    _snapshot = None
+    _generation += 1
+
+
 class PipelineConfigService:
     """Service for managing pipeline stage configuration"""
 
-    def __init__(self):
-        self.db_config = {
-            'host': os.getenv('DATABASE_HOST', 'localhost'),
-            'port': int(os.getenv('DATABASE_PORT', 5432)),
-            'database': os.getenv('DATABASE_NAME', 'cognito-engine'),
-            'user': os.getenv('DATABASE_USER', 'cognito'),
-            'password': os.getenv('DATABASE_PASSWORD', 'cognito')
-        }
-        self._cache = None
-
-    def _get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(**self.db_config, cursor_factory=RealDictCursor)
+    async def _load_snapshot(self) -> _ConfigSnapshot:
+        """Load stage, Phase 2 category and dependency configuration on one connection"""
+        async with DatabaseConnection() as conn:
+            stage_rows = await conn.fetch("""
+                SELECT stage_name, stage_order, enabled, description, progress_weight
+                FROM pipeline_stages
+                ORDER BY stage_order
+            """)
+            category_rows = await conn.fetch("""
+                SELECT id, name, display_order, is_active, description
+                FROM pharmaceutical_categories
+                WHERE phase = 2
+                ORDER BY display_order
+            """)
+            dependency_rows = await conn.fetch("""
+                SELECT dependent_category_id, required_category_id
+                FROM category_dependencies
+                ORDER BY dependent_category_id, required_category_id
+            """)
 
-    def get_all_stages(self, force_refresh: bool = False) -> List[PipelineStageConfig]:
+        stages = [
+            PipelineStageConfig(
+                stage_name=row['stage_name'],
+                stage_order=row['stage_order'],
+                enabled=row['enabled'],
+                description=row['description'],
+                progress_weight=row['progress_weight']
+            )
+            for row in stage_rows
+        ]
+        categories = [
+            {
+                "id": row['id'],
+                "name": row['name'],
+                "order": row['display_order'],
+                "enabled": row['is_active'],
+                "description": row['description'] if row['description'] else f"Phase 2 category: {row['name']}",
+                "phase": 2
+            }
+            for row in category_rows
+        ]
+        dependencies: Dict[int, List[int]] = {}
+        for row in dependency_rows:
+            dependencies.setdefault(row['dependent_category_id'], []).append(row['required_category_id'])
+        return _ConfigSnapshot(stages, categories, dependencies)
+
+    async def _get_snapshot(self, force_refresh: bool = False) -> _ConfigSnapshot:
+        """
+        Get the current configuration snapshot, reloading it when missing,
+        expired or explicitly refreshed. Concurrent reloads are coalesced.
         """
-        Get all pipeline stages from database
+        global _snapshot, _snapshot_loop, _snapshot_lock
+
+        snapshot = _snapshot
+        if (snapshot is not None and not force_refresh
+                and time.monotonic() - snapshot.loaded_at < _snapshot_ttl()):
+            return snapshot
+
+        loop = asyncio.get_running_loop()
+        if _snapshot_lock is None or _snapshot_loop is not loop:
+            _snapshot_lock = asyncio.Lock()
+            _snapshot_loop = loop
+
+        async with _snapshot_lock:
+            # Another task may have reloaded while we waited
+            if _snapshot is not None and _snapshot is not snapshot:
+                return _snapshot
+
+            generation = _generation
+            loaded = await self._load_snapshot()
+            # Don't cache a snapshot that an update invalidated mid-load
+            if generation == _generation:
+                _snapshot = loaded
+            logger.debug("Pipeline config snapshot loaded",
+                         stages=len(loaded.stages),
+                         phase2_categories=len(loaded.phase2_categories))
+            return loaded
+
+    async def get_all_stages(self, force_refresh: bool = False) -> List[PipelineStageConfig]:
+        """
+        Get all pipeline stages
 
         Args:
             force_refresh: Force refresh from database (bypass cache)
@@ -50,39 +159,9 @@ class PipelineConfigService:
         Returns:
             List of pipeline stage configurations
         """
-        if self._cache and not force_refresh:
-            return self._cache
-
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        return (await self._get_snapshot(force_refresh)).stages
 
-        try:
-            cursor.execute("""
-                SELECT stage_name, stage_order, enabled, description, progress_weight
-                FROM pipeline_stages
-                ORDER BY stage_order
-            """)
-
-            rows = cursor.fetchall()
-            stages = [
-                PipelineStageConfig(
-                    stage_name=row['stage_name'],
-                    stage_order=row['stage_order'],
-                    enabled=row['enabled'],
-                    description=row['description'],
-                    progress_weight=row['progress_weight']
-                )
-                for row in rows
-            ]
-
-            self._cache = stages
-            return stages
-
-        finally:
-            cursor.close()
-            conn.close()
-
-    def is_stage_enabled(self, stage_name: str) -> bool:
+    async def is_stage_enabled(self, stage_name: str) -> bool:
         """
         Check if a specific stage is enabled
 
@@ -92,26 +171,18 @@ class PipelineConfigService:
         Returns:
             True if stage is enabled, False otherwise
         """
-        stages = self.get_all_stages()
-        for stage in stages:
-            if stage.stage_name == stage_name:
-                return stage.enabled
-        return False
+        stage = (await self._get_snapshot()).stages_by_name.get(stage_name)
+        return stage.enabled if stage else False
 
-    def get_enabled_stages(self) -> List[PipelineStageConfig]:
+    async def get_enabled_stages(self) -> List[PipelineStageConfig]:
         """Get only enabled stages"""
-        stages = self.get_all_stages()
-        return [stage for stage in stages if stage.enabled]
+        return (await self._get_snapshot()).enabled_stages
 
-    def get_stage_config(self, stage_name: str) -> Optional[PipelineStageConfig]:
+    async def get_stage_config(self, stage_name: str) -> Optional[PipelineStageConfig]:
         """Get configuration for a specific stage"""
-        stages = self.get_all_stages()
-        for stage in stages:
-            if stage.stage_name == stage_name:
-                return stage
-        return None
+        return (await self._get_snapshot()).stages_by_name.get(stage_name)
 
-    def update_stage_enabled(self, stage_name: str, enabled: bool) -> bool:
+    async def update_stage_enabled(self, stage_name: str, enabled: bool) -> bool:
         """
         Update enabled status for a stage
 
@@ -122,29 +193,20 @@ class PipelineConfigService:
         Returns:
             True if update successful
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
+        async with DatabaseConnection() as conn:
+            result = await conn.execute("""
                 UPDATE pipeline_stages
-                SET enabled = %s, updated_at = CURRENT_TIMESTAMP
-                WHERE stage_name = %s
-            """, (enabled, stage_name))
-
-            conn.commit()
-            success = cursor.rowcount > 0
+                SET enabled = $1, updated_at = CURRENT_TIMESTAMP
+                WHERE stage_name = $2
+            """, enabled, stage_name)
 
+            success = result.split()[-1] != '0'
             if success:
-                self._cache = None  # Invalidate cache
+                await self._notify_change(conn, f"stage:{stage_name}")
 
-            return success
+        return success
 
-        finally:
-            cursor.close()
-            conn.close()
-
-    def calculate_progress_percentage(self, completed_stages: List[str]) -> float:
+    async def calculate_progress_percentage(self, completed_stages: List[str]) -> float:
         """
         Calculate progress percentage based on completed stages
 
@@ -154,7 +216,7 @@ class PipelineConfigService:
         Returns:
             Progress percentage (0-100)
         """
-        all_stages = self.get_enabled_stages()
+        all_stages = await self.get_enabled_stages()
         if not all_stages:
             return 100
 
@@ -167,14 +229,14 @@ class PipelineConfigService:
 
         return (completed_weight / total_weight * 100) if total_weight > 0 else 0
 
-    def get_stage_progress_map(self) -> Dict[str, float]:
+    async def get_stage_progress_map(self) -> Dict[str, float]:
         """
         Get progress percentage for each stage milestone
 
         Returns:
             Dict mapping stage names to their completion percentage
         """
-        stages = self.get_enabled_stages()
+        stages = await self.get_enabled_stages()
         if not stages:
             return {}
 
@@ -188,44 +250,30 @@ class PipelineConfigService:
 
         return progress_map
 
-    def get_phase2_categories(self) -> List[Dict]:
+    async def get_phase2_categories(self) -> List[Dict]:
         """
         Get Phase 2 categories from pharmaceutical_categories table
 
         Returns:
             List of Phase 2 category configurations
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        try:
-            cursor.execute("""
-                SELECT id, name, display_order, is_active, description
-                FROM pharmaceutical_categories
-                WHERE phase = 2
-                ORDER BY display_order
-            """)
+        return [dict(cat) for cat in (await self._get_snapshot()).phase2_categories]
 
-            rows = cursor.fetchall()
-            categories = [
-                {
-                    "id": row['id'],
-                    "name": row['name'],
-                    "order": row['display_order'],
-                    "enabled": row['is_active'],
-                    "description": row['description'] if row['description'] else f"Phase 2 category: {row['name']}",
-                    "phase": 2
-                }
-                for row in rows
-            ]
+    async def get_category_dependencies(self) -> Dict[int, List[int]]:
+        """
+        Get declared category dependencies from category_dependencies
 
-            return categories
+        Returns:
+            Dependent category id -> required category ids
+        """
+        snapshot = await self._get_snapshot()
+        return {dependent: list(required) for dependent, required in snapshot.category_dependencies.items()}
 
-        finally:
-            cursor.close()
-            conn.close()
+    async def is_phase2_category(self, category_name: str) -> bool:
+        """Check if a category is an active Phase 2 category"""
+        return category_name in (await self._get_snapshot()).active_phase2_names
 
-    def update_phase2_category_enabled(self, category_id: int, enabled: bool) -> bool:
+    async def update_phase2_category_enabled(self, category_id: int, enabled: bool) -> bool:
         """
         Update enabled status for a Phase 2 category
 
@@ -236,31 +284,65 @@ class PipelineConfigService:
         Returns:
             True if update successful
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        async with DatabaseConnection() as conn:
+            result = await conn.execute("""
+                UPDATE pharmaceutical_categories
+                SET is_active = $1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = $2 AND phase = 2
+            """, enabled, category_id)
 
+            success = result.split()[-1] != '0'
+            if success:
+                await self._notify_change(conn, f"phase2_category:{category_id}")
+
+        return success
+
+    async def _notify_change(self, conn, payload: str):
+        """Invalidate the local snapshot and tell other processes to do the same"""
+        invalidate_config_snapshot()
         try:
-            cursor.execute("""
-                UPDATE pharmaceutical_categories
-                SET is_active = %s, updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s AND phase = 2
-            """, (enabled, category_id))
+            await conn.execute("SELECT pg_notify($1, $2)", CONFIG_CHANGED_CHANNEL, payload)
+        except Exception as e:
+            logger.warning("Failed to publish pipeline config change", error=str(e))
 
-            conn.commit()
-            return cursor.rowcount > 0
+    @staticmethod
+    async def start_listener():
+        """
+        Listen for configuration changes made by other processes.
 
-        finally:
-            cursor.close()
-            conn.close()
+        Uses a dedicated connection (LISTEN state must outlive pool checkouts).
+        Without it, remote changes are picked up when the TTL expires.
+        """
+        global _listener_conn
+
+        if _listener_conn is not None and not _listener_conn.is_closed():
+            return
 
-    def get_pipeline_summary(self) -> Dict:
+        try:
+            _listener_conn = await asyncpg.connect(**get_db_settings())
+            await _listener_conn.add_listener(CONFIG_CHANGED_CHANNEL, invalidate_config_snapshot)
+            logger.info("Listening for pipeline config changes", channel=CONFIG_CHANGED_CHANNEL)
+        except Exception as e:
+            _listener_conn = None
+            logger.warning("Pipeline config listener unavailable, relying on TTL", error=str(e))
+
+    @staticmethod
+    async def stop_listener():
+        """Close the configuration change listener"""
+        global _listener_conn
+
+        if _listener_conn is not None and not _listener_conn.is_closed():
+            await _listener_conn.close()
+        _listener_conn = None
+
+    async def get_pipeline_summary(self) -> Dict:
         """Get summary of pipeline configuration including Phase 1 and Phase 2"""
         # Get Phase 1 stages
-        all_stages = self.get_all_stages()
-        enabled_stages = self.get_enabled_stages()
+        all_stages = await self.get_all_stages()
+        enabled_stages = await self.get_enabled_stages()
 
         # Get Phase 2 categories
-        phase2_categories = self.get_phase2_categories()
+        phase2_categories = await self.get_phase2_categories()
         enabled_phase2 = [cat for cat in phase2_categories if cat['enabled']]
 
         return {
@@ -278,7 +360,7 @@ class PipelineConfigService:
                 }
                 for stage in all_stages
             ],
-            "progress_map": self.get_stage_progress_map(),
+            "progress_map": await self.get_stage_progress_map(),
             "phase2_categories": phase2_categories,
             "total_phase2_categories": len(phase2_categories),
             "enabled_phase2_categories": len(enabled_phase2),
@@ -8,7 +8,8 @@ quick integration and testing of the 4-stage pipeline.
 
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-import json
+import asyncio
+import os
 import statistics
 import time
 from .pipeline_config_service import PipelineConfigService
@@ -18,6 +19,8 @@ from .llm_merger_service import LLMMergerService
 from .merged_data_storage import MergedDataStorage
 from .summary_config_service import SummaryConfigService
 from .llm_summary_generator import LLMSummaryGenerator
+from .phase1_snapshot import get_phase1_snapshots
+from .response_dedup import deduplicate_responses
 import asyncpg
 import logging
 
@@ -34,6 +37,8 @@ class PipelineIntegrationService:
         self.merged_storage = MergedDataStorage()
         self.summary_config = SummaryConfigService()
         self.summary_generator = LLMSummaryGenerator(self.summary_config)
+        # Responses at least this similar are collapsed before the LLM merge
+        self.dedup_threshold = float(os.getenv("MERGE_DEDUP_THRESHOLD", "0.85"))
 
     async def process_with_pipeline(self,
                                     category_name: str,
@@ -78,7 +83,7 @@ class PipelineIntegrationService:
         }
 
         # Stage 1: Data Collection (already done, just record it)
-        if self.config_service.is_stage_enabled("data_collection"):
+        if await self.config_service.is_stage_enabled("data_collection"):
             pipeline_result["stages_executed"].append("data_collection")
             pipeline_result["metadata"]["collection"] = {
                 "total_responses": len(api_responses),
@@ -88,7 +93,7 @@ class PipelineIntegrationService:
         # Stage 2: Verification
         verified_data = api_responses
         stage_start = time.time()
-        if self.config_service.is_stage_enabled("verification"):
+        if await self.config_service.is_stage_enabled("verification"):
             verified_data = await self._verification_stage(
                 api_responses,
                 category_name,
@@ -129,7 +134,7 @@ class PipelineIntegrationService:
         # Stage 3: Merging
         merged_data = verified_data
         stage_start = time.time()
-        if self.config_service.is_stage_enabled("merging"):
+        if await self.config_service.is_stage_enabled("merging"):
             merged_data = await self._merging_stage(
                 verified_data,
                 category_name,
@@ -177,7 +182,7 @@ class PipelineIntegrationService:
 
         # Stage 4: LLM Summary
         stage_start = time.time()
-        if self.config_service.is_stage_enabled("llm_summary"):
+        if await self.config_service.is_stage_enabled("llm_summary"):
             summary_data = await self._llm_summary_stage(
                 merged_data, category_name, drug_name, request_id
             )
@@ -280,6 +285,9 @@ class PipelineIntegrationService:
                 "authority_score": weight * 10,  # Normalize to 0-100
                 "verification_timestamp": datetime.now().isoformat()
             }
+            if "tables_json" in response:
+                # Tables already converted while the response streamed in
+                verified_response["tables_json"] = response["tables_json"]
 
             verified_responses.append(verified_response)
             total_weight += weight
@@ -309,25 +317,47 @@ class PipelineIntegrationService:
                 print(f"[VALIDATION DEBUG] category_name: {category_name}, category_id: {category_id}")
 
                 if category_id:
-                    # PER-SOURCE VALIDATION - Validate each source individually
-                    print(f"[PER-SOURCE VALIDATION] Validating {len(verified_responses)} sources individually...")
-                    source_validations = []
-
-                    for source_idx, verified_response in enumerate(verified_responses):
-                        try:
-                            source_validation = await self.validation_engine.validate_source_response(
-                                category_result_id=category_result_id,
-                                category_id=category_id,
-                                source_response=verified_response,
-                                source_index=source_idx
-                            )
-                            source_validations.append(source_validation)
-                            print(f"[PER-SOURCE VALIDATION] Source {source_idx + 1} ({verified_response.get('provider')}): " +
-                                  f"{source_validation['total_rows']} rows, " +
-                                  f"{source_validation['validated_rows']} validated, " +
-                                  f"pass_rate: {source_validation['pass_rate']}")
-                        except Exception as e:
-                            print(f"[PER-SOURCE VALIDATION ERROR] Failed to validate source {source_idx + 1}: {e}")
+                    # PER-SOURCE VALIDATION - Validate sources concurrently
+                    print(f"[PER-SOURCE VALIDATION] Validating {len(verified_responses)} sources concurrently...")
+
+                    # Extract category data from responses (for aggregated validation)
+                    category_data = self._extract_category_data(verified_responses)
+                    print(f"[VALIDATION DEBUG] Extracted category_data with {len(category_data.get('content', ''))} chars")
+
+                    # Extract source references
+                    source_references = self._extract_source_references(verified_responses)
+                    print(f"[VALIDATION DEBUG] Extracted {len(source_references)} source references")
+
+                    # Per-source and aggregated validation run side by side;
+                    # both are stored together in one batched write below
+                    print(f"[VALIDATION DEBUG] Running aggregated category validation...")
+                    source_validations, validation_result = await asyncio.gather(
+                        self.validation_engine.validate_source_responses(
+                            category_result_id=category_result_id,
+                            category_id=category_id,
+                            source_responses=verified_responses,
+                            store=False
+                        ),
+                        self.validation_engine.validate_category_result(
+                            category_result_id=category_result_id,
+                            category_id=category_id,
+                            category_data=category_data,
+                            source_references=source_references,
+                            store=False
+                        )
+                    )
+                    for source_validation in source_validations:
+                        print(f"[PER-SOURCE VALIDATION] Source {source_validation['source_index'] + 1} ({source_validation.get('provider')}): " +
+                              f"{source_validation['total_rows']} rows, " +
+                              f"{source_validation['validated_rows']} validated, " +
+                              f"pass_rate: {source_validation['pass_rate']}")
+                    print(f"[VALIDATION DEBUG] Validation complete - passed: {validation_result['validation_passed']}, score: {validation_result['validation_score']}")
+
+                    try:
+                        await self.validation_engine.store_validations(source_validations, validation_result)
+                    except Exception as e:
+                        print(f"[VALIDATION DEBUG ERROR] Failed to store validations: {e}")
+                        result["metadata"]["validation_storage_error"] = str(e)
 
                     # Add per-source validation summary to metadata
                     result["metadata"]["source_validations"] = {
@@ -346,24 +376,6 @@ class PipelineIntegrationService:
                         ]
                     }
 
-                    # Extract category data from responses (for aggregated validation)
-                    category_data = self._extract_category_data(verified_responses)
-                    print(f"[VALIDATION DEBUG] Extracted category_data with {len(category_data.get('content', ''))} chars")
-
-                    # Extract source references
-                    source_references = self._extract_source_references(verified_responses)
-                    print(f"[VALIDATION DEBUG] Extracted {len(source_references)} source references")
-
-                    # Run category validation (aggregated)
-                    print(f"[VALIDATION DEBUG] Running aggregated category validation...")
-                    validation_result = await self.validation_engine.validate_category_result(
-                        category_result_id=category_result_id,
-                        category_id=category_id,
-                        category_data=category_data,
-                        source_references=source_references
-                    )
-                    print(f"[VALIDATION DEBUG] Validation complete - passed: {validation_result['validation_passed']}, score: {validation_result['validation_score']}")
-
                     # Add validation metadata
                     result["metadata"]["category_validation"] = {
                         "validation_passed": validation_result["validation_passed"],
@@ -501,13 +513,23 @@ class PipelineIntegrationService:
 
             return verified_data
 
+        # Collapse near-identical responses (e.g. one model at several
+        # temperatures) and repeated table rows before paying for the merge
+        distinct, dedup_report = deduplicate_responses(responses, threshold=self.dedup_threshold)
+        logger.info(
+            f"Pre-merge dedup for {category_name}: {dedup_report['responses_in']} -> "
+            f"{dedup_report['responses_out']} responses, {dedup_report['table_rows_removed']} table rows removed, "
+            f"{dedup_report['tokens_saved']} tokens saved"
+        )
+
         try:
             # Use LLM to merge conflicting responses
             merged_result = await self.llm_merger.merge_conflicting_responses(
                 category_name=category_name,
                 drug_name=drug_name,
-                responses=responses
+                responses=distinct
             )
+            merged_result.setdefault("metadata", {})["dedup"] = dedup_report
 
             # Extract structured data from merged content
             structured_data = await self.llm_merger.extract_structured_data(
@@ -581,7 +603,7 @@ class PipelineIntegrationService:
             traceback.print_exc()
 
             return await self._fallback_weighted_merge(
-                responses=responses,
+                responses=distinct,
                 category_name=category_name,
                 drug_name=drug_name,
                 request_id=request_id,
@@ -720,9 +742,9 @@ Note: Advanced LLM summarization disabled. Enable 'llm_summary' stage for intell
 
         return statistics.mean(scores) if scores else 0.5
 
-    def get_stage_status(self) -> Dict[str, Any]:
+    async def get_stage_status(self) -> Dict[str, Any]:
         """Get current status of all pipeline stages"""
-        return self.config_service.get_pipeline_summary()
+        return await self.config_service.get_pipeline_summary()
 
     async def _fallback_weighted_merge(self,
                                        responses: List[Dict[str, Any]],
@@ -816,23 +838,7 @@ Note: Advanced LLM summarization disabled. Enable 'llm_summary' stage for intell
     async def is_phase2_category(self, category_name: str) -> bool:
         """Check if a category is a Phase 2 decision intelligence category"""
         try:
-            from ..utils.db_connection import get_db_connection
-            conn = await get_db_connection()
-
-            try:
-                result = await conn.fetchrow(
-                    """
-                    SELECT phase FROM pharmaceutical_categories
-                    WHERE name = $1 AND is_active = true
-                    """,
-                    category_name
-                )
-
-                if result and result['phase'] == 2:
-                    return True
-                return False
-            finally:
-                await conn.close()
+            return await self.config_service.is_phase2_category(category_name)
         except Exception as e:
             logger.error(f"Error checking category phase: {e}")
             return False
@@ -1165,56 +1171,17 @@ Note: Advanced LLM summarization disabled. Enable 'llm_summary' stage for intell
             }
 
     async def _get_phase1_results(self, request_id: str) -> Dict[str, Any]:
-        """Get all Phase 1 category results for a request."""
-        try:
-            from ..utils.db_connection import get_db_connection
-            conn = await get_db_connection()
-
-            try:
-                # Get all Phase 1 category results
-                results = await conn.fetch(
-                    """
-                    SELECT
-                        cr.category_name,
-                        cr.summary,
-                        cr.confidence_score,
-                        md.structured_data,
-                        md.merged_content
-                    FROM category_results cr
-                    LEFT JOIN merged_data_results md ON cr.id = md.category_result_id
-                    JOIN pharmaceutical_categories pc ON cr.category_name = pc.name
-                    WHERE cr.request_id = $1::uuid
-                    AND pc.phase = 1
-                    AND cr.status = 'completed'
-                    """,
-                    request_id
-                )
-
-                phase1_data = {}
-                for row in results:
-                    category_data = {
-                        "summary": row['summary'],
-                        "confidence_score": float(row['confidence_score']) if row['confidence_score'] else 0.0
-                    }
-
-                    # Parse structured_data if available
-                    if row['structured_data']:
-                        if isinstance(row['structured_data'], str):
-                            import json
-                            category_data['structured_data'] = json.loads(row['structured_data'])
-                        else:
-                            category_data['structured_data'] = row['structured_data']
-
-                    if row['merged_content']:
-                        category_data['merged_content'] = row['merged_content']
-
-                    phase1_data[row['category_name']] = category_data
-
-                logger.info(f"Retrieved {len(phase1_data)} Phase 1 categories for request {request_id}")
-                return phase1_data
+        """
+        Get all Phase 1 category results for a request.
 
-            finally:
-                await conn.close()
+        Returns the request's shared Phase1Snapshot (a read-only mapping of
+        category name -> results), built once and reused by every Phase 2
+        category and the final output.
+        """
+        try:
+            snapshot = await get_phase1_snapshots().get(request_id)
+            logger.info(f"Retrieved {len(snapshot)} Phase 1 categories for request {request_id}")
+            return snapshot
         except Exception as e:
             logger.error(f"Error retrieving Phase 1 results: {e}")
             return {}
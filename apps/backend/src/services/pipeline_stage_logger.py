@@ -5,9 +5,11 @@ Stores intermediate pipeline stage execution data to database for auditing
 import uuid
 from typing import Optional, Dict, Any
 from datetime import datetime
-import asyncpg
 import structlog
-import json
+
+from ..utils.db_connection import get_db_connection
+from .buffered_log_writer import stage_log_writer
+from .progress_bus import get_progress_bus
 
 logger = structlog.get_logger()
 
@@ -29,7 +31,7 @@ class PipelineStageLogger:
         execution_time_ms: int = 0
     ) -> Optional[str]:
         """
-        Log a pipeline stage execution to the database
+        Log a pipeline stage execution to the database (write-behind)
 
         Args:
             request_id: Drug request ID
@@ -47,74 +49,51 @@ class PipelineStageLogger:
             Stage log ID if successful, None otherwise
         """
         stage_id = str(uuid.uuid4())
-
-        try:
-            conn = await asyncpg.connect(
-                host='localhost',
-                port=5432,
-                user='postgres',
-                password='postgres',
-                database='cognito-engine'
-            )
-
-            try:
-                await conn.execute(
-                    """
-                    INSERT INTO pipeline_stage_executions (
-                        id, request_id, category_result_id,
-                        stage_name, stage_order,
-                        executed, skipped,
-                        input_data, output_data, stage_metadata,
-                        execution_time_ms,
-                        started_at, completed_at
-                    )
-                    VALUES (
-                        $1, $2, $3,
-                        $4, $5,
-                        $6, $7,
-                        $8, $9, $10,
-                        $11,
-                        $12, $13
-                    )
-                    """,
-                    stage_id,
-                    request_id,
-                    category_result_id if category_result_id else None,
-                    stage_name,
-                    stage_order,
-                    executed,
-                    skipped,
-                    json.dumps(input_data) if input_data else None,
-                    json.dumps(output_data) if output_data else None,
-                    json.dumps(stage_metadata) if stage_metadata else None,
-                    execution_time_ms,
-                    datetime.now(),
-                    datetime.now() if executed else None
-                )
-
-                logger.info(
-                    "Pipeline stage logged",
-                    stage_id=stage_id,
-                    request_id=request_id,
-                    stage_name=stage_name,
-                    executed=executed,
-                    skipped=skipped
-                )
-
-                return stage_id
-
-            finally:
-                await conn.close()
-
-        except Exception as e:
-            logger.error(
-                "Failed to log pipeline stage",
+        now = datetime.now()
+
+        # Written behind in batches; stage logging never blocks the pipeline
+        buffered = stage_log_writer.submit({
+            'id': stage_id,
+            'request_id': request_id,
+            'category_result_id': category_result_id if category_result_id else None,
+            'stage_name': stage_name,
+            'stage_order': stage_order,
+            'executed': executed,
+            'skipped': skipped,
+            'input_data': input_data,
+            'output_data': output_data,
+            'stage_metadata': stage_metadata,
+            'execution_time_ms': execution_time_ms,
+            'started_at': now,
+            'completed_at': now if executed else None
+        })
+
+        get_progress_bus().publish(request_id, stage={
+            'name': stage_name,
+            'order': stage_order,
+            'status': 'executed' if executed else ('skipped' if skipped else 'pending'),
+            'categoryResultId': category_result_id
+        })
+
+        if not buffered:
+            logger.warning(
+                "Pipeline stage log dropped, log buffer full",
                 stage_name=stage_name,
-                request_id=request_id,
-                error=str(e)
+                request_id=request_id
             )
             return None
 
+        logger.info(
+            "Pipeline stage logged",
+            stage_id=stage_id,
+            request_id=request_id,
+            stage_name=stage_name,
+            executed=executed,
+            skipped=skipped
+        )
+
+        return stage_id
+
     @staticmethod
     async def get_stage_logs_for_request(request_id: str) -> list:
         """
@@ -127,13 +106,7 @@ class PipelineStageLogger:
             List of stage log dictionaries
         """
         try:
-            conn = await asyncpg.connect(
-                host='localhost',
-                port=5432,
-                user='postgres',
-                password='postgres',
-                database='cognito-engine'
-            )
+            conn = await get_db_connection()
 
             try:
                 rows = await conn.fetch(
@@ -177,13 +150,7 @@ class PipelineStageLogger:
             List of stage log dictionaries
         """
         try:
-            conn = await asyncpg.connect(
-                host='localhost',
-                port=5432,
-                user='postgres',
-                password='postgres',
-                database='cognito-engine'
-            )
+            conn = await get_db_connection()
 
             try:
                 rows = await conn.fetch(
@@ -0,0 +1,398 @@
+"""
+Progress Event Bus
+Pushes request progress to WebSocket/SSE watchers instead of having them
+poll the database.
+
+Pipeline code publishes progress fields for a request_id (request status
+and category counts, per-category completion, pipeline stages, process
+tracking status). The bus keeps the latest state per request in memory,
+computes deltas against it and fans them out to subscriptions. Each
+subscription coalesces bursts: updates that arrive faster than
+``coalesce_interval`` are merged and delivered as one delta. Events from
+other processes (workers) arrive over Postgres NOTIFY.
+"""
+import os
+import json
+import uuid
+import asyncio
+import asyncpg
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set
+import structlog
+
+from ..utils.db_connection import DatabaseConnection, get_db_settings
+
+logger = structlog.get_logger(__name__)
+
+PROGRESS_CHANNEL = "request_progress"
+
+# NOTIFY payloads must stay under 8000 bytes
+MAX_NOTIFY_PAYLOAD = 7900
+
+
+def dict_delta(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fields of new that differ from old; nested dicts are diffed per key
+
+    Args:
+        old: Previous state
+        new: Updated fields
+
+    Returns:
+        Changed fields only (empty if nothing changed)
+    """
+    delta = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = dict_delta(previous, value)
+            if nested:
+                delta[key] = nested
+        elif key not in old or previous != value:
+            delta[key] = value
+    return delta
+
+
+def merge_delta(target: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a delta to target in place (nested dicts are merged)"""
+    for key, value in delta.items():
+        if isinstance(value, dict):
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            merge_delta(target[key], value)
+        elif isinstance(value, list):
+            target[key] = list(value)
+        else:
+            target[key] = value
+    return target
+
+
+class ProgressSubscription:
+    """
+    A watcher's subscription to one or more requests.
+
+    Pending updates are merged per request until the watcher reads them,
+    so a slow watcher receives fewer, larger deltas and never builds an
+    unbounded backlog.
+    """
+
+    def __init__(self, bus: "ProgressEventBus", coalesce_interval: float):
+        self.bus = bus
+        self.coalesce_interval = coalesce_interval
+        self.request_ids: Set[str] = set()
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._last_delivery = 0.0
+        self.closed = False
+
+    def _offer(self, request_id: str, data: Dict[str, Any], snapshot: bool = False):
+        """Merge an update into what this watcher has not read yet"""
+        pending = self._pending.get(request_id)
+        if pending is None or snapshot:
+            self._pending[request_id] = {
+                'type': 'snapshot' if snapshot else 'delta',
+                'data': merge_delta({}, data)
+            }
+        else:
+            merge_delta(pending['data'], data)
+        self._ready.set()
+
+    async def next(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Wait for updates
+
+        Args:
+            timeout: Seconds to wait; an empty list is returned on timeout
+
+        Returns:
+            One message per request with updates:
+            {"request_id", "type": "snapshot" | "delta", "data"}
+        """
+        if not self._pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return []
+
+        # Coalesce: deliver at most once per interval
+        loop = asyncio.get_running_loop()
+        wait = self._last_delivery + self.coalesce_interval - loop.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_delivery = loop.time()
+
+        messages = [
+            {'request_id': request_id, **pending}
+            for request_id, pending in self._pending.items()
+        ]
+        self._pending.clear()
+        self._ready.clear()
+        return messages
+
+    def add(self, request_ids: Iterable[str]):
+        """Subscribe to more requests (current state is sent as a snapshot)"""
+        self.bus._add(self, request_ids)
+
+    def remove(self, request_ids: Iterable[str]):
+        """Stop receiving updates for requests"""
+        self.bus._remove(self, request_ids)
+        for request_id in request_ids:
+            self._pending.pop(request_id, None)
+
+    def close(self):
+        """Unsubscribe from everything"""
+        if not self.closed:
+            self.bus._remove(self, list(self.request_ids))
+            self.closed = True
+
+
+class ProgressEventBus:
+    """
+    In-memory progress state and fan-out keyed by request_id.
+
+    publish() is synchronous and never touches the database, so it can be
+    called from the pipeline hot path. State is kept for the most recent
+    ``max_tracked_requests`` requests.
+    """
+
+    def __init__(self, coalesce_interval: float = 0.25, max_tracked_requests: int = 10000):
+        """
+        Initialize progress bus
+
+        Args:
+            coalesce_interval: Minimum seconds between deliveries to a
+                watcher (and between NOTIFY batches)
+            max_tracked_requests: Requests whose state is kept in memory
+        """
+        self.coalesce_interval = coalesce_interval
+        self.max_tracked_requests = max_tracked_requests
+        self.origin = uuid.uuid4().hex
+
+        self._state: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._subscribers: Dict[str, Set[ProgressSubscription]] = {}
+        self._outbox: Dict[str, Dict[str, Any]] = {}
+        self._outbox_ready: Optional[asyncio.Event] = None
+        self._notifier_task: Optional[asyncio.Task] = None
+        self._listener_conn: Optional[asyncpg.Connection] = None
+
+        self._stats = {
+            'events_published': 0,
+            'events_unchanged': 0,
+            'remote_events': 0,
+            'notifications_sent': 0,
+            'deliveries': 0
+        }
+
+    # ------------------------------------------------------------------ #
+    # Publishing
+    # ------------------------------------------------------------------ #
+
+    def publish(self, request_id: str, **fields) -> Dict[str, Any]:
+        """
+        Publish updated progress fields for a request
+
+        Args:
+            request_id: Drug request ID
+            **fields: Updated fields (nested dicts are merged, e.g.
+                categories={"Safety": "completed"})
+
+        Returns:
+            The delta that was fanned out (empty if nothing changed)
+        """
+        delta = self._apply(request_id, fields)
+        if delta and self._outbox_ready is not None:
+            merge_delta(self._outbox.setdefault(request_id, {}), delta)
+            self._outbox_ready.set()
+        return delta
+
+    def _apply(self, request_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        if not request_id:
+            return {}
+        state = self._state.get(request_id)
+        if state is None:
+            state = self._state[request_id] = {}
+            self._evict()
+        else:
+            self._state.move_to_end(request_id)
+
+        delta = dict_delta(state, fields)
+        if not delta:
+            self._stats['events_unchanged'] += 1
+            return {}
+
+        merge_delta(state, delta)
+        self._stats['events_published'] += 1
+        for subscription in self._subscribers.get(request_id, ()):
+            subscription._offer(request_id, delta)
+            self._stats['deliveries'] += 1
+        return delta
+
+    def _evict(self):
+        """Forget the least recently updated requests nobody is watching"""
+        excess = len(self._state) - self.max_tracked_requests
+        if excess <= 0:
+            return
+        unwatched = [rid for rid in self._state if rid not in self._subscribers]
+        for request_id in unwatched[:excess]:
+            del self._state[request_id]
+
+    def seed(self, request_id: str, state: Dict[str, Any]):
+        """
+        Provide the stored state of a request the bus has not seen yet.
+
+        Fields already received from events win over the seed. Watchers
+        of the request receive the merged state as a snapshot.
+        """
+        merged = merge_delta(merge_delta({}, state), self._state.get(request_id, {}))
+        self._state[request_id] = merged
+        self._evict()
+        for subscription in self._subscribers.get(request_id, ()):
+            subscription._offer(request_id, merged, snapshot=True)
+
+    def has_state(self, request_id: str) -> bool:
+        return request_id in self._state
+
+    def get_state(self, request_id: str) -> Optional[Dict[str, Any]]:
+        state = self._state.get(request_id)
+        return merge_delta({}, state) if state is not None else None
+
+    # ------------------------------------------------------------------ #
+    # Subscriptions
+    # ------------------------------------------------------------------ #
+
+    def subscribe(self, request_ids: Iterable[str] = ()) -> ProgressSubscription:
+        """
+        Subscribe to requests
+
+        Known state is queued as an initial snapshot; everything after
+        that is deltas.
+        """
+        subscription = ProgressSubscription(self, self.coalesce_interval)
+        self._add(subscription, request_ids)
+        return subscription
+
+    def _add(self, subscription: ProgressSubscription, request_ids: Iterable[str]):
+        for request_id in request_ids:
+            if request_id in subscription.request_ids:
+                continue
+            subscription.request_ids.add(request_id)
+            self._subscribers.setdefault(request_id, set()).add(subscription)
+            state = self._state.get(request_id)
+            if state is not None:
+                subscription._offer(request_id, state, snapshot=True)
+
+    def _remove(self, subscription: ProgressSubscription, request_ids: Iterable[str]):
+        for request_id in list(request_ids):
+            subscription.request_ids.discard(request_id)
+            watchers = self._subscribers.get(request_id)
+            if watchers is not None:
+                watchers.discard(subscription)
+                if not watchers:
+                    del self._subscribers[request_id]
+
+    # ------------------------------------------------------------------ #
+    # Cross-process delivery
+    # ------------------------------------------------------------------ #
+
+    async def start(self):
+        """Listen for other processes' events and start publishing ours"""
+        if self._notifier_task is None or self._notifier_task.done():
+            self._outbox_ready = asyncio.Event()
+            self._notifier_task = asyncio.create_task(self._notify_loop(), name="progress-notifier")
+
+        if self._listener_conn is not None and not self._listener_conn.is_closed():
+            return
+        try:
+            self._listener_conn = await asyncpg.connect(**get_db_settings())
+            await self._listener_conn.add_listener(PROGRESS_CHANNEL, self._on_notification)
+            logger.info("Listening for request progress", channel=PROGRESS_CHANNEL)
+        except Exception as e:
+            self._listener_conn = None
+            logger.warning("Progress listener unavailable, only local events are pushed",
+                           error=str(e))
+
+    async def stop(self):
+        """Send pending notifications and stop cross-process delivery"""
+        if self._notifier_task is not None:
+            self._notifier_task.cancel()
+            try:
+                await self._notifier_task
+            except asyncio.CancelledError:
+                pass
+            self._notifier_task = None
+        await self._send_outbox()
+        self._outbox_ready = None
+
+        if self._listener_conn is not None and not self._listener_conn.is_closed():
+            await self._listener_conn.close()
+        self._listener_conn = None
+
+    def _on_notification(self, _conn, _pid, _channel, payload: str):
+        """Apply an event published by another process"""
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get('origin') == self.origin:
+            return
+        self._stats['remote_events'] += 1
+        self._apply(message.get('request_id'), message.get('data') or {})
+
+    async def _notify_loop(self):
+        while True:
+            await self._outbox_ready.wait()
+            await asyncio.sleep(self.coalesce_interval)
+            self._outbox_ready.clear()
+            await self._send_outbox()
+
+    async def _send_outbox(self):
+        if not self._outbox:
+            return
+        outbox, self._outbox = self._outbox, {}
+        try:
+            async with DatabaseConnection() as conn:
+                for request_id, data in outbox.items():
+                    await conn.execute(
+                        "SELECT pg_notify($1, $2)", PROGRESS_CHANNEL,
+                        self._notification_payload(request_id, data)
+                    )
+                    self._stats['notifications_sent'] += 1
+        except Exception as e:
+            logger.warning("Failed to publish request progress", error=str(e),
+                           requests=len(outbox))
+
+    def _notification_payload(self, request_id: str, data: Dict[str, Any]) -> str:
+        payload = json.dumps({'origin': self.origin, 'request_id': request_id, 'data': data},
+                             default=str)
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+            # Keep scalar fields; nested maps resync from the next events
+            data = {key: value for key, value in data.items() if not isinstance(value, (dict, list))}
+            payload = json.dumps({'origin': self.origin, 'request_id': request_id, 'data': data},
+                                 default=str)
+        return payload
+
+    # ------------------------------------------------------------------ #
+    # Introspection
+    # ------------------------------------------------------------------ #
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tracked request, watcher and event counters"""
+        return {
+            **self._stats,
+            'tracked_requests': len(self._state),
+            'watched_requests': len(self._subscribers),
+            'subscriptions': len({s for subs in self._subscribers.values() for s in subs}),
+            'listening': self._listener_conn is not None and not self._listener_conn.is_closed()
+        }
+
+
+progress_bus = ProgressEventBus(
+    coalesce_interval=float(os.getenv('PROGRESS_COALESCE_INTERVAL', '0.25')),
+    max_tracked_requests=int(os.getenv('PROGRESS_MAX_TRACKED_REQUESTS', '10000'))
+)
+
+
+def get_progress_bus() -> ProgressEventBus:
+    """Get the process-wide progress event bus"""
+    return progress_bus
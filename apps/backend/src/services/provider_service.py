@@ -4,16 +4,58 @@ import json
 import asyncio
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any
 from datetime import datetime
 import aiohttp
 
 from ..integrations.providers.chatgpt import ChatGPTProvider
 from ..integrations.providers.anthropic import AnthropicProvider
 from ..integrations.providers.gemini import GeminiProvider
+from ..integrations.connection_pool import get_connection_pool
+from ..integrations.provider_latency import backoff_delay, get_latency_tracker, retry_after_seconds
+from ..integrations.response_cache import get_response_cache
+from ..integrations.provider_streaming import (
+    ChunkCallback,
+    ProviderStream,
+    STREAM_TIMEOUT,
+    anthropic_delta,
+    collect_stream,
+    get_stream_stats,
+    iter_sse_deltas,
+    openai_delta
+)
+from ..integrations.provider_scheduler import (
+    get_provider_scheduler,
+    estimate_tokens,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL
+)
 from ..schemas.provider import ProviderConfig, TemperatureConfig
 from .category_postgres_service import CategoryPostgresService
 from .data_storage_service import DataStorageService
+from .category_validation_engine import CategoryValidationEngine
+from .progress_bus import get_progress_bus
+from .phase1_snapshot import get_phase1_snapshots
+from .pipeline_config_service import PipelineConfigService
+from .category_scheduler import (
+    COMPLETED,
+    SKIPPED,
+    CategoryGraphError,
+    CategoryNode,
+    CategoryScheduler
+)
+
+# Provider statuses answered with a backoff and retry
+RETRYABLE_STATUSES = (429, 503)
+
+
+class ProviderRateLimited(Exception):
+    """A provider asked the caller to back off (HTTP 429 or 503)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, request_payload: Optional[Dict] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.request_payload = request_payload or {}
 
 
 class ProviderService:
@@ -21,6 +63,21 @@ class ProviderService:
 
     CONFIG_FILE = Path("provider_config.json")
 
+    # Phase 2 categories without declared dependencies require this one
+    SCORING_MATRIX_CATEGORY = "Parameter-Based Scoring Matrix"
+
+    # Categories processed at once per request
+    CATEGORY_CONCURRENCY = int(os.getenv("CATEGORY_MAX_CONCURRENCY", "16"))
+
+    # Upper bound for buffered provider calls; tightened by observed latency
+    PROVIDER_TIMEOUT = 90.0
+
+    # Duplicate buffered calls still pending after the provider's p95 latency
+    HEDGE_PROVIDER_CALLS = os.getenv("PROVIDER_HEDGING", "false").lower() == "true"
+
+    # Retries of a rate-limited call, each after the provider's Retry-After delay
+    RATE_LIMIT_RETRIES = int(os.getenv("PROVIDER_RATE_LIMIT_RETRIES", "3"))
+
     # System prompt for pharmaceutical data analysis
     SYSTEM_PROMPT = """You are a pharmaceutical & market-intelligence assistant. Your job is to use the `web_search` tool to retrieve **live, current-year** market data for **{drug_name}** (include branded + generic where applicable) and return **only** two Markdown tables in the exact structures provided by the user. Do **not** add any commentary, headers, notes, bullets, or text outside the tables.
 
@@ -77,7 +134,13 @@ class ProviderService:
         self.config = self._load_config()
         self.providers = {}
         self.category_service = CategoryPostgresService()
+        self.connection_pool = get_connection_pool()
+        self.scheduler = get_provider_scheduler()
+        self.latency = get_latency_tracker()
+        self.response_cache = get_response_cache()
+        self.validation_engine = CategoryValidationEngine()
         self._initialize_providers()
+        self._configure_scheduler()
 
     def _load_config(self) -> Dict[str, Any]:
         """Load provider configuration from file."""
@@ -192,6 +255,61 @@ class ProviderService:
                 except Exception as e:
                     print(f"Failed to initialize {provider_id}: {e}")
 
+    def _configure_scheduler(self):
+        """
+        Apply per-provider call budgets.
+
+        Defaults are seeded from RateLimiter limits; override them with an
+        optional "scheduler" block in provider_config.json, e.g.
+        {"max_concurrency": 8, "rpm": 60, "tpm": 200000}.
+        """
+        for provider_id, config in self.config.items():
+            if config.get("scheduler"):
+                self.scheduler.configure(provider_id, **config["scheduler"])
+
+    async def open_sessions(self):
+        """
+        Create the pooled HTTP sessions for every configured provider.
+
+        Called at application startup. Pool sizing can be tuned per provider
+        with an optional "connection_pool" block in provider_config.json, e.g.
+        {"max_connections": 50, "max_connections_per_host": 10,
+        "keepalive_expiry": 300, "dns_cache_ttl": 300}.
+        """
+        for provider_id, config in self.config.items():
+            if provider_id == "gemini":
+                continue  # Gemini goes through the google-generativeai SDK
+            await self.connection_pool.open_session(
+                provider_id, **config.get("connection_pool", {})
+            )
+
+    async def close_sessions(self):
+        """Close all pooled HTTP sessions. Called at application shutdown."""
+        await self.connection_pool.close_all()
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Get connection pool utilisation metrics per provider."""
+        return self.connection_pool.get_session_metrics()
+
+    def get_scheduler_metrics(self) -> Dict[str, Any]:
+        """Get call scheduler queueing and budget metrics per provider."""
+        return self.scheduler.get_metrics()
+
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """Get response cache hit/miss and utilisation metrics."""
+        return self.response_cache.get_metrics()
+
+    def get_latency_metrics(self) -> Dict[str, Any]:
+        """Get latency percentiles, adaptive timeouts and hedging metrics per provider."""
+        metrics = self.latency.get_metrics()
+        for provider_id, provider_metrics in metrics.items():
+            provider_metrics["timeout_s"] = self.latency.timeout(provider_id, self.PROVIDER_TIMEOUT)
+        return metrics
+
+    def get_stream_metrics(self) -> Dict[str, Any]:
+        """Get time-to-first-token and tokens/second averages for streamed calls."""
+        return get_stream_stats().get_metrics()
+
     def get_all_providers(self) -> list:
         """Get all provider configurations."""
         result = []
@@ -315,15 +433,17 @@ class ProviderService:
         try:
             # Simple connectivity test
             if provider_id == "openai":
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        "https://api.openai.com/v1/models",
-                        headers={"Authorization": f"Bearer {config['api_key']}"}
-                    ) as response:
-                        if response.status == 200:
-                            return {"success": True, "message": "Connection successful"}
-                        else:
-                            return {"success": False, "error": f"API error: {response.status}"}
+                # Interactive check: jump ahead of queued background calls
+                async with self.scheduler.acquire(provider_id, tenant="provider-test", priority=PRIORITY_HIGH):
+                    async with self.connection_pool.get_session(provider_id) as session:
+                        async with session.get(
+                            "https://api.openai.com/v1/models",
+                            headers={"Authorization": f"Bearer {config['api_key']}"}
+                        ) as response:
+                            if response.status == 200:
+                                return {"success": True, "message": "Connection successful"}
+                            else:
+                                return {"success": False, "error": f"API error: {response.status}"}
 
             # Add tests for other providers
             return {"success": True, "message": "Provider test not implemented"}
@@ -335,11 +455,28 @@ class ProviderService:
         self,
         provider_id: str,
         prompt: str,
-        temperature: float
+        temperature: float,
+        request_id: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL,
+        category_name: Optional[str] = None,
+        bypass_cache: bool = False,
+        on_chunk: Optional[ChunkCallback] = None
     ) -> tuple:
         """
         Call a specific provider with a custom prompt.
 
+        When on_chunk is given, OpenAI chat models, Claude, Gemini and
+        Perplexity stream the completion and on_chunk receives each text
+        delta as it arrives; the full text is still returned.
+
+        Identical (provider, model, temperature, prompt, system prompt) calls
+        are served from the response cache; bypass_cache forces a fresh call
+        and refreshes the cached entry. Uncached calls wait for a slot from
+        the provider scheduler, which caps in-flight calls and request/token
+        rates per provider and shares capacity fairly between drug requests.
+        A rate-limited call (429/503) gives its slot back and is retried after
+        the delay the provider asked for.
+
         Returns:
             tuple: (response_text, request_payload)
         """
@@ -351,32 +488,182 @@ class ProviderService:
         if not config.get("api_key"):
             return f"API key not configured for {provider_id}", {}
 
+        prompt_tokens = estimate_tokens(prompt) + estimate_tokens(self.SYSTEM_PROMPT)
+
+        def schedule(dispatch: Callable[[], Awaitable[tuple]]) -> Awaitable[tuple]:
+            return self.scheduler.run(
+                provider_id,
+                dispatch,
+                tenant=request_id or "default",
+                priority=priority,
+                estimated_tokens=prompt_tokens + 4000,  # max_tokens reserved for the completion
+                count_tokens=lambda result: prompt_tokens + estimate_tokens(result[0])
+            )
+
+        async def call() -> Dict[str, Any]:
+            response, request_payload = await self._call_with_backoff(
+                provider_id,
+                lambda: schedule(
+                    lambda: self._timed_provider_call(provider_id, prompt, config, temperature, on_chunk, schedule)
+                )
+            )
+            return {"response": response, "request_payload": request_payload}
+
+        model = config.get("model", "")
+        result = await self.response_cache.get_or_call(
+            self.response_cache.make_key(provider_id, model, temperature, prompt, self.SYSTEM_PROMPT),
+            call,
+            category=category_name,
+            provider=provider_id,
+            model=model,
+            bypass=bypass_cache,
+            cacheable=self._is_cacheable_response
+        )
+        return result["response"], result["request_payload"]
+
+    @staticmethod
+    def _is_cacheable_response(result: Dict[str, Any]) -> bool:
+        """Only successful provider responses are cached, never error strings."""
+        response = result["response"]
+        if not result["request_payload"] or not response:
+            return False
+        return not (isinstance(response, str) and " API error: " in response[:40])
+
+    def stream_provider_with_prompt(
+        self,
+        provider_id: str,
+        prompt: str,
+        temperature: float,
+        request_id: Optional[str] = None,
+        priority: int = PRIORITY_NORMAL,
+        category_name: Optional[str] = None,
+        bypass_cache: bool = False
+    ) -> ProviderStream:
+        """
+        Call a provider and iterate over the completion as it streams in.
+
+        Returns:
+            ProviderStream yielding text deltas; response and request_payload
+            are set once iteration finishes
+        """
+        return ProviderStream(lambda on_chunk: self.call_provider_with_prompt(
+            provider_id,
+            prompt,
+            temperature,
+            request_id=request_id,
+            priority=priority,
+            category_name=category_name,
+            bypass_cache=bypass_cache,
+            on_chunk=on_chunk
+        ))
+
+    async def _call_with_backoff(self, provider_id: str, call: Callable[[], Awaitable[tuple]]) -> tuple:
+        """
+        Run a scheduled provider call, backing off while it is rate limited.
+
+        The wait happens outside the scheduler slot, so other requests can use
+        the capacity. Once retries run out the provider's error is returned.
+        """
+        for attempt in range(self.RATE_LIMIT_RETRIES + 1):
+            try:
+                return await call()
+            except ProviderRateLimited as e:
+                if attempt == self.RATE_LIMIT_RETRIES:
+                    return str(e), e.request_payload
+                delay = backoff_delay(attempt, e.retry_after)
+                print(f"{provider_id} rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                await asyncio.sleep(delay)
+
+    async def _timed_provider_call(
+        self,
+        provider_id: str,
+        prompt: str,
+        config: Dict,
+        temperature: float,
+        on_chunk: Optional[ChunkCallback] = None,
+        schedule: Optional[Callable[[Callable[[], Awaitable[tuple]]], Awaitable[tuple]]] = None
+    ) -> tuple:
+        """
+        Dispatch a buffered call under the provider's adaptive timeout.
+
+        Timeouts follow the provider's observed p99 latency and, with
+        PROVIDER_HEDGING enabled, a slow call is duplicated and the first
+        good response wins. The caller already holds a scheduler slot for the
+        first attempt; a hedge is a second request, so it waits for its own
+        slot through schedule and counts against the provider's budgets.
+        Streamed calls are bounded by their idle timeout and never
+        duplicated, since their chunks are already forwarded.
+        """
+        if on_chunk is not None:
+            return await self._dispatch_provider_call(provider_id, prompt, config, temperature, on_chunk)
+
+        attempts = 0
+
+        def dispatch() -> Awaitable[tuple]:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1 or schedule is None:
+                return self._dispatch_provider_call(provider_id, prompt, config, temperature)
+            return schedule(lambda: self._dispatch_provider_call(provider_id, prompt, config, temperature))
+
+        try:
+            return await self.latency.run(
+                provider_id,
+                dispatch,
+                default_timeout=self.PROVIDER_TIMEOUT,
+                hedge=self.HEDGE_PROVIDER_CALLS,
+                succeeded=lambda result: self._is_cacheable_response(
+                    {"response": result[0], "request_payload": result[1]}
+                )
+            )
+        except asyncio.TimeoutError as e:
+            return f"Error calling {provider_id}: {e}", {}
+
+    async def _dispatch_provider_call(
+        self,
+        provider_id: str,
+        prompt: str,
+        config: Dict,
+        temperature: float,
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> tuple:
+        """Route a prompt to the provider-specific call implementation."""
         try:
             # Use the appropriate provider with custom prompt
             if provider_id == "openai":
-                return await self._call_openai_with_prompt(prompt, config, temperature)
+                return await self._call_openai_with_prompt(prompt, config, temperature, on_chunk)
             elif provider_id == "claude":
-                return await self._call_claude_with_prompt(prompt, config, temperature)
+                return await self._call_claude_with_prompt(prompt, config, temperature, on_chunk)
             elif provider_id == "gemini":
-                return await self._call_gemini_with_prompt(prompt, config, temperature)
+                return await self._call_gemini_with_prompt(prompt, config, temperature, on_chunk)
             elif provider_id == "perplexity":
-                return await self._call_perplexity_with_prompt(prompt, config, temperature)
+                return await self._call_perplexity_with_prompt(prompt, config, temperature, on_chunk)
             elif provider_id == "tavily":
                 return await self._call_tavily_with_prompt(prompt, config, temperature)
             else:
                 return f"Provider {provider_id} not implemented", {}
+        except ProviderRateLimited:
+            raise
         except Exception as e:
             return f"Error calling {provider_id}: {str(e)}", {}
 
-    async def _call_openai_with_prompt(self, prompt: str, config: Dict, temperature: float) -> tuple:
+    async def _call_openai_with_prompt(
+        self,
+        prompt: str,
+        config: Dict,
+        temperature: float,
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> tuple:
         """
         Call OpenAI API with custom prompt.
 
+        Streams the completion into on_chunk when it is given.
+
         Returns:
             tuple: (response_text, request_payload)
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.connection_pool.get_session("openai") as session:
                 headers = {
                     "Authorization": f"Bearer {config['api_key']}",
                     "Content-Type": "application/json"
@@ -467,6 +754,11 @@ class ProviderService:
 
                     endpoint = "https://api.openai.com/v1/chat/completions"
 
+                # Responses API output is structured, so GPT-5 stays buffered
+                stream = on_chunk is not None and not is_gpt5
+                if stream:
+                    payload["stream"] = True
+
                 # Store payload for logging (copy to avoid mutation)
                 request_payload = {
                     "endpoint": endpoint,
@@ -478,9 +770,14 @@ class ProviderService:
                     endpoint,
                     json=payload,
                     headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=90)
+                    timeout=STREAM_TIMEOUT if stream else aiohttp.ClientTimeout(total=90)
                 ) as response:
-                    if response.status == 200:
+                    if response.status == 200 and stream:
+                        text, request_payload["stream_metrics"] = await collect_stream(
+                            "openai", iter_sse_deltas(response, openai_delta), on_chunk
+                        )
+                        return text, request_payload
+                    elif response.status == 200:
                         data = await response.json()
 
                         # Handle different response formats
@@ -497,21 +794,36 @@ class ProviderService:
                             return data["choices"][0]["message"]["content"], request_payload
                     else:
                         error = await response.text()
-                        return f"OpenAI API error: {response.status} - {error[:200]}", request_payload
+                        message = f"OpenAI API error: {response.status} - {error[:200]}"
+                        if response.status in RETRYABLE_STATUSES:
+                            raise ProviderRateLimited(
+                                message, retry_after_seconds(response.headers), request_payload
+                            )
+                        return message, request_payload
+        except ProviderRateLimited:
+            raise
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
             return f"OpenAI exception: {str(e)} - {error_details[:500]}", {}
 
-    async def _call_claude_with_prompt(self, prompt: str, config: Dict, temperature: float) -> tuple:
+    async def _call_claude_with_prompt(
+        self,
+        prompt: str,
+        config: Dict,
+        temperature: float,
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> tuple:
         """
         Call Claude API with custom prompt.
 
+        Streams the completion into on_chunk when it is given.
+
         Returns:
             tuple: (response_text, request_payload)
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.connection_pool.get_session("claude") as session:
                 headers = {
                     "x-api-key": config["api_key"],
                     "anthropic-version": "2023-06-01",
@@ -530,6 +842,10 @@ class ProviderService:
 
                 endpoint = "https://api.anthropic.com/v1/messages"
 
+                stream = on_chunk is not None
+                if stream:
+                    payload["stream"] = True
+
                 # Store payload for logging (copy to avoid mutation)
                 request_payload = {
                     "endpoint": endpoint,
@@ -541,23 +857,43 @@ class ProviderService:
                     endpoint,
                     json=payload,
                     headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=90)
+                    timeout=STREAM_TIMEOUT if stream else aiohttp.ClientTimeout(total=90)
                 ) as response:
-                    if response.status == 200:
+                    if response.status == 200 and stream:
+                        text, request_payload["stream_metrics"] = await collect_stream(
+                            "claude", iter_sse_deltas(response, anthropic_delta), on_chunk
+                        )
+                        return text, request_payload
+                    elif response.status == 200:
                         data = await response.json()
                         return data["content"][0]["text"], request_payload
                     else:
                         error = await response.text()
-                        return f"Claude API error: {response.status} - {error[:200]}", request_payload
+                        message = f"Claude API error: {response.status} - {error[:200]}"
+                        if response.status in RETRYABLE_STATUSES:
+                            raise ProviderRateLimited(
+                                message, retry_after_seconds(response.headers), request_payload
+                            )
+                        return message, request_payload
+        except ProviderRateLimited:
+            raise
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
             return f"Claude exception: {str(e)} - {error_details[:500]}", {}
 
-    async def _call_gemini_with_prompt(self, prompt: str, config: Dict, temperature: float) -> tuple:
+    async def _call_gemini_with_prompt(
+        self,
+        prompt: str,
+        config: Dict,
+        temperature: float,
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> tuple:
         """
         Call Gemini API with custom prompt.
 
+        Streams the completion into on_chunk when it is given.
+
         Returns:
             tuple: (response_text, request_payload)
         """
@@ -588,6 +924,22 @@ class ProviderService:
                 "max_output_tokens": 4000
             }
 
+            if on_chunk is not None:
+                request_payload["stream"] = True
+                response = await model.generate_content_async(
+                    combined_prompt,
+                    generation_config=generation_config,
+                    stream=True
+                )
+
+                async def deltas():
+                    async for chunk in response:
+                        if chunk.text:
+                            yield chunk.text
+
+                text, request_payload["stream_metrics"] = await collect_stream("gemini", deltas(), on_chunk)
+                return text, request_payload
+
             # Generate content asynchronously
             response = await model.generate_content_async(
                 combined_prompt,
@@ -602,19 +954,31 @@ class ProviderService:
         except ImportError:
             return "google-generativeai package not installed. Install with: pip install google-generativeai", {}
         except Exception as e:
+            # google.api_core errors carry the HTTP status but not the response headers
+            status = getattr(e, "code", None)
+            if isinstance(status, int) and status in RETRYABLE_STATUSES:
+                raise ProviderRateLimited(f"Gemini API error: {int(status)} - {str(e)[:200]}")
             import traceback
             error_details = traceback.format_exc()
             return f"Gemini exception: {str(e)} - {error_details[:500]}", {}
 
-    async def _call_perplexity_with_prompt(self, prompt: str, config: Dict, temperature: float) -> tuple:
+    async def _call_perplexity_with_prompt(
+        self,
+        prompt: str,
+        config: Dict,
+        temperature: float,
+        on_chunk: Optional[ChunkCallback] = None
+    ) -> tuple:
         """
         Call Perplexity API with custom prompt.
 
+        Streams the completion into on_chunk when it is given.
+
         Returns:
             tuple: (response_text, request_payload)
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.connection_pool.get_session("perplexity") as session:
                 headers = {
                     "Authorization": f"Bearer {config['api_key']}",
                     "Content-Type": "application/json"
@@ -639,7 +1003,7 @@ class ProviderService:
                     "return_related_questions": False,
                     "search_recency_filter": "month",
                     "top_k": 0,
-                    "stream": False,
+                    "stream": on_chunk is not None,
                     "presence_penalty": 0,
                     "frequency_penalty": 1
                 }
@@ -657,14 +1021,26 @@ class ProviderService:
                     endpoint,
                     headers=headers,
                     json=payload,
-                    timeout=aiohttp.ClientTimeout(total=90)
+                    timeout=STREAM_TIMEOUT if payload["stream"] else aiohttp.ClientTimeout(total=90)
                 ) as response:
-                    if response.status == 200:
+                    if response.status == 200 and payload["stream"]:
+                        text, request_payload["stream_metrics"] = await collect_stream(
+                            "perplexity", iter_sse_deltas(response, openai_delta), on_chunk
+                        )
+                        return text, request_payload
+                    elif response.status == 200:
                         data = await response.json()
                         return data["choices"][0]["message"]["content"], request_payload
                     else:
                         error = await response.text()
-                        return f"Perplexity API error: {response.status} - {error[:200]}", request_payload
+                        message = f"Perplexity API error: {response.status} - {error[:200]}"
+                        if response.status in RETRYABLE_STATUSES:
+                            raise ProviderRateLimited(
+                                message, retry_after_seconds(response.headers), request_payload
+                            )
+                        return message, request_payload
+        except ProviderRateLimited:
+            raise
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
@@ -678,7 +1054,7 @@ class ProviderService:
             tuple: (response_text, request_payload)
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.connection_pool.get_session("tavily") as session:
                 headers = {
                     "Content-Type": "application/json"
                 }
@@ -735,13 +1111,26 @@ class ProviderService:
                         return response_text, request_payload
                     else:
                         error = await response.text()
-                        return f"Tavily API error: {response.status} - {error[:200]}", request_payload
+                        message = f"Tavily API error: {response.status} - {error[:200]}"
+                        if response.status in RETRYABLE_STATUSES:
+                            raise ProviderRateLimited(
+                                message, retry_after_seconds(response.headers), request_payload
+                            )
+                        return message, request_payload
+        except ProviderRateLimited:
+            raise
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
             return f"Tavily exception: {str(e)} - {error_details[:500]}", {}
 
-    async def _process_single_category(self, category: Dict, drug_name: str, request_id: str) -> Dict[str, Any]:
+    async def _process_single_category(
+        self,
+        category: Dict,
+        drug_name: str,
+        request_id: str,
+        bypass_cache: bool = False
+    ) -> Dict[str, Any]:
         """Process a single category with all providers concurrently"""
         category_start_time = datetime.now()
         category_key = category["key"]
@@ -781,17 +1170,24 @@ class ProviderService:
                 enabled_temps = [default_temp]
 
             for temp in enabled_temps:
+                # Streaming providers convert tables row by row as text arrives
+                table_converter = self.validation_engine.start_table_conversion() if config.get("stream") else None
                 tasks.append(self.call_provider_with_prompt(
                     provider_id,
                     category_prompt,
-                    temp["value"]
+                    temp["value"],
+                    request_id=request_id,
+                    category_name=category["name"],
+                    bypass_cache=bypass_cache,
+                    on_chunk=table_converter.feed if table_converter else None
                 ))
                 task_metadata.append({
                     "provider_id": provider_id,
                     "config": config,
                     "temp": temp,
                     "supports_temperature": supports_temperature,
-                    "category": category
+                    "category": category,
+                    "table_converter": table_converter
                 })
 
         # Execute all API calls concurrently
@@ -848,11 +1244,15 @@ class ProviderService:
             else:
                 response, request_payload = result
 
-                category_results_data["responses"][provider_id]["responses"].append({
+                provider_response = {
                     "temperature": temp["value"],
                     "label": temp["label"],
                     "response": response
-                })
+                }
+                table_converter = metadata["table_converter"]
+                if table_converter and table_converter.content and table_converter.content == response:
+                    provider_response["tables_json"] = table_converter.close()
+                category_results_data["responses"][provider_id]["responses"].append(provider_response)
                 all_responses.append(response)
                 counters["total_api_calls"] += 1
 
@@ -895,19 +1295,22 @@ class ProviderService:
             for provider_id, provider_data in category_results_data["responses"].items():
                 for resp in provider_data["responses"]:
                     if "response" in resp and not resp.get("error"):
-                        api_responses_with_meta.append({
+                        response_meta = {
                             "provider": provider_data["provider"],
                             "model": provider_data["model"],
                             "response": resp["response"],
                             "temperature": resp.get("temperature", 0.7),
                             "temperature_label": resp.get("label", "")
-                        })
+                        }
+                        if "tables_json" in resp:
+                            response_meta["tables_json"] = resp["tables_json"]
+                        api_responses_with_meta.append(response_meta)
 
             category_result_id = await DataStorageService.store_category_result(
                 request_id=request_id,
                 category_id=category["id"],
                 category_name=category["name"],
-                summary="Processing through pipeline...",
+                summary=DataStorageService.PENDING_SUMMARY,
                 confidence_score=0.0,
                 data_quality_score=0.0,
                 api_calls_made=len(all_responses),
@@ -955,6 +1358,14 @@ class ProviderService:
                     )
                     counters["stored_sources"] += 1
 
+        get_progress_bus().publish(request_id, categories={
+            category["name"]: {
+                "status": "completed",
+                "apiCalls": counters["total_api_calls"],
+                "durationMs": int((datetime.now() - category_start_time).total_seconds() * 1000)
+            }
+        })
+
         return {
             "category_key": category_key,
             "category_data": category_results_data,
@@ -1013,7 +1424,113 @@ class ProviderService:
                 }
             }
 
-    async def process_drug_with_categories(self, drug_name: str, request_id: str) -> Dict[str, Any]:
+    def _build_category_schedule(
+        self,
+        phase1_categories: List[Dict],
+        phase2_categories: List[Dict],
+        resumed: List[Dict],
+        declared: Dict[int, List[int]],
+        drug_name: str,
+        request_id: str,
+        bypass_cache: bool,
+        pipeline_service: Any,
+        report_progress: Callable[[Awaitable[Any]], Awaitable[Any]]
+    ) -> CategoryScheduler:
+        """
+        Build the category dependency graph for one request.
+
+        Declared dependencies (category_dependencies) are hard requirements.
+        A Phase 2 category without declared dependencies keeps the original
+        ordering: it waits for all of Phase 1 (whatever their outcome) and
+        requires the Parameter-Based Scoring Matrix to succeed.
+        """
+        scheduler = CategoryScheduler(max_concurrency=self.CATEGORY_CONCURRENCY)
+        phase1_ids = {c["id"] for c in phase1_categories} | {c["id"] for c in resumed}
+        scoring_matrix = next(
+            (c for c in phase2_categories if c.get("name") == self.SCORING_MATRIX_CATEGORY), None
+        )
+
+        for category in resumed:
+            scheduler.mark_resumed(category["id"], category["name"])
+
+        for category in phase1_categories:
+            scheduler.add(
+                category["id"], category["name"],
+                lambda category=category: report_progress(
+                    self._process_single_category(category, drug_name, request_id, bypass_cache)
+                ),
+                requires=set(declared.get(category["id"], ()))
+            )
+
+        for category in phase2_categories:
+            requires = set(declared.get(category["id"], ()))
+            after = set()
+            if not requires:
+                after = set(phase1_ids)
+                if scoring_matrix and category is not scoring_matrix:
+                    requires = {scoring_matrix["id"]}
+            scheduler.add(
+                category["id"], category.get("name", "Unknown"),
+                lambda category=category: report_progress(
+                    self._process_phase2_category(category, drug_name, request_id, pipeline_service)
+                ),
+                requires=requires,
+                after=after,
+                succeeded=lambda result: isinstance(result, dict)
+                    and result.get("category_data", {}).get("status") == "completed"
+            )
+
+        return scheduler
+
+    @staticmethod
+    def _collect_phase1_result(results: Dict[str, Any], node: CategoryNode):
+        """Add a finished Phase 1 category to the request summary."""
+        if node.error is not None:
+            import traceback
+            print(f"[CONCURRENT] Category error: {node.error!r}")
+            traceback.print_exception(type(node.error), node.error, node.error.__traceback__)
+        result = node.result
+        if node.status != COMPLETED or result is None:
+            return
+
+        results["phase1_categories"][result["category_key"]] = result["category_data"]
+
+        counters = result["counters"]
+        results["total_api_calls"] += counters["total_api_calls"]
+        results["stored_logs"] += counters["stored_logs"]
+        results["stored_results"] += counters["stored_results"]
+        results["stored_sources"] += counters["stored_sources"]
+
+        for provider in counters["providers_used"]:
+            if provider not in results["providers_used"]:
+                results["providers_used"].append(provider)
+
+    @staticmethod
+    def _collect_phase2_result(results: Dict[str, Any], node: CategoryNode):
+        """Add a finished Phase 2 category to the request summary."""
+        if node.status == SKIPPED:
+            print(f"[PHASE 2] Skipped {node.name}: a required category did not complete")
+            return
+        if node.error is not None:
+            print(f"[PHASE 2] Category error ({node.name}): {node.error}")
+            return
+        if not isinstance(node.result, dict):
+            print(f"[PHASE 2] {node.name} returned no result")
+            return
+
+        print(f"[PHASE 2] {node.name}: {node.result['category_data'].get('status', 'unknown')}")
+        results["phase2_categories"][node.result["category_key"]] = node.result["category_data"]
+        if node.status == COMPLETED:
+            results["stored_results"] += 1
+
+    async def process_drug_with_categories(
+        self,
+        drug_name: str,
+        request_id: str,
+        bypass_cache: bool = False,
+        skip_category_ids: Optional[set] = None,
+        progress_callback: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
         """
         Process a drug through all enabled categories using all enabled providers.
         Stores results to PostgreSQL database tables.
@@ -1021,6 +1538,11 @@ class ProviderService:
         Args:
             drug_name: Name of the drug to analyze
             request_id: Database request ID for correlation
+            bypass_cache: Ignore cached provider responses (results are still cached)
+            skip_category_ids: Phase 1 categories already stored for this
+                request (when resuming); they are not processed again
+            progress_callback: Awaited with (completed, total) categories
+                whenever a category finishes
 
         Returns:
             Summary of processing results
@@ -1048,180 +1570,79 @@ class ProviderService:
             for cat in phase2_categories:
                 print(f"[DEBUG]   - {cat.get('name', 'Unknown')}")
 
-        # Process Phase 1 categories (Data Collection) - CONCURRENTLY!
-        print(f"[CONCURRENT] Processing {len(phase1_categories)} categories concurrently...")
-        category_tasks = [
-            self._process_single_category(category, drug_name, request_id)
-            for category in phase1_categories
-        ]
-
-        category_results = await asyncio.gather(*category_tasks, return_exceptions=True)
-        print(f"[CONCURRENT] All {len(phase1_categories)} categories completed!")
-
-        # Aggregate results from all categories
-        for result in category_results:
-            if result is None or isinstance(result, Exception):
-                if isinstance(result, Exception):
-                    import traceback
-                    error_msg = repr(result)  # Use repr to avoid encoding issues
-                    print(f"[CONCURRENT] Category error: {error_msg}")
-                    print(f"[CONCURRENT] Full traceback:")
-                    traceback.print_exception(type(result), result, result.__traceback__)
-                continue
-
-            # Add category data to results
-            results["phase1_categories"][result["category_key"]] = result["category_data"]
-
-            # Aggregate counters
-            counters = result["counters"]
-            results["total_api_calls"] += counters["total_api_calls"]
-            results["stored_logs"] += counters["stored_logs"]
-            results["stored_results"] += counters["stored_results"]
-            results["stored_sources"] += counters["stored_sources"]
-
-            # Merge providers_used lists (avoid duplicates)
-            for provider in counters["providers_used"]:
-                if provider not in results["providers_used"]:
-                    results["providers_used"].append(provider)
-
-        # Process Phase 2 categories (Decision Intelligence) - these use Phase 1 data
-        print(f"\n{'='*80}")
-        print(f"[PHASE 2 CHECK] phase2_categories: {phase2_categories}")
-        print(f"[PHASE 2 CHECK] len(phase2_categories): {len(phase2_categories) if phase2_categories else 0}")
-        print(f"{'='*80}\n")
+        total_categories = len(phase1_categories) + len(phase2_categories)
+        progress = {"completed": 0}
 
+        async def report_progress(task):
+            try:
+                return await task
+            finally:
+                progress["completed"] += 1
+                if progress_callback:
+                    await progress_callback(progress["completed"], total_categories)
+
+        resumed = []
+        if skip_category_ids:
+            resumed = [c for c in phase1_categories if c["id"] in skip_category_ids]
+            phase1_categories = [c for c in phase1_categories if c["id"] not in skip_category_ids]
+            progress["completed"] = len(resumed)
+            print(f"[RESUME] Skipping {len(resumed)} Phase 1 categories already stored for {request_id}")
+
+        # Phase 1 (data collection) and Phase 2 (decision intelligence) run as
+        # one dependency graph: each category starts once its inputs are ready
+        pipeline_service = None
         if phase2_categories:
-            print(f"[PHASE 2] *** STARTING PHASE 2 PROCESSING ***")
-            print(f"[PHASE 2] Processing {len(phase2_categories)} Phase 2 categories...")
-            print(f"[PHASE 2] Categories: {[c.get('name', 'Unknown') for c in phase2_categories]}")
-
             from .pipeline_integration_service import PipelineIntegrationService
             pipeline_service = PipelineIntegrationService()
+        else:
+            print(f"[PHASE 2] *** NO PHASE 2 CATEGORIES TO PROCESS ***")
 
-            # CRITICAL: Parameter-Based Scoring Matrix MUST run first and succeed
-            # Separate Parameter-Based Scoring Matrix from other Phase 2 categories
-            scoring_matrix_category = None
-            other_phase2_categories = []
-
-            for category in phase2_categories:
-                if category.get('name') == 'Parameter-Based Scoring Matrix':
-                    scoring_matrix_category = category
-                    print(f"[PHASE 2] Found MANDATORY category: {category.get('name')}")
-                else:
-                    other_phase2_categories.append(category)
-
-            # Process Parameter-Based Scoring Matrix FIRST (mandatory)
-            if scoring_matrix_category:
-                print(f"[PHASE 2] *** STEP 1: Processing MANDATORY Parameter-Based Scoring Matrix ***")
-                print(f"[PHASE 2] This category MUST complete successfully before other Phase 2 categories can proceed")
-
-                try:
-                    scoring_result = await self._process_phase2_category(
-                        scoring_matrix_category, drug_name, request_id, pipeline_service
-                    )
-
-                    # Check if scoring matrix succeeded
-                    if scoring_result and isinstance(scoring_result, dict):
-                        scoring_status = scoring_result.get("category_data", {}).get("status", "failed")
-
-                        if scoring_status == "completed":
-                            print(f"[PHASE 2] ✓ Parameter-Based Scoring Matrix COMPLETED successfully")
-                            print(f"[PHASE 2] Storing scoring matrix result...")
-
-                            category_key = scoring_result["category_key"]
-                            results["phase2_categories"][category_key] = scoring_result["category_data"]
-                            results["stored_results"] += 1
-
-                            print(f"[PHASE 2] *** STEP 2: Processing {len(other_phase2_categories)} dependent Phase 2 categories ***")
-
-                            # Now process other Phase 2 categories
-                            if other_phase2_categories:
-                                phase2_tasks = []
-                                for category in other_phase2_categories:
-                                    print(f"[PHASE 2] Creating task for: {category.get('name', 'Unknown')}")
-                                    phase2_tasks.append(
-                                        self._process_phase2_category(
-                                            category, drug_name, request_id, pipeline_service
-                                        )
-                                    )
-
-                                print(f"[PHASE 2] Awaiting {len(phase2_tasks)} dependent Phase 2 tasks...")
-                                phase2_results = await asyncio.gather(*phase2_tasks, return_exceptions=True)
-                                print(f"[PHASE 2] All dependent Phase 2 categories completed!")
-
-                                # Aggregate Phase 2 results
-                                for i, result in enumerate(phase2_results):
-                                    if result is None or isinstance(result, Exception):
-                                        if isinstance(result, Exception):
-                                            print(f"[PHASE 2] Category error [{i}]: {str(result)}")
-                                            import traceback
-                                            print(f"[PHASE 2] Traceback: {traceback.format_exc()}")
-                                        else:
-                                            print(f"[PHASE 2] Result [{i}] is None")
-                                        continue
-
-                                    category_key = result["category_key"]
-                                    print(f"[PHASE 2] Storing result for {category_key}: {result['category_data'].get('status', 'unknown')}")
-                                    results["phase2_categories"][category_key] = result["category_data"]
-                                    results["stored_results"] += 1
-                            else:
-                                print(f"[PHASE 2] No other Phase 2 categories to process")
-
-                        else:
-                            print(f"[PHASE 2] ✗ Parameter-Based Scoring Matrix FAILED with status: {scoring_status}")
-                            print(f"[PHASE 2] ERROR: Cannot proceed with other Phase 2 categories without successful scoring matrix")
-                            print(f"[PHASE 2] Skipping {len(other_phase2_categories)} dependent Phase 2 categories")
+        try:
+            declared = await PipelineConfigService().get_category_dependencies()
+        except Exception as e:
+            print(f"[SCHEDULER] WARNING: Could not load category dependencies, using phase order: {e}")
+            declared = {}
 
-                            # Store the failed scoring result
-                            category_key = scoring_result["category_key"]
-                            results["phase2_categories"][category_key] = scoring_result["category_data"]
+        scheduler = self._build_category_schedule(
+            phase1_categories, phase2_categories, resumed, declared,
+            drug_name, request_id, bypass_cache, pipeline_service, report_progress
+        )
+        try:
+            scheduler.validate()
+        except CategoryGraphError as e:
+            print(f"[SCHEDULER] WARNING: {e}; falling back to phase order")
+            scheduler = self._build_category_schedule(
+                phase1_categories, phase2_categories, resumed, {},
+                drug_name, request_id, bypass_cache, pipeline_service, report_progress
+            )
 
-                    else:
-                        print(f"[PHASE 2] ✗ Parameter-Based Scoring Matrix returned invalid result")
-                        print(f"[PHASE 2] ERROR: Cannot proceed with other Phase 2 categories")
-                        print(f"[PHASE 2] Skipping {len(other_phase2_categories)} dependent Phase 2 categories")
-
-                except Exception as e:
-                    print(f"[PHASE 2] ✗ CRITICAL ERROR: Parameter-Based Scoring Matrix failed with exception")
-                    print(f"[PHASE 2] Exception: {str(e)}")
-                    import traceback
-                    print(f"[PHASE 2] Traceback: {traceback.format_exc()}")
-                    print(f"[PHASE 2] ERROR: Cannot proceed with other Phase 2 categories")
-                    print(f"[PHASE 2] Skipping {len(other_phase2_categories)} dependent Phase 2 categories")
+        phase1_ids = {c["id"] for c in phase1_categories} | {c["id"] for c in resumed}
+        phase1_snapshots = get_phase1_snapshots()
+        phase1_snapshots.discard(request_id)
 
+        async def collect(node: CategoryNode):
+            if node.key in phase1_ids:
+                # Phase 2 categories starting from now on must see this result
+                phase1_snapshots.discard(request_id)
+                self._collect_phase1_result(results, node)
             else:
-                print(f"[PHASE 2] WARNING: Parameter-Based Scoring Matrix not found in Phase 2 categories!")
-                print(f"[PHASE 2] This is unexpected - all Phase 2 categories depend on scoring matrix")
-                print(f"[PHASE 2] Proceeding with available Phase 2 categories anyway...")
-
-                # Fallback: process all available Phase 2 categories
-                phase2_tasks = []
-                for category in other_phase2_categories:
-                    print(f"[PHASE 2] Creating task for: {category.get('name', 'Unknown')}")
-                    phase2_tasks.append(
-                        self._process_phase2_category(
-                            category, drug_name, request_id, pipeline_service
-                        )
-                    )
-
-                if phase2_tasks:
-                    print(f"[PHASE 2] Awaiting {len(phase2_tasks)} Phase 2 tasks...")
-                    phase2_results = await asyncio.gather(*phase2_tasks, return_exceptions=True)
-
-                    for i, result in enumerate(phase2_results):
-                        if result is None or isinstance(result, Exception):
-                            if isinstance(result, Exception):
-                                print(f"[PHASE 2] Category error [{i}]: {str(result)}")
-                            continue
+                self._collect_phase2_result(results, node)
 
-                        category_key = result["category_key"]
-                        results["phase2_categories"][category_key] = result["category_data"]
-                        results["stored_results"] += 1
-
-            print(f"[PHASE 2] *** PHASE 2 PROCESSING COMPLETE ***")
-            print(f"[PHASE 2] Total Phase 2 results stored: {len(results['phase2_categories'])}")
-        else:
-            print(f"[PHASE 2] *** NO PHASE 2 CATEGORIES TO PROCESS ***")
+        print(f"[SCHEDULER] Processing {len(scheduler.nodes)} categories "
+              f"(max {self.CATEGORY_CONCURRENCY} concurrent)...")
+        try:
+            schedule = await scheduler.run(on_finish=collect)
+        finally:
+            phase1_snapshots.discard(request_id)
+
+        results["schedule"] = schedule
+        print(f"[SCHEDULER] All categories finished in {schedule['wall_time']}s "
+              f"(sequential {schedule['sequential_time']}s)")
+        critical_path = " -> ".join(
+            f"{step['name']} ({step['duration']}s)" for step in schedule["critical_path"]
+        )
+        print(f"[SCHEDULER] Critical path: {critical_path}")
+        print(f"[PHASE 2] Total Phase 2 results stored: {len(results['phase2_categories'])}")
 
         return results
 # Phase 2 processing is enabled
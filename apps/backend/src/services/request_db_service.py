@@ -14,6 +14,7 @@ import structlog
 
 from ..database.connection import get_engine, get_db_session
 from .audit_service import AuditService
+from .progress_bus import get_progress_bus
 
 logger = structlog.get_logger(__name__)
 
@@ -240,6 +241,22 @@ class RequestDatabaseService:
             logger.error("Failed to get all requests from database", error=str(e))
             return []
 
+    @staticmethod
+    def _publish_progress(request_id: str, updates: Dict[str, Any]):
+        """Push progress fields of a committed update to live watchers"""
+        fields = {
+            key: updates[key]
+            for key in ("status", "completedCategories", "totalCategories", "completedAt")
+            if key in updates
+        }
+        completed, total = updates.get("completedCategories"), updates.get("totalCategories")
+        if completed is not None and total:
+            fields["progressPercentage"] = int(completed / total * 100)
+        elif "progressPercentage" in updates:
+            fields["progressPercentage"] = updates["progressPercentage"]
+        if fields:
+            get_progress_bus().publish(request_id, **fields)
+
     async def update_request(
         self,
         request_id: str,
@@ -267,7 +284,14 @@ class RequestDatabaseService:
                     update_fields.append("status = :status")
                     params["status"] = updates["status"]
 
-                if "progressPercentage" in updates:
+                if "totalCategories" in updates:
+                    update_fields.append("total_categories = :total")
+                    params["total"] = updates["totalCategories"]
+
+                if "completedCategories" in updates:
+                    update_fields.append("completed_categories = :completed")
+                    params["completed"] = updates["completedCategories"]
+                elif "progressPercentage" in updates:
                     # Calculate completed categories from percentage
                     if "totalCategories" in updates:
                         total = updates["totalCategories"]
@@ -301,6 +325,8 @@ class RequestDatabaseService:
 
                 break
 
+            self._publish_progress(request_id, updates)
+
             # Log audit event
             await AuditService.log_event(
                 event_type="update",
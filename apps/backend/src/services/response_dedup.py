@@ -0,0 +1,246 @@
+"""
+Pre-Merge Response Deduplication
+Deterministic near-duplicate detection for provider responses before the LLM merge.
+
+The same model queried at several temperatures often answers with nearly
+identical text. Whole responses are compared by MinHash (bottom-k sketch of
+word shingles); a response that nearly duplicates a higher-priority one is
+collapsed into it and only its paragraphs and table rows not already present
+are passed on. Markdown table rows are compared by SimHash across all
+responses, so a row repeated by several providers reaches the merge once;
+rows only match when their figures are identical, so conflicting values
+are always left for the merge to resolve.
+No model calls are made; the result only depends on the input.
+"""
+import hashlib
+import heapq
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+import structlog
+
+from .merge_engine import count_tokens
+
+logger = structlog.get_logger(__name__)
+
+# Words per shingle for MinHash comparison
+_SHINGLE_SIZE = 3
+
+# Size of the bottom-k MinHash sketch
+_SKETCH_SIZE = 128
+
+# SimHash fingerprints within this many differing bits are the same row
+_SIMHASH_DISTANCE = 3
+
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_TABLE_SEPARATOR = re.compile(r"^\|?[\s:|-]+\|?$")
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def shingles(text: str, size: int = _SHINGLE_SIZE) -> Set[str]:
+    """Word n-grams of normalized text (the whole text if it is shorter)"""
+    words = _words(text)
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text: str, size: int = _SKETCH_SIZE) -> List[int]:
+    """Bottom-k MinHash sketch: the smallest hashes of the text's shingles"""
+    return sorted(heapq.nsmallest(size, {_hash64(shingle) for shingle in shingles(text)}))
+
+
+def similarity(a: List[int], b: List[int], size: int = _SKETCH_SIZE) -> float:
+    """Estimated Jaccard similarity of two sketches"""
+    if not a or not b:
+        return 0.0
+    union = heapq.nsmallest(size, set(a) | set(b))
+    shared = set(a) & set(b)
+    return sum(1 for value in union if value in shared) / len(union)
+
+
+def simhash(features: List[str]) -> int:
+    """64-bit SimHash of a list of features"""
+    weights = [0] * 64
+    for feature in features:
+        value = _hash64(feature)
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def _row_features(line: str) -> List[str]:
+    """Words of a table row, tagged with their column"""
+    cells = line.strip().strip("|").split("|")
+    return [f"{column}:{word}" for column, cell in enumerate(cells) for word in _words(cell)]
+
+
+def _parse_blocks(text: str) -> List[Dict[str, Any]]:
+    """Split text into paragraphs and tables (header lines plus data rows)"""
+    blocks: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            current = None
+            continue
+        kind = "table" if stripped.startswith("|") else "paragraph"
+        if current is None or current["kind"] != kind:
+            current = {"kind": kind, "lines": [], "header": [], "rows": []}
+            blocks.append(current)
+        if kind == "paragraph":
+            current["lines"].append(line)
+        elif not current["header"] or (len(current["header"]) == 1 and _TABLE_SEPARATOR.match(stripped)):
+            current["header"].append(line)
+        else:
+            current["rows"].append(line)
+    return blocks
+
+
+def _render_blocks(blocks: List[Dict[str, Any]]) -> str:
+    parts = []
+    for block in blocks:
+        if block["kind"] == "paragraph":
+            parts.append("\n".join(block["lines"]))
+        else:
+            parts.append("\n".join(block["header"] + block["rows"]))
+    return "\n\n".join(parts)
+
+
+def _row_figures(line: str) -> Tuple[str, ...]:
+    """Numbers of a table row, in order"""
+    return tuple(_NUMBER.findall(line))
+
+
+class _SeenRows:
+    """
+    SimHash fingerprints of the table rows already passed downstream
+
+    Fingerprints are grouped by the row's figures: a row with any different
+    number is a conflict, never a duplicate, however close its wording.
+    """
+
+    def __init__(self):
+        self.exact: Set[str] = set()
+        self.fingerprints: Dict[Tuple[str, ...], List[int]] = {}
+
+    def matches(self, line: str, features: List[str]) -> bool:
+        if not features:
+            return True
+        if " ".join(features) in self.exact:
+            return True
+        fingerprint = simhash(features)
+        return any(
+            bin(fingerprint ^ seen).count("1") <= _SIMHASH_DISTANCE
+            for seen in self.fingerprints.get(_row_figures(line), [])
+        )
+
+    def add(self, line: str, features: List[str]) -> None:
+        if features:
+            self.exact.add(" ".join(features))
+            self.fingerprints.setdefault(_row_figures(line), []).append(simhash(features))
+
+
+def deduplicate_responses(
+    responses: List[Dict[str, Any]],
+    threshold: float = 0.85,
+    text_key: str = "response"
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Remove near-duplicate responses and table rows before merging
+
+    Responses are visited by weight, then length, so the richest copy of
+    near-identical text is the one kept. Surviving responses keep their
+    original order.
+
+    Args:
+        responses: Verified provider responses
+        threshold: Estimated Jaccard similarity at which a response is collapsed
+        text_key: Key holding the response text
+
+    Returns:
+        (distinct responses, report of what was removed and tokens saved)
+    """
+    texts = [str(response.get(text_key) or "") for response in responses]
+    tokens_in = sum(count_tokens(text) for text in texts)
+    order = sorted(
+        range(len(responses)),
+        key=lambda i: (-(responses[i].get("weight") or 0), -len(texts[i]), i)
+    )
+
+    rows = _SeenRows()
+    paragraphs: List[List[int]] = []
+    sketches: Dict[int, List[int]] = {}
+    kept: Dict[int, Dict[str, Any]] = {}
+    collapsed: List[Dict[str, Any]] = []
+    rows_removed = 0
+
+    for i in order:
+        sketch = minhash(texts[i])
+        match, score = None, 0.0
+        for j, other in sketches.items():
+            candidate = similarity(sketch, other)
+            if candidate > score:
+                match, score = j, candidate
+        duplicate = match is not None and score >= threshold
+
+        blocks, removed = [], 0
+        for block in _parse_blocks(texts[i]):
+            if block["kind"] == "paragraph":
+                paragraph = minhash("\n".join(block["lines"]))
+                if duplicate and any(similarity(paragraph, seen) >= threshold for seen in paragraphs):
+                    removed += 1
+                    continue
+                paragraphs.append(paragraph)
+                blocks.append(block)
+                continue
+
+            fresh = []
+            for row in block["rows"]:
+                features = _row_features(row)
+                if rows.matches(row, features):
+                    rows_removed += 1
+                    removed += 1
+                    continue
+                rows.add(row, features)
+                fresh.append(row)
+            if fresh or not block["rows"]:
+                blocks.append({**block, "rows": fresh})
+
+        if duplicate:
+            logger.debug("Collapsing near-duplicate response", provider=responses[i].get("provider"),
+                         temperature=responses[i].get("temperature"), similarity=round(score, 3))
+            collapsed.append({
+                "provider": responses[i].get("provider"),
+                "temperature": responses[i].get("temperature"),
+                "into_provider": responses[match].get("provider"),
+                "into_temperature": responses[match].get("temperature"),
+                "similarity": round(score, 3)
+            })
+        else:
+            sketches[i] = sketch
+
+        # Untouched responses are passed on verbatim
+        text = _render_blocks(blocks) if removed else texts[i]
+        if text.strip():
+            kept[i] = {**responses[i], text_key: text}
+
+    distinct = [kept[i] for i in range(len(responses)) if i in kept]
+    tokens_out = sum(count_tokens(response[text_key]) for response in distinct)
+    report = {
+        "responses_in": len(responses),
+        "responses_out": len(distinct),
+        "collapsed": collapsed,
+        "table_rows_removed": rows_removed,
+        "tokens_in": tokens_in,
+        "tokens_out": tokens_out,
+        "tokens_saved": tokens_in - tokens_out
+    }
+    return distinct, report
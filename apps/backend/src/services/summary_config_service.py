@@ -6,9 +6,10 @@ import json
 import os
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-import asyncpg
 import structlog
 
+from ..utils.db_connection import get_db_connection
+
 logger = structlog.get_logger(__name__)
 
 
@@ -17,14 +18,6 @@ class SummaryConfigService:
 
     def __init__(self):
         """Initialize service"""
-        # Use environment variables matching the centralized database connection
-        self.db_config = {
-            'host': os.getenv('DATABASE_HOST', 'localhost'),
-            'port': int(os.getenv('DATABASE_PORT', '5432')),
-            'database': os.getenv('DATABASE_NAME', 'cognito-engine'),
-            'user': os.getenv('DATABASE_USER', 'postgres'),
-            'password': os.getenv('DATABASE_PASSWORD', 'postgres')
-        }
         self.provider_config_path = os.path.join(
             os.path.dirname(__file__),
             "..",
@@ -33,8 +26,8 @@ class SummaryConfigService:
         )
 
     async def _get_connection(self):
-        """Get database connection"""
-        return await asyncpg.connect(**self.db_config)
+        """Get database connection from the shared pool"""
+        return await get_db_connection()
 
     # ==================== Provider Configuration ====================
 
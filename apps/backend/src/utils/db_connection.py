@@ -2,54 +2,254 @@
 Database connection utility for CognitoAI Engine.
 
 Provides centralized database connection management using environment variables.
+All connections are served from a single process-wide asyncpg pool which is
+opened at application startup (or lazily on first use) and closed at shutdown.
 """
 import os
+import time
+import asyncio
 import asyncpg
-from typing import Optional
+from typing import Optional, Dict, Any
+from urllib.parse import unquote, urlsplit
 import structlog
 
 logger = structlog.get_logger(__name__)
 
 
-async def get_db_connection() -> asyncpg.Connection:
+# Process-wide pool state
+_pool: Optional[asyncpg.Pool] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+_pool_lock: Optional[asyncio.Lock] = None
+
+_pool_metrics: Dict[str, Any] = {
+    'acquires': 0,
+    'acquire_timeouts': 0,
+    'acquire_errors': 0,
+    'total_acquire_time_ms': 0.0,
+    'max_acquire_time_ms': 0.0,
+    'releases': 0
+}
+
+
+def _env(name: str, short_name: str, default: Optional[str]) -> Optional[str]:
+    """Read a setting supporting both DATABASE_* and DB_* naming conventions."""
+    return os.getenv(name) or os.getenv(short_name, default)
+
+
+def get_db_settings() -> Dict[str, Any]:
     """
-    Get a database connection using environment variables.
+    Get database connection settings from environment variables.
 
-    Reads database credentials from environment variables:
+    Uses DATABASE_URL when it is set, like database.connection, so pooled
+    connections reach the same database as the ORM. Otherwise reads:
     - DATABASE_HOST or DB_HOST (default: localhost)
     - DATABASE_PORT or DB_PORT (default: 5432)
-    - DATABASE_USER or DB_USER (default: cognito)
-    - DATABASE_PASSWORD or DB_PASSWORD (default: password)
-    - DATABASE_NAME or DB_NAME (default: cognito-engine)
+    - DATABASE_USER or DB_USER (default: postgres)
+    - DATABASE_PASSWORD or DB_PASSWORD (no default; asyncpg then falls back
+      to PGPASSWORD / .pgpass)
+    - DATABASE_NAME or DB_NAME (default: cognito_ai_engine)
+
+    The defaults match database.connection.get_database_url.
+
+    Returns:
+        Dict of asyncpg connection keyword arguments
+    """
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        url = urlsplit(database_url)
+        return {
+            'host': url.hostname or 'localhost',
+            'port': url.port or 5432,
+            'user': unquote(url.username) if url.username else 'postgres',
+            'password': unquote(url.password) if url.password else None,
+            'database': unquote(url.path.lstrip('/')) or 'cognito_ai_engine'
+        }
+
+    return {
+        'host': _env('DATABASE_HOST', 'DB_HOST', 'localhost'),
+        'port': int(_env('DATABASE_PORT', 'DB_PORT', '5432')),
+        'user': _env('DATABASE_USER', 'DB_USER', 'postgres'),
+        'password': _env('DATABASE_PASSWORD', 'DB_PASSWORD', None),
+        'database': _env('DATABASE_NAME', 'DB_NAME', 'cognito_ai_engine')
+    }
+
+
+def get_pool_settings() -> Dict[str, Any]:
+    """
+    Get connection pool sizing from environment variables.
+
+    - DATABASE_POOL_MIN_SIZE or DB_POOL_MIN_SIZE (default: 2)
+    - DATABASE_POOL_MAX_SIZE or DB_POOL_MAX_SIZE (default: 20)
+    - DATABASE_POOL_ACQUIRE_TIMEOUT or DB_POOL_ACQUIRE_TIMEOUT (default: 30 seconds)
+    - DATABASE_STATEMENT_CACHE_SIZE or DB_STATEMENT_CACHE_SIZE (default: 256)
+    - DATABASE_POOL_MAX_IDLE or DB_POOL_MAX_IDLE (default: 300 seconds)
+
+    Returns:
+        Dict of pool settings
+    """
+    return {
+        'min_size': int(_env('DATABASE_POOL_MIN_SIZE', 'DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(_env('DATABASE_POOL_MAX_SIZE', 'DB_POOL_MAX_SIZE', '20')),
+        'acquire_timeout': float(_env('DATABASE_POOL_ACQUIRE_TIMEOUT', 'DB_POOL_ACQUIRE_TIMEOUT', '30')),
+        'statement_cache_size': int(_env('DATABASE_STATEMENT_CACHE_SIZE', 'DB_STATEMENT_CACHE_SIZE', '256')),
+        'max_inactive_connection_lifetime': float(_env('DATABASE_POOL_MAX_IDLE', 'DB_POOL_MAX_IDLE', '300'))
+    }
+
+
+async def init_db_pool() -> asyncpg.Pool:
+    """
+    Create the process-wide connection pool if it does not exist yet.
+
+    Safe to call repeatedly; concurrent callers share one pool. A pool that
+    belongs to a different (closed) event loop is discarded and rebuilt.
+
+    Returns:
+        asyncpg.Pool: The shared pool
+
+    Raises:
+        ConnectionError: If the pool cannot be created
+    """
+    global _pool, _pool_loop, _pool_lock
+
+    loop = asyncio.get_running_loop()
+    if _pool is not None and _pool_loop is loop and not _pool.is_closing():
+        return _pool
+
+    if _pool_lock is None or _pool_loop is not loop:
+        _pool_lock = asyncio.Lock()
+        _pool_loop = loop
+        _pool = None
+
+    async with _pool_lock:
+        if _pool is not None and not _pool.is_closing():
+            return _pool
+
+        db_settings = get_db_settings()
+        pool_settings = get_pool_settings()
+
+        try:
+            logger.info(
+                f"Creating database pool: {db_settings['database']} at "
+                f"{db_settings['host']}:{db_settings['port']} as user {db_settings['user']}",
+                min_size=pool_settings['min_size'],
+                max_size=pool_settings['max_size']
+            )
+
+            _pool = await asyncpg.create_pool(
+                **db_settings,
+                min_size=pool_settings['min_size'],
+                max_size=pool_settings['max_size'],
+                statement_cache_size=pool_settings['statement_cache_size'],
+                max_inactive_connection_lifetime=pool_settings['max_inactive_connection_lifetime']
+            )
+            return _pool
+        except Exception as e:
+            logger.error(f"Failed to create database pool: {str(e)}")
+            raise ConnectionError(f"Database connection failed: {str(e)}")
+
+
+async def close_db_pool():
+    """Close the process-wide connection pool, waiting for checked-out connections."""
+    global _pool
+
+    if _pool is not None and not _pool.is_closing():
+        await _pool.close()
+        logger.info("Database pool closed")
+
+    _pool = None
+
+
+def get_db_pool_metrics() -> Dict[str, Any]:
+    """
+    Get pool sizing and acquire metrics.
+
+    Returns:
+        Dict with pool size, idle connections and acquire timing counters
+    """
+    metrics = dict(_pool_metrics)
+    acquires = metrics['acquires']
+    metrics['avg_acquire_time_ms'] = metrics['total_acquire_time_ms'] / acquires if acquires else 0.0
+
+    if _pool is not None and not _pool.is_closing():
+        metrics.update({
+            'open': True,
+            'size': _pool.get_size(),
+            'idle': _pool.get_idle_size(),
+            'in_use': _pool.get_size() - _pool.get_idle_size(),
+            'min_size': _pool.get_min_size(),
+            'max_size': _pool.get_max_size()
+        })
+    else:
+        metrics['open'] = False
+
+    return metrics
+
+
+class PooledConnection:
+    """
+    Pool-backed stand-in for an asyncpg connection.
+
+    Proxies every attribute to the underlying connection, but ``close()``
+    returns the connection to the pool instead of terminating the session,
+    so callers written against ``asyncpg.connect`` keep working unchanged.
+    """
+
+    def __init__(self, pool: asyncpg.Pool, conn: asyncpg.Connection):
+        self._pool = pool
+        self._conn = conn
+        self._released = False
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+    def is_closed(self) -> bool:
+        return self._released or self._conn.is_closed()
+
+    async def close(self, *, timeout: Optional[float] = None):
+        """Release the connection back to the pool (idempotent)."""
+        if self._released:
+            return
+        self._released = True
+        _pool_metrics['releases'] += 1
+        await self._pool.release(self._conn, timeout=timeout)
+
+
+async def get_db_connection() -> PooledConnection:
+    """
+    Get a database connection from the shared pool.
+
+    The returned connection must be closed by the caller; closing it
+    releases it back to the pool.
 
     Returns:
-        asyncpg.Connection: Database connection
+        PooledConnection: asyncpg connection proxy
 
     Raises:
-        ConnectionError: If unable to connect to database
+        ConnectionError: If unable to acquire a connection
     """
+    pool = await init_db_pool()
+    timeout = get_pool_settings()['acquire_timeout']
+
+    start = time.perf_counter()
     try:
-        # Try both naming conventions for environment variables
-        host = os.getenv('DATABASE_HOST') or os.getenv('DB_HOST', 'localhost')
-        port = int(os.getenv('DATABASE_PORT') or os.getenv('DB_PORT', '5432'))
-        user = os.getenv('DATABASE_USER') or os.getenv('DB_USER', 'cognito')
-        password = os.getenv('DATABASE_PASSWORD') or os.getenv('DB_PASSWORD', 'password')
-        database = os.getenv('DATABASE_NAME') or os.getenv('DB_NAME', 'cognito-engine')
-
-        logger.info(f"Connecting to database: {database} at {host}:{port} as user {user}")
-
-        conn = await asyncpg.connect(
-            host=host,
-            port=port,
-            user=user,
-            password=password,
-            database=database
-        )
-        return conn
+        conn = await pool.acquire(timeout=timeout)
+    except asyncio.TimeoutError:
+        _pool_metrics['acquire_timeouts'] += 1
+        logger.error(f"Timed out after {timeout}s waiting for a database connection",
+                     pool_size=pool.get_size(), idle=pool.get_idle_size())
+        raise ConnectionError(f"Database connection failed: pool acquire timed out after {timeout}s")
     except Exception as e:
+        _pool_metrics['acquire_errors'] += 1
         logger.error(f"Failed to connect to database: {str(e)}")
         raise ConnectionError(f"Database connection failed: {str(e)}")
 
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    _pool_metrics['acquires'] += 1
+    _pool_metrics['total_acquire_time_ms'] += elapsed_ms
+    _pool_metrics['max_acquire_time_ms'] = max(_pool_metrics['max_acquire_time_ms'], elapsed_ms)
+
+    return PooledConnection(pool, conn)
+
 
 class DatabaseConnection:
     """
@@ -61,9 +261,9 @@ class DatabaseConnection:
     """
 
     def __init__(self):
-        self.conn: Optional[asyncpg.Connection] = None
+        self.conn: Optional[PooledConnection] = None
 
-    async def __aenter__(self) -> asyncpg.Connection:
+    async def __aenter__(self) -> PooledConnection:
         self.conn = await get_db_connection()
         return self.conn
 
@@ -26,6 +26,18 @@ from src.database.models import (
 )
 
 
+def pytest_configure(config):
+    """
+    Register custom markers.
+
+    Since:
+        Version 1.0.0
+    """
+    config.addinivalue_line(
+        "markers", "benchmark: wall-clock timing comparisons (run with RUN_BENCHMARKS=true)"
+    )
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """
@@ -144,7 +144,7 @@ class TestMultiAPIManager:
         api_manager._initialized = True
 
         # Mock rate limiter to allow all requests
-        api_manager.rate_limiter.check_rate_limit = AsyncMock(return_value=(True, None))
+        api_manager.rate_limiter.check_rate_limits = AsyncMock(return_value=[(True, None), (True, None)])
 
         # Mock active providers
         with patch.object(api_manager, '_get_active_providers_for_category',
@@ -338,7 +338,7 @@ class TestMultiAPIManager:
 
         api_manager.providers = providers
         api_manager._initialized = True
-        api_manager.rate_limiter.check_rate_limit = AsyncMock(return_value=(True, None))
+        api_manager.rate_limiter.check_rate_limits = AsyncMock(return_value=[(True, None)] * len(providers))
 
         with patch.object(api_manager, '_get_active_providers_for_category',
                          return_value=list(providers.keys())):
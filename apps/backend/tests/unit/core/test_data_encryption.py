@@ -0,0 +1,135 @@
+"""
+Unit tests for DataEncryptionService.
+
+Tests envelope encryption with cached data keys, data key rotation, the
+batch API, backward compatibility with legacy per-payload PBKDF2 payloads
+and the shared process-wide instance.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import pytest
+from cryptography.exceptions import InvalidTag
+
+from src.core.security import data_encryption
+from src.core.security.data_encryption import (
+    ENVELOPE_VERSION,
+    LEGACY_VERSION,
+    DataEncryptionService,
+    get_data_encryption_service,
+)
+
+MASTER_KEY = "k" * 48
+DATA = {"drug": "aspirin", "values": [1, 2, 3]}
+
+
+class TestEnvelopeEncryption:
+    """Test suite for envelope-mode encryption."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_derives_key_once(self):
+        """Test many payloads share one derivation and one data key."""
+        service = DataEncryptionService(master_key=MASTER_KEY)
+
+        payloads = [await service.encrypt_data(DATA) for _ in range(5)]
+
+        assert all(p["version"] == ENVELOPE_VERSION for p in payloads)
+        assert len({p["nonce"] for p in payloads}) == 5
+        assert service.key_stats["derivations"] == 1
+        assert service.key_stats["data_keys_created"] == 1
+        assert [await service.decrypt_data(p) for p in payloads] == [DATA] * 5
+
+    @pytest.mark.asyncio
+    async def test_other_instance_unwraps_data_key(self):
+        """Test a payload decrypts on another instance with the same master key."""
+        payload = await DataEncryptionService(master_key=MASTER_KEY).encrypt_data(DATA, context="ctx")
+        reader = DataEncryptionService(master_key=MASTER_KEY)
+
+        assert await reader.decrypt_data(payload) == DATA
+        assert await reader.decrypt_data(payload) == DATA
+        assert reader.key_stats["data_keys_unwrapped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_contexts_use_separate_keys(self):
+        """Test each context gets its own data key and tampered context fails."""
+        service = DataEncryptionService(master_key=MASTER_KEY)
+        first = await service.encrypt_data(DATA, context="a")
+        second = await service.encrypt_data(DATA, context="b")
+
+        assert first["key_id"] != second["key_id"]
+
+        first["context"] = "b"
+        with pytest.raises(InvalidTag):
+            await service.decrypt_data(first)
+
+    @pytest.mark.asyncio
+    async def test_data_key_rotates_after_max_uses(self):
+        """Test a context switches to a new data key after dek_max_uses payloads."""
+        service = DataEncryptionService(master_key=MASTER_KEY, dek_max_uses=2)
+
+        payloads = await service.encrypt_many([DATA] * 5)
+
+        assert len({p["key_id"] for p in payloads}) == 3
+        assert service.key_stats["derivations"] == 1
+        assert await service.decrypt_many(payloads) == [DATA] * 5
+
+    @pytest.mark.asyncio
+    async def test_master_key_rotation_clears_cache(self):
+        """Test rotating the master key drops cached key material."""
+        service = DataEncryptionService(master_key=MASTER_KEY)
+        before = await service.encrypt_data(DATA)
+
+        await service.rotate_encryption_key("n" * 48)
+        after = await service.encrypt_data(DATA)
+
+        assert after["key_id"] != before["key_id"]
+        assert await service.decrypt_data(after) == DATA
+
+
+class TestLegacyCompatibility:
+    """Test suite for version 1.0 payloads."""
+
+    @pytest.mark.asyncio
+    async def test_legacy_payloads_remain_readable(self):
+        """Test payloads written with per-payload PBKDF2 keys still decrypt."""
+        legacy = DataEncryptionService(master_key=MASTER_KEY, envelope_encryption=False)
+        payload = await legacy.encrypt_data(DATA, context="field_name")
+
+        assert payload["version"] == LEGACY_VERSION
+        assert "salt" in payload and "key_id" not in payload
+
+        service = DataEncryptionService(master_key=MASTER_KEY)
+        assert await service.decrypt_data(payload) == DATA
+        assert await service.decrypt_many([payload]) == [DATA]
+
+    @pytest.mark.asyncio
+    async def test_field_round_trip(self):
+        """Test field encryption uses the envelope format transparently."""
+        service = DataEncryptionService(master_key=MASTER_KEY)
+
+        encrypted = await service.encrypt_field("secret", "notes")
+
+        assert await service.decrypt_field(encrypted) == "secret"
+
+
+class TestSharedService:
+    """Test suite for the process-wide encryption service."""
+
+    def test_shared_instance_uses_configured_key(self, monkeypatch):
+        """Test every caller gets one instance keyed by PHARMA_ENCRYPTION_KEY."""
+        monkeypatch.setattr(data_encryption, "_data_encryption_service", None)
+        monkeypatch.setenv("PHARMA_ENCRYPTION_KEY", MASTER_KEY)
+
+        service = get_data_encryption_service()
+
+        assert service is get_data_encryption_service()
+        assert service.master_key == MASTER_KEY
+
+    def test_missing_key_fails(self, monkeypatch):
+        """Test a missing master key is an error, not a silent plaintext fallback."""
+        monkeypatch.setattr(data_encryption, "_data_encryption_service", None)
+        monkeypatch.delenv("PHARMA_ENCRYPTION_KEY", raising=False)
+
+        with pytest.raises(ValueError):
+            get_data_encryption_service()
@@ -0,0 +1,154 @@
+"""
+Unit tests for the data-integrity scan.
+
+Tests payload checksum verification, scan pacing and resumable scanning
+with hashing in a thread and in a process pool.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import hashlib
+import json
+
+import pytest
+
+from src.core import integrity_scanner
+from src.core.integrity_scanner import IntegrityScanner, ScanPacer
+from src.core.response_blobs import find_checksum_mismatches, prepare_blob
+
+PAYLOAD = {"provider": "openai", "results": [1, 2, 3]}
+CHECKSUM = hashlib.sha256(json.dumps(PAYLOAD, sort_keys=True).encode()).hexdigest()
+
+
+def _blob_row(response_id, checksum=CHECKSUM):
+    blob = prepare_blob(PAYLOAD)
+    return (response_id, checksum, None, blob.encoding, blob.content)
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRepository:
+    """Stands in for RawDataRepository.verify_next_batch over an in-memory table."""
+
+    rows = []
+    cursor = 0
+
+    def __init__(self, db):
+        pass
+
+    async def verify_next_batch(self, batch_size, scan_name, find_mismatches):
+        batch = FakeRepository.rows[FakeRepository.cursor:FakeRepository.cursor + batch_size]
+        if not batch:
+            FakeRepository.cursor = 0
+            return {'rows': 0, 'valid': 0, 'invalid': 0, 'fetch_ms': 0.0, 'completed': True}
+
+        mismatches = await find_mismatches(batch)
+        FakeRepository.cursor += len(batch)
+        return {
+            'rows': len(batch),
+            'valid': len(batch) - len(mismatches),
+            'invalid': len(mismatches),
+            'fetch_ms': 1.0,
+            'completed': False
+        }
+
+
+@pytest.fixture
+def fake_repo(monkeypatch):
+    monkeypatch.setattr(integrity_scanner, "RawDataRepository", FakeRepository)
+    FakeRepository.rows = [_blob_row(f"r{i}") for i in range(10)] + [_blob_row("bad", "0" * 64)]
+    FakeRepository.cursor = 0
+    return FakeRepository
+
+
+class TestChecksumVerification:
+    """Test suite for payload checksum verification."""
+
+    def test_inline_and_blob_payloads(self):
+        """Test inline and blob payloads hash to the stored checksum."""
+        rows = [
+            ("inline", CHECKSUM, PAYLOAD, None, None),
+            _blob_row("blob"),
+            ("tampered", CHECKSUM, {**PAYLOAD, "results": []}, None, None),
+            ("missing", CHECKSUM, None, None, None),
+        ]
+
+        mismatches = dict(find_checksum_mismatches(rows))
+
+        assert set(mismatches) == {"tampered", "missing"}
+        assert mismatches["missing"] is None
+
+
+class TestScanPacer:
+    """Test suite for scan pacing."""
+
+    def test_paces_to_target(self):
+        """Test the delay keeps throughput at the target."""
+        pacer = ScanPacer(rows_per_second=100, max_fetch_ms=None)
+
+        assert pacer.delay(rows=50, elapsed=0.1, fetch_ms=5) == pytest.approx(0.4)
+
+    def test_backs_off_on_slow_fetch_and_recovers(self):
+        """Test slow fetches halve the rate and fast ones recover it."""
+        pacer = ScanPacer(rows_per_second=100, max_fetch_ms=50)
+
+        pacer.delay(rows=50, elapsed=0.1, fetch_ms=200)
+        assert pacer.rate == 50
+
+        for _ in range(10):
+            pacer.delay(rows=50, elapsed=0.1, fetch_ms=5)
+        assert pacer.rate == 100
+
+    def test_unpaced_without_target(self):
+        """Test no delay without a target until a fetch is slow."""
+        pacer = ScanPacer(rows_per_second=None, max_fetch_ms=50)
+        assert pacer.delay(rows=50, elapsed=0.1, fetch_ms=5) == 0.0
+
+        assert pacer.delay(rows=50, elapsed=0.1, fetch_ms=200) > 0
+
+
+class TestIntegrityScanner:
+    """Test suite for the resumable scan."""
+
+    @pytest.mark.asyncio
+    async def test_resumes_across_runs(self, fake_repo):
+        """Test a run stopped at max_rows resumes from its cursor."""
+        scanner = IntegrityScanner(session_factory=FakeSession, processes=0)
+
+        first = await scanner.run(batch_size=4, rows_per_second=0, max_rows=4)
+        assert first['rows'] == 4 and not first['pass_completed']
+
+        second = await scanner.run(batch_size=4, rows_per_second=0)
+        assert second['rows'] == 7
+        assert second['invalid'] == 1
+        assert second['pass_completed']
+
+    @pytest.mark.asyncio
+    async def test_hashes_in_process_pool(self, fake_repo):
+        """Test hashing split across pool processes finds the same mismatches."""
+        scanner = IntegrityScanner(session_factory=FakeSession, processes=2)
+
+        stats = await scanner.run(batch_size=20, rows_per_second=0)
+
+        assert stats['rows'] == 11
+        assert stats['invalid'] == 1
+        assert scanner._pool is None
+
+    @pytest.mark.asyncio
+    async def test_background_start_and_stop(self, fake_repo):
+        """Test only one background scan runs at a time."""
+        scanner = IntegrityScanner(session_factory=FakeSession, processes=0)
+
+        assert scanner.start(batch_size=1, rows_per_second=5)
+        assert not scanner.start()
+
+        await scanner.stop()
+        assert not scanner.running
+        assert scanner.run_stats['rows'] < 11
@@ -0,0 +1,202 @@
+"""
+Unit tests for the SQLite work queue stand-in.
+
+Tests job deduplication, leases and visibility timeouts, retries, dead
+lettering and queue URL resolution, and redelivery counting in the
+RabbitMQ work queue.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+from src.core import message_queue
+from src.core.message_queue import MessageQueueService, SQLiteMessageQueue, create_work_queue
+
+
+@pytest_asyncio.fixture
+async def queue():
+    queue = SQLiteMessageQueue(":memory:")
+    await queue.declare_work_queue("jobs", visibility_timeout=60, max_attempts=2)
+    yield queue
+    await queue.disconnect()
+
+
+class TestSQLiteMessageQueue:
+    """Test suite for SQLiteMessageQueue work queues."""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_deduplicates_pending_jobs(self, queue):
+        """Test a job id can only be pending once, but can be re-enqueued after it is done."""
+        assert await queue.enqueue_work("jobs", "req-1", {"request_id": "req-1"})
+        assert not await queue.enqueue_work("jobs", "req-1", {"request_id": "req-1"})
+
+        message = await queue.reserve_work("jobs")
+        assert not await queue.enqueue_work("jobs", "req-1", {"request_id": "req-1"})
+
+        await queue.ack_work(message)
+        assert await queue.enqueue_work("jobs", "req-1", {"request_id": "req-1"})
+
+    @pytest.mark.asyncio
+    async def test_reserved_job_is_invisible(self, queue):
+        """Test a leased job is not handed to a second worker."""
+        await queue.enqueue_work("jobs", "req-1", {"request_id": "req-1"})
+
+        message = await queue.reserve_work("jobs")
+
+        assert message.job_id == "req-1"
+        assert message.payload == {"request_id": "req-1"}
+        assert message.attempts == 1
+        assert await queue.reserve_work("jobs") is None
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_redelivered(self):
+        """Test a job whose worker stopped renewing the lease is picked up again."""
+        queue = SQLiteMessageQueue(":memory:")
+        await queue.declare_work_queue("jobs", visibility_timeout=0.05, max_attempts=3)
+        await queue.enqueue_work("jobs", "req-1", {"request_id": "req-1"})
+
+        first = await queue.reserve_work("jobs")
+        await asyncio.sleep(0.1)
+        second = await queue.reserve_work("jobs")
+
+        assert second.job_id == "req-1"
+        assert second.attempts == 2
+
+        # The stale lease holder can no longer ack
+        await queue.ack_work(first)
+        assert (await queue.get_work_queue_stats("jobs")) == {"reserved": 1}
+
+    @pytest.mark.asyncio
+    async def test_expired_final_lease_is_reported(self):
+        """Test a lease lapsing on the last attempt is dead-lettered and handed out once."""
+        queue = SQLiteMessageQueue(":memory:")
+        await queue.declare_work_queue("jobs", visibility_timeout=0.05, max_attempts=1)
+        await queue.enqueue_work("jobs", "req-1", {"request_id": "req-1"})
+
+        first = await queue.reserve_work("jobs")
+        await asyncio.sleep(0.1)
+        expired = await queue.reserve_work("jobs")
+
+        assert not first.expired
+        assert expired.expired
+        assert expired.payload == {"request_id": "req-1"}
+        assert expired.attempts == 1
+        assert await queue.reserve_work("jobs") is None
+        assert await queue.get_work_queue_stats("jobs") == {"dead": 1}
+
+    @pytest.mark.asyncio
+    async def test_extend_keeps_job_invisible(self):
+        """Test extending a lease prevents redelivery."""
+        queue = SQLiteMessageQueue(":memory:")
+        await queue.declare_work_queue("jobs", visibility_timeout=0.1, max_attempts=3)
+        await queue.enqueue_work("jobs", "req-1", {"request_id": "req-1"})
+
+        message = await queue.reserve_work("jobs")
+        await asyncio.sleep(0.06)
+        await queue.extend_work(message)
+        await asyncio.sleep(0.06)
+
+        assert await queue.reserve_work("jobs") is None
+
+    @pytest.mark.asyncio
+    async def test_fail_retries_then_dead_letters(self, queue):
+        """Test failed jobs are retried until max_attempts, then dead-lettered."""
+        await queue.enqueue_work("jobs", "req-1", {"request_id": "req-1"})
+
+        first = await queue.reserve_work("jobs")
+        assert await queue.fail_work(first, "boom")
+
+        second = await queue.reserve_work("jobs")
+        assert second.attempts == 2
+        assert not await queue.fail_work(second, "boom")
+
+        assert await queue.reserve_work("jobs") is None
+        assert await queue.get_work_queue_stats("jobs") == {"dead": 1}
+
+    def test_create_work_queue_from_url(self):
+        """Test backend selection from the queue URL."""
+        assert isinstance(create_work_queue("memory://"), SQLiteMessageQueue)
+
+        with pytest.raises(ValueError):
+            create_work_queue("redis://localhost")
+
+    def test_relative_sqlite_path_uses_backend_dir(self, tmp_path, monkeypatch):
+        """Test the queue file does not depend on the working directory."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(message_queue, "BACKEND_DIR", tmp_path / "backend")
+        (tmp_path / "backend").mkdir()
+
+        relative = create_work_queue("sqlite:///queue.sqlite3")
+        absolute = create_work_queue(f"sqlite:///{tmp_path / 'other.sqlite3'}")
+
+        assert relative.path == str(tmp_path / "backend" / "queue.sqlite3")
+        assert absolute.path == str(tmp_path / "other.sqlite3")
+
+
+def _delivery(attempts=0, redelivered=False):
+    delivery = MagicMock(
+        message_id="req-1",
+        body=json.dumps({"request_id": "req-1"}).encode(),
+        headers={"x-attempts": attempts},
+        redelivered=redelivered
+    )
+    delivery.ack = AsyncMock()
+    delivery.reject = AsyncMock()
+    return delivery
+
+
+def _rabbit_queue(*deliveries, max_attempts=3):
+    service = MessageQueueService("amqp://localhost", MagicMock())
+    service.channel = MagicMock()
+    service.exchange = MagicMock(publish=AsyncMock())
+    queue = MagicMock(get=AsyncMock(side_effect=[*deliveries, None]))
+    service.work_queues["jobs"] = {"queue": queue, "max_attempts": max_attempts}
+    return service
+
+
+class TestRabbitWorkQueue:
+    """Test suite for MessageQueueService work queue redeliveries."""
+
+    @pytest.mark.asyncio
+    async def test_first_delivery_is_reserved(self):
+        """Test a fresh delivery is handed out with its attempt number."""
+        delivery = _delivery(attempts=1)
+        service = _rabbit_queue(delivery)
+
+        message = await service.reserve_work("jobs")
+
+        assert message.attempts == 2 and not message.expired
+        delivery.ack.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_redelivery_counts_as_an_attempt(self):
+        """Test a delivery lost with its worker is republished with a raised count."""
+        delivery = _delivery(attempts=0, redelivered=True)
+        service = _rabbit_queue(delivery)
+
+        assert await service.reserve_work("jobs") is None
+
+        delivery.ack.assert_awaited_once()
+        published = service.exchange.publish.await_args.args[0]
+        assert published.headers["x-attempts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lost_final_delivery_is_reported(self):
+        """Test a redelivered final attempt is dead-lettered and returned as expired."""
+        delivery = _delivery(attempts=2, redelivered=True)
+        service = _rabbit_queue(delivery)
+
+        message = await service.reserve_work("jobs")
+
+        assert message.expired
+        assert message.attempts == 3
+        assert message.payload == {"request_id": "req-1"}
+        delivery.reject.assert_awaited_once_with(requeue=False)
+        service.exchange.publish.assert_not_awaited()
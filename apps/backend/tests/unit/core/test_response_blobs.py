@@ -0,0 +1,97 @@
+"""
+Unit tests for content-addressed response blobs.
+
+Tests canonical checksums, compression round trips, batch reference
+counting and batched loading.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import hashlib
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.core.response_blobs import (
+    ENCODING_IDENTITY,
+    ResponseBlobStore,
+    compress_blob,
+    decompress_blob,
+    load_blob_value,
+    prepare_blob,
+    upsert_args,
+)
+
+
+class TestBlobEncoding:
+    """Test suite for blob preparation and compression."""
+
+    def test_checksum_is_sha256_of_canonical_json(self):
+        """Test key order does not change the content address."""
+        first = prepare_blob({'b': 1, 'a': [1, 2]})
+        second = prepare_blob({'a': [1, 2], 'b': 1})
+        expected = hashlib.sha256(json.dumps({'a': [1, 2], 'b': 1}, sort_keys=True).encode()).hexdigest()
+
+        assert first.checksum == second.checksum == expected
+
+    def test_round_trip_compresses(self):
+        """Test repetitive responses shrink and decode back unchanged."""
+        value = {'response': '| Region | Market |\n' * 200}
+        blob = prepare_blob(value)
+
+        assert blob.stored_size < blob.original_size / 5
+        assert load_blob_value(blob.encoding, blob.content) == value
+
+    def test_incompressible_data_stored_as_identity(self):
+        """Test data that does not shrink is stored uncompressed."""
+        encoding, content = compress_blob(b'x')
+
+        assert encoding == ENCODING_IDENTITY
+        assert decompress_blob(encoding, content) == b'x'
+
+    def test_unknown_encoding_rejected(self):
+        """Test unknown encodings raise instead of returning garbage."""
+        with pytest.raises(ValueError):
+            decompress_blob('lz4', b'')
+
+    def test_batch_duplicates_share_one_row(self):
+        """Test duplicates within a batch become one upsert with a summed ref count."""
+        blobs = [prepare_blob({'r': 1}), prepare_blob({'r': 2}), prepare_blob({'r': 1})]
+
+        args = upsert_args(blobs)
+
+        assert sorted(row[5] for row in args) == [1, 2]
+
+
+class TestResponseBlobStore:
+    """Test suite for ResponseBlobStore."""
+
+    def test_small_values_stay_inline(self):
+        """Test values under the threshold are not offloaded."""
+        store = ResponseBlobStore(inline_threshold=100)
+
+        assert store.prepare({'n': 1}) is None
+        assert store.prepare(None) is None
+        assert store.prepare({'text': 'x' * 200}) is not None
+
+    @pytest.mark.asyncio
+    async def test_put_and_get_many(self):
+        """Test blobs are written in one batch and loaded in one query."""
+        store = ResponseBlobStore(inline_threshold=0)
+        blob = store.prepare({'response': 'y' * 300})
+        conn = MagicMock()
+        conn.executemany = AsyncMock()
+        conn.fetch = AsyncMock(return_value=[
+            {'checksum': blob.checksum, 'encoding': blob.encoding, 'content': blob.content}
+        ])
+
+        await store.put_many(conn, [blob, blob])
+        values = await store.get_many(conn, [blob.checksum, blob.checksum, None])
+        as_json = await store.get_many(conn, [blob.checksum], as_json=True)
+
+        assert len(conn.executemany.call_args.args[1]) == 1
+        assert conn.fetch.call_args.args[1] == [blob.checksum]
+        assert values == {blob.checksum: {'response': 'y' * 300}}
+        assert json.loads(as_json[blob.checksum]) == {'response': 'y' * 300}
+        assert store.get_stats()['references_added'] == 2
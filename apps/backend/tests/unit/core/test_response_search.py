@@ -0,0 +1,197 @@
+"""
+Unit tests for response search support.
+
+Tests search text extraction, cursors, the in-memory fallback index
+used when pg_trgm/tsvector are unavailable and that encrypted response
+content is never indexed or stored in clear.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.integrations.providers.base import SearchResult, StandardizedAPIResponse
+from src.core.data_persistence import DataPersistenceManager
+from src.core.response_blobs import load_blob_value
+from src.core.security.data_encryption import ENVELOPE_VERSION, DataEncryptionService
+from src.core.response_search import (
+    ResponseSearchIndex,
+    decode_cursor,
+    encode_cursor,
+    extract_search_text,
+    trigram_similarity,
+)
+
+NOW = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def index():
+    index = ResponseSearchIndex()
+    index.add("r1", "Aspirin", "aspirin reduces fever and pain", NOW, category="safety", provider="openai")
+    index.add("r2", "Acetylsalicylic acid", "aspirin bleeding risk", NOW + timedelta(hours=1), category="safety")
+    index.add("r3", "Ibuprofen", "ibuprofen reduces fever", NOW + timedelta(hours=2), category="dosage")
+    index.add("r4", "Aspirin 81mg", "low dose aspirin for cardiac patients", NOW + timedelta(hours=3))
+    return index
+
+
+class TestSearchText:
+    """Test suite for search text helpers."""
+
+    def test_extracts_query_results_and_sources(self):
+        """Test query, result and source text are all indexed."""
+        text = extract_search_text({
+            "query": "aspirin safety",
+            "results": [{"title": "Label", "content": "Bleeding risk"}],
+            "sources": [{"title": "FDA", "domain": "fda.gov"}]
+        })
+
+        assert text.split("\n") == ["aspirin safety", "Label", "Bleeding risk", "FDA"]
+
+    def test_cursor_round_trip(self):
+        """Test cursors encode the full keyset position."""
+        assert decode_cursor(encode_cursor(0.5, NOW, "r1")) == (0.5, NOW, "r1")
+
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_trigram_similarity(self):
+        """Test trigram similarity favours close spellings."""
+        assert trigram_similarity("aspirin", "Aspirin") == 1.0
+        assert trigram_similarity("aspirin", "asprin") > trigram_similarity("aspirin", "ibuprofen")
+
+
+class TestResponseSearchIndex:
+    """Test suite for the fallback search index."""
+
+    def test_compound_search_ranks_closest_match_first(self, index):
+        """Test compound substring matching ranked by similarity."""
+        hits, cursor = index.search(compound="aspirin")
+
+        assert [response_id for response_id, _ in hits] == ["r1", "r4"]
+        assert cursor is None
+
+    def test_text_query_requires_all_terms(self, index):
+        """Test text search uses AND semantics over response text."""
+        hits, _ = index.search(text_query="reduces fever")
+        assert {response_id for response_id, _ in hits} == {"r1", "r3"}
+
+        hits, _ = index.search(text_query="fever bleeding")
+        assert hits == []
+
+    def test_filters(self, index):
+        """Test category, provider and date filters."""
+        hits, _ = index.search(text_query="aspirin", category="safety")
+        assert {response_id for response_id, _ in hits} == {"r1", "r2"}
+
+        hits, _ = index.search(provider="openai")
+        assert [response_id for response_id, _ in hits] == ["r1"]
+
+        hits, _ = index.search(start_date=NOW + timedelta(minutes=90))
+        assert [response_id for response_id, _ in hits] == ["r4", "r3"]
+
+    def test_keyset_pagination_covers_all_results(self, index):
+        """Test pages follow each other without gaps or repeats."""
+        seen, cursor = [], None
+        while True:
+            hits, cursor = index.search(text_query="aspirin", limit=1, cursor=cursor)
+            seen.extend(response_id for response_id, _ in hits)
+            if cursor is None:
+                break
+
+        expected, _ = index.search(text_query="aspirin", limit=10)
+        assert seen == [response_id for response_id, _ in expected]
+        assert len(seen) == 3
+
+    def test_archive_and_remove(self, index):
+        """Test archived responses are hidden by default and removed ones dropped."""
+        index.mark_archived(["r1"])
+        index.remove("r4")
+
+        hits, _ = index.search(compound="aspirin")
+        assert hits == []
+
+        hits, _ = index.search(compound="aspirin", include_archived=True)
+        assert [response_id for response_id, _ in hits] == ["r1"]
+        assert len(index) == 3
+
+
+class TestStoredSearchText:
+    """Test suite for the search text written when a response is stored."""
+
+    @staticmethod
+    def _response():
+        return StandardizedAPIResponse(
+            provider="chatgpt",
+            query="aspirin side effects",
+            temperature=0.7,
+            results=[SearchResult(
+                title="Confidential label draft",
+                content="Unreleased bleeding risk data",
+                relevance_score=0.9,
+                source_type="medical_database"
+            )],
+            sources=[],
+            total_results=1,
+            response_time_ms=100,
+            cost=0.01,
+            relevance_score=0.9,
+            confidence_score=0.9,
+            timestamp=NOW
+        )
+
+    async def _store(self, encryption_enabled):
+        db = AsyncMock()
+        db.add = MagicMock()
+        manager = DataPersistenceManager(
+            db, AsyncMock(),
+            encryption_enabled=encryption_enabled,
+            encryption_service=DataEncryptionService(master_key="k" * 48) if encryption_enabled else None
+        )
+        manager.raw_data_repo = MagicMock(store_blob=AsyncMock())
+        manager.raw_data_repo.search_vector.side_effect = lambda text: text
+
+        await manager.store_api_response(self._response(), "p1", "r1", "c1", "Aspirin", "safety")
+        return db, manager
+
+    async def _indexed_text(self, encryption_enabled):
+        db, manager = await self._store(encryption_enabled)
+
+        vector = db.add.call_args_list[0].args[0].search_vector
+        fallback = manager.raw_data_repo.index_fallback.call_args.args[2]
+        return vector, fallback
+
+    def test_encryption_requires_a_service(self):
+        """Test enabling encryption without a service fails instead of storing plaintext."""
+        with pytest.raises(ValueError):
+            DataPersistenceManager(AsyncMock(), AsyncMock(), encryption_enabled=True)
+
+    @pytest.mark.asyncio
+    async def test_encrypted_payload_is_ciphertext(self):
+        """Test the stored blob holds an envelope-encrypted payload."""
+        _, manager = await self._store(encryption_enabled=True)
+
+        blob = manager.raw_data_repo.store_blob.call_args.args[0]
+        stored = load_blob_value(blob.encoding, blob.content)
+        assert stored["encrypted"] and stored["version"] == ENVELOPE_VERSION
+        assert "Unreleased bleeding risk data" not in json.dumps(stored)
+        assert "Unreleased bleeding risk data" in (await manager.encryption_service.decrypt_data(stored))["data"]
+
+    @pytest.mark.asyncio
+    async def test_encrypted_content_is_not_indexed(self):
+        """Test encrypted payloads only index the query, which is stored in clear."""
+        vector, fallback = await self._indexed_text(encryption_enabled=True)
+
+        assert vector == fallback == "aspirin side effects"
+
+    @pytest.mark.asyncio
+    async def test_plaintext_content_is_indexed(self):
+        """Test unencrypted payloads index their full content."""
+        vector, _ = await self._indexed_text(encryption_enabled=False)
+
+        assert "Unreleased bleeding risk data" in vector
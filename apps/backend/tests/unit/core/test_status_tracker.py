@@ -0,0 +1,178 @@
+"""
+Unit tests for bulk process status.
+
+Tests set-based status computation from a single joined query and the
+short-TTL snapshot shared between concurrent pollers.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.core import status_tracker
+from src.core.status_tracker import StatusSnapshotCache, StatusTracker
+from src.schemas.status import ProcessingStatus
+
+NOW = datetime.utcnow()
+
+
+def _tracking(process_id, status="collecting", **overrides):
+    values = dict(
+        id=process_id,
+        request_id=f"req_{process_id}",
+        current_status=status,
+        progress_percentage=20,
+        estimated_completion=None,
+        current_stage_start=NOW - timedelta(seconds=30),
+        error_details=None,
+        drug_names=["aspirin"],
+        categories_total=10,
+        categories_completed=5,
+        submitted_at=NOW - timedelta(minutes=1),
+        collecting_completed_at=None,
+        verifying_completed_at=None,
+        merging_completed_at=None,
+        summarizing_completed_at=None,
+        completed_at=None,
+        updated_at=NOW
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Returns (tracking, request progress) rows for the requested IDs."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, stmt):
+        self.queries += 1
+        ids = set(stmt.whereclause.right.value)
+        return FakeResult([row for row in self.rows if row[0].id in ids])
+
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    cache = StatusSnapshotCache(ttl=60)
+    monkeypatch.setattr(status_tracker, "status_snapshot_cache", cache)
+    return cache
+
+
+class TestBulkStatus:
+    """Test suite for set-based bulk status."""
+
+    @pytest.mark.asyncio
+    async def test_one_query_for_all_processes(self, snapshot):
+        """Test progress, duration and ETA are derived from a single query."""
+        session = FakeSession([
+            (_tracking(f"p{i}"), None) for i in range(50)
+        ] + [
+            (_tracking("done", "completed", progress_percentage=100,
+                       completed_at=NOW - timedelta(seconds=5)), 100)
+        ])
+        tracker = StatusTracker(session)
+
+        statuses = await tracker.get_bulk_status(["done", "missing"] + [f"p{i}" for i in range(50)])
+
+        assert session.queries == 1
+        assert [s.process_id for s in statuses] == ["done"] + [f"p{i}" for i in range(50)]
+        done, first = statuses[0], statuses[1]
+        assert done.estimated_completion is None
+        assert done.audit_summary.processing_duration == "00:00:55"
+        # 20% base + half of the 60% category share
+        assert first.progress_percentage == 50
+        assert first.estimated_completion > NOW
+        assert first.current_stage == ProcessingStatus.COLLECTING
+
+    @pytest.mark.asyncio
+    async def test_request_progress_and_aware_timestamps(self, snapshot):
+        """Test live request progress is used and timezone-aware rows are handled."""
+        aware = (NOW - timedelta(minutes=2)).replace(tzinfo=timezone.utc)
+        session = FakeSession([
+            (_tracking("p1", submitted_at=aware, current_stage_start=aware), 70)
+        ])
+
+        status = await StatusTracker(session).get_status("p1")
+
+        assert status.progress_percentage == 70
+        assert status.audit_summary.processing_duration.startswith("00:02:")
+
+
+class TestStatusSnapshotCache:
+    """Test suite for the shared status snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_pollers_share_one_load(self, snapshot):
+        """Test overlapping polls trigger a single query."""
+        session = FakeSession([(_tracking("p1"), None), (_tracking("p2"), None)])
+        loads = []
+
+        async def slow_loader(ids):
+            loads.append(list(ids))
+            await asyncio.sleep(0.01)
+            return await StatusTracker(session)._query_statuses(ids)
+
+        first, second = await asyncio.gather(
+            snapshot.get_many(["p1", "p2"], slow_loader),
+            snapshot.get_many(["p2", "p1", "p3"], slow_loader)
+        )
+
+        assert loads == [["p1", "p2"], ["p3"]]
+        assert first["p1"].process_id == second["p1"].process_id == "p1"
+        assert second["p3"] is None
+
+        again = await snapshot.get_many(["p1", "p3"], slow_loader)
+        assert len(loads) == 2 and again["p3"] is None
+        assert snapshot.get_stats()['hits'] == 2
+
+    @pytest.mark.asyncio
+    async def test_expiry_and_invalidation(self):
+        """Test entries reload after the TTL or when invalidated."""
+        cache = StatusSnapshotCache(ttl=0.05)
+        calls = []
+
+        async def loader(ids):
+            calls.append(ids)
+            return {}
+
+        await cache.get_many(["p1"], loader)
+        await cache.get_many(["p1"], loader)
+        cache.invalidate("p1")
+        await cache.get_many(["p1"], loader)
+        await asyncio.sleep(0.06)
+        await cache.get_many(["p1"], loader)
+
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_load_propagates_to_waiters(self):
+        """Test a failed shared load fails every poller waiting on it."""
+        cache = StatusSnapshotCache(ttl=60)
+
+        async def failing_loader(ids):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("database unavailable")
+
+        results = await asyncio.gather(
+            cache.get_many(["p1"], failing_loader),
+            cache.get_many(["p1"], failing_loader),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert cache.get_stats()['entries'] == 0
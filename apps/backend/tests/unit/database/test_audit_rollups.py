@@ -0,0 +1,187 @@
+"""
+Unit tests for audit event rollups used by compliance reports.
+
+Tests splitting report ranges between hourly rollups and raw audit
+events, event type normalization, merging of grouped counts and the
+persisted rolled-up-to watermark.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.database.models import AuditEvent, AuditEventRollup, AuditRollupState
+from src.database.repositories.audit_repo import (
+    ROLLUP_MAX_HOURS_PER_REFRESH,
+    AuditRepository,
+    event_type_value,
+    split_report_range,
+    to_utc_naive,
+)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalar(self):
+        return self.rows
+
+
+class FakeSession:
+    """Returns queued result rows in query order."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    async def execute(self, query):
+        self.queries.append(query)
+        return FakeResult(self.results.pop(0) if self.results else None)
+
+    async def commit(self):
+        pass
+
+    def watermarks(self):
+        """rolled_up_to values written to audit_rollup_state."""
+        return [
+            query.compile().params['rolled_up_to'] for query in self.queries
+            if getattr(getattr(query, 'table', None), 'name', None) == AuditRollupState.__tablename__
+        ]
+
+
+class TestSplitReportRange:
+    """Test suite for dividing report ranges."""
+
+    def test_without_rollups_everything_is_raw(self):
+        """Test ranges are served from audit_events before the first refresh."""
+        start, end = datetime(2026, 1, 1, 0, 30), datetime(2026, 1, 3)
+
+        assert split_report_range(start, end, None) == (None, [(start, end, True)])
+
+    def test_whole_hours_come_from_rollups(self):
+        """Test partial edge hours and the tail stay raw."""
+        start, end = datetime(2026, 1, 1, 0, 30), datetime(2026, 1, 3, 10, 15)
+        rolled_up_to = datetime(2026, 1, 2, 6)
+
+        rollup_range, raw_ranges = split_report_range(start, end, rolled_up_to)
+
+        assert rollup_range == (datetime(2026, 1, 1, 1), rolled_up_to)
+        assert raw_ranges == [
+            (start, datetime(2026, 1, 1, 1), False),
+            (rolled_up_to, end, True),
+        ]
+
+    def test_range_inside_one_hour_is_raw(self):
+        """Test a range shorter than an hour never uses rollups."""
+        start, end = datetime(2026, 1, 1, 0, 10), datetime(2026, 1, 1, 0, 50)
+
+        assert split_report_range(start, end, datetime(2026, 1, 2)) == (None, [(start, end, True)])
+
+    def test_hour_aligned_range(self):
+        """Test an hour-aligned range only keeps the inclusive end instant raw."""
+        start, end = datetime(2026, 1, 1), datetime(2026, 1, 1, 5)
+
+        rollup_range, raw_ranges = split_report_range(start, end, datetime(2026, 1, 2))
+
+        assert rollup_range == (start, end)
+        assert raw_ranges == [(end, end, True)]
+
+
+class TestEventTypes:
+    """Test suite for event type normalization."""
+
+    def test_enum_names_and_values_share_keys(self):
+        """Test ORM-stored names and service-stored values report alike."""
+        assert event_type_value("CREATE") == "create"
+        assert event_type_value("process_start") == "process_start"
+        assert event_type_value("custom_event") == "custom_event"
+
+    def test_aware_datetimes_become_naive_utc(self):
+        """Test report boundaries are compared in UTC."""
+        aware = datetime(2026, 1, 1, 12, tzinfo=timezone(timedelta(hours=2)))
+
+        assert to_utc_naive(aware) == datetime(2026, 1, 1, 10)
+
+
+class TestGroupedCounts:
+    """Test suite for combining rollup and raw counts."""
+
+    @pytest.mark.asyncio
+    async def test_merges_rollup_and_raw_counts(self):
+        """Test counts for the same key are summed across both sources."""
+        session = FakeSession(
+            [("DrugRequest", 40), ("CategoryResult", 2)],
+            [("DrugRequest", 3), ("User", 1)],
+        )
+        repo = AuditRepository(session)
+
+        counts = await repo._grouped_counts(
+            AuditEventRollup.entity_type, AuditEvent.entity_type,
+            (datetime(2026, 1, 1, 1), datetime(2026, 1, 2)),
+            [(datetime(2026, 1, 2), datetime(2026, 1, 2, 3), True)],
+            None
+        )
+
+        assert counts == {"DrugRequest": 43, "CategoryResult": 2, "User": 1}
+        assert len(session.queries) == 2
+
+    @pytest.mark.asyncio
+    async def test_skips_rollups_when_range_is_raw(self):
+        """Test only audit_events is queried without a rollup range."""
+        session = FakeSession([("create", 5)])
+        repo = AuditRepository(session)
+
+        counts = await repo._grouped_counts(
+            AuditEventRollup.event_type, AuditEvent.entity_type, None,
+            [(datetime(2026, 1, 1), datetime(2026, 1, 1, 2), True)],
+            ["DrugRequest"]
+        )
+
+        assert counts == {"create": 5}
+        assert len(session.queries) == 1
+
+
+class TestRefreshRollups:
+    """Test suite for the rolled-up-to watermark."""
+
+    @pytest.mark.asyncio
+    async def test_gap_longer_than_refresh_window_does_not_stall(self):
+        """Test a week-plus stretch without events is skipped, not stuck on."""
+        rolled_up_to = datetime(2026, 1, 1)
+        gap = timedelta(hours=ROLLUP_MAX_HOURS_PER_REFRESH + 30)
+        next_event = rolled_up_to + gap + timedelta(minutes=10)
+        now = next_event + timedelta(hours=5)
+        session = FakeSession(rolled_up_to, next_event)
+        repo = AuditRepository(session)
+
+        hours = await repo.refresh_rollups(now=now)
+
+        assert hours == 5
+        assert session.watermarks() == [rolled_up_to + gap + timedelta(hours=5)]
+
+    @pytest.mark.asyncio
+    async def test_watermark_advances_without_events(self):
+        """Test an empty window still moves the watermark to the last complete hour."""
+        rolled_up_to = datetime(2026, 1, 1)
+        now = rolled_up_to + timedelta(days=30, minutes=30)
+        session = FakeSession(rolled_up_to, None)
+        repo = AuditRepository(session)
+
+        assert await repo.refresh_rollups(now=now) == 0
+        assert session.watermarks() == [rolled_up_to + timedelta(days=30)]
+
+        # The next refresh resumes from the persisted watermark
+        session = FakeSession(rolled_up_to + timedelta(days=30), None)
+        assert await AuditRepository(session).refresh_rollups(now=now) == 0
+        assert session.watermarks() == []
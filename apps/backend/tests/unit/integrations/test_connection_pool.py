@@ -0,0 +1,178 @@
+"""
+Unit tests for provider connection pooling.
+
+Tests the long-lived aiohttp session registry used by ProviderService:
+session reuse, per-provider configuration, metrics and shutdown; and the
+eagerly built httpx provider clients with their connection metrics.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.integrations import connection_pool
+from src.integrations.connection_pool import ConnectionPool
+
+
+@pytest_asyncio.fixture
+async def pool():
+    """Create connection pool and close its sessions after the test."""
+    pool = ConnectionPool(max_connections=50, max_connections_per_host=5, dns_cache_ttl=60)
+    yield pool
+    await pool.close_all()
+
+
+class TestSessionRegistry:
+    """Test suite for pooled provider sessions."""
+
+    @pytest.mark.asyncio
+    async def test_session_reused_across_calls(self, pool):
+        """Test the same session is handed out for repeated calls."""
+        async with pool.get_session('openai') as first:
+            pass
+        async with pool.get_session('openai') as second:
+            pass
+
+        assert first is second
+        assert not first.closed
+
+    @pytest.mark.asyncio
+    async def test_sessions_isolated_per_provider(self, pool):
+        """Test each provider gets its own session and connector."""
+        async with pool.get_session('openai') as openai_session:
+            async with pool.get_session('claude') as claude_session:
+                assert openai_session is not claude_session
+                assert openai_session.connector is not claude_session.connector
+
+    @pytest.mark.asyncio
+    async def test_connector_uses_configured_limits(self, pool):
+        """Test connector limits come from per-provider overrides."""
+        session = await pool.open_session(
+            'perplexity', max_connections=8, max_connections_per_host=4
+        )
+
+        assert session.connector.limit == 8
+        assert session.connector.limit_per_host == 4
+
+    @pytest.mark.asyncio
+    async def test_default_limits_applied(self, pool):
+        """Test pool-wide defaults are used without overrides."""
+        session = await pool.open_session('tavily')
+
+        assert session.connector.limit == 50
+        assert session.connector.limit_per_host == 5
+
+    @pytest.mark.asyncio
+    async def test_utilisation_metrics(self, pool):
+        """Test active and peak request tracking."""
+        async with pool.get_session('openai'):
+            async with pool.get_session('openai'):
+                metrics = pool.get_session_metrics('openai')['metrics']
+                assert metrics['active_requests'] == 2
+                assert metrics['utilisation'] == pytest.approx(2 / 5)
+
+        stats = pool.get_session_metrics('openai')
+        assert stats['open'] is True
+        assert stats['metrics']['active_requests'] == 0
+        assert stats['metrics']['peak_active_requests'] == 2
+        assert stats['metrics']['requests_total'] == 2
+        assert stats['metrics']['sessions_created'] == 1
+
+    @pytest.mark.asyncio
+    async def test_close_all_closes_sessions(self, pool):
+        """Test shutdown closes sessions and they are recreated on demand."""
+        session = await pool.open_session('claude')
+        await pool.close_all()
+
+        assert session.closed
+        assert pool.get_session_metrics('claude')['open'] is False
+
+        async with pool.get_session('claude') as reopened:
+            assert reopened is not session
+            assert not reopened.closed
+
+
+@pytest_asyncio.fixture
+async def local_server():
+    """Serve a slow endpoint on localhost for httpx client tests."""
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_get('/slow', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f'http://127.0.0.1:{port}'
+    await runner.cleanup()
+
+
+class TestProviderClients:
+    """Test suite for pooled httpx provider clients."""
+
+    @pytest.mark.asyncio
+    async def test_client_built_on_initialize(self, pool):
+        """Test clients exist before the first request and lookups reuse them."""
+        await pool.initialize_provider('openai', 'https://api.openai.com')
+        client = pool._clients['openai']
+
+        async with pool.get_client('openai') as first:
+            async with pool.get_client('openai') as second:
+                assert first is second is client
+
+        with pytest.raises(ValueError):
+            async with pool.get_client('unknown'):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_reinitialize_replaces_and_close_rebuilds(self, pool):
+        """Test re-initialization closes the old client and closed providers rebuild on use."""
+        await pool.initialize_provider('openai', 'https://api.openai.com')
+        old = pool._clients['openai']
+        await pool.initialize_provider('openai', 'https://api.openai.com', timeout=10)
+
+        assert old.is_closed
+        await pool.close_provider('openai')
+        async with pool.get_client('openai') as client:
+            assert client is not old and not client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_http2_falls_back_without_h2(self, pool, monkeypatch):
+        """Test HTTP/2 is only enabled when the h2 package is available."""
+        monkeypatch.setattr(connection_pool, 'h2', None)
+        await pool.initialize_provider('perplexity', 'https://api.perplexity.ai', http2=True)
+
+        assert pool.get_metrics('perplexity')['connections']['http2_enabled'] is False
+
+    @pytest.mark.asyncio
+    async def test_connection_metrics(self, pool, local_server):
+        """Test in-use, idle, waiter counts and acquire latency are exported."""
+        await pool.initialize_provider(
+            'tavily', local_server, http2=False, max_connections=1, max_keepalive=1
+        )
+
+        async def get():
+            async with pool.get_client('tavily') as client:
+                return (await client.get('/slow')).status_code
+
+        requests = [asyncio.ensure_future(get()) for _ in range(3)]
+        await asyncio.sleep(0.02)
+        busy = pool.get_metrics('tavily')['connections']
+        assert busy['in_use'] == 1
+        assert busy['waiters'] == 2
+
+        assert await asyncio.gather(*requests) == [200, 200, 200]
+        stats = pool.get_metrics('tavily')['connections']
+        assert stats['in_use'] == 0 and stats['idle'] == 1 and stats['waiters'] == 0
+        assert stats['acquire_samples'] == 3
+        # Queued requests waited roughly one and two response times for the connection
+        assert stats['acquire_p99_ms'] >= 50
+        assert sum(stats['acquire_histogram_ms'].values()) == 3
@@ -0,0 +1,220 @@
+"""
+Unit tests for provider latency tracking.
+
+Tests latency histograms, adaptive timeouts, request hedging with its
+budget and metrics, rate-limit header parsing and retry backoff in the
+connection pool.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from src.integrations.connection_pool import ConnectionPool
+from src.integrations.provider_latency import (
+    LatencyHistogram,
+    LatencyTracker,
+    backoff_delay,
+    retry_after_seconds
+)
+
+
+def _tracker(samples, provider='perplexity', **kwargs):
+    kwargs.setdefault('min_samples', 10)
+    tracker = LatencyTracker(**kwargs)
+    for seconds in samples:
+        tracker.record(provider, seconds)
+    return tracker
+
+
+def _delayed(delay, result='ok', calls=None):
+    async def call():
+        if calls is not None:
+            calls.append(delay)
+        await asyncio.sleep(delay)
+        return result
+    return call
+
+
+class TestLatencyTracker:
+    """Test suite for adaptive timeouts and hedging."""
+
+    def test_histogram_percentiles(self):
+        """Test percentiles resolve to the bucket holding the ranked sample."""
+        histogram = LatencyHistogram()
+        for _ in range(95):
+            histogram.record(0.1)
+        for _ in range(5):
+            histogram.record(4.0)
+
+        assert LatencyHistogram.percentile([histogram], 0.5) == pytest.approx(0.1, rel=0.25)
+        assert LatencyHistogram.percentile([histogram], 0.99) == pytest.approx(4.0, rel=0.25)
+        assert LatencyHistogram.percentile([LatencyHistogram()], 0.99) is None
+
+    def test_adaptive_timeout(self):
+        """Test timeouts follow p99 x factor within [min_timeout, default]."""
+        assert _tracker([]).timeout('perplexity', 90) == 90
+
+        fast = _tracker([2.0] * 50, timeout_factor=2.0)
+        assert 4.0 <= fast.timeout('perplexity', 90) <= 5.0
+
+        tiny = _tracker([0.05] * 50, min_timeout=5.0)
+        assert tiny.timeout('perplexity', 90) == 5.0
+
+        slow = _tracker([80.0] * 50)
+        assert slow.timeout('perplexity', 90) == 90
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises_and_records_tail(self):
+        """Test a call past the adaptive timeout is cancelled and raises."""
+        tracker = _tracker([0.01] * 20, min_timeout=0.05)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await tracker.run('perplexity', _delayed(1.0), default_timeout=30)
+
+        metrics = tracker.get_metrics('perplexity')['perplexity']
+        assert metrics['timeouts'] == 1
+        assert metrics['samples'] == 21
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_over_slow_primary(self):
+        """Test a duplicate is sent after p95 and the faster response is used."""
+        tracker = _tracker([0.02] * 20, hedge_budget=1.0)
+        delays = iter([1.0, 0.01])
+        calls = []
+
+        async def call():
+            delay = next(delays)
+            calls.append(delay)
+            await asyncio.sleep(delay)
+            return f'done in {delay}'
+
+        result = await tracker.run('perplexity', call, default_timeout=30, hedge=True, cost=lambda r: 0.5)
+
+        assert result == 'done in 0.01'
+        assert calls == [1.0, 0.01]
+        metrics = tracker.get_metrics('perplexity')['perplexity']
+        assert metrics['hedges_sent'] == 1
+        assert metrics['hedge_wins'] == 1
+        assert metrics['wasted_calls'] == 1
+        assert metrics['wasted_cost'] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """Test calls answering before p95 send no duplicate."""
+        tracker = _tracker([0.2] * 20, hedge_budget=1.0)
+        calls = []
+
+        await tracker.run('perplexity', _delayed(0.01, calls=calls), default_timeout=30, hedge=True)
+
+        assert len(calls) == 1
+        assert tracker.get_metrics('perplexity')['perplexity']['primary_wins'] == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_budget_caps_duplicates(self):
+        """Test hedges stay within the configured fraction of calls."""
+        tracker = _tracker([0.01] * 400, hedge_budget=0.25)
+
+        for _ in range(8):
+            await tracker.run('perplexity', _delayed(0.05), default_timeout=30, hedge=True)
+
+        metrics = tracker.get_metrics('perplexity')['perplexity']
+        assert metrics['hedges_sent'] <= 3
+        assert metrics['hedges_skipped_budget'] >= 5
+
+    @pytest.mark.asyncio
+    async def test_bad_result_waits_for_other_attempt(self):
+        """Test an unsuccessful result does not win while the hedge is running."""
+        tracker = _tracker([0.01] * 20, hedge_budget=1.0)
+        results = iter([(0.05, 'error'), (0.08, 'good')])
+
+        async def call():
+            delay, result = next(results)
+            await asyncio.sleep(delay)
+            return result
+
+        result = await tracker.run(
+            'perplexity', call, default_timeout=30, hedge=True,
+            succeeded=lambda r: r == 'good'
+        )
+
+        assert result == 'good'
+        metrics = tracker.get_metrics('perplexity')['perplexity']
+        assert metrics['hedge_wins'] == 1
+        assert metrics['wasted_calls'] == 0
+
+    @pytest.mark.asyncio
+    async def test_primary_error_is_raised_without_hedge(self):
+        """Test errors before the hedge point propagate for the caller to retry."""
+        tracker = _tracker([0.5] * 20, hedge_budget=1.0)
+
+        async def failing():
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            await tracker.run('perplexity', failing, default_timeout=30, hedge=True)
+        assert tracker.get_metrics('perplexity')['perplexity']['hedges_sent'] == 0
+
+
+class TestRetryAfter:
+    """Test suite for rate-limit header parsing and backoff."""
+
+    NOW = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+    def test_retry_after_formats(self):
+        """Test seconds, HTTP dates, durations and reset timestamps."""
+        assert retry_after_seconds({'Retry-After': '7'}) == 7.0
+        assert retry_after_seconds({'retry-after-ms': '250'}) == 0.25
+        assert retry_after_seconds(
+            {'Retry-After': 'Thu, 01 Jan 2026 12:00:30 GMT'}, now=self.NOW
+        ) == 30.0
+        assert retry_after_seconds({'x-ratelimit-reset-requests': '6m0s'}) == 360.0
+        assert retry_after_seconds({'x-ratelimit-reset-tokens': '20ms'}) == pytest.approx(0.02)
+        assert retry_after_seconds(
+            {'anthropic-ratelimit-requests-reset': '2026-01-01T12:00:05Z'}, now=self.NOW
+        ) == 5.0
+        assert retry_after_seconds({'content-type': 'application/json'}) is None
+
+    def test_longest_delay_wins(self):
+        """Test the most conservative of several headers is used."""
+        headers = {'Retry-After': '2', 'x-ratelimit-reset-requests': '12s'}
+
+        assert retry_after_seconds(headers) == 12.0
+
+    def test_backoff_delay(self):
+        """Test provider delays are honoured and capped; otherwise jittered."""
+        assert backoff_delay(0, retry_after=4.0) == 4.0
+        assert backoff_delay(0, retry_after=600.0, cap=60.0) == 60.0
+        assert all(0 <= backoff_delay(3) <= 8 for _ in range(20))
+
+    @pytest.mark.asyncio
+    async def test_execute_request_honours_retry_after(self, monkeypatch):
+        """Test a 429 retry sleeps for the provider's Retry-After."""
+        pool = ConnectionPool(timeout=30)
+        pool.latency = LatencyTracker()
+        await pool.initialize_provider('perplexity', 'https://api.example.com')
+
+        request = httpx.Request('POST', 'https://api.example.com/chat')
+        limited = httpx.Response(429, headers={'Retry-After': '3'}, request=request)
+        ok = httpx.Response(200, request=request)
+        client = MagicMock(is_closed=False)
+        client.request = AsyncMock(side_effect=[limited, ok])
+        pool._clients['perplexity'] = client
+
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+        monkeypatch.setattr('src.integrations.connection_pool.asyncio.sleep', fake_sleep)
+
+        response = await pool.execute_request('perplexity', 'POST', '/chat')
+
+        assert response.status_code == 200
+        assert sleeps == [3.0]
+        assert pool.get_metrics('perplexity')['latency']['primary_wins'] == 1
@@ -0,0 +1,167 @@
+"""
+Unit tests for the provider call scheduler.
+
+Tests per-provider concurrency caps, request and token budgets, priority
+lanes and fair queuing across tenants.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import time
+import pytest
+
+from src.integrations import provider_scheduler
+from src.integrations.provider_scheduler import (
+    ProviderScheduler,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+)
+from src.integrations.rate_limiter import RateLimiter
+
+
+async def _hold_slot(scheduler, provider, release: asyncio.Event, **kwargs):
+    async with scheduler.acquire(provider, **kwargs):
+        await release.wait()
+
+
+class TestProviderScheduler:
+    """Test suite for ProviderScheduler."""
+
+    def test_budget_seeded_from_rate_limiter(self):
+        """Test defaults come from RateLimiter limits via provider aliases."""
+        scheduler = ProviderScheduler()
+        scheduler.configure('openai', max_concurrency=3)
+
+        metrics = scheduler.get_metrics('openai')['openai']
+
+        assert metrics['rpm'] == RateLimiter.DEFAULT_PROVIDER_LIMITS['chatgpt']['rpm']
+        assert metrics['tpm'] == ProviderScheduler.DEFAULT_TPM['chatgpt']
+        assert metrics['max_concurrency'] == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """Test in-flight calls never exceed max_concurrency and none are dropped."""
+        scheduler = ProviderScheduler()
+        scheduler.configure('openai', max_concurrency=2, rpm=0, tpm=0)
+        in_flight = 0
+        peak = 0
+
+        async def call():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return 'ok'
+
+        results = await asyncio.gather(*[scheduler.run('openai', call) for _ in range(6)])
+
+        assert results == ['ok'] * 6
+        assert peak == 2
+        assert scheduler.get_metrics()['openai']['granted'] == 6
+
+    @pytest.mark.asyncio
+    async def test_rpm_budget_waits_for_window(self, monkeypatch):
+        """Test calls over the request budget wait for the window instead of failing."""
+        monkeypatch.setattr(provider_scheduler, '_WINDOW_SECONDS', 0.2)
+        scheduler = ProviderScheduler()
+        scheduler.configure('perplexity', max_concurrency=10, rpm=2, tpm=0)
+
+        async def call():
+            return time.monotonic()
+
+        start = time.monotonic()
+        finished = await asyncio.gather(*[scheduler.run('perplexity', call) for _ in range(3)])
+
+        assert finished[1] - start < 0.1
+        assert finished[2] - start >= 0.15
+        assert scheduler.get_metrics()['perplexity']['rate_limited_waits'] >= 1
+
+    @pytest.mark.asyncio
+    async def test_tpm_budget_uses_actual_tokens(self, monkeypatch):
+        """Test recorded token usage replaces the estimate in the budget."""
+        monkeypatch.setattr(provider_scheduler, '_WINDOW_SECONDS', 0.2)
+        scheduler = ProviderScheduler()
+        scheduler.configure('claude', max_concurrency=10, rpm=0, tpm=1000)
+
+        await scheduler.run('claude', lambda: asyncio.sleep(0), estimated_tokens=900,
+                            count_tokens=lambda _: 100)
+        assert scheduler.get_metrics()['claude']['tokens_last_minute'] == 100
+
+        start = time.monotonic()
+        await scheduler.run('claude', lambda: asyncio.sleep(0), estimated_tokens=800)
+        assert time.monotonic() - start < 0.1
+
+        await scheduler.run('claude', lambda: asyncio.sleep(0), estimated_tokens=500)
+        assert time.monotonic() - start >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_fair_queuing_across_tenants(self):
+        """Test a tenant with a backlog does not starve a later tenant."""
+        scheduler = ProviderScheduler()
+        scheduler.configure('openai', max_concurrency=1, rpm=0, tpm=0)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_hold_slot(scheduler, 'openai', release))
+        await asyncio.sleep(0)
+        order = []
+
+        async def call(label):
+            order.append(label)
+
+        tasks = [asyncio.create_task(scheduler.run('openai', lambda i=i: call(f'a{i}'), tenant='drug-a'))
+                 for i in range(3)]
+        tasks.append(asyncio.create_task(scheduler.run('openai', lambda: call('b0'), tenant='drug-b')))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+
+        assert order == ['a0', 'b0', 'a1', 'a2']
+
+    @pytest.mark.asyncio
+    async def test_priority_lanes(self):
+        """Test high-priority calls are granted before earlier low-priority ones."""
+        scheduler = ProviderScheduler()
+        scheduler.configure('openai', max_concurrency=1, rpm=0, tpm=0)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_hold_slot(scheduler, 'openai', release))
+        await asyncio.sleep(0)
+        order = []
+
+        async def call(label):
+            order.append(label)
+
+        low = asyncio.create_task(scheduler.run('openai', lambda: call('low'), priority=PRIORITY_LOW))
+        high = asyncio.create_task(scheduler.run('openai', lambda: call('high'), priority=PRIORITY_HIGH))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(blocker, low, high)
+
+        assert order == ['high', 'low']
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_nothing(self):
+        """Test cancelling a queued call leaves capacity accounting intact."""
+        scheduler = ProviderScheduler()
+        scheduler.configure('openai', max_concurrency=1, rpm=0, tpm=0)
+        release = asyncio.Event()
+        blocker = asyncio.create_task(_hold_slot(scheduler, 'openai', release))
+        await asyncio.sleep(0)
+
+        waiting = asyncio.create_task(scheduler.run('openai', lambda: asyncio.sleep(0)))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        release.set()
+        await blocker
+        await scheduler.run('openai', lambda: asyncio.sleep(0))
+
+        metrics = scheduler.get_metrics()['openai']
+        assert metrics['in_flight'] == 0
+        assert metrics['queued'] == 0
+        assert metrics['cancelled'] == 1
@@ -0,0 +1,170 @@
+"""
+Unit tests for provider response streaming.
+
+Tests SSE delta extraction, per-call stream metrics and the ProviderStream
+async iterator.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import json
+import pytest
+
+from src.integrations.provider_streaming import (
+    ProviderStream,
+    StreamStats,
+    StreamMetrics,
+    anthropic_delta,
+    collect_stream,
+    iter_sse_deltas,
+    openai_delta,
+)
+
+
+class _FakeContent:
+    def __init__(self, lines):
+        self._lines = lines
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for line in self._lines:
+            yield line.encode()
+
+
+class _FakeResponse:
+    def __init__(self, lines):
+        self.content = _FakeContent(lines)
+
+
+def _sse(event) -> str:
+    return f"data: {json.dumps(event)}\n"
+
+
+async def _drain(iterator):
+    return [item async for item in iterator]
+
+
+class TestSSEDeltas:
+    """Test suite for SSE parsing."""
+
+    @pytest.mark.asyncio
+    async def test_openai_deltas(self):
+        """Test OpenAI-style chunks yield content deltas until [DONE]."""
+        response = _FakeResponse([
+            _sse({"choices": [{"delta": {"role": "assistant"}}]}),
+            ": keep-alive\n",
+            _sse({"choices": [{"delta": {"content": "| a |"}}]}),
+            "\n",
+            _sse({"choices": [{"delta": {"content": " b |"}}]}),
+            "data: [DONE]\n",
+            _sse({"choices": [{"delta": {"content": "ignored"}}]}),
+        ])
+
+        assert await _drain(iter_sse_deltas(response, openai_delta)) == ["| a |", " b |"]
+
+    @pytest.mark.asyncio
+    async def test_anthropic_deltas(self):
+        """Test only text deltas are taken from Anthropic events."""
+        response = _FakeResponse([
+            "event: message_start\n",
+            _sse({"type": "message_start", "message": {}}),
+            _sse({"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hello"}}),
+            _sse({"type": "content_block_delta", "delta": {"type": "input_json_delta", "partial_json": "{"}}),
+            _sse({"type": "content_block_delta", "delta": {"type": "text_delta", "text": " world"}}),
+            _sse({"type": "message_stop"}),
+        ])
+
+        assert await _drain(iter_sse_deltas(response, anthropic_delta)) == ["Hello", " world"]
+
+    @pytest.mark.asyncio
+    async def test_error_event_raises(self):
+        """Test an in-stream error event fails the call."""
+        response = _FakeResponse([_sse({"type": "error", "error": {"message": "overloaded"}})])
+
+        with pytest.raises(RuntimeError):
+            await _drain(iter_sse_deltas(response, anthropic_delta))
+
+
+class TestStreamMetrics:
+    """Test suite for stream timing."""
+
+    @pytest.mark.asyncio
+    async def test_collect_stream_forwards_chunks_and_records_metrics(self):
+        """Test chunks reach the callback in order and TTFT/tokens per second are recorded."""
+        received = []
+
+        async def deltas():
+            await asyncio.sleep(0.01)
+            yield "abcd" * 10
+            await asyncio.sleep(0.01)
+            yield "efgh" * 10
+
+        text, metrics = await collect_stream("openai", deltas(), received.append)
+
+        assert text == "abcd" * 10 + "efgh" * 10
+        assert received == ["abcd" * 10, "efgh" * 10]
+        assert metrics["chunks"] == 2
+        assert metrics["time_to_first_token_ms"] >= 5
+        assert metrics["output_tokens"] > 0
+        assert metrics["tokens_per_second"] > 0
+
+    @pytest.mark.asyncio
+    async def test_failing_consumer_does_not_break_stream(self):
+        """Test a raising chunk callback is detached and the text still completes."""
+        async def deltas():
+            yield "a"
+            yield "b"
+
+        def consumer(text):
+            raise ValueError("boom")
+
+        text, _ = await collect_stream("openai", deltas(), consumer)
+
+        assert text == "ab"
+
+    def test_stats_average_per_provider(self):
+        """Test per-provider aggregation of finished streams."""
+        stats = StreamStats()
+        for ttft in (0.1, 0.3):
+            metrics = StreamMetrics("claude")
+            metrics.first_chunk_at = metrics.started_at + ttft
+            metrics.finished_at = metrics.first_chunk_at + 1
+            metrics.output_tokens = 50
+            stats.record(metrics)
+
+        claude = stats.get_metrics()["claude"]
+
+        assert claude["streams"] == 2
+        assert claude["avg_time_to_first_token_ms"] == pytest.approx(200, abs=1)
+        assert claude["avg_tokens_per_second"] == pytest.approx(50)
+
+
+class TestProviderStream:
+    """Test suite for the ProviderStream iterator."""
+
+    @pytest.mark.asyncio
+    async def test_yields_chunks_then_exposes_result(self):
+        """Test deltas are yielded as produced and the final tuple is kept."""
+        async def call(on_chunk):
+            on_chunk("one ")
+            await asyncio.sleep(0)
+            on_chunk("two")
+            return "one two", {"stream": True}
+
+        stream = ProviderStream(call)
+
+        assert await _drain(stream) == ["one ", "two"]
+        assert stream.response == "one two"
+        assert stream.request_payload == {"stream": True}
+
+    @pytest.mark.asyncio
+    async def test_unstreamed_response_yields_once(self):
+        """Test cached or buffered responses arrive as a single chunk."""
+        async def call(on_chunk):
+            return "cached text", {}
+
+        assert await _drain(ProviderStream(call)) == ["cached text"]
@@ -1,295 +1,280 @@
 """
 Unit tests for rate limiting implementation.
 
-Tests token bucket algorithm, rate limit enforcement, and quota management.
+Tests GCRA limit enforcement across minute/hour/day windows, single
+round-trip batch checks, category multipliers, quota reporting and the
+in-process fallbacks.
 
 Version: 1.0.0
 Author: CognitoAI Development Team
 """
 
 import pytest
-import time
-from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock
 import redis.asyncio as redis
 
-from src.integrations.rate_limiter import RateLimiter
+from src.core.rate_limiter import RateLimiter as APIRateLimiter
+from src.integrations.rate_limiter import GCRALimit, InProcessGCRA, RateLimiter
+
+
+class FakeGCRARedis:
+    """
+    Redis stand-in that evaluates GCRA_SCRIPT calls in Python.
+
+    Decodes KEYS/ARGV exactly as the Lua script does and stores TATs in
+    milliseconds against a controllable server clock.
+    """
+
+    def __init__(self):
+        self.now_ms = 1_700_000_000_000
+        self.tats = {}
+        self.script_calls = 0
+        self.down = False
+        self.hgetall = AsyncMock(return_value={})
+        self.hset = AsyncMock(return_value=1)
+        self.expire = AsyncMock(return_value=True)
+
+    def register_script(self, source):
+        assert "redis.call('TIME')" in source
+        return self.run_script
+
+    async def run_script(self, keys, args):
+        if self.down:
+            raise redis.ConnectionError("redis unavailable")
+        self.script_calls += 1
+        now = self.now_ms
+        arg, key, result = 1, 0, []
+        for _ in range(int(args[0])):
+            n = int(args[arg])
+            arg += 1
+            new_tats, wait = [], 0
+            for i in range(n):
+                interval, tolerance, cost = (float(a) for a in args[arg:arg + 3])
+                arg += 3
+                tat = max(self.tats.get(keys[key + i], now), now)
+                new_tats.append(tat + cost * interval)
+                wait = max(wait, new_tats[-1] - tolerance - now)
+            if wait <= 0:
+                for i in range(n):
+                    self.tats[keys[key + i]] = new_tats[i]
+            key += n
+            result += [1 if wait <= 0 else 0, int(-(-max(wait, 0) // 1))]
+        return result
+
+    def advance(self, seconds):
+        self.now_ms += int(seconds * 1000)
+
+    def pipeline(self, transaction=True):
+        fake = self
+        pipe = MagicMock()
+        calls = []
+        pipe.time = lambda: calls.append(lambda: (fake.now_ms // 1000, (fake.now_ms % 1000) * 1000))
+        pipe.get = lambda key: calls.append(lambda: fake.tats.get(key))
+        pipe.mget = lambda keys: calls.append(lambda: [fake.tats.get(k) for k in keys])
+
+        async def execute():
+            if fake.down:
+                raise redis.ConnectionError("redis unavailable")
+            return [call() for call in calls]
+        pipe.execute = execute
+        return pipe
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.tats.pop(key, None)
+        return len(keys)
 
 
 @pytest.fixture
-async def mock_redis():
-    """Create mock Redis client."""
-    mock = AsyncMock(spec=redis.Redis)
-    mock.pipeline = AsyncMock()
-    mock.zremrangebyscore = AsyncMock(return_value=0)
-    mock.zcard = AsyncMock(return_value=0)
-    mock.zadd = AsyncMock(return_value=1)
-    mock.expire = AsyncMock(return_value=True)
-    mock.zrange = AsyncMock(return_value=[])
-    mock.incr = AsyncMock(return_value=1)
-    mock.get = AsyncMock(return_value=None)
-    mock.hgetall = AsyncMock(return_value={})
-    mock.hset = AsyncMock(return_value=1)
-    mock.delete = AsyncMock(return_value=1)
-    mock.scan = AsyncMock(return_value=(0, []))
-    return mock
+def fake_redis():
+    return FakeGCRARedis()
 
 
 @pytest.fixture
-async def rate_limiter(mock_redis):
-    """Create rate limiter instance with mock Redis."""
-    return RateLimiter(mock_redis)
+def rate_limiter(fake_redis):
+    limiter = RateLimiter(fake_redis)
+    limiter.limits_cache['chatgpt'] = {'rpm': 60, 'rph': 1000, 'rpd': 10000}
+    limiter.limits_cache['grok'] = {'rpm': 2, 'rph': 400, 'rpd': 4000}
+    return limiter
 
 
 class TestRateLimiter:
     """Test suite for rate limiting functionality."""
 
     @pytest.mark.asyncio
-    async def test_check_rate_limit_allowed(self, rate_limiter, mock_redis):
-        """Test rate limit allows request when under limit."""
-        # Mock Redis pipeline for sliding window
-        pipeline_mock = AsyncMock()
-        pipeline_mock.zremrangebyscore = AsyncMock()
-        pipeline_mock.zcard = AsyncMock()
-        pipeline_mock.zadd = AsyncMock()
-        pipeline_mock.expire = AsyncMock()
-        pipeline_mock.execute = AsyncMock(return_value=[0, 5, 1, True])  # 5 requests in window
+    async def test_minute_burst_then_steady_rate(self, rate_limiter, fake_redis):
+        """Test the full minute burst is allowed, then one call per emission interval."""
+        for _ in range(60):
+            assert await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials') == (True, None)
 
-        mock_redis.pipeline = lambda: pipeline_mock
+        allowed, retry_after = await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials')
+        assert allowed is False
+        assert retry_after == 1
 
-        # Mock hour and day counters
-        mock_redis.incr = AsyncMock(return_value=10)
+        fake_redis.advance(1)
+        assert (await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials'))[0] is True
+        assert fake_redis.script_calls == 62
 
-        allowed, retry_after = await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials')
+    @pytest.mark.asyncio
+    async def test_denied_calls_consume_nothing(self, rate_limiter, fake_redis):
+        """Test state is one TAT per window and denials do not extend the wait."""
+        for _ in range(2):
+            await rate_limiter.check_rate_limit('grok', 'Clinical Trials')
+        for _ in range(20):
+            assert (await rate_limiter.check_rate_limit('grok', 'Clinical Trials'))[0] is False
 
-        assert allowed is True
-        assert retry_after is None
+        assert len(fake_redis.tats) == 3
+        fake_redis.advance(30)
+        assert (await rate_limiter.check_rate_limit('grok', 'Clinical Trials'))[0] is True
 
     @pytest.mark.asyncio
-    async def test_minute_rate_limit_exceeded(self, rate_limiter, mock_redis):
-        """Test per-minute rate limit enforcement."""
-        # Mock pipeline to return count exceeding limit
-        pipeline_mock = AsyncMock()
-        pipeline_mock.zremrangebyscore = AsyncMock()
-        pipeline_mock.zcard = AsyncMock()
-        pipeline_mock.zadd = AsyncMock()
-        pipeline_mock.expire = AsyncMock()
-        pipeline_mock.execute = AsyncMock(return_value=[0, 61, 1, True])  # 61 requests (exceeds 60 rpm)
-
-        mock_redis.pipeline = lambda: pipeline_mock
-
-        # Mock zrange to return oldest entry for retry calculation
-        current = time.time()
-        mock_redis.zrange = AsyncMock(return_value=[('request', current - 30)])  # 30 seconds ago
+    async def test_hour_limit_checked_with_minute(self, rate_limiter, fake_redis):
+        """Test an exhausted hour window denies even when the minute window is free."""
+        rate_limiter.limits_cache['chatgpt'] = {'rpm': 60, 'rph': 3, 'rpd': 10000}
+        for _ in range(3):
+            await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials')
 
         allowed, retry_after = await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials')
 
         assert allowed is False
-        assert retry_after is not None
-        assert retry_after > 0
-        assert retry_after <= 30
+        assert retry_after == 1200  # one hourly emission interval
 
     @pytest.mark.asyncio
-    async def test_hour_rate_limit_exceeded(self, rate_limiter, mock_redis):
-        """Test per-hour rate limit enforcement."""
-        # Mock minute check to pass
-        pipeline_mock = AsyncMock()
-        pipeline_mock.execute = AsyncMock(return_value=[0, 50, 1, True])  # Under minute limit
-        mock_redis.pipeline = lambda: pipeline_mock
-
-        # Mock hour counter to exceed limit
-        mock_redis.incr = AsyncMock(return_value=1001)  # Exceeds 1000 rph
+    async def test_category_multiplier(self, rate_limiter):
+        """Test conservative categories get a smaller share of the burst."""
+        for _ in range(48):
+            await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials & Studies')
 
-        with patch('src.integrations.rate_limiter.datetime') as mock_datetime:
-            now = datetime.utcnow()
-            mock_datetime.utcnow.return_value = now
+        # 60 * 0.8 = 48 back-to-back calls for this category
+        assert (await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials & Studies'))[0] is False
+        assert (await rate_limiter.check_rate_limit('chatgpt', 'Regulatory Status & Approvals'))[0] is True
 
-            allowed, retry_after = await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials')
+    @pytest.mark.asyncio
+    async def test_category_multiplier_scales_sustained_rate(self, rate_limiter, fake_redis):
+        """Test a conservative category is held to its scaled rate after the burst."""
+        for _ in range(48):
+            await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials & Studies')
 
-            assert allowed is False
-            assert retry_after is not None
-            assert retry_after > 0
+        # The provider emits one call per second, the category one per 1.25s
+        fake_redis.advance(1)
+        assert (await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials & Studies'))[0] is False
+        fake_redis.advance(0.25)
+        assert (await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials & Studies'))[0] is True
 
     @pytest.mark.asyncio
-    async def test_daily_quota_exceeded(self, rate_limiter, mock_redis):
-        """Test daily quota enforcement."""
-        # Mock minute and hour checks to pass
-        pipeline_mock = AsyncMock()
-        pipeline_mock.execute = AsyncMock(return_value=[0, 50, 1, True])
-        mock_redis.pipeline = lambda: pipeline_mock
-
-        # Mock counters - hour passes but day exceeds
-        counter = 0
-
-        def incr_side_effect(key):
-            nonlocal counter
-            counter += 1
-            if 'hour' in key:
-                return 500  # Under hour limit
-            else:
-                return 10001  # Exceeds daily quota
-
-        mock_redis.incr = AsyncMock(side_effect=incr_side_effect)
-
-        with patch('src.integrations.rate_limiter.datetime') as mock_datetime:
-            now = datetime.utcnow()
-            mock_datetime.utcnow.return_value = now
-            mock_datetime.combine.return_value = datetime.combine(
-                now.date() + timedelta(days=1),
-                datetime.min.time()
-            )
-
-            allowed, retry_after = await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials')
-
-            assert allowed is False
-            assert retry_after is not None
+    async def test_category_shares_provider_usage(self, rate_limiter):
+        """Test a conservative category is denied once the provider is mostly used."""
+        for _ in range(48):
+            await rate_limiter.check_rate_limit('chatgpt', 'Regulatory Status & Approvals')
+
+        assert (await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials & Studies'))[0] is False
 
     @pytest.mark.asyncio
-    async def test_category_multiplier(self, rate_limiter, mock_redis):
-        """Test category-specific rate limit multipliers."""
-        # Mock getting provider limits
-        rate_limiter.limits_cache['chatgpt'] = {
-            'rpm': 60,
-            'rph': 1000,
-            'rpd': 10000
-        }
-
-        # Test with category that has 0.8 multiplier
-        pipeline_mock = AsyncMock()
-        pipeline_mock.execute = AsyncMock(return_value=[0, 49, 1, True])  # 49 requests
-        mock_redis.pipeline = lambda: pipeline_mock
-        mock_redis.incr = AsyncMock(return_value=100)
-
-        # 60 * 0.8 = 48 limit, 49 requests should fail
-        allowed, retry_after = await rate_limiter.check_rate_limit(
-            'chatgpt',
-            'Clinical Trials & Studies'  # Has 0.8 multiplier
-        )
-
-        # The minute check will fail because 49 > 48
-        assert allowed is False
+    async def test_batch_check_single_round_trip(self, rate_limiter, fake_redis):
+        """Test several providers are checked independently in one script call."""
+        for _ in range(2):
+            await rate_limiter.check_rate_limit('grok', 'Clinical Trials')
+        calls = fake_redis.script_calls
+
+        results = await rate_limiter.check_rate_limits([
+            ('chatgpt', 'Clinical Trials'),
+            ('grok', 'Clinical Trials'),
+            ('chatgpt', 'Real-World Evidence')
+        ])
+
+        assert fake_redis.script_calls == calls + 1
+        assert [allowed for allowed, _ in results] == [True, False, True]
+        assert results[1][1] == 30
 
     @pytest.mark.asyncio
-    async def test_get_remaining_quota(self, rate_limiter, mock_redis):
-        """Test getting remaining quota for provider."""
-        # Mock provider limits
-        rate_limiter.limits_cache['chatgpt'] = {
-            'rpm': 60,
-            'rph': 1000,
-            'rpd': 10000
-        }
-
-        # Mock current usage
-        mock_redis.zcard = AsyncMock(return_value=25)  # 25 requests in minute window
-        mock_redis.get = AsyncMock(side_effect=lambda key: {
-            f'rate_limit:hour:chatgpt:{datetime.utcnow().replace(minute=0, second=0, microsecond=0).isoformat()}': '400',
-            f'rate_limit:day:chatgpt:{datetime.utcnow().date().isoformat()}': '3000'
-        }.get(key, '0'))
+    async def test_get_remaining_quota(self, rate_limiter):
+        """Test remaining quota is derived from the stored TATs."""
+        for _ in range(25):
+            await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials')
 
         remaining = await rate_limiter.get_remaining_quota('chatgpt')
 
-        assert remaining['minute'] == 35  # 60 - 25
-        assert remaining['hour'] == 600  # 1000 - 400
-        assert remaining['day'] == 7000  # 10000 - 3000
+        assert remaining == {'minute': 35, 'hour': 975, 'day': 9975}
 
     @pytest.mark.asyncio
-    async def test_reset_limits(self, rate_limiter, mock_redis):
+    async def test_reset_limits(self, rate_limiter, fake_redis):
         """Test resetting rate limits for provider."""
-        # Mock scan to return keys
-        mock_redis.scan = AsyncMock(side_effect=[
-            (1, [b'rate_limit:minute:chatgpt:123', b'rate_limit:minute:chatgpt:456']),
-            (0, [b'rate_limit:minute:chatgpt:789'])
-        ])
+        for _ in range(3):
+            await rate_limiter.check_rate_limit('grok', 'Clinical Trials')
 
-        await rate_limiter.reset_limits('chatgpt')
+        await rate_limiter.reset_limits('grok')
 
-        # Verify delete was called for found keys
-        assert mock_redis.delete.called
+        assert fake_redis.tats == {}
+        assert (await rate_limiter.check_rate_limit('grok', 'Clinical Trials'))[0] is True
 
     @pytest.mark.asyncio
-    async def test_update_provider_limits(self, rate_limiter, mock_redis):
+    async def test_update_provider_limits(self, rate_limiter, fake_redis):
         """Test updating provider rate limits."""
-        await rate_limiter.update_provider_limits(
-            'chatgpt',
-            rpm=100,
-            rph=2000,
-            rpd=20000
-        )
-
-        # Verify Redis update
-        mock_redis.hset.assert_called_once()
-        call_args = mock_redis.hset.call_args
-        assert 'provider_limits:chatgpt' in call_args[0]
-        assert call_args[1]['mapping']['rpm'] == 100
-        assert call_args[1]['mapping']['rph'] == 2000
-        assert call_args[1]['mapping']['rpd'] == 20000
+        await rate_limiter.update_provider_limits('chatgpt', rpm=100, rph=2000, rpd=20000)
 
-        # Verify cache cleared
+        fake_redis.hset.assert_called_once()
+        call_args = fake_redis.hset.call_args
+        assert 'provider_limits:chatgpt' in call_args[0]
+        assert call_args[1]['mapping'] == {'rpm': 100, 'rph': 2000, 'rpd': 20000}
         assert 'chatgpt' not in rate_limiter.limits_cache
 
     @pytest.mark.asyncio
-    async def test_sliding_window_algorithm(self, rate_limiter, mock_redis):
-        """Test sliding window algorithm for minute rate limiting."""
-        current_time = time.time()
+    async def test_falls_back_to_memory_without_redis(self, rate_limiter, fake_redis):
+        """Test checks keep being enforced in-process when Redis is down."""
+        fake_redis.down = True
 
-        # Mock pipeline operations
-        pipeline_mock = AsyncMock()
-        remove_count = 0
-        request_count = 0
+        results = [await rate_limiter.check_rate_limit('grok', 'Clinical Trials') for _ in range(3)]
 
-        def zremrangebyscore_effect(key, min_score, max_score):
-            nonlocal remove_count
-            remove_count = 10  # Removed 10 old requests
-            return AsyncMock()
+        assert [allowed for allowed, _ in results] == [True, True, False]
 
-        def zcard_effect(key):
-            nonlocal request_count
-            request_count = 45  # 45 requests in current window
-            return AsyncMock()
+    @pytest.mark.asyncio
+    async def test_limit_loading_falls_back_without_redis(self, fake_redis):
+        """Test default limits are used when Redis fails while loading them."""
+        fake_redis.down = True
+        fake_redis.hgetall.side_effect = redis.ConnectionError("down")
+        rate_limiter = RateLimiter(fake_redis)
 
-        pipeline_mock.zremrangebyscore = AsyncMock(side_effect=zremrangebyscore_effect)
-        pipeline_mock.zcard = AsyncMock(side_effect=zcard_effect)
-        pipeline_mock.zadd = AsyncMock()
-        pipeline_mock.expire = AsyncMock()
-        pipeline_mock.execute = AsyncMock(return_value=[10, 45, 1, True])
+        results = [await rate_limiter.check_rate_limit('unknown', 'Clinical Trials') for _ in range(31)]
+        quota = await rate_limiter.get_remaining_quota('unknown')
 
-        mock_redis.pipeline = lambda: pipeline_mock
+        # Default limits for unknown providers are 30 rpm
+        assert [allowed for allowed, _ in results] == [True] * 30 + [False]
+        assert quota['minute'] == 0
+        assert 'unknown' not in rate_limiter.limits_cache
 
-        # Mock hour and day checks to pass
-        mock_redis.incr = AsyncMock(return_value=100)
 
-        allowed, _ = await rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials')
+class TestInProcessGCRA:
+    """Test suite for the in-process GCRA fallback."""
 
-        assert allowed is True
+    def test_all_or_nothing_across_limits(self):
+        """Test a denied check leaves every limit untouched."""
+        limiter = InProcessGCRA()
+        minute, hour = GCRALimit('m', 10, 60), GCRALimit('h', 2, 3600)
 
-        # Verify sliding window was applied
-        pipeline_mock.zremrangebyscore.assert_called()
-        zrem_call = pipeline_mock.zremrangebyscore.call_args
-        assert 'rate_limit:minute:chatgpt' in zrem_call[0][0]
+        assert limiter.check([minute, hour], now=0) == (True, None)
+        assert limiter.check([minute, hour], now=0) == (True, None)
+        assert limiter.check([minute, hour], now=0) == (False, 1800)
+        assert limiter.remaining(minute, now=0) == 8
+
+    def test_expired_state_is_pruned(self):
+        """Test memory stays bounded by live keys."""
+        limiter = InProcessGCRA(max_keys=2)
+        limit = GCRALimit('a', 1, 1)
+        for i, key in enumerate(['a', 'b', 'c', 'd']):
+            limiter.check([GCRALimit(key, 1, 1)], now=i * 10)
+
+        assert len(limiter.tats) <= 2
+        assert limiter.remaining(limit, now=100) == 1
 
     @pytest.mark.asyncio
-    async def test_concurrent_rate_limit_checks(self, rate_limiter, mock_redis):
-        """Test concurrent rate limit checks don't cause race conditions."""
-        # Mock pipeline for atomic operations
-        pipeline_mock = AsyncMock()
-        pipeline_mock.zremrangebyscore = AsyncMock()
-        pipeline_mock.zcard = AsyncMock()
-        pipeline_mock.zadd = AsyncMock()
-        pipeline_mock.expire = AsyncMock()
-        pipeline_mock.execute = AsyncMock(return_value=[0, 30, 1, True])
-
-        mock_redis.pipeline = lambda: pipeline_mock
-        mock_redis.incr = AsyncMock(return_value=500)
-
-        # Simulate concurrent checks
-        tasks = []
-        for _ in range(10):
-            tasks.append(rate_limiter.check_rate_limit('chatgpt', 'Clinical Trials'))
-
-        import asyncio
-        results = await asyncio.gather(*tasks)
-
-        # All should get consistent results
-        for allowed, retry_after in results:
-            assert allowed is True
-            assert retry_after is None
\ No newline at end of file
+    async def test_api_rate_limiter_memory_path(self):
+        """Test the API limiter without Redis uses GCRA with weighted increments."""
+        limiter = APIRateLimiter(max_requests=10, time_window=60)
+
+        assert await limiter.check_rate_limit('key', increment=8) == (True, None)
+        allowed, retry_after = await limiter.check_rate_limit('key', increment=3)
+
+        assert allowed is False and retry_after == 6
+        assert (await limiter.get_remaining_quota('key'))[0] == 2
+        await limiter.reset_limit('key')
+        assert (await limiter.get_remaining_quota('key'))[0] == 10
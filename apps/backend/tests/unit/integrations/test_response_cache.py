@@ -0,0 +1,146 @@
+"""
+Unit tests for the provider response cache.
+
+Tests content-addressed keys, the bounded local LRU tier, per-category TTLs,
+bypass and coalescing of concurrent misses.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import pytest
+
+from src.core.metrics_collector import metrics_collector
+from src.integrations.response_cache import LocalLRUCache, ResponseCache
+
+
+class TestLocalLRUCache:
+    """Test suite for LocalLRUCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the entry bound evicts the least recently used entry."""
+        cache = LocalLRUCache(max_entries=2)
+        cache.set('a', 'A', 60)
+        cache.set('b', 'B', 60)
+        cache.get('a')
+        cache.set('c', 'C', 60)
+
+        assert cache.get('a') == 'A'
+        assert cache.get('b') is None
+        assert cache.get('c') == 'C'
+        assert cache.evictions == 1
+
+    def test_size_bound(self):
+        """Test the byte bound is enforced."""
+        cache = LocalLRUCache(max_entries=100, max_bytes=10)
+        cache.set('a', 'x' * 6, 60)
+        cache.set('b', 'y' * 6, 60)
+
+        assert len(cache) == 1
+        assert cache.size_bytes == 6
+
+    def test_expired_entries_are_dropped(self):
+        """Test entries past their TTL are not returned."""
+        cache = LocalLRUCache()
+        cache.set('a', 'A', 0)
+
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+
+class TestResponseCache:
+    """Test suite for ResponseCache with the durable tier disabled."""
+
+    def test_key_covers_all_inputs(self):
+        """Test every key component changes the content address."""
+        base = ResponseCache.make_key('openai', 'gpt-4o', 0.7, 'prompt', 'system')
+
+        assert base == ResponseCache.make_key('openai', 'gpt-4o', 0.70, 'prompt', 'system')
+        assert base != ResponseCache.make_key('anthropic', 'gpt-4o', 0.7, 'prompt', 'system')
+        assert base != ResponseCache.make_key('openai', 'gpt-4', 0.7, 'prompt', 'system')
+        assert base != ResponseCache.make_key('openai', 'gpt-4o', 0.3, 'prompt', 'system')
+        assert base != ResponseCache.make_key('openai', 'gpt-4o', 0.7, 'other', 'system')
+        assert base != ResponseCache.make_key('openai', 'gpt-4o', 0.7, 'prompt', 'other')
+
+    @pytest.mark.asyncio
+    async def test_hit_after_miss_records_metrics(self):
+        """Test a repeated call is served from cache and recorded in MetricsCollector."""
+        cache = ResponseCache(durable=False)
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            return {'response': 'text'}
+
+        hits_before = metrics_collector.cache_hits
+        misses_before = metrics_collector.cache_misses
+
+        first = await cache.get_or_call('k', call)
+        second = await cache.get_or_call('k', call)
+
+        assert first == second == {'response': 'text'}
+        assert calls == 1
+        assert metrics_collector.cache_hits == hits_before + 1
+        assert metrics_collector.cache_misses == misses_before + 1
+        assert cache.get_metrics()['hit_rate'] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_bypass_refreshes_entry(self):
+        """Test bypass skips the lookup but stores the fresh result."""
+        cache = ResponseCache(durable=False)
+        await cache.set('k', 'old')
+
+        async def call():
+            return 'new'
+
+        assert await cache.get_or_call('k', call, bypass=True) == 'new'
+        assert await cache.get('k') == 'new'
+        assert cache.metrics['bypassed'] == 1
+
+    @pytest.mark.asyncio
+    async def test_category_ttl_zero_disables_caching(self):
+        """Test a zero category TTL never stores results."""
+        cache = ResponseCache(durable=False, category_ttls={'Live News': 0})
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            return 'text'
+
+        await cache.get_or_call('k', call, category='Live News')
+        await cache.get_or_call('k', call, category='Live News')
+
+        assert calls == 2
+        assert len(cache.local) == 0
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_results_are_not_stored(self):
+        """Test the cacheable predicate keeps error responses out of the cache."""
+        cache = ResponseCache(durable=False)
+
+        async def call():
+            return 'error'
+
+        await cache.get_or_call('k', call, cacheable=lambda value: value != 'error')
+
+        assert cache.metrics['writes'] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_call(self):
+        """Test concurrent misses for one key coalesce into a single call."""
+        cache = ResponseCache(durable=False)
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 'text'
+
+        results = await asyncio.gather(*[cache.get_or_call('k', call) for _ in range(5)])
+
+        assert results == ['text'] * 5
+        assert calls == 1
@@ -0,0 +1,198 @@
+"""
+Unit tests for the write-behind audit event sink.
+
+Tests multi-row batch inserts, ordered spill-to-disk and replay,
+back-pressure, persistence on shutdown, isolation of rejected rows and
+writing through the same engine the audit trail is read from.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.services import audit_sink
+from src.services.audit_sink import AUDIT_COLUMNS, AuditEventSink
+
+
+class _FakeDatabaseConnection:
+    """Stand-in for DatabaseConnection yielding a shared mock connection."""
+
+    conn = None
+
+    async def __aenter__(self):
+        return _FakeDatabaseConnection.conn
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class FakeAuditTable:
+    """Records inserted audit ids; fails while ``down`` is set."""
+
+    def __init__(self):
+        self.ids = []
+        self.statements = 0
+        self.down = False
+        self.bad_ids = set()
+
+    async def execute(self, query, *params):
+        if self.down:
+            raise ConnectionError("database unavailable")
+        rows = [params[i:i + len(AUDIT_COLUMNS)] for i in range(0, len(params), len(AUDIT_COLUMNS))]
+        if any(row[0] in self.bad_ids for row in rows):
+            raise ValueError("invalid input value")
+        self.statements += 1
+        self.ids.extend(row[0] for row in rows)
+
+    async def fetchval(self, query):
+        if self.down:
+            raise ConnectionError("database unavailable")
+        return 1
+
+
+@pytest.fixture
+def table(monkeypatch):
+    """Patch the sink's database connection with an in-memory table."""
+    table = FakeAuditTable()
+    conn = MagicMock()
+    conn.execute = AsyncMock(side_effect=table.execute)
+    conn.fetchval = AsyncMock(side_effect=table.fetchval)
+    _FakeDatabaseConnection.conn = conn
+    monkeypatch.setattr(audit_sink, 'DatabaseConnection', _FakeDatabaseConnection)
+    return table
+
+
+def _event(i, correlation_id="c1"):
+    return {
+        'id': f"e{i}",
+        'event_type': 'process_start',
+        'event_description': f"event {i}",
+        'entity_type': 'drug_request',
+        'entity_id': 'r1',
+        'timestamp': '2026-01-01T00:00:00',
+        'audit_metadata': json.dumps({'n': i}),
+        'correlation_id': correlation_id
+    }
+
+
+def _sink(tmp_path=None, **kwargs):
+    kwargs.setdefault('flush_interval', 60)
+    kwargs.setdefault('retry_backoff', 0.01)
+    return AuditEventSink(spill_dir=str(tmp_path) if tmp_path else None, **kwargs)
+
+
+class TestAuditEventSink:
+    """Test suite for AuditEventSink."""
+
+    @pytest.mark.asyncio
+    async def test_batches_into_multi_row_inserts(self, table):
+        """Test queued events are written in submission order, one INSERT per batch."""
+        sink = _sink(batch_size=4)
+        for i in range(10):
+            await sink.submit(_event(i))
+
+        written = await sink.flush()
+        await sink.stop()
+
+        assert written == 10
+        assert table.ids == [f"e{i}" for i in range(10)]
+        assert table.statements == 3
+        query = _FakeDatabaseConnection.conn.execute.call_args_list[0].args[0]
+        assert query.count("),") == 3 and "ON CONFLICT (id) DO NOTHING" in query
+
+    @pytest.mark.asyncio
+    async def test_spills_to_disk_and_replays_in_order(self, table, tmp_path):
+        """Test overflow goes to the spill file and is written after the buffer."""
+        table.down = True
+        sink = _sink(tmp_path, batch_size=3, max_buffer_size=3)
+        await sink.start()
+
+        for i in range(8):
+            await sink.submit(_event(i))
+        assert await sink.flush() == 0
+        assert sink.get_stats()['events_spilled'] == 5
+
+        table.down = False
+        assert await sink.flush() == 8
+        await sink.stop()
+
+        assert table.ids == [f"e{i}" for i in range(8)]
+        assert (tmp_path / "audit-spill-0.jsonl").stat().st_size == 0
+
+    @pytest.mark.asyncio
+    async def test_backpressure_instead_of_dropping(self, table):
+        """Test submit waits for space when spilling is disabled."""
+        sink = _sink(batch_size=10, max_buffer_size=2, flush_interval=0.01)
+        table.down = True
+        await sink.submit(_event(0))
+        await sink.submit(_event(1))
+
+        blocked = asyncio.create_task(sink.submit(_event(2)))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        table.down = False
+        await asyncio.wait_for(blocked, timeout=1)
+        await sink.stop()
+
+        assert table.ids == ["e0", "e1", "e2"]
+        assert sink.get_stats()['backpressure_waits'] >= 1
+
+    @pytest.mark.asyncio
+    async def test_unwritten_events_survive_restart(self, table, tmp_path):
+        """Test buffered and spilled events are persisted on stop and replayed in order."""
+        table.down = True
+        sink = _sink(tmp_path, batch_size=10, max_buffer_size=2)
+        await sink.start()
+        for i in range(5):
+            await sink.submit(_event(i))
+        await sink.stop()
+
+        table.down = False
+        restarted = _sink(tmp_path, batch_size=10)
+        await restarted.start()
+        assert await restarted.flush() == 5
+        await restarted.stop()
+
+        assert table.ids == [f"e{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_rejected_rows_do_not_block_queue(self, table, tmp_path):
+        """Test a row the database rejects is set aside and the rest written."""
+        table.bad_ids = {"e1"}
+        sink = _sink(tmp_path, batch_size=10)
+        for i in range(3):
+            await sink.submit(_event(i))
+
+        await sink.flush()
+        await sink.stop()
+
+        assert table.ids == ["e0", "e2"]
+        rejected = (tmp_path / "audit-rejected.jsonl").read_text().splitlines()
+        assert [json.loads(line)['id'] for line in rejected] == ["e1"]
+        assert sink.get_stats()['events_rejected'] == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_through_the_reader_engine(self, monkeypatch):
+        """Test events are written on a connection of the engine the trail is read from."""
+        driver = MagicMock()
+        driver.execute = AsyncMock()
+        raw = MagicMock(driver_connection=driver)
+        connection = MagicMock()
+        connection.get_raw_connection = AsyncMock(return_value=raw)
+        connection.close = AsyncMock()
+        engine = MagicMock()
+        engine.connect = AsyncMock(return_value=connection)
+        monkeypatch.setattr(audit_sink, 'get_engine', lambda: engine)
+
+        sink = _sink(batch_size=10)
+        await sink.submit(_event(0))
+        await sink.flush()
+        await sink.stop()
+
+        assert driver.execute.await_count == 1
+        connection.close.assert_awaited()
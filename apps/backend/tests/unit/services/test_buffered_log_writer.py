@@ -0,0 +1,173 @@
+"""
+Unit tests for the buffered write-behind log writer.
+
+Tests batching, size/interval flush triggers, bounded buffering with drop
+counters, COPY fallback, blob offloading and final flush on shutdown.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.core.response_blobs import ResponseBlobStore
+from src.services import buffered_log_writer
+from src.services.buffered_log_writer import BufferedLogWriter
+
+
+class _FakeDatabaseConnection:
+    """Stand-in for DatabaseConnection yielding a shared mock connection."""
+
+    conn = None
+
+    async def __aenter__(self):
+        return _FakeDatabaseConnection.conn
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+@pytest.fixture
+def fake_conn(monkeypatch):
+    """Patch the writer's database connection with a mock."""
+    conn = MagicMock()
+    conn.copy_records_to_table = AsyncMock()
+    conn.execute = AsyncMock()
+    conn.executemany = AsyncMock()
+    _FakeDatabaseConnection.conn = conn
+    monkeypatch.setattr(buffered_log_writer, 'DatabaseConnection', _FakeDatabaseConnection)
+    return conn
+
+
+def _make_writer(**kwargs):
+    return BufferedLogWriter(
+        "test_logs",
+        columns=["id", "payload"],
+        json_columns=["payload"],
+        **kwargs
+    )
+
+
+class TestBufferedLogWriter:
+    """Test suite for BufferedLogWriter."""
+
+    @pytest.mark.asyncio
+    async def test_flush_uses_copy_and_serializes_json(self, fake_conn):
+        """Test buffered records are written in one COPY with JSON encoded."""
+        writer = _make_writer(batch_size=10)
+        writer.submit({'id': 1, 'payload': {'a': 1}})
+        writer.submit({'id': 2, 'payload': {}})
+
+        written = await writer.flush()
+        await writer.stop()
+
+        assert written == 2
+        fake_conn.copy_records_to_table.assert_awaited_once()
+        records = fake_conn.copy_records_to_table.call_args.kwargs['records']
+        assert records == [(1, json.dumps({'a': 1})), (2, None)]
+
+    @pytest.mark.asyncio
+    async def test_size_trigger_flushes_without_waiting(self, fake_conn):
+        """Test reaching batch_size flushes before the interval elapses."""
+        writer = _make_writer(batch_size=3, flush_interval=60)
+        await writer.start()
+
+        for i in range(3):
+            writer.submit({'id': i, 'payload': None})
+        await asyncio.sleep(0.05)
+
+        assert writer.get_stats()['records_written'] == 3
+        await writer.stop()
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_drops_records(self, fake_conn):
+        """Test submit never blocks and counts drops when the buffer is full."""
+        writer = _make_writer(batch_size=100, flush_interval=60, max_buffer_size=2)
+
+        results = [writer.submit({'id': i, 'payload': None}) for i in range(5)]
+        stats = writer.get_stats()
+
+        assert results == [True, True, False, False, False]
+        assert stats['records_dropped'] == 3
+        assert stats['buffer_high_water_mark'] == 2
+        await writer.stop()
+        assert writer.get_stats()['records_written'] == 2
+
+    @pytest.mark.asyncio
+    async def test_copy_failure_falls_back_to_row_inserts(self, fake_conn):
+        """Test a failed COPY salvages good rows via per-row INSERTs."""
+        fake_conn.copy_records_to_table.side_effect = Exception("bad row")
+        fake_conn.execute.side_effect = [None, Exception("bad row"), None]
+        writer = _make_writer()
+
+        for i in range(3):
+            writer.submit({'id': i, 'payload': {'n': i}})
+        await writer.stop()
+
+        stats = writer.get_stats()
+        assert stats['copy_fallbacks'] == 1
+        assert stats['records_written'] == 2
+        assert stats['records_failed'] == 1
+        assert "$2::jsonb" in fake_conn.execute.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_remaining(self, fake_conn):
+        """Test shutdown flushes records still waiting for the interval."""
+        writer = _make_writer(batch_size=100, flush_interval=60)
+        await writer.start()
+        writer.submit({'id': 1, 'payload': None})
+
+        await writer.stop()
+
+        stats = writer.get_stats()
+        assert stats['records_written'] == 1
+        assert stats['buffered'] == 0
+        assert stats['running'] is False
+
+    @pytest.mark.asyncio
+    async def test_large_values_are_offloaded_to_blobs(self, fake_conn):
+        """Test large JSON values become shared blob references, small ones stay inline."""
+        writer = BufferedLogWriter(
+            "test_logs",
+            columns=["id", "payload", "payload_blob"],
+            json_columns=["payload"],
+            blob_columns={"payload": "payload_blob"},
+            blob_store=ResponseBlobStore(inline_threshold=100)
+        )
+        large = {'response': 'x' * 500}
+        writer.submit({'id': 1, 'payload': large})
+        writer.submit({'id': 2, 'payload': large})
+        writer.submit({'id': 3, 'payload': {'n': 1}})
+
+        await writer.flush()
+        await writer.stop()
+
+        upserts = fake_conn.executemany.call_args.args[1]
+        assert len(upserts) == 1 and upserts[0][5] == 2
+        records = fake_conn.copy_records_to_table.call_args.kwargs['records']
+        assert records[0] == (1, None, upserts[0][0])
+        assert records[1] == (2, None, upserts[0][0])
+        assert records[2] == (3, json.dumps({'n': 1}), None)
+        assert writer.get_stats()['values_offloaded'] == 2
+
+    @pytest.mark.asyncio
+    async def test_blob_failure_keeps_values_inline(self, fake_conn):
+        """Test rows keep their values when the blob write fails."""
+        fake_conn.executemany.side_effect = Exception("no table")
+        writer = BufferedLogWriter(
+            "test_logs",
+            columns=["id", "payload", "payload_blob"],
+            json_columns=["payload"],
+            blob_columns={"payload": "payload_blob"},
+            blob_store=ResponseBlobStore(inline_threshold=10)
+        )
+        writer.submit({'id': 1, 'payload': {'response': 'x' * 50}})
+
+        await writer.flush()
+        await writer.stop()
+
+        records = fake_conn.copy_records_to_table.call_args.kwargs['records']
+        assert records == [(1, json.dumps({'response': 'x' * 50}), None)]
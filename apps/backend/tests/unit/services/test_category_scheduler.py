@@ -0,0 +1,166 @@
+"""
+Unit tests for the category dependency scheduler.
+
+Tests that categories start as soon as their inputs finish, failure and
+skip propagation, bounded concurrency, cycle detection, critical-path
+reporting and the graph built for Phase 1 and Phase 2 categories.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.category_scheduler import (
+    COMPLETED,
+    FAILED,
+    SKIPPED,
+    CategoryGraphError,
+    CategoryScheduler
+)
+from src.services.provider_service import ProviderService
+
+
+def _task(log, name, delay=0.0, result="ok", error=None):
+    async def run():
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+        if error:
+            raise error
+        return result
+    return run
+
+
+class TestCategoryScheduler:
+    """Test suite for CategoryScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_dependents_start_when_their_inputs_finish(self):
+        """Test a category does not wait for unrelated slow categories."""
+        log = []
+        scheduler = CategoryScheduler()
+        scheduler.add("fast", "Fast", _task(log, "fast"))
+        scheduler.add("slow", "Slow", _task(log, "slow", delay=0.05))
+        scheduler.add("analysis", "Analysis", _task(log, "analysis"), requires={"fast"})
+        scheduler.add("summary", "Summary", _task(log, "summary"), after={"analysis", "slow"})
+
+        report = await scheduler.run()
+
+        assert log.index(("start", "analysis")) < log.index(("end", "slow"))
+        assert log.index(("start", "summary")) > log.index(("end", "slow"))
+        assert report["categories"] == {COMPLETED: ["Fast", "Slow", "Analysis", "Summary"]}
+
+    @pytest.mark.asyncio
+    async def test_failures_skip_required_dependents_only(self):
+        """Test failed requirements skip dependents transitively; ordering edges do not."""
+        log = []
+        finished = []
+        scheduler = CategoryScheduler()
+        scheduler.add("a", "A", _task(log, "a", error=RuntimeError("provider down")))
+        scheduler.add("b", "B", _task(log, "b", result=None))
+        scheduler.add("c", "C", _task(log, "c"), requires={"a"})
+        scheduler.add("d", "D", _task(log, "d"), requires={"c"})
+        scheduler.add("e", "E", _task(log, "e"), after={"a", "b"})
+
+        async def on_finish(node):
+            finished.append((node.name, node.status))
+
+        await scheduler.run(on_finish=on_finish)
+
+        assert dict(finished) == {"A": FAILED, "B": FAILED, "C": SKIPPED, "D": SKIPPED, "E": COMPLETED}
+        assert ("start", "c") not in log and ("start", "d") not in log
+        assert isinstance(scheduler.nodes["a"].error, RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_prefers_longest_chain(self):
+        """Test at most max_concurrency categories run and chain heads go first."""
+        log = []
+        running = {"now": 0, "peak": 0}
+
+        def tracked(name):
+            async def run():
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+                log.append(name)
+                await asyncio.sleep(0.01)
+                running["now"] -= 1
+                return "ok"
+            return run
+
+        scheduler = CategoryScheduler(max_concurrency=2)
+        for name in ["x1", "x2", "x3", "head"]:
+            scheduler.add(name, name, tracked(name))
+        scheduler.add("mid", "mid", tracked("mid"), requires={"head"})
+        scheduler.add("tail", "tail", tracked("tail"), requires={"mid"})
+
+        await scheduler.run()
+
+        assert running["peak"] == 2
+        assert log[0] == "head"
+
+    @pytest.mark.asyncio
+    async def test_cycles_rejected_and_unknown_dependencies_ignored(self):
+        """Test cyclic graphs raise and edges to absent categories are dropped."""
+        scheduler = CategoryScheduler()
+        scheduler.add("a", "A", _task([], "a"), requires={"b"})
+        scheduler.add("b", "B", _task([], "b"), requires={"a"})
+        with pytest.raises(CategoryGraphError, match="A, B"):
+            await scheduler.run()
+
+        scheduler = CategoryScheduler()
+        scheduler.add("a", "A", _task([], "a"), requires={"disabled"})
+        await scheduler.run()
+        assert scheduler.nodes["a"].status == COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_critical_path_report(self):
+        """Test the report follows the last dependency to finish."""
+        scheduler = CategoryScheduler()
+        scheduler.mark_resumed("stored", "Stored")
+        scheduler.add("short", "Short", _task([], "short"))
+        scheduler.add("long", "Long", _task([], "long", delay=0.03))
+        scheduler.add("final", "Final", _task([], "final"), after={"short", "long", "stored"})
+
+        report = await scheduler.run()
+
+        assert [step["name"] for step in report["critical_path"]] == ["Long", "Final"]
+        assert report["critical_path"][0]["duration"] >= 0.03
+        assert report["wall_time"] >= report["critical_path"][0]["duration"]
+        assert report["categories"]["resumed"] == ["Stored"]
+
+
+class TestProviderCategorySchedule:
+    """Test suite for the Phase 1 / Phase 2 graph built by ProviderService."""
+
+    def _schedule(self, declared):
+        service = ProviderService.__new__(ProviderService)
+
+        async def passthrough(task):
+            return await task
+
+        phase1 = [{"id": 1, "name": "Market Overview"}, {"id": 2, "name": "Pharmacokinetics"}]
+        phase2 = [{"id": 11, "name": "Parameter-Based Scoring Matrix"}, {"id": 12, "name": "Risk Assessment Analysis"}]
+        return service._build_category_schedule(
+            phase1, phase2, [{"id": 3, "name": "Safety"}], declared,
+            "aspirin", "r1", False, None, passthrough
+        )
+
+    def test_phase_order_without_declared_dependencies(self):
+        """Test undeclared Phase 2 categories wait for Phase 1 and require the scoring matrix."""
+        scheduler = self._schedule({})
+
+        scoring, risk = scheduler.nodes[11], scheduler.nodes[12]
+        assert scoring.after == {1, 2, 3} and scoring.requires == set()
+        assert risk.after == {1, 2, 3} and risk.requires == {11}
+        assert scheduler.nodes[3].status == "resumed"
+
+    def test_declared_dependencies_replace_phase_order(self):
+        """Test declared inputs let a Phase 2 category start before the rest of Phase 1."""
+        scheduler = self._schedule({12: [2]})
+
+        assert scheduler.nodes[12].requires == {2}
+        assert scheduler.nodes[12].after == set()
+        assert scheduler.nodes[11].after == {1, 2, 3}
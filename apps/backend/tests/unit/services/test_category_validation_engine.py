@@ -0,0 +1,322 @@
+"""
+Unit tests for CategoryValidationEngine table parsing.
+
+Tests that incremental (streamed) table conversion matches one-pass parsing
+and that the precompiled row source classifier matches the original
+per-call implementation, and the concurrent, batched per-source validation.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import os
+import re
+import time
+
+import pytest
+
+from src.services import category_validation_engine as engine_module
+from src.services.category_validation_engine import (
+    CategoryValidationEngine,
+    RowSourceClassifier,
+    StreamingTableParser,
+)
+
+
+BENCHMARKS_ENABLED = os.getenv('RUN_BENCHMARKS', 'false').lower() == 'true'
+BENCHMARK_SKIP_MESSAGE = "Timing benchmarks disabled. Set RUN_BENCHMARKS=true to enable."
+
+CONTENT = """Intro text
+| Region | Market Size | Source |
+|---|---|---|
+| Global | USD 4.2B | [Priority 2: FDA, Jan 2025] (https://fda.gov) |
+| Europe | USD 1.1B | N/A |
+
+| Year | CAGR |
+|:--|--:|
+| 2025 | 6.7% (2024) |
+trailing"""
+
+ROWS = [
+    ["Global", "USD 4.2B", "[Priority 2: FDA, Jan 2025]"],
+    ["US", "USD 2B", "[PRIORITY 9: Internal estimate]"],
+    ["EU", "1.1B", "EMA assessment report"],
+    ["Japan", "0.4B", "Cortellis"],
+    ["Trial", "Phase 3", "Journal of Oncology"],
+    ["Sales", "USD 3B", "Company press release"],
+    ["Share", "12%", "Reuters news"],
+    ["Growth", "6.7%", "Smith et al. (2024)"],
+    ["Pipeline", "4 assets", "https://example.org/pipeline"],
+    ["Cohort", "n=120", "study 2023"],
+    ["Price", "USD 900", "N/A"],
+    ["", "", ""],
+]
+
+
+def legacy_validate_row_source(row_cells):
+    """Original per-call implementation, kept as the reference behaviour."""
+    source_priorities = {
+        'PAID_APIS': 1, 'GOVERNMENT': 2, 'PEER_REVIEWED': 3,
+        'INDUSTRY': 4, 'COMPANY': 5, 'NEWS': 6
+    }
+    source_keywords = {
+        'PAID_APIS': ['pharmacircle', 'globaldata', 'evaluate pharma', 'cortellis', 'iqvia'],
+        'GOVERNMENT': ['.gov', '.edu', 'fda', 'ema', 'pmda', 'clinicaltrials', 'government'],
+        'PEER_REVIEWED': ['pubmed', 'doi:', 'pmid:', 'journal', 'peer-reviewed'],
+        'INDUSTRY': ['association', 'white paper', 'industry report'],
+        'COMPANY': ['press release', 'corporate', 'company website'],
+        'NEWS': ['news', 'report', 'article']
+    }
+    row_text = ' '.join(row_cells).lower()
+
+    priority_match = re.search(r'\[priority\s+(\d+):\s*([^\]]+)\]', row_text, re.IGNORECASE)
+    if priority_match:
+        priority_num = int(priority_match.group(1))
+        source_type = None
+        for stype, prio in source_priorities.items():
+            if prio == priority_num:
+                source_type = stype
+                break
+        return {
+            'has_source': True,
+            'priority': priority_num,
+            'source_type': source_type or 'UNKNOWN',
+            'source_name': priority_match.group(2).strip()
+        }
+
+    for source_type, keywords in source_keywords.items():
+        for keyword in keywords:
+            if keyword in row_text:
+                return {
+                    'has_source': True,
+                    'priority': source_priorities[source_type],
+                    'source_type': source_type,
+                    'source_name': f'Detected: {keyword}'
+                }
+
+    for pattern in [r'\(\d{4}\)', r'https?://', r'\d{4}\s+report', r'study\s+\d{4}']:
+        if re.search(pattern, row_text):
+            return {
+                'has_source': True,
+                'priority': 6,
+                'source_type': 'GENERIC_CITATION',
+                'source_name': 'Generic citation found'
+            }
+
+    return {
+        'has_source': False,
+        'priority': None,
+        'source_type': None,
+        'reason': 'No source citation detected'
+    }
+
+
+class TestStreamingTableParser:
+    """Test suite for incremental markdown table parsing."""
+
+    def test_rows_emitted_when_line_completes(self):
+        """Test a row is only emitted once its newline arrives."""
+        parser = StreamingTableParser()
+
+        assert parser.feed("| a | b |\n|---|---|\n| 1 | 2") == []
+        rows = parser.feed(" |\n")
+
+        assert [cells for _, cells in rows] == [["1", "2"]]
+        assert parser.tables == [{"headers": ["a", "b"], "rows": [["1", "2"]]}]
+
+    def test_matches_one_pass_parse_for_any_chunking(self):
+        """Test chunk boundaries never change the parsed tables."""
+        engine = CategoryValidationEngine()
+        expected = engine._parse_markdown_tables(CONTENT)
+
+        assert len(expected) == 2
+        for size in (1, 3, 7, 64):
+            parser = StreamingTableParser()
+            for start in range(0, len(CONTENT), size):
+                parser.feed(CONTENT[start:start + size])
+            parser.close()
+            assert parser.tables == expected
+
+
+class TestStreamingTableConverter:
+    """Test suite for incremental table-to-JSON conversion."""
+
+    def test_streamed_conversion_matches_buffered(self):
+        """Test row validation done during streaming equals the buffered conversion."""
+        engine = CategoryValidationEngine()
+        converter = engine.start_table_conversion()
+        for start in range(0, len(CONTENT), 5):
+            converter.feed(CONTENT[start:start + 5])
+
+        tables_json = converter.close()
+
+        assert tables_json == engine._convert_tables_to_json_with_validation(CONTENT)
+        assert converter.content == CONTENT
+        assert tables_json[0]["total_rows"] == 2
+        assert tables_json[0]["validated_rows"] == 1
+        assert tables_json[1]["rows"][0]["validation"]["status"] == "PASS"
+
+
+class TestRowSourceClassifier:
+    """Test suite for the precompiled row source classifier."""
+
+    def test_matches_legacy_classification(self):
+        """Test every row classifies exactly as the original implementation."""
+        classifier = RowSourceClassifier()
+
+        for row in ROWS:
+            assert classifier.classify(row) == legacy_validate_row_source(row)
+
+    def test_results_are_not_shared(self):
+        """Test callers may mutate a result without affecting later rows."""
+        classifier = RowSourceClassifier()
+        classifier.classify(["Cortellis"])['source_name'] = 'changed'
+
+        assert classifier.classify(["Cortellis"])['source_name'] == 'Detected: cortellis'
+
+    @pytest.mark.benchmark
+    @pytest.mark.skipif(not BENCHMARKS_ENABLED, reason=BENCHMARK_SKIP_MESSAGE)
+    def test_faster_than_legacy(self):
+        """Microbenchmark: the precompiled classifier beats per-call setup."""
+        classifier = RowSourceClassifier()
+        rows = ROWS * 200
+
+        start = time.perf_counter()
+        for row in rows:
+            legacy_validate_row_source(row)
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for row in rows:
+            classifier.classify(row)
+        classifier_seconds = time.perf_counter() - start
+
+        assert classifier_seconds < legacy_seconds
+
+
+class TestTableDetection:
+    """Test suite for single-pass table detection."""
+
+    def test_detection_formats(self):
+        """Test markdown, pipe and tab tables are detected from the shared scan."""
+        engine = CategoryValidationEngine()
+
+        assert engine._detect_text_tables(CONTENT) == {'has_tables': True, 'count': 3, 'format': 'markdown'}
+        assert engine._detect_text_tables("| a | b |\n| c | d |\n| e | f |")['format'] == 'pipe-separated'
+        assert engine._detect_text_tables("a\tb\tc\nd\te\tf")['format'] == 'tab-separated'
+        assert engine._detect_text_tables("plain text")['has_tables'] is False
+        assert engine._detect_text_tables("")['has_tables'] is False
+
+
+class FakeConnection:
+    """Records statements instead of talking to Postgres."""
+
+    def __init__(self, log):
+        self.log = log
+
+    def transaction(self):
+        log = self.log
+
+        class Transaction:
+            async def __aenter__(self):
+                log.append(('begin',))
+
+            async def __aexit__(self, *exc):
+                log.append(('commit',))
+
+        return Transaction()
+
+    async def executemany(self, query, args):
+        self.log.append(('executemany', query, list(args)))
+
+    async def execute(self, query, *args):
+        self.log.append(('execute', query, args))
+
+    async def close(self):
+        self.log.append(('close',))
+
+
+class FakeEngine(CategoryValidationEngine):
+    """Engine with a fixed schema and a recording connection."""
+
+    def __init__(self):
+        super().__init__()
+        self.log = []
+        self.schema_lookups = 0
+
+    async def get_validation_schema(self, category_id):
+        self.schema_lookups += 1
+        return {'schema_id': 'schema-1', 'config': {}}
+
+    async def _get_connection(self):
+        return FakeConnection(self.log)
+
+
+class TestSourceValidationFanOut:
+    """Test suite for concurrent per-source validation."""
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_source_order(self):
+        """Test at most `concurrency` sources convert at once and results keep source order."""
+        engine = FakeEngine()
+        running = 0
+        peak = 0
+        convert = engine.convert_tables_offloaded
+
+        async def tracked(content):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return await convert(content)
+
+        engine.convert_tables_offloaded = tracked
+        sources = [{'provider': f'p{i}', 'response': CONTENT} for i in range(6)]
+
+        results = await engine.validate_source_responses('cr-1', 1, sources, concurrency=2, store=False)
+
+        assert peak == 2
+        assert [r['provider'] for r in results] == [f'p{i}' for i in range(6)]
+        assert results[0]['tables_json'] == engine._convert_tables_to_json_with_validation(CONTENT)
+        assert engine.schema_lookups == 1
+        assert engine.log == []
+
+    @pytest.mark.asyncio
+    async def test_one_batched_write_per_category(self):
+        """Test source rows and the category result are written in one transaction."""
+        engine = FakeEngine()
+        sources = [{'provider': 'a', 'response': CONTENT}, {'provider': 'b', 'tables_json': []}]
+        source_validations = await engine.validate_source_responses('cr-1', 1, sources, store=False)
+        validation_result = engine._create_default_validation_result('cr-1', 'r', 'm')
+        validation_result['validation_schema_id'] = 'schema-1'
+
+        await engine.store_validations(source_validations, validation_result)
+
+        assert [entry[0] for entry in engine.log] == ['begin', 'executemany', 'execute', 'commit', 'close']
+        assert len(engine.log[1][2]) == 2
+
+    @pytest.mark.asyncio
+    async def test_defaults_are_not_stored(self):
+        """Test no-schema defaults never reach the database."""
+        engine = FakeEngine()
+        default_source = engine._create_source_validation_default('cr-1', {}, 0, 'no_schema')
+        default_result = engine._create_default_validation_result('cr-1', 'no_schema', 'm')
+
+        await engine.store_validations([default_source], default_result)
+
+        assert engine.log == []
+
+    @pytest.mark.asyncio
+    async def test_process_pool_matches_inline(self, monkeypatch):
+        """Test conversion offloaded to the process pool equals inline conversion."""
+        monkeypatch.setattr(engine_module, 'TABLE_PARSE_PROCESSES', 1)
+        monkeypatch.setattr(engine_module, 'TABLE_PARSE_OFFLOAD_MIN_CHARS', 0)
+        engine = CategoryValidationEngine()
+        try:
+            offloaded = await engine.convert_tables_offloaded(CONTENT)
+        finally:
+            engine_module.shutdown_table_parse_pool()
+
+        assert offloaded == engine._convert_tables_to_json_with_validation(CONTENT)
@@ -0,0 +1,126 @@
+"""
+Unit tests for the drug processing worker.
+
+Tests that queued jobs are processed with bounded concurrency, retried on
+failure and marked failed once attempts run out.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import pytest
+
+from src.core.message_queue import SQLiteMessageQueue
+from src.services.drug_processing_worker import (
+    DRUG_PROCESSING_QUEUE,
+    DrugProcessingWorker,
+    enqueue_drug_processing,
+)
+
+
+class _FakeProcessingService:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.calls = []
+        self.failed = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def process(self, request_id: str, bypass_cache: bool = False):
+        self.calls.append((request_id, bypass_cache))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("provider outage")
+        finally:
+            self.in_flight -= 1
+
+    async def mark_failed(self, request_id: str, error: str):
+        self.failed.append(request_id)
+
+
+async def _wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met"
+        await asyncio.sleep(0.01)
+
+
+class TestDrugProcessingWorker:
+    """Test suite for DrugProcessingWorker."""
+
+    @pytest.mark.asyncio
+    async def test_processes_jobs_with_bounded_concurrency(self):
+        """Test every queued request is processed once, at most `concurrency` at a time."""
+        queue = SQLiteMessageQueue(":memory:")
+        service = _FakeProcessingService()
+        worker = DrugProcessingWorker(queue, service, concurrency=2, poll_interval=0.01)
+        await worker.start()
+
+        for index in range(5):
+            await enqueue_drug_processing(queue, f"req-{index}", bypass_cache=index == 0)
+
+        await _wait_for(lambda: worker.stats["processed"] == 5)
+        await worker.stop()
+
+        assert sorted(call[0] for call in service.calls) == [f"req-{index}" for index in range(5)]
+        assert ("req-0", True) in service.calls
+        assert service.peak == 2
+        assert await queue.get_work_queue_stats(DRUG_PROCESSING_QUEUE) == {"done": 5}
+
+    @pytest.mark.asyncio
+    async def test_failed_job_is_retried(self):
+        """Test a transient failure is retried and then succeeds."""
+        queue = SQLiteMessageQueue(":memory:")
+        service = _FakeProcessingService(failures=1)
+        worker = DrugProcessingWorker(queue, service, concurrency=1, max_attempts=3, poll_interval=0.01)
+        await worker.start()
+
+        await enqueue_drug_processing(queue, "req-1")
+
+        await _wait_for(lambda: worker.stats["processed"] == 1)
+        await worker.stop()
+
+        assert len(service.calls) == 2
+        assert worker.stats["retried"] == 1
+        assert service.failed == []
+
+    @pytest.mark.asyncio
+    async def test_exhausted_job_marks_request_failed(self):
+        """Test the request is marked failed after the last attempt."""
+        queue = SQLiteMessageQueue(":memory:")
+        service = _FakeProcessingService(failures=5)
+        worker = DrugProcessingWorker(queue, service, concurrency=1, max_attempts=2, poll_interval=0.01)
+        await worker.start()
+
+        await enqueue_drug_processing(queue, "req-1")
+
+        await _wait_for(lambda: worker.stats["failed"] == 1)
+        await worker.stop()
+
+        assert len(service.calls) == 2
+        assert service.failed == ["req-1"]
+        assert await queue.get_work_queue_stats(DRUG_PROCESSING_QUEUE) == {"dead": 1}
+
+    @pytest.mark.asyncio
+    async def test_expired_final_lease_marks_request_failed(self):
+        """Test a job whose worker died on the last attempt still fails its request."""
+        queue = SQLiteMessageQueue(":memory:")
+        await queue.declare_work_queue(DRUG_PROCESSING_QUEUE, visibility_timeout=0.05, max_attempts=1)
+        await enqueue_drug_processing(queue, "req-1")
+        await queue.reserve_work(DRUG_PROCESSING_QUEUE)  # held by a worker that dies
+        await asyncio.sleep(0.1)
+
+        service = _FakeProcessingService()
+        worker = DrugProcessingWorker(queue, service, concurrency=1, max_attempts=1, poll_interval=0.01)
+        await worker.start()
+        await _wait_for(lambda: worker.stats["failed"] == 1)
+        await worker.stop()
+
+        assert service.calls == []
+        assert service.failed == ["req-1"]
+        assert await queue.get_work_queue_stats(DRUG_PROCESSING_QUEUE) == {"dead": 1}
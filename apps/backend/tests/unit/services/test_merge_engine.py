@@ -0,0 +1,230 @@
+"""
+Unit tests for the map-reduce merge engine.
+
+Tests token-budgeted splitting and grouping, parallel map and reduce
+stages, chunk caching across re-runs, per-stage accounting and the
+reduction of chunked structured extractions.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import re
+
+import pytest
+
+from src.integrations.response_cache import ResponseCache
+from src.services.llm_merger_service import LLMMergerService
+from src.services.merge_engine import (
+    MergeEngine,
+    count_tokens,
+    merge_structured,
+    plan_groups,
+    split_text
+)
+
+
+def _render(texts):
+    return "Merge these sources:\n" + "\n---\n".join(texts)
+
+
+def _source(index, padding=300):
+    """A provider response: a few facts buried in filler paragraphs."""
+    paragraphs = []
+    for fact in range(index * 3, index * 3 + 3):
+        paragraphs.append(f"fact{fact} " + "filler " * padding)
+    return "\n\n".join(paragraphs)
+
+
+class FakeLLM:
+    """Merges by keeping the facts of its prompt, dropping the filler."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def __call__(self, prompt):
+        self.prompts.append(prompt)
+        facts = sorted(set(re.findall(r"fact\d+", prompt)), key=lambda f: int(f[4:]))
+        return {
+            "merged_content": " ".join(facts),
+            "conflicts_resolved": [{"field": "facts", "resolution": str(len(facts))}],
+            "key_findings": facts[:1]
+        }, 100
+
+
+def _engine(llm, cache=None, chunk_tokens=1000):
+    return MergeEngine(
+        complete=llm,
+        cache_key=lambda prompt: ResponseCache.make_key("openai", "test", 1, prompt),
+        chunk_tokens=chunk_tokens,
+        cache=cache,
+        category="Market Overview",
+        model="test"
+    )
+
+
+class TestChunking:
+    """Test suite for splitting and grouping."""
+
+    def test_split_respects_budget_and_keeps_content(self):
+        """Test pieces fit the budget, break at paragraphs and lose no words."""
+        text = _source(0)
+
+        pieces = split_text(text, 600)
+
+        assert len(pieces) == 3
+        assert all(count_tokens(piece) <= 600 for piece in pieces)
+        assert [piece.split()[0] for piece in pieces] == ["fact0", "fact1", "fact2"]
+        assert sum(len(piece.split()) for piece in pieces) == len(text.split())
+
+    def test_unbroken_text_is_cut_by_length(self):
+        """Test text without boundaries is still split within budget."""
+        pieces = split_text("x" * 5000, 100)
+
+        assert "".join(pieces) == "x" * 5000
+        assert all(count_tokens(piece) <= 100 for piece in pieces)
+
+    def test_groups_fit_budget(self):
+        """Test everything that fits goes in one group, otherwise groups stay in budget."""
+        small = ["a" * 40, "b" * 40, "c" * 40]
+        assert plan_groups(small, 100) == [small]
+
+        pieces = [f"piece {i} " + "y" * 300 for i in range(12)]
+        groups = plan_groups(pieces, 250)
+
+        assert [piece for group in groups for piece in group] == pieces
+        assert all(sum(count_tokens(piece) for piece in group) <= 250 for group in groups)
+
+    def test_edit_only_regroups_around_it(self):
+        """Test editing one piece changes only the groups next to it."""
+        pieces = [f"piece {i} " + "y" * 300 for i in range(12)]
+        edited = list(pieces)
+        edited[8] = "piece 8 edited " + "z" * 280
+
+        before, after = plan_groups(pieces, 250), plan_groups(edited, 250)
+        changed = [group for group in after if group not in before]
+
+        assert len(changed) <= 2
+        assert before[-1] == after[-1]
+
+
+class TestMapReduce:
+    """Test suite for MergeEngine.map_reduce."""
+
+    @pytest.mark.asyncio
+    async def test_small_input_is_one_call(self):
+        """Test sources that fit one prompt are merged in a single call."""
+        llm = FakeLLM()
+        engine = _engine(llm, chunk_tokens=4000)
+
+        result = await engine.map_reduce(["fact1 short", "fact2 short"], _render)
+
+        assert result["merged_content"] == "fact1 fact2"
+        assert len(llm.prompts) == 1
+        assert engine.report()["stages"].keys() == {"merge"}
+
+    @pytest.mark.asyncio
+    async def test_large_input_maps_then_reduces(self):
+        """Test large inputs are merged in budgeted chunks without losing data."""
+        llm = FakeLLM()
+        engine = _engine(llm)
+        sources = [_source(i) for i in range(5)]
+
+        result = await engine.map_reduce(sources, _render)
+
+        assert result["merged_content"] == " ".join(f"fact{i}" for i in range(15))
+        assert all(count_tokens(prompt) <= 1000 for prompt in llm.prompts)
+        report = engine.report()
+        assert report["stages"]["map"]["calls"] == report["chunks"] > 1
+        assert report["stages"]["reduce"]["calls"] >= 1
+        assert report["tokens_used"] == 100 * len(llm.prompts)
+        assert report["stages"]["map"]["prompt_tokens"] > 0
+        # Partial conflicts and findings are kept alongside the final ones
+        assert len(result["conflicts_resolved"]) > 1
+        assert "fact0" in result["key_findings"]
+
+    @pytest.mark.asyncio
+    async def test_rerun_only_remerges_changed_chunks(self):
+        """Test cached chunk results are reused when their content is unchanged."""
+        cache = ResponseCache(durable=False)
+        sources = [_source(i) for i in range(5)]
+        first = _engine(FakeLLM(), cache=cache)
+        await first.map_reduce(sources, _render)
+        map_calls = first.report()["stages"]["map"]["calls"]
+
+        sources[4] = _source(4).replace("fact14", "fact99")
+        llm = FakeLLM()
+        second = _engine(llm, cache=cache)
+        result = await second.map_reduce(sources, _render)
+
+        assert "fact99" in result["merged_content"]
+        stats = second.report()["stages"]["map"]
+        assert stats["cache_hits"] >= map_calls - 2
+        assert stats["calls"] - stats["cache_hits"] <= 2
+
+    @pytest.mark.asyncio
+    async def test_failed_partial_carries_sources_forward(self):
+        """Test a failed map call does not drop its group's data."""
+        llm = FakeLLM()
+        calls = {"n": 0}
+
+        async def flaky(prompt):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise RuntimeError("provider error")
+            return await llm(prompt)
+
+        engine = _engine(flaky)
+        result = await engine.map_reduce([_source(i) for i in range(3)], _render)
+
+        assert result["merged_content"] == " ".join(f"fact{i}" for i in range(9))
+
+
+class TestStructuredReduce:
+    """Test suite for combining chunked structured extractions."""
+
+    def test_rows_union_and_prefer_available_values(self):
+        """Test rows with the same identity are combined, not duplicated."""
+        parts = [
+            {"parameters": [
+                {"parameter": "Molecular Weight", "value": "180.16", "unit": "Da"},
+                {"parameter": "Melting Point", "value": "Not available", "unit": "°C"}
+            ]},
+            {"parameters": [
+                {"parameter": "Melting Point", "value": "135", "unit": "°C"},
+                {"parameter": "pKa", "value": "3.5", "unit": ""}
+            ]}
+        ]
+
+        merged = merge_structured(parts)
+
+        assert merged["parameters"] == [
+            {"parameter": "Molecular Weight", "value": "180.16", "unit": "Da"},
+            {"parameter": "Melting Point", "value": "135", "unit": "°C"},
+            {"parameter": "pKa", "value": "3.5", "unit": ""}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_long_content_extracted_in_chunks(self):
+        """Test extraction covers content beyond one prompt instead of truncating it."""
+        service = LLMMergerService.__new__(LLMMergerService)
+        service.model = "gpt-5-nano"
+        service.temperature = 1
+        service.response_cache = ResponseCache(durable=False)
+        service.extract_chunk_tokens = 1200
+        service.max_parallel = 4
+        prompts = []
+
+        async def complete(system_prompt, prompt, request_id=None):
+            prompts.append(prompt)
+            found = re.findall(r"Region(\w+) market", prompt)
+            return {"current": [{"region": name, "market_size_usd": "$1 billion"} for name in found]}, 50
+
+        service._complete_json = complete
+        content = "\n\n".join(f"Region{name} market is $1 billion. " + "detail " * 200
+                              for name in ["Alpha", "Beta", "Gamma", "Delta"])
+
+        data = await service.extract_structured_data(content, "Market Overview")
+
+        assert len(prompts) > 1
+        assert [row["region"] for row in data["current"]] == ["Alpha", "Beta", "Gamma", "Delta"]
@@ -0,0 +1,168 @@
+"""
+Unit tests for the request-scoped Phase 1 snapshot.
+
+Tests context rendering for the Phase 2 services, immutability, the final
+output category view and shared, bounded snapshot builds.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.services.phase1_snapshot import (
+    ANALYSIS_CONTEXT,
+    SCORING_CONTEXT,
+    Phase1Snapshot,
+    Phase1SnapshotCache,
+    render_phase1_context
+)
+from src.services.phase2_analysis_service import Phase2AnalysisService
+from src.services.phase2_scoring_service import Phase2ScoringService
+
+
+def _row(name, summary, structured=None, merged=True):
+    return {
+        'category_name': name,
+        'summary': summary,
+        'confidence_score': 0.8,
+        'structured_data': json.dumps(structured) if structured is not None else None,
+        'merged_content': "merged" if merged else None,
+        'has_merged_data': merged
+    }
+
+
+ROWS = [
+    _row("Market Overview", "m" * 2500, {"market_size": "1B", "summary": "ignored"}),
+    _row("Pharmacokinetics", "pk " * 10, {"half_life": [1, 2]}),
+    _row("Safety", "s" * 1200, merged=False),
+    _row("Empty", ""),
+]
+
+
+class TestContextRendering:
+    """Test suite for Phase 1 context rendering."""
+
+    def test_scoring_profile(self):
+        """Test priority categories are kept whole and others truncated to 500 chars."""
+        snapshot = Phase1Snapshot("r1", ROWS)
+
+        assert snapshot.context(SCORING_CONTEXT) == "\n".join([
+            f"## Pharmacokinetics\n{'pk ' * 10}\n",
+            f"## Market Overview\n{'m' * 500}\n",
+            f"## Safety\n{'s' * 500}\n",
+        ])
+
+    def test_analysis_profile(self):
+        """Test priority order, 2000/1000 char truncation and token estimates."""
+        snapshot = Phase1Snapshot("r1", ROWS)
+        context = snapshot.context(ANALYSIS_CONTEXT)
+
+        assert context.startswith(f"### Market Overview\n\n{'m' * 2000}\n\n### Pharmacokinetics\n\n")
+        assert context.endswith(f"### Safety\n\n{'s' * 1000}\n")
+        assert snapshot.context_tokens(ANALYSIS_CONTEXT) == len(context) // 4
+
+    def test_services_read_snapshot_or_dict(self):
+        """Test both services render plain dicts the same as snapshots."""
+        snapshot = Phase1Snapshot("r1", ROWS)
+        plain = {name: dict(data) for name, data in snapshot.items()}
+
+        assert Phase2ScoringService._prepare_phase1_context(None, snapshot) == \
+            render_phase1_context(plain, SCORING_CONTEXT)
+        assert Phase2AnalysisService._prepare_phase1_context(None, plain) == \
+            snapshot.context(ANALYSIS_CONTEXT)
+
+
+class TestPhase1Snapshot:
+    """Test suite for Phase1Snapshot."""
+
+    def test_read_only(self):
+        """Test the snapshot and its nested data cannot be modified."""
+        snapshot = Phase1Snapshot("r1", ROWS)
+
+        with pytest.raises(AttributeError):
+            snapshot.request_id = "r2"
+        with pytest.raises(TypeError):
+            snapshot["Safety"]["summary"] = "changed"
+        assert snapshot["Pharmacokinetics"]["structured_data"]["half_life"] == (1, 2)
+
+    def test_output_categories(self):
+        """Test the final output view covers merged categories with the LLM summary."""
+        snapshot = Phase1Snapshot("r1", ROWS)
+        categories = snapshot.output_categories()
+
+        assert list(categories) == ["Market Overview", "Pharmacokinetics", "Empty"]
+        assert categories["Market Overview"] == {"market_size": "1B", "summary": "m" * 2500}
+        categories["Pharmacokinetics"]["half_life"].append(3)
+        assert snapshot.output_categories()["Pharmacokinetics"]["half_life"] == [1, 2]
+
+
+class TestPhase1SnapshotCache:
+    """Test suite for Phase1SnapshotCache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_readers_share_one_build(self, monkeypatch):
+        """Test Phase 2 categories starting together trigger one query."""
+        cache = Phase1SnapshotCache(ttl=60)
+        loads = []
+
+        async def load(request_id):
+            loads.append(request_id)
+            await asyncio.sleep(0.01)
+            return Phase1Snapshot(request_id, ROWS)
+
+        monkeypatch.setattr(cache, "_load", load)
+
+        snapshots = await asyncio.gather(*[cache.get("r1") for _ in range(7)])
+        assert await cache.get("r1") is snapshots[0]
+
+        assert loads == ["r1"]
+        assert all(s is snapshots[0] for s in snapshots)
+        assert cache.get_stats()["shared_builds"] == 6
+
+        await cache.build("r1")
+        assert loads == ["r1", "r1"]
+
+    @pytest.mark.asyncio
+    async def test_bounded_and_empty_not_cached(self, monkeypatch):
+        """Test old requests are evicted and missing Phase 1 data is re-read."""
+        cache = Phase1SnapshotCache(ttl=60, max_entries=2)
+        loads = []
+
+        async def load(request_id):
+            loads.append(request_id)
+            return Phase1Snapshot(request_id, [] if request_id == "pending" else ROWS)
+
+        monkeypatch.setattr(cache, "_load", load)
+
+        for request_id in ["r1", "r2", "r3", "pending", "pending"]:
+            await cache.get(request_id)
+
+        assert loads == ["r1", "r2", "r3", "pending", "pending"]
+        assert cache.get_stats()["entries"] == 2
+        assert cache.get_stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_discard_during_build_is_not_cached(self, monkeypatch):
+        """Test a build overtaken by a newer Phase 1 result is not kept."""
+        cache = Phase1SnapshotCache(ttl=60)
+        loads = []
+
+        async def load(request_id):
+            loads.append(request_id)
+            await asyncio.sleep(0.01)
+            return Phase1Snapshot(request_id, ROWS)
+
+        monkeypatch.setattr(cache, "_load", load)
+
+        stale = asyncio.create_task(cache.get("r1"))
+        await asyncio.sleep(0)
+        cache.discard("r1")
+        fresh = await cache.get("r1")
+
+        assert (await stale) is not fresh
+        assert await cache.get("r1") is fresh
+        assert len(loads) == 2
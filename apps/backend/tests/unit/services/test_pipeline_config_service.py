@@ -0,0 +1,155 @@
+"""
+Unit tests for the cached pipeline configuration service.
+
+Tests that stage, Phase 2 and dependency lookups are served from a shared snapshot,
+that concurrent reloads are coalesced, and that updates and TTL expiry
+invalidate the snapshot.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.services import pipeline_config_service
+from src.services.pipeline_config_service import PipelineConfigService
+
+STAGE_ROWS = [
+    {'stage_name': 'data_collection', 'stage_order': 1, 'enabled': True,
+     'description': 'Collect', 'progress_weight': 40},
+    {'stage_name': 'verification', 'stage_order': 2, 'enabled': False,
+     'description': 'Verify', 'progress_weight': 20},
+    {'stage_name': 'merging', 'stage_order': 3, 'enabled': True,
+     'description': 'Merge', 'progress_weight': 20},
+]
+
+CATEGORY_ROWS = [
+    {'id': 11, 'name': 'Parameter-Based Scoring Matrix', 'display_order': 11,
+     'is_active': True, 'description': None},
+    {'id': 12, 'name': 'Risk Assessment Analysis', 'display_order': 13,
+     'is_active': False, 'description': 'Risk'},
+]
+
+DEPENDENCY_ROWS = [
+    {'dependent_category_id': 12, 'required_category_id': 2},
+    {'dependent_category_id': 12, 'required_category_id': 11},
+]
+
+
+class _FakeDatabaseConnection:
+    """Stand-in for DatabaseConnection yielding a shared mock connection."""
+
+    conn = None
+
+    async def __aenter__(self):
+        return _FakeDatabaseConnection.conn
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+@pytest.fixture
+def fake_conn(monkeypatch):
+    """Patch the database connection and reset the shared snapshot."""
+    async def fetch(query, *args):
+        await asyncio.sleep(0)
+        if 'pipeline_stages' in query:
+            return STAGE_ROWS
+        return DEPENDENCY_ROWS if 'category_dependencies' in query else CATEGORY_ROWS
+
+    conn = MagicMock()
+    conn.fetch = AsyncMock(side_effect=fetch)
+    conn.execute = AsyncMock(return_value="UPDATE 1")
+    _FakeDatabaseConnection.conn = conn
+    monkeypatch.setattr(pipeline_config_service, 'DatabaseConnection', _FakeDatabaseConnection)
+    monkeypatch.setattr(pipeline_config_service, '_snapshot', None)
+    monkeypatch.setattr(pipeline_config_service, '_snapshot_lock', None)
+    monkeypatch.setattr(pipeline_config_service, '_snapshot_loop', None)
+    return conn
+
+
+class TestPipelineConfigService:
+    """Test suite for PipelineConfigService snapshot caching."""
+
+    @pytest.mark.asyncio
+    async def test_lookups_share_one_snapshot(self, fake_conn):
+        """Test concurrent lookups across instances load configuration once."""
+        results = await asyncio.gather(*[
+            PipelineConfigService().is_stage_enabled('data_collection') for _ in range(10)
+        ])
+
+        assert all(results)
+        assert fake_conn.fetch.await_count == 3  # stages + Phase 2 categories + dependencies
+        assert await PipelineConfigService().is_stage_enabled('verification') is False
+        assert await PipelineConfigService().is_stage_enabled('unknown') is False
+        assert fake_conn.fetch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_phase2_lookups(self, fake_conn):
+        """Test Phase 2 category listing and active-category checks."""
+        service = PipelineConfigService()
+
+        categories = await service.get_phase2_categories()
+
+        assert [c['id'] for c in categories] == [11, 12]
+        assert categories[0]['description'] == 'Phase 2 category: Parameter-Based Scoring Matrix'
+        assert await service.is_phase2_category('Parameter-Based Scoring Matrix')
+        assert not await service.is_phase2_category('Risk Assessment Analysis')
+
+    @pytest.mark.asyncio
+    async def test_category_dependencies_from_snapshot(self, fake_conn):
+        """Test declared dependencies are served from the shared snapshot."""
+        service = PipelineConfigService()
+
+        dependencies = await service.get_category_dependencies()
+        dependencies[12].append(99)  # callers get a copy
+
+        assert await service.get_category_dependencies() == {12: [2, 11]}
+        assert await service.is_stage_enabled('data_collection')
+        assert fake_conn.fetch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates_and_notifies(self, fake_conn):
+        """Test updates invalidate the snapshot and publish a NOTIFY."""
+        service = PipelineConfigService()
+        await service.get_all_stages()
+
+        assert await service.update_stage_enabled('verification', True)
+        await service.get_all_stages()
+
+        assert fake_conn.fetch.await_count == 6
+        notify = fake_conn.execute.await_args_list[-1].args
+        assert notify[0] == "SELECT pg_notify($1, $2)"
+        assert notify[2] == "stage:verification"
+
+    @pytest.mark.asyncio
+    async def test_update_missing_row_keeps_snapshot(self, fake_conn):
+        """Test an update that matches no row leaves the snapshot cached."""
+        fake_conn.execute.return_value = "UPDATE 0"
+        service = PipelineConfigService()
+        await service.get_all_stages()
+
+        assert not await service.update_phase2_category_enabled(99, False)
+        await service.get_all_stages()
+
+        assert fake_conn.fetch.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry_reloads(self, fake_conn, monkeypatch):
+        """Test an expired snapshot is reloaded on the next lookup."""
+        monkeypatch.setenv('PIPELINE_CONFIG_TTL', '0')
+        service = PipelineConfigService()
+
+        await service.get_all_stages()
+        await service.get_all_stages()
+
+        assert fake_conn.fetch.await_count == 6
+
+    @pytest.mark.asyncio
+    async def test_progress_map(self, fake_conn):
+        """Test progress is computed over enabled stages only."""
+        progress = await PipelineConfigService().get_stage_progress_map()
+
+        assert progress == pytest.approx({'data_collection': 200 / 3, 'merging': 100.0})
@@ -0,0 +1,116 @@
+"""
+Unit tests for the progress event bus.
+
+Tests delta computation, per-request subscriptions, coalescing of bursts,
+seeding from stored state and events from other processes.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import json
+
+import pytest
+
+from src.services.progress_bus import ProgressEventBus, dict_delta
+
+
+class TestDeltas:
+    """Test suite for delta helpers."""
+
+    def test_only_changed_fields(self):
+        """Test unchanged fields and nested keys are left out."""
+        old = {"status": "processing", "categories": {"Safety": {"status": "completed"}}}
+        new = {
+            "status": "processing",
+            "progressPercentage": 40,
+            "categories": {"Safety": {"status": "completed"}, "Dosage": {"status": "completed"}}
+        }
+
+        assert dict_delta(old, new) == {
+            "progressPercentage": 40,
+            "categories": {"Dosage": {"status": "completed"}}
+        }
+
+
+class TestProgressEventBus:
+    """Test suite for ProgressEventBus."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_then_coalesced_deltas(self):
+        """Test a watcher gets its snapshot, then bursts merged into one delta."""
+        bus = ProgressEventBus(coalesce_interval=0)
+        bus.publish("r1", status="processing", progressPercentage=10)
+        subscription = bus.subscribe(["r1"])
+
+        assert await subscription.next(timeout=1) == [{
+            "request_id": "r1", "type": "snapshot",
+            "data": {"status": "processing", "progressPercentage": 10}
+        }]
+
+        for completed in range(1, 6):
+            bus.publish("r1", status="processing", progressPercentage=10 + completed * 10,
+                        categories={f"c{completed}": {"status": "completed"}})
+
+        messages = await subscription.next(timeout=1)
+        assert len(messages) == 1
+        assert messages[0]["type"] == "delta"
+        assert messages[0]["data"]["progressPercentage"] == 60
+        assert "status" not in messages[0]["data"]
+        assert len(messages[0]["data"]["categories"]) == 5
+
+    @pytest.mark.asyncio
+    async def test_subscriptions_are_per_request(self):
+        """Test watchers only receive the requests they subscribed to."""
+        bus = ProgressEventBus(coalesce_interval=0)
+        first, second = bus.subscribe(["r1"]), bus.subscribe(["r2"])
+
+        bus.publish("r1", progressPercentage=50)
+        bus.publish("r1", progressPercentage=50)  # unchanged, not delivered
+
+        assert [m["request_id"] for m in await first.next(timeout=1)] == ["r1"]
+        assert await second.next(timeout=0.01) == []
+        assert bus.get_stats()["events_unchanged"] == 1
+
+        first.close()
+        assert bus.get_stats()["watched_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_seed_does_not_override_newer_events(self):
+        """Test stored state fills gaps without replacing event data."""
+        bus = ProgressEventBus(coalesce_interval=0)
+        subscription = bus.subscribe(["r1"])
+        bus.publish("r1", progressPercentage=80)
+        bus.seed("r1", {"status": "processing", "progressPercentage": 20, "drugName": "aspirin"})
+
+        messages = await subscription.next(timeout=1)
+
+        assert messages[0]["type"] == "snapshot"
+        assert messages[0]["data"] == {
+            "status": "processing", "progressPercentage": 80, "drugName": "aspirin"
+        }
+
+    @pytest.mark.asyncio
+    async def test_remote_events_apply_and_own_events_are_ignored(self):
+        """Test NOTIFY payloads from other processes reach local watchers once."""
+        bus = ProgressEventBus(coalesce_interval=0)
+        subscription = bus.subscribe(["r1"])
+
+        payload = bus._notification_payload("r1", {"status": "completed"})
+        bus._on_notification(None, 1, "request_progress", payload)
+        assert await subscription.next(timeout=0.01) == []
+
+        remote = json.dumps({"origin": "other", "request_id": "r1", "data": {"status": "completed"}})
+        bus._on_notification(None, 1, "request_progress", remote)
+        messages = await subscription.next(timeout=1)
+        assert messages[0]["data"] == {"status": "completed"}
+
+    def test_untracked_requests_are_evicted(self):
+        """Test state is bounded while watched requests are kept."""
+        bus = ProgressEventBus(max_tracked_requests=2)
+        bus.subscribe(["r0"])
+        for i in range(4):
+            bus.publish(f"r{i}", progressPercentage=i)
+
+        assert bus.has_state("r0") and bus.has_state("r3")
+        assert bus.get_stats()["tracked_requests"] == 2
@@ -0,0 +1,111 @@
+"""
+Unit tests for scheduled provider calls.
+
+Tests that hedged duplicates take their own scheduler slot and that
+rate-limited calls back off for the provider's Retry-After delay.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+import asyncio
+import pytest
+
+from src.integrations.provider_latency import LatencyTracker
+from src.integrations.provider_scheduler import ProviderScheduler
+from src.services import provider_service
+from src.services.provider_service import ProviderRateLimited, ProviderService
+
+
+class _PassthroughCache:
+    def make_key(self, *parts):
+        return parts
+
+    async def get_or_call(self, key, call, **kwargs):
+        return await call()
+
+
+def _service(dispatch, hedge=False, samples=()):
+    service = ProviderService.__new__(ProviderService)
+    service.config = {"openai": {"api_key": "test", "model": "gpt-4o"}}
+    service.scheduler = ProviderScheduler()
+    service.scheduler.configure("openai", max_concurrency=4, rpm=0, tpm=0)
+    service.latency = LatencyTracker(min_samples=10, hedge_budget=1.0)
+    for seconds in samples:
+        service.latency.record("openai", seconds)
+    service.response_cache = _PassthroughCache()
+    service.HEDGE_PROVIDER_CALLS = hedge
+    service._dispatch_provider_call = dispatch
+    return service
+
+
+class TestProviderCalls:
+    """Test suite for ProviderService.call_provider_with_prompt."""
+
+    @pytest.mark.asyncio
+    async def test_hedge_takes_its_own_scheduler_slot(self):
+        """Test a hedged duplicate is granted and counted like any other request."""
+        calls = []
+
+        async def dispatch(provider_id, prompt, config, temperature, on_chunk=None):
+            calls.append(provider_id)
+            await asyncio.sleep(0.2 if len(calls) == 1 else 0.01)
+            return "answer", {"endpoint": "test"}
+
+        service = _service(dispatch, hedge=True, samples=[0.01] * 20)
+
+        response, _ = await service.call_provider_with_prompt("openai", "prompt", 0.3)
+
+        metrics = service.scheduler.get_metrics("openai")["openai"]
+        assert response == "answer"
+        assert len(calls) == 2
+        assert metrics["granted"] == 2
+        assert metrics["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_backs_off_and_retries(self, monkeypatch):
+        """Test a 429 waits for Retry-After outside the slot, then succeeds."""
+        sleeps = []
+        in_flight = []
+        real_sleep = asyncio.sleep
+
+        async def fake_sleep(delay):
+            in_flight.append(service.scheduler.get_metrics("openai")["openai"]["in_flight"])
+            sleeps.append(delay)
+            await real_sleep(0)
+
+        attempts = []
+
+        async def dispatch(provider_id, prompt, config, temperature, on_chunk=None):
+            attempts.append(provider_id)
+            if len(attempts) == 1:
+                raise ProviderRateLimited("OpenAI API error: 429 - slow down", retry_after=7.0)
+            return "answer", {"endpoint": "test"}
+
+        service = _service(dispatch)
+        monkeypatch.setattr(provider_service.asyncio, "sleep", fake_sleep)
+
+        response, _ = await service.call_provider_with_prompt("openai", "prompt", 0.3)
+
+        assert response == "answer"
+        assert sleeps == [7.0]
+        assert in_flight == [0]
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_error_returned_after_retries(self, monkeypatch):
+        """Test the provider error is returned, uncached, once retries run out."""
+        async def dispatch(provider_id, prompt, config, temperature, on_chunk=None):
+            raise ProviderRateLimited("OpenAI API error: 429 - slow down", request_payload={"endpoint": "test"})
+
+        async def no_sleep(delay):
+            pass
+
+        service = _service(dispatch)
+        service.RATE_LIMIT_RETRIES = 2
+        monkeypatch.setattr(provider_service.asyncio, "sleep", no_sleep)
+
+        response, payload = await service.call_provider_with_prompt("openai", "prompt", 0.3)
+
+        assert response == "OpenAI API error: 429 - slow down"
+        assert not ProviderService._is_cacheable_response({"response": response, "request_payload": payload})
+        assert service.scheduler.get_metrics("openai")["openai"]["granted"] == 3
@@ -0,0 +1,151 @@
+"""
+Unit tests for pre-merge response deduplication.
+
+Tests MinHash and SimHash similarity, collapsing of near-identical
+responses, removal of repeated table rows and the tokens-saved report.
+
+Version: 1.0.0
+Author: CognitoAI Development Team
+"""
+
+from src.services.response_dedup import (
+    deduplicate_responses,
+    minhash,
+    similarity,
+    simhash
+)
+
+
+_REPORT = (
+    "Aspirin is a nonsteroidal anti-inflammatory drug used to reduce pain, fever and inflammation. "
+    "It irreversibly inhibits cyclooxygenase enzymes and is widely used for cardiovascular prevention. "
+    "The global market was valued at about two billion dollars with steady growth expected through 2030. "
+    "Major manufacturers include Bayer and several generic producers across Asia and Europe."
+)
+
+_TABLE = """| Region | Market Size | Growth |
+|---|---|---|
+| North America | $800 million | 3.1% |
+| Europe | $600 million | 2.8% |"""
+
+
+def _response(provider, text, temperature=0.3, weight=10):
+    return {"provider": provider, "temperature": temperature, "weight": weight, "response": text}
+
+
+class TestSimilarity:
+    """Test suite for the MinHash and SimHash fingerprints."""
+
+    def test_minhash_estimates_overlap(self):
+        """Test near-identical texts score high and unrelated texts low."""
+        reworded = _REPORT.replace("steady growth", "moderate growth")
+        unrelated = "Clinical trials for the compound enrolled patients across twelve sites in three countries."
+
+        assert similarity(minhash(_REPORT), minhash(_REPORT)) == 1.0
+        assert similarity(minhash(_REPORT), minhash(reworded)) > 0.8
+        assert similarity(minhash(_REPORT), minhash(unrelated)) < 0.1
+        assert similarity(minhash(""), minhash(_REPORT)) == 0.0
+
+    def test_simhash_is_deterministic(self):
+        """Test fingerprints only depend on the features."""
+        features = ["0:north", "0:america", "1:800", "1:million"]
+
+        assert simhash(features) == simhash(list(features))
+        assert simhash(features) != simhash(["0:europe", "1:600", "1:million"])
+
+
+class TestDeduplicateResponses:
+    """Test suite for deduplicate_responses."""
+
+    def test_temperature_duplicates_collapse(self):
+        """Test the same answer at several temperatures reaches the merge once."""
+        responses = [
+            _response("openai", _REPORT, temperature=0.3),
+            _response("openai", _REPORT.replace("steady growth", "growth"), temperature=0.7),
+            _response("perplexity", "Clinical trials for the compound enrolled patients across twelve sites.")
+        ]
+
+        distinct, report = deduplicate_responses(responses)
+
+        assert [(r["provider"], r["temperature"]) for r in distinct] == [("openai", 0.3), ("perplexity", 0.3)]
+        assert report["responses_in"] == 3 and report["responses_out"] == 2
+        assert report["collapsed"][0]["into_temperature"] == 0.3
+        assert report["tokens_saved"] > 0
+        assert report["tokens_saved"] == report["tokens_in"] - report["tokens_out"]
+
+    def test_collapsed_response_keeps_new_paragraphs(self):
+        """Test content only found in a near-duplicate is still passed on."""
+        extra = "A new formulation received approval in Japan in 2025."
+        responses = [
+            _response("openai", _REPORT + "\n\n" + _REPORT.replace("Aspirin", "ASA")),
+            _response("openai", _REPORT + "\n\n" + _REPORT.replace("Aspirin", "ASA") + "\n\n" + extra,
+                      temperature=0.7, weight=5)
+        ]
+
+        distinct, report = deduplicate_responses(responses)
+
+        assert len(report["collapsed"]) == 1
+        assert [r["response"] for r in distinct if extra in r["response"]] == [extra]
+
+    def test_repeated_table_rows_are_removed(self):
+        """Test rows repeated across distinct responses appear once, formatting aside."""
+        other = """Market data from industry reports:
+
+| Region | Market Size | Growth |
+|---|---|---|
+| **Europe** | $600 Million | 2.8% |
+| Asia Pacific | $400 million | 5.2% |"""
+        responses = [_response("openai", _TABLE), _response("gemini", other, weight=8)]
+
+        distinct, report = deduplicate_responses(responses)
+
+        assert len(distinct) == 2
+        assert report["table_rows_removed"] == 1
+        assert "Europe" not in distinct[1]["response"]
+        assert "| Asia Pacific | $400 million | 5.2% |" in distinct[1]["response"]
+        assert distinct[1]["response"].startswith("Market data from industry reports:\n\n| Region |")
+
+    def test_rows_with_different_figures_are_kept(self):
+        """Test conflicting values are not mistaken for duplicates."""
+        conflicting = _TABLE.replace("$800 million", "$850 million")
+
+        distinct, report = deduplicate_responses([
+            _response("openai", _TABLE + "\n\nFigures from 2023."),
+            _response("grok", conflicting + "\n\nFigures from company filings.")
+        ])
+
+        assert report["table_rows_removed"] == 1
+        assert "$850 million" in distinct[1]["response"]
+
+    def test_long_rows_differing_in_one_figure_are_kept(self):
+        """Test a single changed number in a long row is never collapsed."""
+        row = ("| Global market size | 2024 | USD 4.2 billion | Growing at {} CAGR driven by "
+               "generic uptake and expanded cardiovascular indications | [Priority 2: FDA, Jan 2025] |")
+        header = "| Metric | Year | Value | Notes | Source |\n|---|---|---|---|---|\n"
+
+        for figure in ["2.6%", "4.7%", "6.2%", "7.4%", "7.6%"] + [f"{i / 10}%" for i in range(10, 100, 7)]:
+            distinct, report = deduplicate_responses([
+                _response("openai", header + row.format("6.7%") + "\n\nFigures from 2023."),
+                _response("grok", header + row.format(figure) + "\n\nFigures from company filings.")
+            ])
+
+            assert report["table_rows_removed"] == 0, figure
+            assert f"Growing at {figure}" in distinct[1]["response"]
+
+        _, report = deduplicate_responses([
+            _response("openai", header + row.format("6.7%") + "\n\nFigures from 2023."),
+            _response("grok", header + row.format("6.7%").replace("Global", "global") + "\n\nCompany filings.")
+        ])
+        assert report["table_rows_removed"] == 1
+
+    def test_distinct_responses_pass_unchanged(self):
+        """Test nothing is removed when responses do not overlap."""
+        responses = [
+            _response("openai", _REPORT),
+            _response("perplexity", "Clinical trials for the compound enrolled patients across twelve sites.")
+        ]
+
+        distinct, report = deduplicate_responses(responses)
+
+        assert distinct == responses
+        assert report["tokens_saved"] == 0